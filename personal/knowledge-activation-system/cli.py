@@ -703,14 +703,22 @@ def maintenance(
     vacuum: Annotated[bool, typer.Option("--vacuum", help="Run VACUUM ANALYZE on database")] = False,
     reindex: Annotated[bool, typer.Option("--reindex", help="Rebuild search indexes")] = False,
     cleanup: Annotated[bool, typer.Option("--cleanup", help="Clean up orphaned chunks")] = False,
+    vector_index: Annotated[
+        bool, typer.Option("--vector-index", help="Rebuild the in-process vector index snapshot")
+    ] = False,
+    previews: Annotated[
+        bool, typer.Option("--previews", help="Backfill content previews from first chunks")
+    ] = False,
     dry_run: Annotated[bool, typer.Option("--dry-run", "-n", help="Show what would be done")] = False,
 ) -> None:
     """Database maintenance tasks."""
-    if not any([vacuum, reindex, cleanup]):
+    if not any([vacuum, reindex, cleanup, vector_index, previews]):
         console.print("[yellow]Specify at least one maintenance task:[/yellow]")
-        console.print("  --vacuum   Run VACUUM ANALYZE")
-        console.print("  --reindex  Rebuild search indexes")
-        console.print("  --cleanup  Clean up orphaned chunks")
+        console.print("  --vacuum        Run VACUUM ANALYZE")
+        console.print("  --reindex       Rebuild search indexes")
+        console.print("  --cleanup       Clean up orphaned chunks")
+        console.print("  --vector-index  Rebuild vector index snapshot")
+        console.print("  --previews      Backfill content previews")
         raise typer.Exit(1)
 
     async def _maintenance():
@@ -769,6 +777,36 @@ def maintenance(
                         count = result.split()[-1] if result else "0"
                     console.print(f"[green]✓[/green] Deleted {count} orphaned chunks")
 
+            if previews:
+                console.print("[bold]Backfilling content previews...[/bold]")
+                if dry_run:
+                    async with db._pool.acquire() as conn:
+                        missing = await conn.fetchval("""
+                            SELECT COUNT(*) FROM content c
+                            WHERE c.preview_text IS DISTINCT FROM (
+                                SELECT chunk_text FROM chunks
+                                WHERE content_id = c.id
+                                ORDER BY chunk_index
+                                LIMIT 1
+                            )
+                        """)
+                    console.print(f"[dim]Would update {missing} content previews[/dim]")
+                else:
+                    updated = await db.refresh_previews()
+                    console.print(f"[green]✓[/green] Updated {updated} content previews")
+
+            if vector_index:
+                from knowledge.vector_index import build_vector_index, get_vector_index_path
+
+                path = get_vector_index_path()
+                console.print("[bold]Rebuilding vector index snapshot...[/bold]")
+                if dry_run:
+                    console.print(f"[dim]Would rebuild snapshot at {path}[/dim]")
+                else:
+                    index = await build_vector_index(db, nprobe=get_settings().vector_index_nprobe)
+                    index.save(path)
+                    console.print(f"[green]✓[/green] Indexed {len(index)} chunks to {path}")
+
             console.print()
             console.print("[bold green]Maintenance complete![/bold green]")
 
@@ -781,7 +819,7 @@ def maintenance(
 @app.command("export")
 def export_cmd(
     output: Annotated[str, typer.Option("--output", "-o", help="Output file path")] = "kas-export.json",
-    format: Annotated[str, typer.Option("--format", "-f", help="Format: json, jsonl")] = "json",
+    format: Annotated[str, typer.Option("--format", "-f", help="Format: json, jsonl, parquet")] = "json",
     namespace: Annotated[str | None, typer.Option("--namespace", "-ns", help="Filter by namespace")] = None,
     include_embeddings: Annotated[bool, typer.Option("--embeddings", help="Include embedding vectors")] = False,
 ) -> None:
@@ -792,7 +830,9 @@ def export_cmd(
 
     try:
         with httpx.Client(timeout=300.0) as client:
-            response = client.post(
+            # Stream to disk so large exports never sit in memory
+            with client.stream(
+                "POST",
                 "http://localhost:8000/api/v1/export",
                 json={
                     "format": format,
@@ -800,14 +840,15 @@ def export_cmd(
                     "include_chunks": True,
                     "include_embeddings": include_embeddings,
                 },
-            )
-
-            if response.status_code != 200:
-                console.print(f"[red]Export failed: {response.text}[/red]")
-                raise typer.Exit(1)
+            ) as response:
+                if response.status_code != 200:
+                    response.read()
+                    console.print(f"[red]Export failed: {response.text}[/red]")
+                    raise typer.Exit(1)
 
-            with open(output, "wb") as f:
-                f.write(response.content)
+                with open(output, "wb") as f:
+                    for chunk in response.iter_bytes():
+                        f.write(chunk)
 
         console.print(f"[green]✓[/green] Exported to {output}")
 
@@ -984,9 +1025,23 @@ def ingest_directory_cmd(
         bool, typer.Option("--recursive", "-r", help="Scan subdirectories")
     ] = False,
     tags: Annotated[list[str] | None, typer.Option("--tag", "-T", help="Tags to add")] = None,
+    resume: Annotated[
+        bool, typer.Option("--resume/--no-resume", help="Skip files finished by a previous run")
+    ] = True,
+    parse_workers: Annotated[
+        int | None, typer.Option("--parse-workers", help="Parser processes (0 = in-process threads)")
+    ] = None,
+    embed_workers: Annotated[
+        int | None, typer.Option("--embed-workers", help="Concurrent embedding batches")
+    ] = None,
+    store_workers: Annotated[
+        int | None, typer.Option("--store-workers", help="Concurrent database writers")
+    ] = None,
 ) -> None:
     """Ingest all supported files from a directory."""
-    from knowledge.ingest.files import ingest_file, scan_directory
+    from knowledge.ingest import IngestResult
+    from knowledge.ingest.files import scan_directory
+    from knowledge.ingest.pipeline import PipelineConfig, default_progress_path, run_ingest_pipeline
 
     async def _ingest():
         try:
@@ -1005,20 +1060,48 @@ def ingest_directory_cmd(
 
             console.print(f"Found {len(files)} files to ingest")
 
-            # Ingest each file
-            success_count = 0
-            for file_path in files:
-                with console.status(f"[bold blue]Ingesting {file_path.name}..."):
-                    result = await ingest_file(file_path, tags=tags)
-
+            settings = get_settings()
+            config = PipelineConfig.from_settings(settings)
+            if parse_workers is not None:
+                config.parse_workers = parse_workers
+            if embed_workers is not None:
+                config.embed_workers = embed_workers
+            if store_workers is not None:
+                config.store_workers = store_workers
+
+            progress_path = default_progress_path(path, settings)
+            if not resume:
+                progress_path.unlink(missing_ok=True)
+
+            def on_result(file_path, result: IngestResult) -> None:
                 if result.success:
                     console.print(f"[green]✓[/green] {result.title}")
-                    success_count += 1
                 else:
                     console.print(f"[red]✗[/red] {file_path.name}: {result.error}")
 
+            report = await run_ingest_pipeline(
+                files,
+                tags=tags,
+                settings=settings,
+                progress_path=progress_path,
+                config=config,
+                on_result=on_result,
+            )
+
             console.print()
-            console.print(f"Ingested {success_count}/{len(files)} files")
+            if report.skipped:
+                console.print(f"[dim]Skipped {report.skipped} files finished by a previous run[/dim]")
+            console.print(f"Ingested {report.ingested}/{len(files) - report.skipped} files")
+
+            summary = Table(show_header=False, box=None)
+            summary.add_column("Metric", style="cyan")
+            summary.add_column("Value", style="green", justify="right")
+            summary.add_row("Elapsed", f"{report.elapsed:.1f}s")
+            summary.add_row("Docs/s", f"{report.docs_per_second:.2f}")
+            summary.add_row("Chunks/s", f"{report.chunks_per_second:.1f}")
+            for name, stage in report.stages.items():
+                summary.add_row(f"{name.capitalize()} busy", f"{stage.busy_seconds:.1f}s ({stage.items} docs)")
+            console.print(summary)
 
         finally:
             await close_db()
@@ -1703,6 +1786,7 @@ def entity_extract(
     """
     from uuid import UUID
 
+    from knowledge.entity_backfill import extraction_record
     from knowledge.entity_extraction import extract_entities
 
     async def _extract():
@@ -1745,36 +1829,9 @@ def entity_extract(
                 console.print("[yellow]No entities found in content.[/yellow]")
                 return
 
-            # Delete existing entities and insert new ones
-            deleted = await db.delete_entities_by_content(uuid)
-            if deleted > 0:
-                console.print(f"[dim]Replaced {deleted} existing entities[/dim]")
-
-            # Insert entities
-            entity_ids: dict[str, str] = {}
-            for entity in result.entities:
-                entity_id = await db.insert_entity(
-                    content_id=uuid,
-                    name=entity.name,
-                    entity_type=entity.entity_type,
-                    confidence=entity.confidence,
-                )
-                entity_ids[entity.name.lower()] = str(entity_id)
-
-            # Insert relationships
-            rel_count = 0
-            for rel in result.relationships:
-                from_id = entity_ids.get(rel.from_entity.lower())
-                to_id = entity_ids.get(rel.to_entity.lower())
-                if from_id and to_id:
-                    from uuid import UUID as UUIDClass
-                    await db.insert_relationship(
-                        from_entity_id=UUIDClass(from_id),
-                        to_entity_id=UUIDClass(to_id),
-                        relation_type=rel.relation_type,
-                        confidence=rel.confidence,
-                    )
-                    rel_count += 1
+            # Replace existing entities in one transaction
+            stored = await db.store_entity_extractions([extraction_record(uuid, result)])
+            rel_count = stored[uuid][1]
 
             # Display results
             table = Table(title="Extracted Entities")
@@ -1945,128 +2002,50 @@ def entity_canonical(
 
 @entity_app.command("batch")
 def entity_batch(
-    limit: Annotated[int, typer.Option("--limit", "-l", help="Max content items to process")] = 50,
-    force: Annotated[bool, typer.Option("--force", "-f", help="Re-extract even if entities exist")] = False,
+    limit: Annotated[int | None, typer.Option("--limit", "-l", help="Max content items to process")] = None,
+    force: Annotated[bool, typer.Option("--force", "-f", help="Re-extract even if text is unchanged")] = False,
+    concurrency: Annotated[
+        int | None, typer.Option("--concurrency", "-c", help="Concurrent LLM extractions")
+    ] = None,
 ) -> None:
     """Batch extract entities from all content.
 
-    Processes content that doesn't have extracted entities yet,
-    or all content if --force is specified.
+    Processes content whose entities are missing or were extracted from
+    different text, or all content if --force is specified. Progress is
+    checkpointed per batch, so an interrupted run picks up where it left off.
     """
-    from knowledge.entity_extraction import extract_entities
+    from knowledge.entity_backfill import BackfillReport, run_entity_backfill
+
+    def _progress(report: BackfillReport) -> None:
+        console.print(
+            f"  [green]✓[/green] {report.extracted} items, {report.entities} entities, "
+            f"{report.relationships} relations ({report.items_per_second:.1f} items/s)"
+        )
 
     async def _batch():
         try:
-            db = await get_db()
-
-            # Get content without entities (or all if force)
-            async with db.acquire() as conn:
-                if force:
-                    query = """
-                        SELECT c.id, c.title FROM content c
-                        WHERE c.deleted_at IS NULL
-                        ORDER BY c.created_at DESC
-                        LIMIT $1
-                    """
-                    rows = await conn.fetch(query, limit)
-                else:
-                    query = """
-                        SELECT c.id, c.title FROM content c
-                        LEFT JOIN entities e ON e.content_id = c.id
-                        WHERE c.deleted_at IS NULL AND e.id IS NULL
-                        ORDER BY c.created_at DESC
-                        LIMIT $1
-                    """
-                    rows = await conn.fetch(query, limit)
-
-            if not rows:
-                console.print("[dim]No content needs entity extraction.[/dim]")
-                return
-
-            console.print(f"[bold]Extracting entities from {len(rows)} content items...[/bold]")
+            console.print("[bold]Extracting entities...[/bold]")
             console.print()
 
-            total_entities = 0
-            total_relations = 0
-            errors = 0
-
-            for i, row in enumerate(rows, 1):
-                content_id = row["id"]
-                title = row["title"]
-
-                # Get chunks
-                chunks = await db.get_chunks(content_id)
-                if not chunks:
-                    console.print(f"  [{i}/{len(rows)}] [yellow]No chunks:[/yellow] {title[:50]}")
-                    continue
-
-                content_text = " ".join(c["chunk_text"] for c in chunks[:5])
-
-                try:
-                    result = await extract_entities(title, content_text)
-
-                    if not result.success:
-                        console.print(f"  [{i}/{len(rows)}] [red]Error:[/red] {title[:50]}")
-                        errors += 1
-                        continue
-
-                    if not result.entities:
-                        console.print(f"  [{i}/{len(rows)}] [dim]No entities:[/dim] {title[:50]}")
-                        continue
-
-                    # Delete existing if force
-                    if force:
-                        await db.delete_entities_by_content(content_id)
-
-                    # Insert entities using batch method (auto-links to canonical)
-                    entity_records = [
-                        {
-                            "name": e.name,
-                            "entity_type": e.entity_type,
-                            "confidence": e.confidence,
-                        }
-                        for e in result.entities
-                    ]
-                    entity_ids = await db.insert_entities_batch(content_id, entity_records)
-
-                    # Build entity ID map for relationships
-                    entity_id_map = {
-                        result.entities[i].name.lower(): entity_ids[i]
-                        for i in range(len(result.entities))
-                    }
-
-                    # Insert relationships
-                    rel_count = 0
-                    for rel in result.relationships:
-                        from_id = entity_id_map.get(rel.from_entity.lower())
-                        to_id = entity_id_map.get(rel.to_entity.lower())
-                        if from_id and to_id:
-                            await db.insert_relationship(
-                                from_entity_id=from_id,
-                                to_entity_id=to_id,
-                                relation_type=rel.relation_type,
-                                confidence=rel.confidence,
-                            )
-                            rel_count += 1
-
-                    total_entities += len(result.entities)
-                    total_relations += rel_count
-
-                    console.print(
-                        f"  [{i}/{len(rows)}] [green]✓[/green] {len(result.entities)} entities, "
-                        f"{rel_count} relations: {title[:40]}..."
-                    )
+            report = await run_entity_backfill(
+                concurrency=concurrency,
+                limit=limit,
+                force=force,
+                on_progress=_progress,
+            )
 
-                except Exception as e:
-                    console.print(f"  [{i}/{len(rows)}] [red]Error: {e}[/red]")
-                    errors += 1
+            if report.scanned == 0:
+                console.print("[dim]No content needs entity extraction.[/dim]")
+                return
 
             console.print()
             console.print(f"[green]✓[/green] Batch extraction complete")
-            console.print(f"  Total entities:      {total_entities}")
-            console.print(f"  Total relationships: {total_relations}")
-            if errors > 0:
-                console.print(f"  [yellow]Errors: {errors}[/yellow]")
+            console.print(f"  Items extracted:     {report.extracted}")
+            console.print(f"  Total entities:      {report.entities}")
+            console.print(f"  Total relationships: {report.relationships}")
+            console.print(f"  Elapsed:             {report.elapsed:.1f}s")
+            if report.failed > 0:
+                console.print(f"  [yellow]Errors: {report.failed}[/yellow]")
 
         finally:
             await close_db()
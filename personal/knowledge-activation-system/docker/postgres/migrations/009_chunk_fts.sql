@@ -0,0 +1,17 @@
+-- Migration: Chunk-level full-text search
+-- Purpose: Rank BM25 hits by their best-matching passage instead of the first chunk
+-- Run: docker exec -i knowledge-db psql -U knowledge knowledge < docker/postgres/migrations/009_chunk_fts.sql
+
+SET maintenance_work_mem = '256MB';
+
+-- Per-chunk tsvector, maintained by Postgres on insert/update of chunk_text
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS fts_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', chunk_text)) STORED;
+
+-- GIN index for chunk-level @@ matching
+-- Used by: Database.bm25_search (best passage per document)
+CREATE INDEX IF NOT EXISTS idx_chunks_fts ON chunks USING GIN(fts_vector);
+
+ANALYZE chunks;
+
+RESET maintenance_work_mem;
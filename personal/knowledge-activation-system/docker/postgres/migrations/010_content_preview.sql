@@ -0,0 +1,20 @@
+-- Migration: Precomputed content previews
+-- Purpose: Store each item's first chunk on content so listings avoid per-row chunk lookups
+-- Run: docker exec -i knowledge-db psql -U knowledge knowledge < docker/postgres/migrations/010_content_preview.sql
+
+-- First chunk text, maintained by Database.insert_chunks
+-- Used by: Database.bm25_search (fallback passage), review scheduler queues
+ALTER TABLE content ADD COLUMN IF NOT EXISTS preview_text TEXT;
+
+-- Backfill existing rows (re-runnable via: python cli.py maintenance --previews)
+UPDATE content c
+SET preview_text = f.chunk_text
+FROM (
+    SELECT DISTINCT ON (content_id) content_id, chunk_text
+    FROM chunks
+    ORDER BY content_id, chunk_index
+) f
+WHERE c.id = f.content_id
+  AND c.preview_text IS DISTINCT FROM f.chunk_text;
+
+ANALYZE content;
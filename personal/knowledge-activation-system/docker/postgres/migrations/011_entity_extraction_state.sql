@@ -0,0 +1,36 @@
+-- Migration: Entity extraction checkpoints
+-- Purpose: Record which text each item's entities were extracted from, so backfills resume and skip unchanged content
+-- Run: docker exec -i knowledge-db psql -U knowledge knowledge < docker/postgres/migrations/011_entity_extraction_state.sql
+
+-- One row per item, written in the same transaction as its entities
+-- Used by: Database.get_entity_extraction_candidates, Database.store_entity_extractions
+CREATE TABLE IF NOT EXISTS entity_extraction_state (
+    content_id UUID PRIMARY KEY REFERENCES content(id) ON DELETE CASCADE,
+    text_hash TEXT NOT NULL,               -- md5 of title + first five chunks (see knowledge.db.ENTITY_TEXT_HASH)
+    entity_count INTEGER NOT NULL DEFAULT 0,
+    relationship_count INTEGER NOT NULL DEFAULT 0,
+    extracted_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Items that already have entities count as extracted from their current text
+INSERT INTO entity_extraction_state (content_id, text_hash, entity_count)
+SELECT c.id,
+       md5(c.title || E'\n' || COALESCE(t.text, '')),
+       e.entity_count
+FROM content c
+JOIN (
+    SELECT content_id, COUNT(*) AS entity_count FROM entities GROUP BY content_id
+) e ON e.content_id = c.id
+LEFT JOIN LATERAL (
+    SELECT string_agg(chunk_text, ' ' ORDER BY chunk_index) AS text
+    FROM (
+        SELECT chunk_text, chunk_index FROM chunks
+        WHERE content_id = c.id
+        ORDER BY chunk_index
+        LIMIT 5
+    ) first_chunks
+) t ON TRUE
+WHERE c.deleted_at IS NULL
+ON CONFLICT (content_id) DO NOTHING;
+
+ANALYZE entity_extraction_state;
@@ -0,0 +1,11 @@
+-- Migration: API key lookup prefix
+-- Purpose: Authenticate a key with one indexed row and one hash verification instead of checking every active key
+-- Run: docker exec -i knowledge-db psql -U knowledge knowledge < docker/postgres/migrations/012_api_key_prefix.sql
+
+-- Non-secret leading characters of the key ("kas_" + 12 random characters)
+-- Used by: knowledge.api.auth.get_api_key
+-- Existing Argon2 keys are left NULL and filled in the first time they authenticate
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS key_prefix TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_api_keys_prefix ON api_keys(key_prefix)
+    WHERE revoked_at IS NULL;
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark API key authentication overhead per request.
+
+For 1, 100 and 1,000 stored keys, times three paths through auth:
+
+    scan     the previous approach: Argon2-verify every active key
+             (worst case, the presented key is checked last)
+    indexed  get_api_key with a cold cache: one prefix lookup, one Argon2 verify
+    cached   get_api_key served from the verified-key cache
+
+The api_keys table is an in-memory stand-in indexed by prefix, so the
+numbers are auth CPU cost without database round trips. Filler keys share
+one Argon2 hash; verifying it costs the same as verifying distinct ones.
+
+Usage:
+    python scripts/benchmark_api_auth.py
+    python scripts/benchmark_api_auth.py --keys 1 100 1000 --requests 200 --scan-requests 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console
+from rich.table import Table
+
+from knowledge.api import auth
+from knowledge.api.auth import api_key_prefix, generate_api_key, get_api_key, verify_api_key
+
+
+class IndexedKeys:
+    """api_keys rows indexed by prefix, answering the lookup get_api_key issues."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.by_prefix = {row["key_prefix"]: row for row in rows}
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        if "key_prefix = $1" in query:
+            row = self.by_prefix.get(args[0])
+            return [row] if row else []
+        return []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self
+
+
+def key_row(key_hash: str, prefix: str) -> dict[str, Any]:
+    return {
+        "id": uuid4(),
+        "name": prefix,
+        "scopes": ["read"],
+        "rate_limit": 100,
+        "key_hash": key_hash,
+        "key_prefix": prefix,
+        "expires_at": None,
+    }
+
+
+def make_rows(count: int) -> tuple[str, list[dict[str, Any]]]:
+    """The presented key plus ``count`` stored rows (the key's own row last)."""
+    key, key_hash = generate_api_key()
+    _, filler_hash = generate_api_key()
+    rows = [key_row(filler_hash, f"kas_{i:012d}") for i in range(count - 1)]
+    rows.append(key_row(key_hash, api_key_prefix(key)))
+    return key, rows
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    """p50 and p99 in milliseconds."""
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50 * 1000, p99 * 1000
+
+
+def time_scan(key: str, rows: list[dict[str, Any]], requests: int) -> list[float]:
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        next(row for row in rows if verify_api_key(key, row["key_hash"]))
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def time_get_api_key(key: str, rows: list[dict[str, Any]], requests: int) -> dict[str, list[float]]:
+    db = IndexedKeys(rows)
+    request = MagicMock()
+    request.url.path = "/api/v1/search"
+    timings: dict[str, list[float]] = {"indexed": [], "cached": []}
+
+    async def get_db() -> IndexedKeys:
+        return db
+
+    with patch("knowledge.api.auth.get_db", side_effect=get_db):
+        for _ in range(requests):
+            auth.get_verified_key_cache().clear()
+            for label in ("indexed", "cached"):
+                start = time.perf_counter()
+                await get_api_key(request, key)
+                timings[label].append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API key authentication")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 100, 1000], help="Stored key counts")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per indexed/cached run")
+    parser.add_argument("--scan-requests", type=int, default=3, help="Requests per scan run (slow)")
+    args = parser.parse_args()
+
+    console = Console()
+    table = Table(title="API key auth overhead per request")
+    for column in ("Keys", "Path", "p50 (ms)", "p99 (ms)", "Requests/s"):
+        table.add_column(column, justify="right" if column != "Path" else "left")
+
+    for count in args.keys:
+        key, rows = make_rows(count)
+        results = {"scan": time_scan(key, rows, args.scan_requests)}
+        results.update(asyncio.run(time_get_api_key(key, rows, args.requests)))
+        for label, samples in results.items():
+            p50, p99 = percentiles(samples)
+            table.add_row(f"{count:,}", label, f"{p50:.3f}", f"{p99:.3f}", f"{len(samples) / sum(samples):,.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Microbenchmark knowledge_engine.distributed.cache.MemoryCache.
+
+Fills a cache to --entries items, then times random hits, overwrites,
+inserts that evict the least recently used entry, and reads of expired
+entries, reporting per-operation cost.
+
+Usage:
+    python scripts/benchmark_distributed_cache.py
+    python scripts/benchmark_distributed_cache.py --entries 100000 --ops 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console
+from rich.table import Table
+
+from knowledge_engine.distributed.cache import MemoryCache
+
+
+def make_value(i: int) -> dict[str, Any]:
+    """A small search-result-like payload."""
+    return {"id": i, "title": f"Document {i}", "score": 0.5, "tags": ["python", "cache"]}
+
+
+async def run(entries: int, ops: int) -> dict[str, float]:
+    """Seconds per phase."""
+    rng = random.Random(7)
+    cache = MemoryCache(max_items=entries, max_size_mb=1024)
+    timings: dict[str, float] = {}
+
+    start = time.perf_counter()
+    for i in range(entries):
+        await cache.set(f"key:{i}", make_value(i), ttl=3600)
+    timings["fill"] = time.perf_counter() - start
+
+    keys = [f"key:{rng.randrange(entries)}" for _ in range(ops)]
+    start = time.perf_counter()
+    for key in keys:
+        await cache.get(key)
+    timings["get (hit)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, key in enumerate(keys):
+        await cache.set(key, make_value(i), ttl=3600)
+    timings["set (overwrite)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.set(f"new:{i}", make_value(i), ttl=3600)
+    timings["set (evict LRU)"] = time.perf_counter() - start
+
+    for i in range(ops):
+        await cache.set(f"short:{i}", make_value(i), ttl=1)
+    await asyncio.sleep(1.1)
+    start = time.perf_counter()
+    for i in range(ops):
+        await cache.get(f"short:{i}")
+    timings["get (expired)"] = time.perf_counter() - start
+
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MemoryCache")
+    parser.add_argument("--entries", type=int, default=100_000, help="Cache capacity (and fill size)")
+    parser.add_argument("--ops", type=int, default=100_000, help="Operations per phase")
+    args = parser.parse_args()
+
+    timings = asyncio.run(run(args.entries, args.ops))
+
+    table = Table(title=f"MemoryCache ({args.entries:,} entries, {args.ops:,} ops/phase)")
+    for column in ("Phase", "Total (s)", "Per op (µs)", "Ops/s"):
+        table.add_column(column, justify="right" if column != "Phase" else "left")
+    for phase, seconds in timings.items():
+        count = args.entries if phase == "fill" else args.ops
+        table.add_row(phase, f"{seconds:.3f}", f"{seconds / count * 1e6:.2f}", f"{count / seconds:,.0f}")
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
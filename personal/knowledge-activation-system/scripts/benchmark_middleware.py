@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark the API middleware stack on GET /api/v1/search.
+
+Drives the FastAPI app in-process over httpx's ASGI transport, with search
+and the database stubbed out, so the numbers are framework and middleware
+overhead only. Compares the full app (CORS, security, security headers,
+metrics and versioning middleware) with the same routes and no middleware.
+
+Usage:
+    python scripts/benchmark_middleware.py
+    python scripts/benchmark_middleware.py --requests 5000 --concurrency 50 --results 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Keep the real rate limiter in the path, with limits the benchmark won't hit
+os.environ.setdefault("KNOWLEDGE_RATE_LIMIT_REQUESTS", str(10**9))
+os.environ.setdefault("KNOWLEDGE_RATE_LIMIT_BURST", str(10**9))
+os.environ.setdefault("KNOWLEDGE_REDIS_ENABLED", "false")
+
+import httpx
+from fastapi import FastAPI
+from rich.console import Console
+from rich.table import Table
+
+from knowledge.api.main import app
+
+
+def fake_results(count: int) -> list[Any]:
+    """Search results shaped like knowledge.search.SearchResult."""
+    return [
+        SimpleNamespace(
+            content_id=uuid4(),
+            title=f"Result {i}",
+            content_type="note",
+            score=0.9 - i * 0.01,
+            namespace="default",
+            chunk_text="postgres vector index embedding search " * 10,
+            source_ref=None,
+            vector_similarity=0.8,
+            bm25_score=3.2,
+        )
+        for i in range(count)
+    ]
+
+
+async def drive(target: Any, requests: int, concurrency: int) -> tuple[float, float, float]:
+    """Issue ``requests`` searches over ``concurrency`` workers; returns (req/s, p50 ms, p99 ms)."""
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost:8000") as client:
+        await client.get("/api/v1/search", params={"q": "warm up"})
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get("/api/v1/search", params={"q": "vector index tuning"})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise RuntimeError(f"search returned {response.status_code}: {response.text[:200]}")
+
+        begin = time.perf_counter()
+        await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - begin
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return len(latencies) / elapsed, p50, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the API middleware stack")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per target")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--results", type=int, default=10, help="Results per search response")
+    args = parser.parse_args()
+
+    db = MagicMock()
+    db.log_search_query = AsyncMock()
+    # Same routes, none of the middleware
+    bare = FastAPI()
+    bare.include_router(app.router)
+    targets = {"no middleware": bare, "full app": app}
+
+    table = Table(title=f"GET /api/v1/search ({args.requests:,} requests, {args.concurrency} concurrent)")
+    for column in ("Target", "Requests/s", "p50 (ms)", "p99 (ms)"):
+        table.add_column(column, justify="right" if column != "Target" else "left")
+
+    with patch("knowledge.api.routes.integration.hybrid_search", AsyncMock(return_value=fake_results(args.results))), \
+         patch("knowledge.api.routes.integration.get_db", AsyncMock(return_value=db)):
+        for name, target in targets.items():
+            rps, p50, p99 = asyncio.run(drive(target, args.requests, args.concurrency))
+            table.add_row(name, f"{rps:,.0f}", f"{p50:.2f}", f"{p99:.2f}")
+
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark query expansion over the evaluation queries.
+
+Reports the cost of compiling the synonym index, per-query latency with a
+cold expansion LRU (index lookup only) and with a warm one, and how many
+queries were expanded.
+
+Usage:
+    python scripts/benchmark_query_expansion.py
+    python scripts/benchmark_query_expansion.py --rounds 500
+    python scripts/benchmark_query_expansion.py --queries evaluation/test_queries.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+
+from knowledge import query_expansion
+from knowledge.query_expansion import expand_query, rebuild_synonym_index
+
+DEFAULT_QUERIES = Path(__file__).parent.parent / "evaluation" / "test_queries.yaml"
+
+
+def load_queries(path: Path) -> list[str]:
+    """Query strings from an evaluation file."""
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    return [entry["query"] for entry in data["queries"]]
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    """p50 and p99 in microseconds."""
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50 * 1e6, p99 * 1e6
+
+
+async def run(queries: list[str], rounds: int) -> dict[str, list[float]]:
+    """Time every query per round, cold (LRU cleared) and warm."""
+    timings: dict[str, list[float]] = {"cold": [], "warm": []}
+    for _ in range(rounds):
+        query_expansion._expansion_cache.clear()
+        for label in ("cold", "warm"):
+            for query in queries:
+                start = time.perf_counter()
+                await expand_query(query)
+                timings[label].append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark query expansion")
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES, help="Evaluation queries YAML")
+    parser.add_argument("--rounds", type=int, default=200, help="Passes over the query set")
+    args = parser.parse_args()
+
+    console = Console()
+    queries = load_queries(args.queries)
+
+    start = time.perf_counter()
+    rebuild_synonym_index()
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    timings = asyncio.run(run(queries, args.rounds))
+    expanded = sum(1 for q in queries if asyncio.run(expand_query(q)).expansion_applied)
+
+    console.print(
+        f"{len(queries)} queries, {len(query_expansion._index.expansions)} index keys "
+        f"(phrases up to {query_expansion._index.max_words} words), compiled in {compile_ms:.2f} ms; "
+        f"{expanded}/{len(queries)} queries expanded"
+    )
+
+    table = Table(title=f"expand_query latency ({args.rounds} rounds)")
+    for column in ("LRU", "p50 (µs)", "p99 (µs)", "Queries/s"):
+        table.add_column(column, justify="right" if column != "LRU" else "left")
+    for label, samples in timings.items():
+        p50, p99 = percentiles(samples)
+        table.add_row(label, f"{p50:.1f}", f"{p99:.1f}", f"{len(samples) / sum(samples):,.0f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
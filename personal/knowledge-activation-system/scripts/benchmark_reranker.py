@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Compare reranker backends: cold start, p50/p99 latency and RSS.
+
+Each backend runs in a fresh process so model memory and import cost are
+measured in isolation.
+
+Usage:
+    python scripts/benchmark_reranker.py
+    python scripts/benchmark_reranker.py --backends torch onnx --requests 200 --passages 20
+    python scripts/benchmark_reranker.py --model mixedbread-ai/mxbai-rerank-large-v2
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import psutil
+from rich.console import Console
+from rich.table import Table
+
+WORDS = (
+    "postgres vector index embedding search hybrid query chunk rerank latency "
+    "python async pool cache redis model token passage score batch memory"
+).split()
+
+
+def make_requests(count: int, passages: int, seed: int = 7) -> list[list[list[str]]]:
+    """Build synthetic query-passage batches of varied length."""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        query = " ".join(rng.choices(WORDS, k=rng.randint(3, 8)))
+        requests.append([
+            [query, " ".join(rng.choices(WORDS, k=rng.randint(20, 200)))]
+            for _ in range(passages)
+        ])
+    return requests
+
+
+def run_backend(backend: str, model: str, requests: list[list[list[str]]], out: mp.Queue) -> None:
+    """Load one backend and time every request (runs in a child process)."""
+    from knowledge.reranker import LocalReranker
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    start = time.perf_counter()
+    reranker = LocalReranker(model_name=model, device="cpu", backend=backend)
+    reranker.preload()
+    cold_start = time.perf_counter() - start
+
+    reranker._predict_sync(requests[0])  # warm-up
+    latencies = []
+    for pairs in requests:
+        start = time.perf_counter()
+        reranker._predict_sync(pairs, batch_size=len(pairs))
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    out.put({
+        "backend": backend,
+        "cold_start_s": cold_start,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "rss_mb": (process.memory_info().rss - rss_before) / 1024 / 1024,
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark reranker backends")
+    parser.add_argument("--model", default="mixedbread-ai/mxbai-rerank-base-v1")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx"])
+    parser.add_argument("--requests", type=int, default=100, help="Rerank requests per backend")
+    parser.add_argument("--passages", type=int, default=10, help="Passages per request")
+    args = parser.parse_args()
+
+    console = Console()
+    requests = make_requests(args.requests, args.passages)
+    ctx = mp.get_context("spawn")
+
+    table = Table(title=f"Reranker backends: {args.model} ({args.passages} passages/request)")
+    for column in ("Backend", "Cold start (s)", "p50 (ms)", "p99 (ms)", "RSS (MB)"):
+        table.add_column(column, justify="right" if column != "Backend" else "left")
+
+    for backend in args.backends:
+        out = ctx.Queue()
+        proc = ctx.Process(target=run_backend, args=(backend, args.model, requests, out))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0 or out.empty():
+            console.print(f"[red]{backend} failed (exit code {proc.exitcode})[/red]")
+            continue
+        r = out.get()
+        table.add_row(
+            r["backend"],
+            f"{r['cold_start_s']:.2f}",
+            f"{r['p50_ms']:.1f}",
+            f"{r['p99_ms']:.1f}",
+            f"{r['rss_mb']:.0f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from pathlib import Path
 
 from knowledge.db import get_db
 from knowledge.chunking import ChunkingConfig, chunk_recursive
-from knowledge.embeddings import embed_text
+from knowledge.embeddings import embed_batch
 
 
 YAML_FRONTMATTER_PATTERN = re.compile(r'^---\n.*?\n---\n\n?', re.DOTALL)
@@ -94,7 +94,7 @@ async def remove_file_duplicates(conn, dry_run: bool = True) -> int:
     return len(file_dup_ids)
 
 
-async def fix_yaml_chunks(conn, dry_run: bool = True) -> int:
+async def fix_yaml_chunks(db, conn, dry_run: bool = True) -> int:
     """Re-embed chunks that have YAML frontmatter contamination."""
     # Find content with YAML-contaminated chunks
     affected_content = await conn.fetch("""
@@ -134,19 +134,23 @@ async def fix_yaml_chunks(conn, dry_run: bool = True) -> int:
                 print(f"  Skipping empty content after YAML removal: {filepath}")
                 continue
 
-            # Delete old chunks
-            await conn.execute("DELETE FROM chunks WHERE content_id = $1", content_id)
-
-            # Re-chunk and embed
+            # Re-chunk and embed the whole item in one batch
             chunks = chunk_recursive(clean_content, config)
-
-            for chunk in chunks:
-                embedding = await embed_text(chunk.text)
-                await conn.execute("""
-                    INSERT INTO chunks (content_id, chunk_index, chunk_text, embedding, source_ref, start_char, end_char)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """, content_id, chunk.index, chunk.text, embedding,
-                    f"{file_path.name}#chunk-{chunk.index}", chunk.start_char, chunk.end_char)
+            embeddings = await embed_batch([chunk.text for chunk in chunks])
+
+            # Replace old chunks with a single binary COPY + merge
+            await db.bulk_load_chunks([
+                {
+                    "content_id": content_id,
+                    "chunk_index": chunk.index,
+                    "chunk_text": chunk.text,
+                    "embedding": embedding,
+                    "source_ref": f"{file_path.name}#chunk-{chunk.index}",
+                    "start_char": chunk.start_char,
+                    "end_char": chunk.end_char,
+                }
+                for chunk, embedding in zip(chunks, embeddings, strict=True)
+            ], mode="replace", conn=conn)
 
             fixed_count += 1
             print(f"  Fixed: {row['title'][:50]} ({len(chunks)} chunks)")
@@ -198,7 +202,7 @@ async def main():
         # Step 2: Fix YAML chunks
         if not args.skip_yaml:
             print("\n--- Step 2: Fix YAML Contaminated Chunks ---")
-            await fix_yaml_chunks(conn, dry_run)
+            await fix_yaml_chunks(db, conn, dry_run)
 
         if dry_run:
             print("\n" + "=" * 60)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Load-test the rate limiter: latency it adds at a fixed request rate.
+
+Requests arrive open-loop at --rate per second (default 5,000), spread over
+--clients client ids, each one an ``acquire`` on its own task as the
+middleware would issue it. Reports per-acquire latency, how far behind
+schedule requests started (event loop saturation), and the allow/deny split.
+
+Usage:
+    python scripts/loadtest_rate_limiter.py
+    python scripts/loadtest_rate_limiter.py --rate 5000 --seconds 10 --clients 2000
+    python scripts/loadtest_rate_limiter.py --redis-url redis://localhost:6379/0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rich.console import Console
+from rich.table import Table
+
+from knowledge.api.middleware import RedisRateLimiter, TokenBucketRateLimiter
+
+
+def percentiles(samples: list[float]) -> tuple[float, float, float]:
+    """p50, p99 and max in microseconds."""
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50 * 1e6, p99 * 1e6, samples[-1] * 1e6
+
+
+async def run(limiter: Any, rate: int, seconds: float, clients: int, rpm: int) -> dict[str, Any]:
+    """Drive ``limiter`` at ``rate`` requests/second for ``seconds``."""
+    rng = random.Random(7)
+    client_ids = [f"client-{i}" for i in range(clients)]
+    latencies: list[float] = []
+    lag: list[float] = []
+    allowed = 0
+
+    async def request(client_id: str, scheduled: float) -> None:
+        nonlocal allowed
+        start = time.perf_counter()
+        lag.append(max(0.0, start - scheduled))
+        ok, _ = await limiter.acquire(client_id, rate_limit=rpm)
+        latencies.append(time.perf_counter() - start)
+        allowed += ok
+
+    total = int(rate * seconds)
+    tasks = []
+    begin = time.perf_counter()
+    for i in range(total):
+        scheduled = begin + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(rng.choice(client_ids), scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - begin
+
+    return {
+        "requests": total,
+        "achieved": total / elapsed,
+        "allowed": allowed,
+        "latency": percentiles(latencies),
+        "lag": percentiles(lag),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the rate limiter")
+    parser.add_argument("--rate", type=int, default=5000, help="Requests per second")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Test duration")
+    parser.add_argument("--clients", type=int, default=1000, help="Distinct client ids")
+    parser.add_argument("--rpm", type=int, default=100, help="Per-client limit (requests/minute)")
+    parser.add_argument("--max-clients", type=int, default=10000, help="In-memory bucket bound")
+    parser.add_argument("--redis-url", help="Also test the Redis Lua limiter against this server")
+    args = parser.parse_args()
+
+    console = Console()
+    limiters: dict[str, Any] = {
+        "memory": TokenBucketRateLimiter(requests_per_minute=args.rpm, max_clients=args.max_clients),
+    }
+    if args.redis_url:
+        limiters["redis"] = RedisRateLimiter(requests_per_minute=args.rpm, redis_url=args.redis_url)
+
+    table = Table(title=f"Rate limiter at {args.rate:,} req/s ({args.clients:,} clients, {args.seconds:g}s)")
+    for column in ("Limiter", "Achieved req/s", "Allowed", "p50 (µs)", "p99 (µs)", "max (µs)", "Lag p99 (µs)"):
+        table.add_column(column, justify="right" if column != "Limiter" else "left")
+
+    for name, limiter in limiters.items():
+        result = asyncio.run(run(limiter, args.rate, args.seconds, args.clients, args.rpm))
+        p50, p99, worst = result["latency"]
+        table.add_row(
+            name,
+            f"{result['achieved']:,.0f}",
+            f"{result['allowed'] / result['requests']:.1%}",
+            f"{p50:.1f}",
+            f"{p99:.1f}",
+            f"{worst:.1f}",
+            f"{result['lag'][1]:.1f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
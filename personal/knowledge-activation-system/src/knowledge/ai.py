@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+from collections.abc import AsyncGenerator, AsyncIterator
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 
+from knowledge.exceptions import ExternalServiceError
 from knowledge.logging import get_logger
 
 logger = get_logger(__name__)
@@ -67,6 +71,102 @@ MODELS = {
 # Default model priority for fallback
 MODEL_PRIORITY = ["deepseek", "claude", "deepseek-free"]
 
+ANSWER_SYSTEM_PROMPT = """You are a helpful assistant that answers questions based on the provided context.
+
+Guidelines:
+- Answer based ONLY on the provided context
+- If the context doesn't contain enough information, say so
+- Cite sources using [1], [2], etc. when referencing specific information
+- Be concise but thorough
+- If you're unsure, indicate your uncertainty"""
+
+# Lower temperature for factual answers
+ANSWER_TEMPERATURE = 0.3
+
+# Stands in for the user prompt while the request prefix is serialized
+_PROMPT_SLOT = "\x00prompt\x00"
+
+
+class AnswerStream:
+    """A streaming chat completion opened before its prompt is known.
+
+    The request starts as soon as the stream is created: connection setup,
+    headers and the body up to the user message go out immediately, and the
+    body is held open (chunked) until send() supplies the prompt. Tokens are
+    then read from the server-sent event stream with tokens().
+    """
+
+    def __init__(self, client: httpx.AsyncClient, model: str, payload: dict[str, Any]) -> None:
+        """
+        Start the request.
+
+        Args:
+            client: HTTP client to send on
+            model: Model key from MODELS dict
+            payload: Chat completion payload whose last message content is the prompt slot
+        """
+        self.model = model
+        head, tail = json.dumps(payload).split(json.dumps(_PROMPT_SLOT))
+        self._prompt: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        request = client.build_request(
+            "POST",
+            "/chat/completions",
+            content=self._body(head.encode(), tail.encode()),
+            headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+        )
+        self._response = asyncio.create_task(client.send(request, stream=True))
+
+    async def _body(self, head: bytes, tail: bytes) -> AsyncIterator[bytes]:
+        """Yield the payload prefix, then the rest once the prompt arrives."""
+        yield head
+        prompt = await self._prompt
+        yield json.dumps(prompt).encode() + tail
+
+    def send(self, prompt: str) -> None:
+        """Complete the request body with the user prompt."""
+        if not self._prompt.done():
+            self._prompt.set_result(prompt)
+
+    async def tokens(self) -> AsyncGenerator[str, None]:
+        """
+        Yield content deltas as the model produces them.
+
+        Raises:
+            ExternalServiceError: If the API rejects the request
+        """
+        response = await self._response
+        if response.status_code != 200:
+            body = (await response.aread()).decode(errors="replace")
+            await response.aclose()
+            raise ExternalServiceError(f"API error ({response.status_code}): {body[:200]}")
+
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        """Abandon the request if it is still open."""
+        if not self._prompt.done():
+            self._prompt.cancel()
+        if not self._response.done():
+            self._response.cancel()
+            try:
+                await self._response
+            except (asyncio.CancelledError, Exception):
+                pass
+        elif not self._response.cancelled() and self._response.exception() is None:
+            await self._response.result().aclose()
+
 
 class AIProvider:
     """AI provider using OpenRouter API."""
@@ -208,6 +308,55 @@ class AIProvider:
                 error=f"Request failed: {str(e)}",
             )
 
+    async def open_stream(
+        self,
+        system_prompt: str | None = None,
+        model: str = "deepseek",
+        max_tokens: int | None = None,
+        temperature: float = 0.7,
+    ) -> AnswerStream:
+        """
+        Open a streaming generation ahead of its prompt.
+
+        Use this to overlap connection setup with work that produces the
+        prompt (retrieval, reranking); call send() on the result when ready.
+
+        Args:
+            system_prompt: Optional system prompt
+            model: Model key from MODELS dict
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-1)
+
+        Returns:
+            AnswerStream with the request in flight
+
+        Raises:
+            ExternalServiceError: If no API key is configured or the model is unknown
+        """
+        if not self.api_key:
+            raise ExternalServiceError("OpenRouter API key not configured")
+        model_config = MODELS.get(model)
+        if not model_config:
+            raise ExternalServiceError(f"Unknown model: {model}")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": _PROMPT_SLOT})
+
+        client = await self._get_client()
+        return AnswerStream(
+            client,
+            model,
+            {
+                "model": model_config.model_id,
+                "max_tokens": max_tokens or model_config.max_tokens,
+                "temperature": temperature,
+                "stream": True,
+                "messages": messages,
+            },
+        )
+
     async def generate_with_fallback(
         self,
         prompt: str,
@@ -291,7 +440,25 @@ async def generate_answer(
     """
     provider = await get_ai_provider()
 
-    # Format context for prompt
+    return await provider.generate_with_fallback(
+        prompt=build_answer_prompt(query, context),
+        system_prompt=ANSWER_SYSTEM_PROMPT,
+        max_tokens=max_tokens,
+        temperature=ANSWER_TEMPERATURE,
+    )
+
+
+def build_answer_prompt(query: str, context: list[dict[str, Any]]) -> str:
+    """
+    Build the user prompt for answering a query from search context.
+
+    Args:
+        query: User's question
+        context: List of context chunks with 'text', 'title', 'source' keys
+
+    Returns:
+        Prompt text with numbered context entries
+    """
     context_text = ""
     for i, ctx in enumerate(context, 1):
         title = ctx.get("title", "Unknown")
@@ -301,29 +468,13 @@ async def generate_answer(
         if source:
             context_text += f"Source: {source}\n"
 
-    system_prompt = """You are a helpful assistant that answers questions based on the provided context.
-
-Guidelines:
-- Answer based ONLY on the provided context
-- If the context doesn't contain enough information, say so
-- Cite sources using [1], [2], etc. when referencing specific information
-- Be concise but thorough
-- If you're unsure, indicate your uncertainty"""
-
-    user_prompt = f"""Context:
+    return f"""Context:
 {context_text}
 
 Question: {query}
 
 Please answer the question based on the context above. Cite your sources."""
 
-    return await provider.generate_with_fallback(
-        prompt=user_prompt,
-        system_prompt=system_prompt,
-        max_tokens=max_tokens,
-        temperature=0.3,  # Lower temperature for factual answers
-    )
-
 
 async def summarize_content(
     content: str,
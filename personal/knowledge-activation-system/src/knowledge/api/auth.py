@@ -1,10 +1,21 @@
-"""API Authentication (P17: Authentication System)."""
+"""API Authentication (P17: Authentication System).
+
+Keys look like ``kas_<43 url-safe chars>``. The first KEY_PREFIX_LENGTH
+characters are stored in the clear (``api_keys.key_prefix``) and indexed, so
+authenticating a key reads one row and verifies one Argon2 hash however many
+keys exist. Verified keys are then cached in memory for a short TTL, rejected
+keys for a shorter one, and ``last_used_at`` is written in periodic batches
+rather than on every request.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import secrets
-from datetime import datetime
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime
 from typing import Annotated, Any
 from uuid import UUID
 
@@ -13,7 +24,7 @@ from argon2.exceptions import InvalidHashError, VerifyMismatchError
 from fastapi import Depends, Header, Request
 from pydantic import BaseModel
 
-from knowledge.config import get_settings
+from knowledge.config import Settings, get_settings
 from knowledge.db import get_db
 from knowledge.exceptions import (
     InsufficientScopeError,
@@ -34,6 +45,10 @@ _argon2_hasher = PasswordHasher(
     salt_len=16,
 )
 
+# "kas_" plus 12 random characters (72 bits): unique enough to index,
+# too short to help guess the remaining 31 characters
+KEY_PREFIX_LENGTH = 16
+
 
 # =============================================================================
 # Valid Scopes
@@ -139,6 +154,11 @@ def generate_api_key() -> tuple[str, str]:
     return key, key_hash
 
 
+def api_key_prefix(key: str) -> str:
+    """Non-secret lookup prefix stored alongside the key hash."""
+    return key[:KEY_PREFIX_LENGTH]
+
+
 def hash_api_key_argon2(key: str) -> str:
     """Hash an API key using Argon2id for storage."""
     return _argon2_hasher.hash(key)
@@ -175,11 +195,274 @@ def verify_api_key(key: str, stored_hash: str) -> bool:
         return hashlib.sha256(key.encode()).hexdigest() == stored_hash
 
 
+# =============================================================================
+# Verified Key Cache
+# =============================================================================
+
+
+class VerifiedKeyCache:
+    """
+    Bounded in-memory cache of recently verified API keys.
+
+    Entries are keyed by the SHA-256 digest of the presented key, never the
+    key itself, and live for ``ttl`` seconds or until the key expires,
+    whichever is sooner. Revoking a key drops its entries from this process
+    immediately; other workers stop accepting it within ``ttl``.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[APIKey, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: str) -> APIKey | None:
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        api_key, deadline = entry
+        if time.monotonic() >= deadline:
+            del self._entries[digest]
+            return None
+        self._entries.move_to_end(digest)
+        return api_key
+
+    def put(self, digest: str, api_key: APIKey, expires_at: datetime | None = None) -> None:
+        ttl = self.ttl
+        if expires_at is not None:
+            ttl = min(ttl, (expires_at - datetime.now(UTC)).total_seconds())
+        if ttl <= 0:
+            return
+        self._entries[digest] = (api_key, time.monotonic() + ttl)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key_id: UUID) -> int:
+        """Drop every entry for a key. Returns the number removed."""
+        stale = [digest for digest, (api_key, _) in self._entries.items() if api_key.id == key_id]
+        for digest in stale:
+            del self._entries[digest]
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class RejectedKeyCache:
+    """
+    Bounded in-memory set of recently rejected key digests.
+
+    Repeating an unknown key within ``ttl`` seconds is refused without
+    touching the database or running Argon2.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._deadlines: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, digest: str) -> bool:
+        deadline = self._deadlines.get(digest)
+        if deadline is None:
+            return False
+        if time.monotonic() >= deadline:
+            del self._deadlines[digest]
+            return False
+        return True
+
+    def add(self, digest: str) -> None:
+        if self.ttl <= 0:
+            return
+        self._deadlines[digest] = time.monotonic() + self.ttl
+        self._deadlines.move_to_end(digest)
+        while len(self._deadlines) > self.max_size:
+            self._deadlines.popitem(last=False)
+
+    def clear(self) -> None:
+        self._deadlines.clear()
+
+
+_verified_keys: VerifiedKeyCache | None = None
+_rejected_keys: RejectedKeyCache | None = None
+
+
+def get_verified_key_cache(settings: Settings | None = None) -> VerifiedKeyCache:
+    """Get the process-wide verified key cache."""
+    global _verified_keys
+    if _verified_keys is None:
+        settings = settings or get_settings()
+        _verified_keys = VerifiedKeyCache(settings.api_key_cache_ttl, settings.api_key_cache_size)
+    return _verified_keys
+
+
+def get_rejected_key_cache(settings: Settings | None = None) -> RejectedKeyCache:
+    """Get the process-wide rejected key cache."""
+    global _rejected_keys
+    if _rejected_keys is None:
+        settings = settings or get_settings()
+        _rejected_keys = RejectedKeyCache(settings.api_key_reject_ttl, settings.api_key_cache_size)
+    return _rejected_keys
+
+
+# =============================================================================
+# Batched last_used_at Updates
+# =============================================================================
+
+
+class LastUsedTracker:
+    """
+    Collects key usage in memory and writes ``last_used_at`` in batches.
+
+    Only the latest timestamp per key is kept, so a flush is one UPDATE no
+    matter how many requests were served since the last one.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[UUID, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, key_id: UUID) -> None:
+        self._pending[key_id] = datetime.now(UTC)
+
+    async def flush(self) -> int:
+        """Write pending timestamps. Returns the number of keys updated."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        try:
+            db = await get_db()
+            async with db.acquire() as conn:
+                await conn.execute(
+                    """
+                    UPDATE api_keys k
+                    SET last_used_at = GREATEST(k.last_used_at, u.used_at)
+                    FROM unnest($1::uuid[], $2::timestamptz[]) AS u(id, used_at)
+                    WHERE k.id = u.id
+                    """,
+                    list(pending),
+                    list(pending.values()),
+                )
+        except Exception:
+            # Keep the timestamps for the next flush unless newer ones arrived
+            for key_id, used_at in pending.items():
+                self._pending.setdefault(key_id, used_at)
+            raise
+        return len(pending)
+
+
+_last_used = LastUsedTracker()
+_flush_task: asyncio.Task[None] | None = None
+
+
+async def _run_last_used_flush(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await _last_used.flush()
+        except Exception as e:
+            logger.warning("api_key_last_used_flush_failed", error=str(e))
+
+
+async def start_api_key_tracker() -> None:
+    """Start periodically flushing API key usage timestamps."""
+    global _flush_task
+    if _flush_task is not None:
+        return
+    settings = get_settings()
+    _flush_task = asyncio.create_task(_run_last_used_flush(settings.api_key_last_used_flush_interval))
+
+
+async def stop_api_key_tracker() -> None:
+    """Stop the flush loop and write any pending timestamps."""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+
+    try:
+        await _last_used.flush()
+    except Exception as e:
+        logger.warning("api_key_last_used_flush_failed", error=str(e))
+
+
 # =============================================================================
 # Authentication Dependencies
 # =============================================================================
 
 
+_KEY_COLUMNS = "id, name, scopes, rate_limit, key_hash, expires_at"
+_ACTIVE = "revoked_at IS NULL AND (expires_at IS NULL OR expires_at > NOW())"
+
+# Whether un-prefixed Argon2 rows may still exist. Every key created since
+# prefixes were introduced has one, so once a scan finds none left (or
+# backfills the last one) no later lookup in this process needs to scan.
+_legacy_argon2_keys = True
+
+
+async def _lookup_api_key(key: str, digest: str) -> Any:
+    """
+    Find and verify the api_keys row for a presented key.
+
+    Keys with a stored prefix, and legacy SHA-256 keys, are found by one
+    indexed lookup. Argon2 keys created before prefixes existed are found by
+    scanning only the un-prefixed rows, and get their prefix recorded so the
+    scan is needed at most once per key. Once no such rows remain the scan
+    is skipped altogether.
+    """
+    global _legacy_argon2_keys
+    prefix = api_key_prefix(key)
+    db = await get_db()
+    async with db.acquire() as conn:
+        rows = await conn.fetch(
+            f"""
+            SELECT {_KEY_COLUMNS}
+            FROM api_keys
+            WHERE {_ACTIVE}
+              AND (key_prefix = $1 OR key_hash = $2)
+            """,
+            prefix,
+            digest,
+        )
+        for row in rows:
+            if verify_api_key(key, row["key_hash"]):
+                return row
+
+        if not _legacy_argon2_keys:
+            return None
+
+        legacy = await conn.fetch(
+            f"""
+            SELECT {_KEY_COLUMNS}
+            FROM api_keys
+            WHERE {_ACTIVE}
+              AND key_prefix IS NULL
+              AND key_hash LIKE '$argon2%'
+            """
+        )
+        for row in legacy:
+            if verify_api_key(key, row["key_hash"]):
+                await conn.execute("UPDATE api_keys SET key_prefix = $2 WHERE id = $1", row["id"], prefix)
+                logger.info("api_key_prefix_backfilled", key_id=str(row["id"]))
+                _legacy_argon2_keys = len(legacy) > 1
+                return row
+
+        _legacy_argon2_keys = bool(legacy)
+
+    return None
+
+
 async def get_api_key(
     request: Request,
     x_api_key: Annotated[str | None, Header(alias="X-API-Key")] = None,
@@ -189,7 +472,7 @@ async def get_api_key(
 
     This is a FastAPI dependency that:
     1. Checks if authentication is required
-    2. Validates the provided API key
+    2. Validates the provided API key (cache first, then one indexed row)
     3. Returns APIKey model if valid
 
     Args:
@@ -230,41 +513,33 @@ async def get_api_key(
         )
         raise InvalidAPIKeyError("Invalid API key format")
 
-    # Fetch all active keys and verify using Argon2 or SHA-256 (legacy)
-    # This approach supports both new Argon2 hashes and legacy SHA-256 hashes
-    db = await get_db()
-    async with db.acquire() as conn:
-        rows = await conn.fetch(
-            """
-            SELECT id, name, scopes, rate_limit, key_hash
-            FROM api_keys
-            WHERE revoked_at IS NULL
-              AND (expires_at IS NULL OR expires_at > NOW())
-            """
-        )
+    # SHA-256 of the key: cache key, legacy hash and (prefix) debug identifier
+    digest = hash_api_key_sha256(x_api_key)
+    cache = get_verified_key_cache(settings)
+    rejected = get_rejected_key_cache(settings)
 
-        # Find matching key by verifying against each stored hash
+    api_key = cache.get(digest)
+    if api_key is None:
         row = None
-        for candidate in rows:
-            if verify_api_key(x_api_key, candidate["key_hash"]):
-                row = candidate
-                break
-
+        if digest not in rejected:
+            row = await _lookup_api_key(x_api_key, digest)
+            if not row:
+                rejected.add(digest)
         if not row:
-            # Log with SHA-256 hash prefix for debugging (doesn't reveal key)
-            debug_hash = hash_api_key_sha256(x_api_key)
             logger.warning(
                 "api_key_invalid",
                 path=request.url.path,
-                key_hash_prefix=debug_hash[:16],
+                key_hash_prefix=digest[:16],
             )
             raise InvalidAPIKeyError("Invalid or expired API key")
 
-        # Update last used timestamp
-        await conn.execute(
-            "UPDATE api_keys SET last_used_at = NOW() WHERE id = $1",
-            row["id"],
+        api_key = APIKey(
+            id=row["id"],
+            name=row["name"],
+            scopes=list(row["scopes"]),
+            rate_limit=row["rate_limit"],
         )
+        cache.put(digest, api_key, row["expires_at"])
 
         logger.debug(
             "api_key_validated",
@@ -272,12 +547,8 @@ async def get_api_key(
             key_name=row["name"],
         )
 
-        return APIKey(
-            id=row["id"],
-            name=row["name"],
-            scopes=list(row["scopes"]),
-            rate_limit=row["rate_limit"],
-        )
+    _last_used.touch(api_key.id)
+    return api_key
 
 
 def require_scope(scope: str) -> Any:
@@ -388,15 +659,16 @@ async def create_api_key_record(
     async with db.acquire() as conn:
         row = await conn.fetchrow(
             """
-            INSERT INTO api_keys (key_hash, name, description, scopes, rate_limit, expires_at, created_by)
-            VALUES ($1, $2, $3, $4, $5,
-                    CASE WHEN $6::int IS NOT NULL
-                         THEN NOW() + ($6::int || ' days')::interval
+            INSERT INTO api_keys (key_hash, key_prefix, name, description, scopes, rate_limit, expires_at, created_by)
+            VALUES ($1, $2, $3, $4, $5, $6,
+                    CASE WHEN $7::int IS NOT NULL
+                         THEN NOW() + ($7::int || ' days')::interval
                          ELSE NULL END,
-                    $7)
+                    $8)
             RETURNING id
             """,
             key_hash,
+            api_key_prefix(key),
             name,
             description,
             scopes,
@@ -473,6 +745,9 @@ async def revoke_api_key(key_id: UUID) -> bool:
 
         revoked = result == "UPDATE 1"
 
+        # Dropped even when already revoked, in case this process cached it
+        get_verified_key_cache().invalidate(key_id)
+
         if revoked:
             logger.info("api_key_revoked", key_id=str(key_id))
         else:
@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from knowledge.ai import close_ai_provider
+from knowledge.api.auth import start_api_key_tracker, stop_api_key_tracker
 from knowledge.api.middleware import (
     APIVersionMiddleware,
     MetricsMiddleware,
@@ -38,6 +39,7 @@ from knowledge.embeddings import close_embedding_service
 from knowledge.reranker import close_reranker, preload_reranker
 from knowledge.review import start_daily_scheduler, stop_daily_scheduler
 from knowledge.tracing import configure_tracing
+from knowledge.vector_index import start_vector_index, stop_vector_index
 
 
 @asynccontextmanager
@@ -52,10 +54,18 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Start daily review scheduler (if enabled)
     await start_daily_scheduler()
 
+    # Load or build the in-process vector index (if enabled)
+    await start_vector_index()
+
+    # Batch API key last_used_at writes
+    await start_api_key_tracker()
+
     yield
 
     # Shutdown - cleanup all resources
     await stop_daily_scheduler()
+    await stop_vector_index()
+    await stop_api_key_tracker()
     await close_db()
     await close_embedding_service()
     await close_ai_provider()
@@ -8,19 +8,26 @@ Provides:
 - API version headers (P19)
 - Prometheus metrics collection (P24)
 - CSRF protection via Origin/Referer validation
+
+The middleware classes are pure ASGI: each wraps ``send`` to add its
+headers to the response start message and passes body messages through
+untouched, so streamed responses (export, SSE) are never buffered.
 """
 
 from __future__ import annotations
 
-import asyncio
+import re
 import time
-from collections.abc import Callable
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Protocol
+from urllib.parse import urlparse
 
 from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from knowledge.config import get_settings
 from knowledge.logging import get_logger
@@ -53,13 +60,14 @@ class RateLimiterProtocol(Protocol):
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenBucket:
     """Token bucket for rate limiting."""
 
     tokens: float
     last_refill: float
     rate_limit: int  # Custom rate limit for this bucket (per minute)
+    capacity: float  # Burst size
 
 
 @dataclass
@@ -71,6 +79,26 @@ class RateLimitInfo:
     reset: int  # Unix timestamp when tokens fully refill
 
 
+def _take_token(bucket: TokenBucket, now: float, consume: bool = True) -> tuple[bool, RateLimitInfo]:
+    """Refill a bucket to ``now`` and optionally take one token from it."""
+    rate = bucket.rate_limit / 60.0
+    bucket.tokens = min(bucket.capacity, bucket.tokens + max(0.0, now - bucket.last_refill) * rate)
+    bucket.last_refill = now
+
+    if not consume:
+        reset = (bucket.capacity - bucket.tokens) / rate if rate > 0 else 0
+        return True, RateLimitInfo(bucket.rate_limit, int(bucket.tokens), int(now + reset))
+
+    if bucket.tokens >= 1:
+        bucket.tokens -= 1
+        reset = (bucket.capacity - bucket.tokens) / rate if rate > 0 else 0
+        return True, RateLimitInfo(bucket.rate_limit, int(bucket.tokens), int(now + reset))
+
+    # Time until one token is available
+    retry_after = (1 - bucket.tokens) / rate if rate > 0 else 60
+    return False, RateLimitInfo(bucket.rate_limit, 0, int(now + retry_after))
+
+
 class TokenBucketRateLimiter:
     """
     Token bucket rate limiter with burst support.
@@ -80,6 +108,14 @@ class TokenBucketRateLimiter:
     - Burst capacity for legitimate traffic spikes
     - Per-client rate limits (e.g., per API key)
 
+    Buckets are spread over ``shards`` LRU maps by client id, each bounded
+    to its share of ``max_clients``. A bucket's refill and take run without
+    awaiting, so they are atomic on the event loop and no lock is needed.
+    Expiry is lazy: a bucket idle long enough to have refilled is identical
+    to a new one, so idle buckets at the cold end of a shard are dropped as
+    new clients arrive, and the least recently used bucket is evicted when a
+    shard is full.
+
     For production with multiple instances, use Redis-backed rate limiting.
     """
 
@@ -88,7 +124,7 @@ class TokenBucketRateLimiter:
         requests_per_minute: int = 100,
         burst_size: int | None = None,
         max_clients: int = 10000,
-        cleanup_interval: int = 300,
+        shards: int = 16,
     ) -> None:
         """
         Initialize rate limiter.
@@ -96,33 +132,64 @@ class TokenBucketRateLimiter:
         Args:
             requests_per_minute: Default rate limit
             burst_size: Maximum burst capacity (default: requests_per_minute * 2)
-            max_clients: Maximum clients to track before forced cleanup
-            cleanup_interval: Seconds between cleanup runs
+            max_clients: Maximum clients to track across all shards
+            shards: Number of independent bucket maps
         """
         self.requests_per_minute = requests_per_minute
         self.rate = requests_per_minute / 60.0  # tokens per second
         self.burst_size = burst_size or requests_per_minute * 2
-        self.buckets: dict[str, TokenBucket] = {}
-        self._max_clients = max_clients
-        self._cleanup_interval = cleanup_interval
-        self._last_cleanup = time.time()
-        self._lock = asyncio.Lock()
+        self._shards: list[OrderedDict[str, TokenBucket]] = [OrderedDict() for _ in range(shards)]
+        self._shard_size = max(1, max_clients // shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def _shard(self, client_id: str) -> OrderedDict[str, TokenBucket]:
+        return self._shards[hash(client_id) % len(self._shards)]
+
+    def _capacity(self, rate_limit: int) -> float:
+        """Burst size for a rate limit (the configured burst for the default rate)."""
+        return float(self.burst_size if rate_limit == self.requests_per_minute else rate_limit * 2)
 
     def _get_or_create_bucket(
         self,
         client_id: str,
         rate_limit: int | None = None,
+        now: float | None = None,
     ) -> TokenBucket:
         """Get or create a token bucket for a client."""
-        if client_id not in self.buckets:
-            custom_rate = rate_limit or self.requests_per_minute
-            custom_burst = (rate_limit * 2) if rate_limit else self.burst_size
-            self.buckets[client_id] = TokenBucket(
-                tokens=float(custom_burst),
-                last_refill=time.time(),
-                rate_limit=custom_rate,
-            )
-        return self.buckets[client_id]
+        shard = self._shard(client_id)
+        bucket = shard.get(client_id)
+        if bucket is not None:
+            shard.move_to_end(client_id)
+            return bucket
+
+        now = time.time() if now is None else now
+        self._expire(shard, now)
+        if len(shard) >= self._shard_size:
+            shard.popitem(last=False)
+
+        rate = rate_limit or self.requests_per_minute
+        capacity = self._capacity(rate)
+        bucket = shard[client_id] = TokenBucket(
+            tokens=capacity,
+            last_refill=now,
+            rate_limit=rate,
+            capacity=capacity,
+        )
+        return bucket
+
+    @staticmethod
+    def _expire(shard: OrderedDict[str, TokenBucket], now: float, limit: int = 2) -> None:
+        """Drop up to ``limit`` refilled buckets from the cold end of a shard."""
+        for _ in range(limit):
+            if not shard:
+                return
+            bucket = next(iter(shard.values()))
+            idle = now - bucket.last_refill
+            if bucket.tokens + idle * bucket.rate_limit / 60.0 < bucket.capacity:
+                return
+            shard.popitem(last=False)
 
     async def acquire(
         self,
@@ -139,126 +206,64 @@ class TokenBucketRateLimiter:
         Returns:
             Tuple of (allowed, rate_limit_info)
         """
-        async with self._lock:
-            # Periodic cleanup
-            self._maybe_cleanup()
-
-            bucket = self._get_or_create_bucket(client_id, rate_limit)
-            now = time.time()
-
-            # Calculate tokens per second for this bucket
-            effective_rate = bucket.rate_limit / 60.0
-            effective_burst = bucket.rate_limit * 2
-
-            # Refill tokens based on elapsed time
-            elapsed = now - bucket.last_refill
-            bucket.tokens = min(
-                effective_burst,
-                bucket.tokens + elapsed * effective_rate
-            )
-            bucket.last_refill = now
-
-            # Calculate reset time (when tokens would be full)
-            tokens_needed = effective_burst - bucket.tokens
-            reset_seconds = tokens_needed / effective_rate if effective_rate > 0 else 0
-            reset_time = int(now + reset_seconds)
-
-            # Try to consume a token
-            if bucket.tokens >= 1:
-                bucket.tokens -= 1
-                return True, RateLimitInfo(
-                    limit=bucket.rate_limit,
-                    remaining=int(bucket.tokens),
-                    reset=reset_time,
-                )
-            else:
-                # Calculate retry-after (time until 1 token available)
-                retry_after = (1 - bucket.tokens) / effective_rate if effective_rate > 0 else 60
-                return False, RateLimitInfo(
-                    limit=bucket.rate_limit,
-                    remaining=0,
-                    reset=int(now + retry_after),
-                )
+        now = time.time()
+        bucket = self._get_or_create_bucket(client_id, rate_limit, now)
+        return _take_token(bucket, now)
 
     def get_info(self, client_id: str) -> RateLimitInfo | None:
         """Get current rate limit info for a client without consuming tokens."""
-        if client_id not in self.buckets:
+        bucket = self._shard(client_id).get(client_id)
+        if bucket is None:
             return None
-
-        bucket = self.buckets[client_id]
-        now = time.time()
-
-        # Calculate current tokens (with refill)
-        effective_rate = bucket.rate_limit / 60.0
-        effective_burst = bucket.rate_limit * 2
-        elapsed = now - bucket.last_refill
-        current_tokens = min(effective_burst, bucket.tokens + elapsed * effective_rate)
-
-        # Calculate reset time
-        tokens_needed = effective_burst - current_tokens
-        reset_seconds = tokens_needed / effective_rate if effective_rate > 0 else 0
-
-        return RateLimitInfo(
-            limit=bucket.rate_limit,
-            remaining=int(current_tokens),
-            reset=int(now + reset_seconds),
-        )
-
-    def _maybe_cleanup(self) -> None:
-        """Periodically clean up stale buckets."""
-        now = time.time()
-
-        needs_cleanup = (
-            now - self._last_cleanup > self._cleanup_interval
-            or len(self.buckets) > self._max_clients
-        )
-
-        if not needs_cleanup:
-            return
-
-        # Remove buckets that haven't been used recently (full tokens = idle)
-        stale_clients = []
-        for client_id, bucket in self.buckets.items():
-            # Calculate current tokens
-            effective_rate = bucket.rate_limit / 60.0
-            effective_burst = bucket.rate_limit * 2
-            elapsed = now - bucket.last_refill
-            current_tokens = bucket.tokens + elapsed * effective_rate
-
-            # If tokens are full and haven't been touched in cleanup interval
-            if current_tokens >= effective_burst and elapsed > self._cleanup_interval:
-                stale_clients.append(client_id)
-
-        for client_id in stale_clients:
-            del self.buckets[client_id]
-
-        self._last_cleanup = now
-
-        if stale_clients:
-            logger.debug(
-                "rate_limiter_cleanup",
-                removed_clients=len(stale_clients),
-                remaining_clients=len(self.buckets),
-            )
+        return _take_token(bucket, time.time(), consume=False)[1]
 
 
 # =============================================================================
 # Redis Rate Limiter
 # =============================================================================
 
+# Token bucket refill-and-take in one atomic round trip.
+# KEYS[1] bucket hash; ARGV: tokens/second, capacity, now (s), ttl (ms)
+# Returns {allowed (0/1), tokens left} - tokens as a string to keep the fraction
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
 
 class RedisRateLimiter:
     """
-    Redis-backed sliding window rate limiter for distributed deployments.
+    Redis-backed token bucket rate limiter for distributed deployments.
 
-    Uses Redis sorted sets for accurate sliding window rate limiting.
+    Each request is a single EVALSHA of a Lua script that refills and takes
+    from the client's bucket atomically, so all workers share one bucket per
+    client. A bucket's key expires once it would have refilled completely,
+    which keeps Redis memory bounded by the number of active clients.
     Falls back to in-memory rate limiting if Redis is unavailable.
     """
 
+    KEY_PREFIX = "ratelimit:tb:"
+    RECONNECT_INTERVAL = 30.0  # Seconds between reconnect attempts
+
     def __init__(
         self,
         requests_per_minute: int = 100,
         redis_url: str | None = None,
+        burst_size: int | None = None,
+        redis: Any = None,
     ) -> None:
         """
         Initialize Redis rate limiter.
@@ -266,16 +271,20 @@ class RedisRateLimiter:
         Args:
             requests_per_minute: Default rate limit
             redis_url: Redis connection URL
+            burst_size: Maximum burst capacity (default: requests_per_minute * 2)
+            redis: Existing async Redis client (used instead of redis_url)
         """
         self.requests_per_minute = requests_per_minute
         self._redis_url = redis_url
-        self._redis: Any = None
-        self._fallback = TokenBucketRateLimiter(requests_per_minute)
-        self._redis_available = False
+        self._redis: Any = redis
+        self._script: Any = redis.register_script(_TOKEN_BUCKET_LUA) if redis is not None else None
+        self._fallback = TokenBucketRateLimiter(requests_per_minute, burst_size)
+        self._redis_available = redis is not None
+        self._retry_at = 0.0
 
     async def _get_redis(self) -> Any:
         """Get or create Redis connection."""
-        if self._redis is None and self._redis_url:
+        if self._redis is None and self._redis_url and time.monotonic() >= self._retry_at:
             try:
                 import redis.asyncio as aioredis
                 self._redis = aioredis.from_url(
@@ -285,12 +294,14 @@ class RedisRateLimiter:
                 )
                 # Test connection
                 await self._redis.ping()
+                self._script = self._redis.register_script(_TOKEN_BUCKET_LUA)
                 self._redis_available = True
                 logger.info("redis_rate_limiter_connected", url=sanitize_url(self._redis_url))
             except Exception as e:
                 logger.warning("redis_rate_limiter_unavailable", error=str(e)[:100])
                 self._redis_available = False
                 self._redis = None
+                self._retry_at = time.monotonic() + self.RECONNECT_INTERVAL
         return self._redis
 
     async def acquire(
@@ -299,7 +310,7 @@ class RedisRateLimiter:
         rate_limit: int | None = None,
     ) -> tuple[bool, RateLimitInfo]:
         """
-        Try to acquire a token using Redis sliding window.
+        Try to acquire a token from the client's shared bucket.
 
         Falls back to in-memory rate limiting if Redis is unavailable.
         """
@@ -309,43 +320,21 @@ class RedisRateLimiter:
 
         try:
             limit = rate_limit or self.requests_per_minute
-            window_seconds = 60
+            rate = limit / 60.0
+            capacity = self._fallback._capacity(limit)
             now = time.time()
-            window_start = now - window_seconds
-            key = f"ratelimit:{client_id}"
-
-            # Use Redis pipeline for atomic operations
-            pipe = redis.pipeline()
-            # Remove old entries
-            pipe.zremrangebyscore(key, 0, window_start)
-            # Count current requests in window
-            pipe.zcard(key)
-            # Add current request
-            pipe.zadd(key, {str(now): now})
-            # Set expiry
-            pipe.expire(key, window_seconds + 1)
-
-            results = await pipe.execute()
-            current_count = results[1]
-
-            # Calculate remaining
-            remaining = max(0, limit - current_count - 1)
-            reset_time = int(now + window_seconds)
-
-            if current_count >= limit:
-                # Over limit - remove the request we just added
-                await redis.zrem(key, str(now))
-                return False, RateLimitInfo(
-                    limit=limit,
-                    remaining=0,
-                    reset=reset_time,
-                )
+            ttl_ms = int(capacity / rate * 1000) + 1000
 
-            return True, RateLimitInfo(
-                limit=limit,
-                remaining=remaining,
-                reset=reset_time,
+            allowed, tokens = await self._script(
+                keys=[f"{self.KEY_PREFIX}{client_id}"],
+                args=[rate, capacity, now, ttl_ms],
             )
+            tokens = float(tokens)
+            if allowed:
+                reset = (capacity - tokens) / rate
+                return True, RateLimitInfo(limit, int(tokens), int(now + reset))
+            retry_after = (1 - tokens) / rate
+            return False, RateLimitInfo(limit, 0, int(now + retry_after))
 
         except Exception as e:
             logger.warning("redis_rate_limit_error", error=str(e)[:100])
@@ -361,6 +350,7 @@ class RedisRateLimiter:
         if self._redis:
             await self._redis.close()
             self._redis = None
+            self._script = None
 
 
 def _create_rate_limiter() -> TokenBucketRateLimiter | RedisRateLimiter:
@@ -370,8 +360,12 @@ def _create_rate_limiter() -> TokenBucketRateLimiter | RedisRateLimiter:
         return RedisRateLimiter(
             requests_per_minute=settings.rate_limit_requests,
             redis_url=settings.redis_url,
+            burst_size=settings.rate_limit_burst,
         )
-    return TokenBucketRateLimiter(requests_per_minute=settings.rate_limit_requests)
+    return TokenBucketRateLimiter(
+        requests_per_minute=settings.rate_limit_requests,
+        burst_size=settings.rate_limit_burst,
+    )
 
 
 # Global rate limiter instance (Redis if available, otherwise in-memory)
@@ -381,7 +375,30 @@ rate_limiter = _create_rate_limiter()
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+def _set_response_headers(send: Send, headers: dict[str, str]) -> Send:
+    """
+    Wrap ``send`` to set headers on the response start message.
+
+    Only ``http.response.start`` is touched; body messages pass straight
+    through, so streamed responses are never buffered.
+    """
+
+    async def send_with_headers(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response_headers = MutableHeaders(scope=message)
+            for name, value in headers.items():
+                response_headers[name] = value
+        await send(message)
+
+    return send_with_headers
+
+
+def _reject(status_code: int, detail: str, headers: dict[str, str] | None = None) -> JSONResponse:
+    """Error response in FastAPI's HTTPException format."""
+    return JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+
+
+class SecurityMiddleware:
     """Security middleware for API key validation, CSRF protection, and rate limiting."""
 
     # Paths to skip for rate limiting and auth
@@ -400,132 +417,136 @@ class SecurityMiddleware(BaseHTTPMiddleware):
     # Methods that require CSRF protection
     CSRF_PROTECTED_METHODS = {"POST", "PUT", "DELETE", "PATCH"}
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through security checks."""
-        settings = get_settings()
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
 
         # Set request correlation ID for distributed tracing
         incoming_request_id = request.headers.get("X-Request-ID")
         request_id = set_request_id(incoming_request_id)
 
         try:
-            # Get client identifier (IP or API key)
-            client_ip = request.client.host if request.client else "unknown"
-            api_key = request.headers.get(settings.api_key_header)
+            headers = {"X-Request-ID": request_id}
 
             # Skip security checks for certain paths
-            if request.url.path in self.SKIP_PATHS:
-                response = await call_next(request)
-                response.headers["X-Request-ID"] = request_id
-                return response
-
-            # CSRF protection for state-changing requests
-            if request.method in self.CSRF_PROTECTED_METHODS:
-                origin = request.headers.get("Origin")
-                referer = request.headers.get("Referer")
-
-                # Check Origin header first (more reliable)
-                if origin:
-                    if origin not in self.ALLOWED_ORIGINS:
-                        logger.warning(
-                            "csrf_origin_rejected",
-                            origin=origin,
-                            path=request.url.path,
-                            client_ip=client_ip,
-                        )
-                        raise HTTPException(
-                            status_code=403,
-                            detail="Invalid origin",
-                        )
-                elif referer:
-                    # Fall back to Referer header
-                    # Extract origin from referer (scheme + host)
-                    from urllib.parse import urlparse
-                    parsed = urlparse(referer)
-                    referer_origin = f"{parsed.scheme}://{parsed.netloc}"
-                    if referer_origin not in self.ALLOWED_ORIGINS:
-                        logger.warning(
-                            "csrf_referer_rejected",
-                            referer=referer[:100],
-                            path=request.url.path,
-                            client_ip=client_ip,
-                        )
-                        raise HTTPException(
-                            status_code=403,
-                            detail="Invalid referer",
-                        )
-                # If neither Origin nor Referer, allow (for API clients like curl)
-                # API key validation provides protection for authenticated requests
-
-            # API key validation (if required)
-            if settings.require_api_key:
-                if not api_key:
+            if scope["path"] not in self.SKIP_PATHS:
+                rejection = await self._check(request, headers)
+                if rejection is not None:
+                    rejection.headers["X-Request-ID"] = request_id
+                    await rejection(scope, receive, send)
+                    return
+
+            await self.app(scope, receive, _set_response_headers(send, headers))
+
+        finally:
+            clear_request_id()
+
+    async def _check(self, request: Request, headers: dict[str, str]) -> Response | None:
+        """
+        Run CSRF, API key and rate limit checks.
+
+        Returns:
+            Error response to send instead of the app's, or None if allowed
+            (rate limit headers for the response are added to ``headers``)
+        """
+        settings = get_settings()
+        path = request.scope["path"]
+
+        # Get client identifier (IP or API key)
+        client_ip = request.client.host if request.client else "unknown"
+        api_key = request.headers.get(settings.api_key_header)
+
+        # CSRF protection for state-changing requests
+        if request.method in self.CSRF_PROTECTED_METHODS:
+            origin = request.headers.get("Origin")
+            referer = request.headers.get("Referer")
+
+            # Check Origin header first (more reliable)
+            if origin:
+                if origin not in self.ALLOWED_ORIGINS:
                     logger.warning(
-                        "api_key_required",
-                        path=request.url.path,
+                        "csrf_origin_rejected",
+                        origin=origin,
+                        path=path,
                         client_ip=client_ip,
                     )
-                    raise HTTPException(
-                        status_code=401,
-                        detail="API key required",
-                        headers={"WWW-Authenticate": "ApiKey"},
-                    )
-                # Use constant-time comparison to prevent timing attacks
-                if not settings.api_key or not secure_compare(api_key, settings.api_key):
+                    return _reject(403, "Invalid origin")
+            elif referer:
+                # Fall back to Referer header
+                # Extract origin from referer (scheme + host)
+                parsed = urlparse(referer)
+                referer_origin = f"{parsed.scheme}://{parsed.netloc}"
+                if referer_origin not in self.ALLOWED_ORIGINS:
                     logger.warning(
-                        "api_key_invalid",
-                        path=request.url.path,
+                        "csrf_referer_rejected",
+                        referer=referer[:100],
+                        path=path,
                         client_ip=client_ip,
                     )
-                    raise HTTPException(
-                        status_code=403,
-                        detail="Invalid API key",
-                    )
-
-            # Use API key as client ID if provided, otherwise use IP
-            client_id = api_key[:16] if api_key else client_ip
-
-            # Rate limiting (if enabled)
-            rate_info = None
-            if settings.rate_limit_enabled:
-                allowed, rate_info = await rate_limiter.acquire(
-                    client_id,
-                    rate_limit=settings.rate_limit_requests,
+                    return _reject(403, "Invalid referer")
+            # If neither Origin nor Referer, allow (for API clients like curl)
+            # API key validation provides protection for authenticated requests
+
+        # API key validation (if required)
+        if settings.require_api_key:
+            if not api_key:
+                logger.warning(
+                    "api_key_required",
+                    path=path,
+                    client_ip=client_ip,
                 )
+                return _reject(401, "API key required", {"WWW-Authenticate": "ApiKey"})
+            # Use constant-time comparison to prevent timing attacks
+            if not settings.api_key or not secure_compare(api_key, settings.api_key):
+                logger.warning(
+                    "api_key_invalid",
+                    path=path,
+                    client_ip=client_ip,
+                )
+                return _reject(403, "Invalid API key")
 
-                if not allowed:
-                    retry_after = max(1, rate_info.reset - int(time.time()))
-                    logger.warning(
-                        "rate_limit_exceeded",
-                        client_id=client_id[:8] + "..." if len(client_id) > 8 else client_id,
-                        path=request.url.path,
-                        retry_after=retry_after,
-                    )
-                    raise HTTPException(
-                        status_code=429,
-                        detail="Rate limit exceeded",
-                        headers={
-                            "X-RateLimit-Limit": str(rate_info.limit),
-                            "X-RateLimit-Remaining": "0",
-                            "X-RateLimit-Reset": str(rate_info.reset),
-                            "Retry-After": str(retry_after),
-                        },
-                    )
+        # Use API key as client ID if provided, otherwise use IP
+        client_id = api_key[:16] if api_key else client_ip
 
-            # Process request
-            response = await call_next(request)
+        # Rate limiting (if enabled)
+        if settings.rate_limit_enabled:
+            allowed, rate_info = await rate_limiter.acquire(
+                client_id,
+                rate_limit=settings.rate_limit_requests,
+            )
 
-            # Add rate limit headers to response
-            if rate_info:
-                response.headers["X-RateLimit-Limit"] = str(rate_info.limit)
-                response.headers["X-RateLimit-Remaining"] = str(rate_info.remaining)
-                response.headers["X-RateLimit-Reset"] = str(rate_info.reset)
+            if not allowed:
+                retry_after = max(1, rate_info.reset - int(time.time()))
+                logger.warning(
+                    "rate_limit_exceeded",
+                    client_id=client_id[:8] + "..." if len(client_id) > 8 else client_id,
+                    path=path,
+                    retry_after=retry_after,
+                )
+                return _reject(
+                    429,
+                    "Rate limit exceeded",
+                    {
+                        "X-RateLimit-Limit": str(rate_info.limit),
+                        "X-RateLimit-Remaining": "0",
+                        "X-RateLimit-Reset": str(rate_info.reset),
+                        "Retry-After": str(retry_after),
+                    },
+                )
 
-            response.headers["X-Request-ID"] = request_id
-            return response
+            # Add rate limit headers to response
+            headers["X-RateLimit-Limit"] = str(rate_info.limit)
+            headers["X-RateLimit-Remaining"] = str(rate_info.remaining)
+            headers["X-RateLimit-Reset"] = str(rate_info.reset)
 
-        finally:
-            clear_request_id()
+        return None
 
 
 def verify_api_key(api_key: str | None = None) -> bool:
@@ -554,7 +575,12 @@ def verify_api_key(api_key: str | None = None) -> bool:
 # =============================================================================
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+# Path segments collapsed to {id} for metric labels
+_UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_NUMERIC_ID_PATTERN = re.compile(r"/\d+(?=/|$)")
+
+
+class MetricsMiddleware:
     """
     Middleware for collecting Prometheus metrics.
 
@@ -567,49 +593,60 @@ class MetricsMiddleware(BaseHTTPMiddleware):
     # Skip paths for metrics (health checks are too noisy)
     SKIP_PATHS = {"/health/live", "/health/ready", "/metrics"}
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Record metrics for each request."""
+    def __init__(self, app: ASGIApp) -> None:
         from knowledge.metrics import (
             http_request_duration_seconds,
             http_requests_in_progress,
             http_requests_total,
         )
 
+        self.app = app
+        self._duration = http_request_duration_seconds
+        self._in_progress = http_requests_in_progress
+        self._total = http_requests_total
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Record metrics for each request."""
         # Skip metrics collection for certain paths
-        if request.url.path in self.SKIP_PATHS:
-            return await call_next(request)
+        if scope["type"] != "http" or scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         # Normalize endpoint path (replace IDs with placeholders)
-        endpoint = self._normalize_path(request.url.path)
-        method = request.method
+        endpoint = self._normalize_path(scope["path"])
+        method = scope["method"]
 
         # Track in-progress requests
-        http_requests_in_progress.labels(method=method).inc()
+        self._in_progress.labels(method=method).inc()
 
         start_time = time.time()
         status_code = 500  # Default if exception
 
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            return response
+            await self.app(scope, receive, send_with_status)
         finally:
             # Calculate duration
             duration = time.time() - start_time
 
             # Record metrics
-            http_requests_total.labels(
+            self._total.labels(
                 method=method,
                 endpoint=endpoint,
                 status=str(status_code),
             ).inc()
 
-            http_request_duration_seconds.labels(
+            self._duration.labels(
                 method=method,
                 endpoint=endpoint,
             ).observe(duration)
 
-            http_requests_in_progress.labels(method=method).dec()
+            self._in_progress.labels(method=method).dec()
 
     def _normalize_path(self, path: str) -> str:
         """
@@ -619,16 +656,10 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         - UUIDs with {id}
         - Numbers with {id}
         """
-        import re
-
         # Replace UUIDs
-        path = re.sub(
-            r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
-            "{id}",
-            path,
-        )
+        path = _UUID_PATTERN.sub("{id}", path)
         # Replace numeric IDs
-        path = re.sub(r"/\d+(?=/|$)", "/{id}", path)
+        path = _NUMERIC_ID_PATTERN.sub("/{id}", path)
         return path
 
 
@@ -637,7 +668,7 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 # =============================================================================
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Middleware to add security headers to all responses.
 
@@ -649,30 +680,20 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Unwanted browser features (Permissions-Policy)
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add security headers to response."""
-        response = await call_next(request)
-
+    HEADERS = {
         # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
+        "X-Frame-Options": "DENY",
         # Prevent MIME-type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
+        "X-Content-Type-Options": "nosniff",
         # XSS Protection (legacy but still useful for older browsers)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
+        "X-XSS-Protection": "1; mode=block",
         # Referrer Policy - don't leak full URL to other origins
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
+        "Referrer-Policy": "strict-origin-when-cross-origin",
         # Permissions Policy - disable unnecessary browser features
-        response.headers["Permissions-Policy"] = (
-            "camera=(), microphone=(), geolocation=(), payment=()"
-        )
-
+        "Permissions-Policy": "camera=(), microphone=(), geolocation=(), payment=()",
         # Content Security Policy
         # Note: 'unsafe-inline' needed for some UI frameworks, adjust as needed
-        response.headers["Content-Security-Policy"] = (
+        "Content-Security-Policy": (
             "default-src 'self'; "
             "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
             "style-src 'self' 'unsafe-inline'; "
@@ -680,15 +701,26 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "font-src 'self' data:; "
             "connect-src 'self' http://localhost:* https://localhost:*; "
             "frame-ancestors 'none';"
-        )
+        ),
+    }
 
-        # HSTS - only for HTTPS connections
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
+    # HSTS - only for HTTPS connections
+    HTTPS_HEADERS = {
+        **HEADERS,
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    }
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add security headers to response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        return response
+        headers = self.HTTPS_HEADERS if scope.get("scheme") == "https" else self.HEADERS
+        await self.app(scope, receive, _set_response_headers(send, headers))
 
 
 # =============================================================================
@@ -696,7 +728,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 # =============================================================================
 
 
-class APIVersionMiddleware(BaseHTTPMiddleware):
+class APIVersionMiddleware:
     """
     Middleware for API version headers and deprecation warnings.
 
@@ -704,24 +736,26 @@ class APIVersionMiddleware(BaseHTTPMiddleware):
     future deprecation warnings for version transitions.
     """
 
-    def __init__(self, app: Any, version: str = "v1") -> None:
-        super().__init__(app)
+    DEPRECATION_HEADERS = {
+        "Deprecation": "true",
+        "Sunset": "2027-01-01T00:00:00Z",
+        "X-Deprecation-Notice": "This API version is deprecated. Please migrate to /api/v1/.",
+    }
+
+    def __init__(self, app: ASGIApp, version: str = "v1") -> None:
+        self.app = app
         self.version = version
+        self._headers = {"X-API-Version": version}
+        self._deprecated_headers = {**self._headers, **self.DEPRECATION_HEADERS}
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add API version headers to response."""
-        response = await call_next(request)
-
-        # Add version header
-        response.headers["X-API-Version"] = self.version
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
         # Add deprecation warning for old API paths (future use)
-        path = request.url.path
-        if path.startswith("/v0/") or path.startswith("/api/v0/"):
-            response.headers["Deprecation"] = "true"
-            response.headers["Sunset"] = "2027-01-01T00:00:00Z"
-            response.headers["X-Deprecation-Notice"] = (
-                "This API version is deprecated. Please migrate to /api/v1/."
-            )
-
-        return response
+        path = scope["path"]
+        deprecated = path.startswith("/v0/") or path.startswith("/api/v0/")
+        headers = self._deprecated_headers if deprecated else self._headers
+        await self.app(scope, receive, _set_response_headers(send, headers))
@@ -7,6 +7,7 @@ Provides endpoints for performing multiple operations in a single request:
 
 from __future__ import annotations
 
+import asyncio
 from uuid import UUID
 
 from fastapi import APIRouter, Depends
@@ -14,9 +15,13 @@ from pydantic import BaseModel, Field
 
 from knowledge.api.auth import require_scope
 from knowledge.api.schemas import SearchMode, SearchResponse, SearchResultItem
+from knowledge.config import get_settings
 from knowledge.db import get_db
+from knowledge.embeddings import embed_batch
 from knowledge.logging import get_logger
 from knowledge.search import (
+    HybridSearchResponse,
+    get_cached_search,
     hybrid_search_with_status,
     search_bm25_only,
     search_vector_only,
@@ -26,6 +31,9 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/batch", tags=["batch"])
 
+# Maximum queries per batch search request
+MAX_BATCH_QUERIES = 50
+
 
 # =============================================================================
 # Schemas
@@ -44,7 +52,7 @@ class BatchSearchQuery(BaseModel):
 class BatchSearchRequest(BaseModel):
     """Batch search request."""
 
-    queries: list[BatchSearchQuery] = Field(..., min_length=1, max_length=10)
+    queries: list[BatchSearchQuery] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
 
 
 class BatchSearchResponse(BaseModel):
@@ -77,76 +85,157 @@ class BatchDeleteResponse(BaseModel):
 # =============================================================================
 
 
+def _query_key(query: BatchSearchQuery) -> tuple[str, int, SearchMode, str | None]:
+    """Key identifying queries that produce identical results."""
+    return (query.query, query.limit, query.mode, query.namespace)
+
+
+async def _cached_searches(
+    queries: dict[tuple[str, int, SearchMode, str | None], BatchSearchQuery],
+) -> dict[tuple[str, int, SearchMode, str | None], HybridSearchResponse]:
+    """Look up every hybrid query in the search cache, so hits skip embedding."""
+    hybrid = {key: q for key, q in queries.items() if q.mode == SearchMode.HYBRID}
+    if not hybrid:
+        return {}
+
+    try:
+        cached = await asyncio.gather(
+            *(get_cached_search(q.query, limit=q.limit, namespace=q.namespace) for q in hybrid.values())
+        )
+    except Exception as e:
+        logger.warning("batch_search_cache_failed", queries=len(hybrid), error=str(e))
+        return {}
+
+    return {key: response for key, response in zip(hybrid, cached, strict=True) if response is not None}
+
+
+async def _embed_queries(queries: list[BatchSearchQuery]) -> dict[str, list[float]]:
+    """
+    Embed the text of every hybrid/vector query in one batched call.
+
+    Returns an empty mapping on failure so each query falls back to its
+    own embedding path (and its own degradation handling).
+    """
+    texts = list(dict.fromkeys(q.query for q in queries if q.mode != SearchMode.BM25))
+    if not texts:
+        return {}
+
+    try:
+        embeddings = await embed_batch(texts)
+    except Exception as e:
+        logger.warning("batch_search_embedding_failed", queries=len(texts), error=str(e))
+        return {}
+
+    return dict(zip(texts, embeddings, strict=True))
+
+
+async def _execute_query(
+    query: BatchSearchQuery,
+    query_embedding: list[float] | None,
+    cached: HybridSearchResponse | None = None,
+) -> SearchResponse:
+    """Run a single batch query (or use its cached result) and build its response."""
+    if query.mode == SearchMode.HYBRID:
+        response = cached or await hybrid_search_with_status(
+            query.query,
+            limit=query.limit,
+            namespace=query.namespace,
+            query_embedding=query_embedding,
+        )
+        search_results = response.results
+        degraded = response.degraded
+        search_mode = response.search_mode
+        warnings = response.warnings
+    elif query.mode == SearchMode.BM25:
+        search_results = await search_bm25_only(
+            query.query,
+            limit=query.limit,
+            namespace=query.namespace,
+        )
+        degraded = False
+        search_mode = "bm25_only"
+        warnings = []
+    else:
+        search_results = await search_vector_only(
+            query.query,
+            limit=query.limit,
+            namespace=query.namespace,
+            query_embedding=query_embedding,
+        )
+        degraded = False
+        search_mode = "vector_only"
+        warnings = []
+
+    return SearchResponse(
+        query=query.query,
+        results=[
+            SearchResultItem(
+                content_id=r.content_id,
+                title=r.title,
+                content_type=r.content_type,
+                score=r.score,
+                chunk_text=r.chunk_text,
+                source_ref=r.source_ref,
+                bm25_rank=r.bm25_rank,
+                vector_rank=r.vector_rank,
+            )
+            for r in search_results
+        ],
+        total=len(search_results),
+        mode=query.mode.value,
+        degraded=degraded,
+        search_mode=search_mode,
+        warnings=warnings,
+    )
+
+
 @router.post("/search", response_model=BatchSearchResponse, dependencies=[Depends(require_scope("read"))])
 async def batch_search(request: BatchSearchRequest) -> BatchSearchResponse:
     """
     Execute multiple search queries in a single request.
 
-    Maximum 10 queries per batch. Each query is executed independently,
-    and results are returned in the same order as the queries.
+    Maximum 50 queries per batch. Identical queries are executed once,
+    cached hybrid results are served without embedding, the remaining query
+    embeddings are generated in a single batched call, and searches run
+    concurrently (bounded by the database pool). Results are returned in
+    the same order as the queries.
     """
+    distinct: dict[tuple[str, int, SearchMode, str | None], BatchSearchQuery] = {}
+    for query in request.queries:
+        distinct.setdefault(_query_key(query), query)
+
+    cached = await _cached_searches(distinct)
+    embeddings = await _embed_queries([q for key, q in distinct.items() if key not in cached])
+
+    # A hybrid query holds up to two connections (BM25 + vector) at once
+    semaphore = asyncio.Semaphore(max(1, get_settings().db_pool_max // 2))
+
+    async def run(
+        key: tuple[str, int, SearchMode, str | None], query: BatchSearchQuery
+    ) -> SearchResponse | Exception:
+        async with semaphore:
+            try:
+                return await _execute_query(query, embeddings.get(query.query), cached.get(key))
+            except Exception as e:
+                return e
+
+    outcomes = dict(
+        zip(
+            distinct,
+            await asyncio.gather(*(run(key, q) for key, q in distinct.items())),
+            strict=True,
+        )
+    )
+
     results: list[SearchResponse] = []
     errors: list[dict] = []
     succeeded = 0
 
     for i, query in enumerate(request.queries):
-        try:
-            if query.mode == SearchMode.HYBRID:
-                response = await hybrid_search_with_status(
-                    query.query,
-                    limit=query.limit,
-                    namespace=query.namespace,
-                )
-                search_results = response.results
-                degraded = response.degraded
-                search_mode = response.search_mode
-                warnings = response.warnings
-            elif query.mode == SearchMode.BM25:
-                search_results = await search_bm25_only(
-                    query.query,
-                    limit=query.limit,
-                    namespace=query.namespace,
-                )
-                degraded = False
-                search_mode = "bm25_only"
-                warnings = []
-            else:
-                search_results = await search_vector_only(
-                    query.query,
-                    limit=query.limit,
-                    namespace=query.namespace,
-                )
-                degraded = False
-                search_mode = "vector_only"
-                warnings = []
-
-            results.append(
-                SearchResponse(
-                    query=query.query,
-                    results=[
-                        SearchResultItem(
-                            content_id=r.content_id,
-                            title=r.title,
-                            content_type=r.content_type,
-                            score=r.score,
-                            chunk_text=r.chunk_text,
-                            source_ref=r.source_ref,
-                            bm25_rank=r.bm25_rank,
-                            vector_rank=r.vector_rank,
-                        )
-                        for r in search_results
-                    ],
-                    total=len(search_results),
-                    mode=query.mode.value,
-                    degraded=degraded,
-                    search_mode=search_mode,
-                    warnings=warnings,
-                )
-            )
-            succeeded += 1
-        except Exception as e:
-            logger.error("batch_search_query_failed", index=i, error=str(e))
-            errors.append({"index": i, "query": query.query[:50], "error": str(e)})
+        outcome = outcomes[_query_key(query)]
+        if isinstance(outcome, Exception):
+            logger.error("batch_search_query_failed", index=i, error=str(outcome))
+            errors.append({"index": i, "query": query.query[:50], "error": str(outcome)})
             # Add empty result to maintain order
             results.append(
                 SearchResponse(
@@ -156,9 +245,15 @@ async def batch_search(request: BatchSearchRequest) -> BatchSearchResponse:
                     mode=query.mode.value,
                     degraded=True,
                     search_mode="error",
-                    warnings=[f"Query failed: {str(e)[:100]}"],
+                    warnings=[f"Query failed: {str(outcome)[:100]}"],
                 )
             )
+        else:
+            results.append(outcome)
+            succeeded += 1
+
+    if len(distinct) < len(request.queries):
+        logger.debug("batch_search_deduplicated", total=len(request.queries), distinct=len(distinct))
 
     return BatchSearchResponse(
         results=results,
@@ -160,12 +160,8 @@ async def delete_content(content_id: UUID) -> dict:
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
 
-    # Soft delete
-    async with db.acquire() as conn:
-        await conn.execute(
-            "UPDATE content SET deleted_at = NOW() WHERE id = $1",
-            content_id,
-        )
+    # Soft delete (also drops it from the vector index and answer cache)
+    await db.soft_delete_content(content_id)
 
     return {"status": "deleted", "id": str(content_id)}
 
@@ -220,12 +216,7 @@ async def autotag_content(
     else:
         final_tags = list(dict.fromkeys((content.tags or []) + new_tags))
 
-    async with db.acquire() as conn:
-        await conn.execute(
-            "UPDATE content SET tags = $1, updated_at = NOW() WHERE id = $2",
-            final_tags,
-            content_id,
-        )
+    await db.update_content_tags(content_id, final_tags)
 
     return {
         "content_id": str(content_id),
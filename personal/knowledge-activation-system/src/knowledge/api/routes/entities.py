@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
+from knowledge.api.auth import require_scope
 from knowledge.db import Database, get_db
+from knowledge.entity_backfill import BackfillReport, extraction_record, run_entity_backfill
 from knowledge.entity_extraction import extract_entities
 from knowledge.logging import get_logger
 
@@ -146,44 +149,18 @@ async def extract_entities_for_content(
             error=result.error,
         )
 
-    # Delete existing entities for this content (re-extraction)
-    await db.delete_entities_by_content(request.content_id)
-
-    # Insert entities
-    entity_ids: dict[str, UUID] = {}
-    stored_entities = []
-
-    for entity in result.entities:
-        entity_id = await db.insert_entity(
-            content_id=request.content_id,
+    # Replace existing entities for this content (re-extraction)
+    stored = await db.store_entity_extractions([extraction_record(request.content_id, result)])
+    entity_ids, rel_count = stored[request.content_id]
+    stored_entities = [
+        EntityResponse(
+            id=entity_id,
             name=entity.name,
             entity_type=entity.entity_type,
             confidence=entity.confidence,
         )
-        entity_ids[entity.name.lower()] = entity_id
-        stored_entities.append(
-            EntityResponse(
-                id=entity_id,
-                name=entity.name,
-                entity_type=entity.entity_type,
-                confidence=entity.confidence,
-            )
-        )
-
-    # Insert relationships (only if both entities exist)
-    rel_count = 0
-    for rel in result.relationships:
-        from_id = entity_ids.get(rel.from_entity.lower())
-        to_id = entity_ids.get(rel.to_entity.lower())
-        if from_id and to_id:
-            rel_id = await db.insert_relationship(
-                from_entity_id=from_id,
-                to_entity_id=to_id,
-                relation_type=rel.relation_type,
-                confidence=rel.confidence,
-            )
-            if rel_id:
-                rel_count += 1
+        for entity_id, entity in zip(entity_ids, result.entities, strict=True)
+    ]
 
     logger.info(
         "entities_extracted",
@@ -200,6 +177,73 @@ async def extract_entities_for_content(
     )
 
 
+class BackfillRequest(BaseModel):
+    """Entity backfill request."""
+
+    limit: int | None = None
+    force: bool = False
+    concurrency: int | None = None
+
+
+class BackfillResponse(BaseModel):
+    """Entity backfill progress."""
+
+    running: bool
+    scanned: int
+    extracted: int
+    failed: int
+    entities: int
+    relationships: int
+    elapsed_s: float
+    items_per_s: float
+
+
+# The backfill started through the API (one at a time, in-memory)
+_backfill_report = BackfillReport()
+_backfill_task: asyncio.Task[BackfillReport] | None = None
+
+
+@router.post(
+    "/backfill",
+    response_model=BackfillResponse,
+    status_code=202,
+    dependencies=[Depends(require_scope("write"))],
+)
+async def start_entity_backfill(request: BackfillRequest) -> BackfillResponse:
+    """Start extracting entities for all content that lacks them or has changed.
+
+    Runs in the background; poll ``GET /entities/backfill`` for progress.
+    Items whose text is unchanged since their last extraction are skipped
+    unless ``force`` is set.
+    """
+    global _backfill_report, _backfill_task
+    if _backfill_task is not None and not _backfill_task.done():
+        raise HTTPException(status_code=409, detail="Entity backfill already running")
+
+    _backfill_report = BackfillReport(running=True)
+    _backfill_task = asyncio.create_task(
+        run_entity_backfill(
+            concurrency=request.concurrency,
+            limit=request.limit,
+            force=request.force,
+            report=_backfill_report,
+        )
+    )
+    _backfill_task.add_done_callback(_log_backfill_failure)
+    return BackfillResponse(**_backfill_report.summary())
+
+
+@router.get("/backfill", response_model=BackfillResponse, dependencies=[Depends(require_scope("read"))])
+async def get_entity_backfill() -> BackfillResponse:
+    """Progress of the most recent entity backfill."""
+    return BackfillResponse(**_backfill_report.summary())
+
+
+def _log_backfill_failure(task: asyncio.Task[BackfillReport]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("entity_backfill_failed", error=str(task.exception()))
+
+
 class ContentByEntityResponse(BaseModel):
     """Content containing an entity."""
 
@@ -1,25 +1,38 @@
 """Export/Import API (P21: Backup and Data Portability).
 
 Provides endpoints for:
-- Exporting knowledge base content (JSON, Markdown)
+- Exporting knowledge base content (JSON, JSONL, Parquet)
 - Importing content from backups
 - Streaming exports for large datasets
+
+Exports never hold the whole corpus in memory: content is read through a
+server-side cursor, chunks are fetched for a page of content at a time,
+and every format is written incrementally.
 """
 
 from __future__ import annotations
 
+import codecs
+import hashlib
+import io
 import json
+import re
+import zlib
+from collections import OrderedDict
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from enum import Enum
+from pathlib import PurePosixPath
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
+import numpy as np
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from knowledge.api.auth import require_scope
+from knowledge.config import get_settings
 from knowledge.db import get_db
 from knowledge.logging import get_logger
 
@@ -38,6 +51,7 @@ class ExportFormat(str, Enum):
 
     JSON = "json"
     JSONL = "jsonl"  # JSON Lines for streaming
+    PARQUET = "parquet"  # One row per chunk, embeddings as float32 columns
 
 
 class ExportRequest(BaseModel):
@@ -67,12 +81,24 @@ class ImportResult(BaseModel):
     imported: int
     skipped: int
     errors: list[dict] = []
+    job_id: str | None = None
+
+
+class ImportJob(ImportResult):
+    """Progress of a running or finished import."""
+
+    job_id: str
+    status: str = "running"  # running, completed, failed
+    filename: str | None = None
+    started_at: str
+    finished_at: str | None = None
 
 
 class ContentExportItem(BaseModel):
     """Single content item for export."""
 
     id: str
+    filepath: str | None = None
     title: str
     content_type: str
     source_ref: str | None = None
@@ -96,61 +122,83 @@ async def export_content(
     """
     Export knowledge base content.
 
-    Supports JSON and JSONL (streaming) formats.
-    Use JSONL for large exports to avoid memory issues.
+    Supports JSON, JSONL and Parquet formats, all streamed. Parquet stores
+    one row per chunk with embeddings as fixed-size float32 lists and
+    needs pyarrow installed.
     """
+    if request.format == ExportFormat.PARQUET:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as err:
+            raise HTTPException(
+                status_code=501,
+                detail="Parquet export requires pyarrow. Install with: uv pip install pyarrow",
+            ) from err
+
     db = await get_db()
 
+    def metadata(count: int) -> dict[str, Any]:
+        return ExportMetadata(
+            exported_at=datetime.now(UTC).isoformat(),
+            total_items=count,
+            namespace=request.namespace,
+            content_types=request.content_types,
+        ).model_dump()
+
     async def generate_json() -> AsyncIterator[bytes]:
-        """Generate JSON export with all items in array."""
-        items = []
+        """Generate a JSON object, streaming the items array page by page."""
         count = 0
+        yield b'{"items": ['
 
-        async for item in _export_items(db, request):
-            items.append(item)
-            count += 1
-
-        export_data = {
-            "metadata": ExportMetadata(
-                exported_at=datetime.now(UTC).isoformat(),
-                total_items=count,
-                namespace=request.namespace,
-                content_types=request.content_types,
-            ).model_dump(),
-            "items": items,
-        }
+        async for page in _export_pages(db, request):
+            encoded = b",".join(_dump_json(item) for item in page)
+            yield (b"," if count else b"") + encoded
+            count += len(page)
 
-        yield json.dumps(export_data, indent=2, default=str).encode("utf-8")
+        # Metadata goes last so the item count is known without a second pass
+        yield b'], "metadata": ' + _dump_json(metadata(count)) + b"}"
 
     async def generate_jsonl() -> AsyncIterator[bytes]:
         """Generate JSONL export (one item per line)."""
         count = 0
 
-        # First line is metadata (will update count at end via separate request)
-        metadata = ExportMetadata(
-            exported_at=datetime.now(UTC).isoformat(),
-            total_items=0,  # Will be actual count in footer
-            namespace=request.namespace,
-            content_types=request.content_types,
-        )
-        yield (json.dumps({"type": "metadata", "data": metadata.model_dump()}, default=str) + "\n").encode("utf-8")
+        # First line is metadata; the actual count is in the footer
+        yield _dump_json({"type": "metadata", "data": metadata(0)}) + b"\n"
 
-        # Stream items
-        async for item in _export_items(db, request):
-            yield (json.dumps({"type": "item", "data": item}, default=str) + "\n").encode("utf-8")
-            count += 1
+        async for page in _export_pages(db, request):
+            yield b"".join(_dump_json({"type": "item", "data": item}) + b"\n" for item in page)
+            count += len(page)
 
-        # Footer with actual count
-        yield (json.dumps({"type": "footer", "total_items": count}) + "\n").encode("utf-8")
+        yield _dump_json({"type": "footer", "total_items": count}) + b"\n"
 
+    async def generate_parquet() -> AsyncIterator[bytes]:
+        """Generate a Parquet file with one row group per page."""
+        import pyarrow.parquet as pq
+
+        sink = _ByteSink()
+        schema = _parquet_schema(request.include_embeddings, metadata(0))
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        try:
+            async for page in _export_pages(db, request):
+                writer.write_table(_parquet_table(page, schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    timestamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
     if request.format == ExportFormat.JSONL:
         generator = generate_jsonl()
         media_type = "application/x-ndjson"
-        filename = f"kas-export-{datetime.now(UTC).strftime('%Y%m%d-%H%M%S')}.jsonl"
+        filename = f"kas-export-{timestamp}.jsonl"
+    elif request.format == ExportFormat.PARQUET:
+        generator = generate_parquet()
+        media_type = "application/vnd.apache.parquet"
+        filename = f"kas-export-{timestamp}.parquet"
     else:
         generator = generate_json()
         media_type = "application/json"
-        filename = f"kas-export-{datetime.now(UTC).strftime('%Y%m%d-%H%M%S')}.json"
+        filename = f"kas-export-{timestamp}.json"
 
     logger.info(
         "export_started",
@@ -166,37 +214,54 @@ async def export_content(
     )
 
 
-# Maximum file upload size (50 MB default)
-MAX_UPLOAD_SIZE_MB = 50
-MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+# Recent import jobs, newest last (in-memory, like webhook deliveries)
+MAX_IMPORT_JOBS = 50
+_import_jobs: OrderedDict[str, ImportJob] = OrderedDict()
+
+# Bytes read from the upload per parse step
+IMPORT_READ_SIZE = 1024 * 1024
+
+# Values allowed by the content.type CHECK constraint (migration 003)
+CONTENT_TYPES = frozenset({
+    "youtube", "bookmark", "file", "note",
+    "research", "documentation", "tutorial", "paper",
+    "capture", "pattern", "decision",
+})
 
 
 @router.post("/import", response_model=ImportResult)
 async def import_content(
     file: UploadFile = File(...),  # noqa: B008
     skip_existing: bool = True,
+    job_id: str | None = None,
     _: bool = Depends(require_scope("write")),  # noqa: B008
 ) -> ImportResult:
     """
     Import content from a backup file.
 
-    Supports JSON and JSONL formats. Maximum file size: 50 MB.
+    Supports JSON and JSONL exports, optionally gzip-compressed (.gz). The
+    upload is parsed incrementally and items are written in transactions of
+    ``import_batch_size``, so there is no size cap unless
+    ``import_max_upload_mb`` sets one. Pass a ``job_id`` to follow progress
+    at ``GET /import/{job_id}`` while the upload runs.
     Set skip_existing=false to update existing items.
     """
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename required")
 
     # Validate file extension
-    if not file.filename.endswith((".json", ".jsonl")):
+    name = file.filename.removesuffix(".gz")
+    if not name.endswith((".json", ".jsonl")):
         raise HTTPException(
             status_code=400,
-            detail="Invalid file type. Only .json and .jsonl files are supported."
+            detail="Invalid file type. Only .json and .jsonl files (optionally .gz) are supported."
         )
 
     # Check content type
     if file.content_type and file.content_type not in (
         "application/json",
         "application/x-ndjson",
+        "application/gzip",
         "text/plain",
     ):
         logger.warning(
@@ -205,105 +270,149 @@ async def import_content(
             filename=file.filename,
         )
 
-    is_jsonl = file.filename.endswith(".jsonl")
-    db = await get_db()
+    settings = get_settings()
+    max_bytes = settings.import_max_upload_mb * 1024 * 1024
+    parser = _JsonlItemParser() if name.endswith(".jsonl") else _JsonItemParser()
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if file.filename.endswith(".gz") else None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    job = ImportJob(
+        job_id=job_id or str(uuid4()),
+        total=0,
+        imported=0,
+        skipped=0,
+        filename=file.filename,
+        started_at=datetime.now(UTC).isoformat(),
+    )
+    _register_import_job(job)
 
-    total = 0
-    imported = 0
-    skipped = 0
-    errors: list[dict] = []
+    received = 0
+    group: list[dict] = []
 
     try:
-        # Read file with size limit check
-        content = await file.read()
+        while data := await file.read(IMPORT_READ_SIZE):
+            received += len(data)
+            if max_bytes and received > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum size is {settings.import_max_upload_mb} MB."
+                )
+            if decompressor is not None:
+                data = decompressor.decompress(data)
 
-        # Validate file size
-        if len(content) > MAX_UPLOAD_SIZE_BYTES:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_MB} MB."
-            )
+            for item in parser.feed(decoder.decode(data)):
+                group.append(item)
+                if len(group) >= settings.import_batch_size:
+                    await _import_group(group, skip_existing, job)
+                    group = []
 
-        if len(content) == 0:
+        if received == 0:
             raise HTTPException(status_code=400, detail="Empty file")
 
-        content_str = content.decode("utf-8")
-
-        if is_jsonl:
-            items = _parse_jsonl(content_str)
-        else:
-            data = json.loads(content_str)
-            items = data.get("items", [])
-
-        for item in items:
-            total += 1
-            try:
-                result = await _import_item(db, item, skip_existing)
-                if result == "imported":
-                    imported += 1
-                elif result == "skipped":
-                    skipped += 1
-            except Exception as e:
-                errors.append({
-                    "item_id": item.get("id", "unknown"),
-                    "error": str(e)[:200],
-                })
-
-    except json.JSONDecodeError as e:
+        tail = decompressor.flush() if decompressor is not None else b""
+        group.extend(parser.feed(decoder.decode(tail, final=True)))
+        group.extend(parser.close())
+        if group:
+            await _import_group(group, skip_existing, job)
+
+    except HTTPException:
+        job.status = "failed"
+        raise
+    except (json.JSONDecodeError, UnicodeDecodeError, zlib.error) as e:
+        job.status = "failed"
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)[:100]}") from e
     except Exception as e:
-        logger.error("import_failed", error=str(e))
+        job.status = "failed"
+        logger.error("import_failed", error=str(e), job_id=job.job_id)
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)[:100]}") from e
+    finally:
+        job.finished_at = datetime.now(UTC).isoformat()
 
+    job.status = "completed"
     logger.info(
         "import_completed",
-        total=total,
-        imported=imported,
-        skipped=skipped,
-        errors=len(errors),
+        job_id=job.job_id,
+        total=job.total,
+        imported=job.imported,
+        skipped=job.skipped,
+        errors=len(job.errors),
     )
 
     return ImportResult(
-        total=total,
-        imported=imported,
-        skipped=skipped,
-        errors=errors,
+        total=job.total,
+        imported=job.imported,
+        skipped=job.skipped,
+        errors=job.errors,
+        job_id=job.job_id,
     )
 
 
+@router.get("/import/{job_id}", response_model=ImportJob)
+async def get_import_job(
+    job_id: str,
+    _: bool = Depends(require_scope("read")),
+) -> ImportJob:
+    """Get progress for a running or recently finished import."""
+    job = _import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
 
+# Content rows per chunk prefetch (and per Parquet row group)
+EXPORT_PAGE_SIZE = 200
+
+# chunks.embedding is vector(768)
+EMBEDDING_DIM = 768
+
+
 async def _export_items(db: Any, request: ExportRequest) -> AsyncIterator[dict]:
     """Generate export items from database."""
-    # Get content with optional filters
+    async for page in _export_pages(db, request):
+        for item in page:
+            yield item
+
+
+async def _export_pages(
+    db: Any,
+    request: ExportRequest,
+    page_size: int | None = None,
+) -> AsyncIterator[list[dict]]:
+    """Generate export items a page at a time, with chunks fetched per page."""
+    page_size = page_size or EXPORT_PAGE_SIZE
     query = """
         SELECT
-            c.id, c.title, c.content_type, c.source_ref, c.namespace,
+            c.id, c.filepath, c.title, c.type AS content_type, c.url AS source_ref,
+            COALESCE(c.metadata->>'namespace', 'default') AS namespace,
             c.tags, c.created_at, c.updated_at
         FROM content c
-        WHERE 1=1
+        WHERE c.deleted_at IS NULL
     """
     params: list = []
     param_idx = 1
 
     if request.namespace:
-        query += f" AND c.namespace = ${param_idx}"
+        query += f" AND COALESCE(c.metadata->>'namespace', 'default') = ${param_idx}"
         params.append(request.namespace)
         param_idx += 1
 
     if request.content_types:
-        query += f" AND c.content_type = ANY(${param_idx})"
+        query += f" AND c.type = ANY(${param_idx})"
         params.append(request.content_types)
         param_idx += 1
 
     query += " ORDER BY c.created_at"
 
+    page: list[dict] = []
     async for row in db.iterate(query, *params):
-        item = {
+        page.append({
             "id": str(row["id"]),
+            "filepath": row["filepath"],
             "title": row["title"],
             "content_type": row["content_type"],
             "source_ref": row["source_ref"],
@@ -311,140 +420,427 @@ async def _export_items(db: Any, request: ExportRequest) -> AsyncIterator[dict]:
             "tags": row["tags"] or [],
             "created_at": row["created_at"].isoformat() if row["created_at"] else None,
             "updated_at": row["updated_at"].isoformat() if row["updated_at"] else None,
-        }
+        })
+        if len(page) >= page_size:
+            yield await _attach_chunks(db, page, request)
+            page = []
+
+    if page:
+        yield await _attach_chunks(db, page, request)
 
-        if request.include_chunks:
-            chunks = await _get_chunks(db, row["id"], request.include_embeddings)
-            item["chunks"] = chunks
 
-        yield item
+async def _attach_chunks(db: Any, page: list[dict], request: ExportRequest) -> list[dict]:
+    """Fetch chunks for every item in a page with one query."""
+    if not request.include_chunks:
+        return page
 
+    chunks = await _get_chunks_for_page(
+        db, [UUID(item["id"]) for item in page], request.include_embeddings
+    )
+    for item in page:
+        item["chunks"] = chunks.get(item["id"], [])
+    return page
 
-async def _get_chunks(db: Any, content_id: UUID, include_embeddings: bool) -> list[dict]:
-    """Get chunks for a content item."""
+
+async def _get_chunks_for_page(
+    db: Any,
+    content_ids: list[UUID],
+    include_embeddings: bool,
+) -> dict[str, list[dict]]:
+    """Get chunks for a page of content items, keyed by content id.
+
+    Embeddings stay as the float32 arrays pgvector decodes them to; the
+    JSON encoder and Parquet writer convert them in bulk.
+    """
+    columns = "content_id, chunk_index, chunk_text"
     if include_embeddings:
-        query = """
-            SELECT chunk_index, chunk_text, embedding
-            FROM chunks
-            WHERE content_id = $1
-            ORDER BY chunk_index
-        """
-    else:
-        query = """
-            SELECT chunk_index, chunk_text
-            FROM chunks
-            WHERE content_id = $1
-            ORDER BY chunk_index
-        """
+        columns += ", embedding"
+    query = f"""
+        SELECT {columns}
+        FROM chunks
+        WHERE content_id = ANY($1::uuid[])
+        ORDER BY content_id, chunk_index
+    """
 
-    chunks = []
-    async for row in db.iterate(query, content_id):
+    chunks: dict[str, list[dict]] = {}
+    async for row in db.iterate(query, content_ids):
         chunk = {
             "index": row["chunk_index"],
             "text": row["chunk_text"],
         }
-        if include_embeddings and row.get("embedding"):
-            # Convert pgvector to list
-            chunk["embedding"] = list(row["embedding"])
-        chunks.append(chunk)
+        if include_embeddings and row.get("embedding") is not None:
+            chunk["embedding"] = row["embedding"]
+        chunks.setdefault(str(row["content_id"]), []).append(chunk)
 
     return chunks
 
 
-def _parse_jsonl(content: str) -> list[dict]:
-    """Parse JSONL content, extracting items only."""
-    items = []
-    for line in content.strip().split("\n"):
+def _json_default(value: Any) -> Any:
+    """Encode pgvector arrays as plain float lists."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return str(value)
+
+
+def _dump_json(value: Any) -> bytes:
+    """Compact JSON encoding for streamed export output."""
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file that hands buffered bytes back to a streaming response."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _parquet_schema(include_embeddings: bool, metadata: dict[str, Any]) -> Any:
+    """Schema for Parquet exports: one row per chunk."""
+    import pyarrow as pa
+
+    fields = [
+        pa.field("content_id", pa.string()),
+        pa.field("filepath", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("content_type", pa.string()),
+        pa.field("source_ref", pa.string()),
+        pa.field("namespace", pa.string()),
+        pa.field("tags", pa.list_(pa.string())),
+        pa.field("created_at", pa.string()),
+        pa.field("updated_at", pa.string()),
+        pa.field("chunk_index", pa.int32()),
+        pa.field("chunk_text", pa.string()),
+    ]
+    if include_embeddings:
+        fields.append(pa.field("embedding", pa.list_(pa.float32(), EMBEDDING_DIM)))
+    return pa.schema(fields, metadata={"kas_export": json.dumps(metadata)})
+
+
+def _parquet_table(page: list[dict], schema: Any) -> Any:
+    """Build a row group from a page of items.
+
+    Items without chunks still get one row (with null chunk columns) so
+    every exported item is present.
+    """
+    import pyarrow as pa
+
+    rows: list[tuple[dict, dict | None]] = []
+    for item in page:
+        chunks = item.get("chunks") or [None]
+        rows.extend((item, chunk) for chunk in chunks)
+
+    columns: dict[str, Any] = {
+        name: [item[name] for item, _ in rows]
+        for name in ("filepath", "title", "content_type", "source_ref", "namespace", "tags", "created_at", "updated_at")
+    }
+    columns["content_id"] = [item["id"] for item, _ in rows]
+    columns["chunk_index"] = [chunk["index"] if chunk else None for _, chunk in rows]
+    columns["chunk_text"] = [chunk["text"] if chunk else None for _, chunk in rows]
+
+    if "embedding" in schema.names:
+        vectors = np.zeros((len(rows), EMBEDDING_DIM), dtype=np.float32)
+        valid = np.zeros(len(rows), dtype=bool)
+        for i, (_, chunk) in enumerate(rows):
+            if chunk and chunk.get("embedding") is not None:
+                vectors[i] = chunk["embedding"]
+                valid[i] = True
+        # Contiguous float32 values; the validity bitmap marks rows without vectors
+        validity = None if valid.all() else pa.array(valid).buffers()[1]
+        columns["embedding"] = pa.Array.from_buffers(
+            schema.field("embedding").type,
+            len(rows),
+            [validity],
+            children=[pa.array(vectors.reshape(-1))],
+        )
+
+    return pa.table({name: columns[name] for name in schema.names}, schema=schema)
+
+
+def _register_import_job(job: ImportJob) -> None:
+    """Track a job, forgetting the oldest once the registry is full."""
+    _import_jobs[job.job_id] = job
+    _import_jobs.move_to_end(job.job_id)
+    while len(_import_jobs) > MAX_IMPORT_JOBS:
+        _import_jobs.popitem(last=False)
+
+
+class _JsonlItemParser:
+    """Incremental parser for JSONL exports, yielding item payloads."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[dict]:
+        lines = (self._buffer + text).split("\n")
+        self._buffer = lines.pop()
+        return [item for line in lines if (item := self._parse(line)) is not None]
+
+    def close(self) -> list[dict]:
+        line, self._buffer = self._buffer, ""
+        item = self._parse(line)
+        return [item] if item is not None else []
+
+    @staticmethod
+    def _parse(line: str) -> dict | None:
         if not line.strip():
-            continue
+            return None
         try:
             obj = json.loads(line)
-            if obj.get("type") == "item":
-                items.append(obj.get("data", {}))
         except json.JSONDecodeError:
-            continue
-    return items
+            return None
+        if isinstance(obj, dict) and obj.get("type") == "item":
+            return obj.get("data", {})
+        return None
 
 
-async def _import_item(db: Any, item: dict, skip_existing: bool) -> str:
-    """Import a single item. Returns 'imported', 'skipped', or raises."""
-    content_id = item.get("id")
+class _JsonItemParser:
+    """Incremental parser for JSON exports.
 
-    # Check if exists
-    if content_id:
-        existing = await db.fetchrow(
-            "SELECT id FROM content WHERE id = $1",
-            UUID(content_id),
-        )
-        if existing and skip_existing:
-            return "skipped"
-
-    # Create or update content
-    if content_id and not skip_existing:
-        # Update existing
-        await db.execute(
-            """
-            UPDATE content SET
-                title = $2,
-                content_type = $3,
-                source_ref = $4,
-                namespace = $5,
-                tags = $6,
+    Decodes the elements of the top-level ``"items"`` array one at a time
+    as text arrives, so only the current item is ever buffered. Anything
+    outside the array (metadata) is skipped.
+    """
+
+    _ITEMS_START = re.compile(r'"items"\s*:\s*\[')
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._in_items = False
+        self._done = False
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> list[dict]:
+        if self._done:
+            return []
+        self._buffer += text
+
+        if not self._in_items:
+            match = self._ITEMS_START.search(self._buffer)
+            if match is None:
+                return []
+            self._buffer = self._buffer[match.end():]
+            self._in_items = True
+
+        items: list[dict] = []
+        pos = 0
+        while True:
+            pos = self._skip_separators(pos)
+            if pos >= len(self._buffer):
+                break
+            if self._buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                break  # Item continues in the next block
+            items.append(item)
+            pos = end
+
+        self._buffer = "" if self._done else self._buffer[pos:]
+        return items
+
+    def close(self) -> list[dict]:
+        if self._done:
+            return []
+        if not self._in_items:
+            # No items array: accept any other valid JSON document as empty
+            json.loads(self._buffer)
+            return []
+        # Unterminated array: surface the real decode error
+        self._decoder.raw_decode(self._buffer, self._skip_separators(0))
+        raise json.JSONDecodeError("Unterminated items array", self._buffer, len(self._buffer))
+
+    def _skip_separators(self, pos: int) -> int:
+        while pos < len(self._buffer) and self._buffer[pos] in " \t\r\n,":
+            pos += 1
+        return pos
+
+
+def _content_row(item: dict) -> tuple:
+    """Map an export item to content upsert columns."""
+    content_id = UUID(item["id"]) if item.get("id") else uuid4()
+    content_type = item.get("content_type", "note")
+    if content_type not in CONTENT_TYPES:
+        raise ValueError(f"Invalid content_type: {content_type}")
+    chunks = item.get("chunks") or []
+    body = "\n".join(chunk["text"] for chunk in chunks) or item["title"]
+    return (
+        content_id,
+        item.get("filepath") or f"imports/{content_id}.md",
+        hashlib.sha256(body.encode()).hexdigest(),
+        content_type,
+        item.get("source_ref"),
+        item["title"],
+        item.get("tags") or [],
+        item.get("namespace") or "default",
+    )
+
+
+def _unique_filepath(filepath: str, content_id: UUID) -> str:
+    """Suffix a filepath with the content id, for paths owned by another item."""
+    path = PurePosixPath(filepath)
+    return str(path.with_name(f"{path.stem}-{content_id.hex[:8]}{path.suffix}"))
+
+
+async def _upsert_rows(db: Any, conn: Any, rows: list[tuple], chunk_lists: list[list[dict]]) -> None:
+    """Upsert content rows with a single unnest() INSERT and bulk load their chunks.
+
+    Every upserted item is invalidated in the caches, under both its old and
+    its new namespace, whether or not it has chunks.
+    """
+    namespaces = await conn.fetch(
+        """
+        WITH old AS (
+            SELECT COALESCE(metadata->>'namespace', 'default') AS namespace
+            FROM content
+            WHERE id = ANY($1::uuid[])
+        ), upserted AS (
+            INSERT INTO content (id, filepath, content_hash, type, url, title, tags, metadata)
+            SELECT u.id, u.filepath, u.content_hash, u.type, u.url, u.title,
+                   ARRAY(SELECT jsonb_array_elements_text(u.tags)),
+                   jsonb_build_object('namespace', u.namespace)
+            FROM unnest($1::uuid[], $2::text[], $3::text[], $4::text[], $5::text[],
+                        $6::text[], $7::jsonb[], $8::text[])
+                AS u(id, filepath, content_hash, type, url, title, tags, namespace)
+            ON CONFLICT (id) DO UPDATE SET
+                title = EXCLUDED.title,
+                type = EXCLUDED.type,
+                url = EXCLUDED.url,
+                tags = EXCLUDED.tags,
+                metadata = content.metadata || EXCLUDED.metadata,
                 updated_at = NOW()
-            WHERE id = $1
-            """,
-            UUID(content_id),
-            item["title"],
-            item["content_type"],
-            item.get("source_ref"),
-            item.get("namespace", "default"),
-            item.get("tags", []),
+            RETURNING COALESCE(metadata->>'namespace', 'default') AS namespace
         )
-        result_id = UUID(content_id)
-    else:
-        # Insert new
-        result = await db.fetchrow(
-            """
-            INSERT INTO content (title, content_type, source_ref, namespace, tags)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id
-            """,
-            item["title"],
-            item["content_type"],
-            item.get("source_ref"),
-            item.get("namespace", "default"),
-            item.get("tags", []),
-        )
-        result_id = result["id"]
-
-    # Import chunks if present
-    chunks = item.get("chunks", [])
+        SELECT namespace FROM old
+        UNION
+        SELECT namespace FROM upserted
+        """,
+        *(list(column) for column in zip(*rows, strict=True)),
+    )
+    await db.content_changed_in(conn, [record["namespace"] for record in namespaces], [row[0] for row in rows])
+
+    chunks = [
+        {
+            "content_id": row[0],
+            "chunk_index": chunk["index"],
+            "chunk_text": chunk["text"],
+            "embedding": chunk.get("embedding") or None,
+        }
+        for row, item_chunks in zip(rows, chunk_lists, strict=True)
+        for chunk in item_chunks
+    ]
     if chunks:
-        # Clear existing chunks first
-        await db.execute("DELETE FROM chunks WHERE content_id = $1", result_id)
-
-        for chunk in chunks:
-            embedding = chunk.get("embedding")
-            if embedding:
-                await db.execute(
-                    """
-                    INSERT INTO chunks (content_id, chunk_index, chunk_text, embedding)
-                    VALUES ($1, $2, $3, $4)
-                    """,
-                    result_id,
-                    chunk["index"],
-                    chunk["text"],
-                    embedding,
-                )
-            else:
-                await db.execute(
-                    """
-                    INSERT INTO chunks (content_id, chunk_index, chunk_text)
-                    VALUES ($1, $2, $3)
-                    """,
-                    result_id,
-                    chunk["index"],
-                    chunk["text"],
-                )
+        await db.bulk_load_chunks(chunks, mode="replace", conn=conn)
+
+
+async def _import_group(items: list[dict], skip_existing: bool, job: ImportJob) -> None:
+    """Import a group of items in one transaction.
+
+    Existing ids and filepaths are found with one query for the whole group,
+    content rows are upserted with a single unnest() INSERT, and chunks go
+    through the binary COPY bulk loader. A filepath already owned by another
+    item is suffixed with the content id. If the group still fails, it is
+    retried item by item in savepoints so only the bad items are reported.
+    """
+    job.total += len(items)
+
+    rows: list[tuple] = []
+    chunk_lists: list[list[dict]] = []
+    for item in items:
+        try:
+            rows.append(_content_row(item))
+            chunk_lists.append(item.get("chunks") or [])
+        except (KeyError, TypeError, ValueError) as e:
+            job.errors.append({"item_id": item.get("id", "unknown"), "error": str(e)[:200]})
+
+    if not rows:
+        return
+
+    db = await get_db()
+    checked = False
+    try:
+        async with db.transaction() as conn:
+            found = await conn.fetch(
+                "SELECT id, filepath FROM content WHERE id = ANY($1::uuid[]) OR filepath = ANY($2::text[])",
+                [row[0] for row in rows],
+                [row[1] for row in rows],
+            )
+            existing = {record["id"] for record in found}
+            if skip_existing:
+                kept = [i for i, row in enumerate(rows) if row[0] not in existing]
+                job.skipped += len(rows) - len(kept)
+                rows = [rows[i] for i in kept]
+                chunk_lists = [chunk_lists[i] for i in kept]
+
+            # Only new rows insert a filepath; it must not belong to another item
+            # (or to an earlier item of this group)
+            owners = {record["filepath"]: record["id"] for record in found}
+            for i, row in enumerate(rows):
+                content_id, filepath = row[0], row[1]
+                if content_id in existing:
+                    continue
+                if owners.setdefault(filepath, content_id) != content_id:
+                    filepath = _unique_filepath(filepath, content_id)
+                    owners[filepath] = content_id
+                    rows[i] = (content_id, filepath, *row[2:])
+
+            checked = True
+            if rows:
+                await _upsert_rows(db, conn, rows, chunk_lists)
+    except Exception as e:
+        if not checked:
+            # Failed before the existence check; the rows are not safe to retry
+            for row in rows:
+                job.errors.append({"item_id": str(row[0]), "error": str(e)[:200]})
+            return
+        logger.warning("import_group_failed", items=len(rows), error=str(e)[:200], job_id=job.job_id)
+        await _import_rows_individually(db, rows, chunk_lists, job)
+        return
+
+    job.imported += len(rows)
+
+
+async def _import_rows_individually(
+    db: Any, rows: list[tuple], chunk_lists: list[list[dict]], job: ImportJob
+) -> None:
+    """Retry a failed group one item per savepoint, reporting only the items that fail."""
+    imported = 0
+    errors: list[dict] = []
+    try:
+        async with db.transaction() as conn:
+            for row, item_chunks in zip(rows, chunk_lists, strict=True):
+                try:
+                    async with db.savepoint(conn):
+                        await _upsert_rows(db, conn, [row], [item_chunks])
+                    imported += 1
+                except Exception as e:
+                    errors.append({"item_id": str(row[0]), "error": str(e)[:200]})
+    except Exception as e:
+        # Nothing from the group was committed; report every item in it
+        job.errors.extend({"item_id": str(row[0]), "error": str(e)[:200]} for row in rows)
+        return
 
-    return "imported"
+    job.imported += imported
+    job.errors.extend(errors)
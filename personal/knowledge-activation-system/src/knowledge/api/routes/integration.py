@@ -18,6 +18,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from knowledge.cache import get_cache
 from knowledge.db import get_db
 from knowledge.embeddings import check_ollama_health
 from knowledge.logging import get_logger
@@ -1229,19 +1230,24 @@ async def update_content_quality(
         db = await get_db()
 
         async with db.acquire() as conn:
-            result = await conn.execute(
+            namespace = await conn.fetchval(
                 """
                 UPDATE content
                 SET quality_score = $1
                 WHERE id = $2 AND deleted_at IS NULL
+                RETURNING COALESCE(metadata->>'namespace', 'default')
                 """,
                 quality_score,
                 UUID(content_id),
             )
 
-        if result == "UPDATE 0":
+        if namespace is None:
             raise HTTPException(status_code=404, detail="Content not found")
 
+        # Quality boosts ranking, so cached searches in the namespace are stale
+        cache = await get_cache()
+        await cache.bump_generations([namespace])
+
         return {
             "success": True,
             "content_id": content_id,
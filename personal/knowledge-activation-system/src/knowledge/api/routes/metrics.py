@@ -5,8 +5,9 @@ from __future__ import annotations
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse, Response
 
+from knowledge.cache import get_cache
 from knowledge.logging import get_logger
-from knowledge.metrics import PROMETHEUS_AVAILABLE
+from knowledge.metrics import PROMETHEUS_AVAILABLE, update_cache_metrics
 
 logger = get_logger(__name__)
 
@@ -29,6 +30,7 @@ async def prometheus_metrics() -> Response:
     - Content counts
     - Circuit breaker states
     - Rate limiting events
+    - Cache hit rates and search cache generations
     """
     if not PROMETHEUS_AVAILABLE:
         return PlainTextResponse(
@@ -40,6 +42,9 @@ async def prometheus_metrics() -> Response:
     try:
         from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+        cache = await get_cache()
+        update_cache_metrics(cache.is_connected, cache.get_stats(), await cache.get_generations())
+
         return Response(
             content=generate_latest(),
             media_type=CONTENT_TYPE_LATEST,
@@ -2,13 +2,17 @@
 
 Provides search functionality with:
 - Hybrid search (BM25 + vector)
-- AI-powered Q&A with citations
+- AI-powered Q&A with citations (optionally streamed as SSE)
 - Search result summarization
 """
 
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from knowledge.api.auth import require_scope
 from knowledge.api.schemas import (
@@ -23,8 +27,8 @@ from knowledge.api.schemas import (
 )
 from knowledge.api.utils import handle_exceptions
 from knowledge.multihop import search_with_routing
+from knowledge.qa import AskEvent, ask_stream, search_and_summarize
 from knowledge.qa import ask as qa_ask
-from knowledge.qa import search_and_summarize
 from knowledge.query_router import analyze_query
 from knowledge.reranker import rerank_results
 from knowledge.search import (
@@ -164,13 +168,24 @@ async def search(request: SearchRequest) -> SearchResponse:
 
 @router.post("/ask", response_model=AskResponse, dependencies=[Depends(require_scope("read"))])
 @handle_exceptions("ask")
-async def ask(request: AskRequest) -> AskResponse:
+async def ask(request: AskRequest) -> AskResponse | StreamingResponse:
     """
     Ask a question and get an AI-generated answer with citations.
 
     Uses hybrid search, reranking, and LLM generation to provide
     answers based on your knowledge base.
+
+    With `stream=True` the answer is returned as server-sent events:
+    `context` (confidence and citations), `token` (answer text as it is
+    generated) and a final `done` (full answer, warning, error).
     """
+    if request.stream:
+        return StreamingResponse(
+            _sse_events(ask_stream(request.query, limit=request.limit)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     result = await qa_ask(request.query, limit=request.limit)
 
     return AskResponse(
@@ -189,9 +204,16 @@ async def ask(request: AskRequest) -> AskResponse:
         ],
         warning=result.warning,
         error=result.error,
+        cached=result.cached,
     )
 
 
+async def _sse_events(events: AsyncIterator[AskEvent]) -> AsyncIterator[str]:
+    """Format ask events as server-sent events."""
+    async for event in events:
+        yield f"event: {event.event}\ndata: {json.dumps(event.data)}\n\n"
+
+
 @router.post("/summarize", response_model=AskResponse, dependencies=[Depends(require_scope("read"))])
 @handle_exceptions("summarize")
 async def summarize(request: AskRequest) -> AskResponse:
@@ -11,8 +11,18 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from knowledge.cache import get_cache
 from knowledge.config import get_settings
 from knowledge.logging import get_logger
+from knowledge.tuning import (  # noqa: F401 - helpers re-exported for existing callers
+    _runtime_config,
+    get_effective_bm25_weight,
+    get_effective_rrf_k,
+    get_effective_vector_weight,
+    is_query_expansion_enabled,
+)
+from knowledge.tuning import get_runtime_value as _get_runtime_value
+from knowledge.tuning import set_runtime_value as _set_runtime_value
 
 logger = get_logger(__name__)
 
@@ -72,22 +82,13 @@ class CacheTTLUpdate(BaseModel):
     rerank_ttl: int | None = Field(default=None, ge=0, le=86400)
 
 
-# =============================================================================
-# Runtime Configuration Store
-# =============================================================================
-
-# Runtime-adjustable settings (not persisted to file)
-_runtime_config: dict = {}
-
+class CacheGenerations(BaseModel):
+    """Search cache generation counters and hit rates."""
 
-def _get_runtime_value(key: str, default: Any) -> Any:
-    """Get runtime config value, falling back to settings."""
-    return _runtime_config.get(key, default)
-
-
-def _set_runtime_value(key: str, value: Any) -> None:
-    """Set runtime config value."""
-    _runtime_config[key] = value
+    generations: dict[str, int] = Field(
+        description="Generation per namespace ('*' versions searches over all namespaces or a prefix)"
+    )
+    stats: dict[str, dict[str, Any]] = Field(description="Hit/miss statistics per cache type")
 
 
 # =============================================================================
@@ -228,6 +229,22 @@ async def update_cache_ttl(update: CacheTTLUpdate) -> CacheTTL:
     return await get_cache_ttl()
 
 
+@router.get("/cache/generations", response_model=CacheGenerations)
+async def get_cache_generations() -> CacheGenerations:
+    """
+    Get search cache generations and hit rates.
+
+    Search cache keys embed their namespace's generation, which is bumped
+    whenever content in the namespace is inserted, deleted or retagged.
+    Older entries are never read again, so search TTLs can be long.
+    """
+    cache = await get_cache()
+    return CacheGenerations(
+        generations=await cache.get_generations(),
+        stats=cache.get_stats(),
+    )
+
+
 # =============================================================================
 # Full Configuration Endpoint
 # =============================================================================
@@ -252,31 +269,3 @@ async def get_all_tuning() -> FullTuningConfig:
         cache=await get_cache_ttl(),
     )
 
-
-# =============================================================================
-# Helper Functions for Search Module
-# =============================================================================
-
-
-def get_effective_bm25_weight() -> float:
-    """Get the effective BM25 weight (runtime or default)."""
-    settings = get_settings()
-    return _get_runtime_value("search_bm25_weight", settings.search_bm25_weight)
-
-
-def get_effective_vector_weight() -> float:
-    """Get the effective vector weight (runtime or default)."""
-    settings = get_settings()
-    return _get_runtime_value("search_vector_weight", settings.search_vector_weight)
-
-
-def get_effective_rrf_k() -> int:
-    """Get the effective RRF constant (runtime or default)."""
-    settings = get_settings()
-    return _get_runtime_value("rrf_k", settings.rrf_k)
-
-
-def is_query_expansion_enabled() -> bool:
-    """Check if query expansion is enabled (runtime or default)."""
-    settings = get_settings()
-    return _get_runtime_value("search_enable_query_expansion", settings.search_enable_query_expansion)
@@ -114,6 +114,10 @@ class AskRequest(BaseModel):
         description="Question to answer (max 2000 characters)"
     )
     limit: int = Field(10, ge=1, le=50, description="Search results to consider")
+    stream: bool = Field(
+        False,
+        description="Stream the answer as server-sent events (context, token, done)",
+    )
 
 
 class CitationItem(BaseModel):
@@ -135,6 +139,7 @@ class AskResponse(BaseModel):
     citations: list[CitationItem]
     warning: str | None = None
     error: str | None = None
+    cached: bool = False  # Answer reused from the answer cache
 
 
 # =============================================================================
@@ -3,17 +3,24 @@ Redis caching layer for KAS.
 
 Provides caching for:
 - Search results (short TTL)
-- Embedding vectors (long TTL)
+- Embedding vectors (long TTL, packed float32, in-process LRU tier)
 - Reranking results (medium TTL)
+- Generated answers (tagged by content id for targeted invalidation)
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 
 import redis.asyncio as redis
 from redis.asyncio.connection import ConnectionPool
@@ -21,11 +28,15 @@ from redis.asyncio.connection import ConnectionPool
 from knowledge.config import get_settings
 from knowledge.logging import get_logger
 from knowledge.security import sanitize_url
+from knowledge.tuning import get_runtime_value
 
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+# Generation counter bumped by every namespace (keys searches over all or a prefix)
+ALL_NAMESPACES = "*"
+
 
 class CacheType(Enum):
     """Cache types with different TTLs."""
@@ -33,6 +44,8 @@ class CacheType(Enum):
     EMBEDDING = "embedding"
     RERANK = "rerank"
     QUERY_EXPANSION = "expansion"
+    ANSWER = "answer"
+    DECOMPOSITION = "decomposition"
 
 
 @dataclass
@@ -48,6 +61,105 @@ class CacheStats:
         return self.hits / total if total > 0 else 0.0
 
 
+def pack_vector(vector: list[float] | array) -> bytes:  # type: ignore[type-arg]
+    """Pack a vector as little-endian float32 bytes (4 bytes per dimension)."""
+    packed = vector if isinstance(vector, array) else array("f", vector)
+    if sys.byteorder != "little":
+        packed = array("f", packed)
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_vector(data: bytes) -> array:  # type: ignore[type-arg]
+    """Unpack little-endian float32 bytes produced by pack_vector."""
+    vector = array("f")
+    vector.frombytes(data)
+    if sys.byteorder != "little":
+        vector.byteswap()
+    return vector
+
+
+class LRUCache:
+    """
+    Size-bounded in-process LRU cache.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._data: OrderedDict[str, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        """Get a value and mark it as most recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a value, evicting the least recently used entries if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task and get its result or
+    exception. Nothing is retained once the task finishes, so this only
+    deduplicates overlapping work and never serves stale results.
+
+    A cancelled caller does not cancel the shared task. Results are shared
+    objects and must not be mutated by callers.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the call already in flight."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            logger.debug("single_flight_coalesced", flight=self.name)
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
 class RedisCache:
     """
     Async Redis cache with support for different cache types.
@@ -57,15 +169,22 @@ class RedisCache:
     - Type-specific TTLs
     - Graceful degradation on Redis failures
     - Cache statistics tracking
+    - Binary vector storage with an in-process LRU tier for embeddings
     """
 
     def __init__(self) -> None:
         self.settings = get_settings()
         self._pool: ConnectionPool | None = None
         self._client: redis.Redis | None = None  # type: ignore[type-arg]
+        self._binary_pool: ConnectionPool | None = None
+        self._binary_client: redis.Redis | None = None  # type: ignore[type-arg]
         self._stats: dict[CacheType, CacheStats] = {
             ct: CacheStats() for ct in CacheType
         }
+        self._local: dict[CacheType, LRUCache] = {
+            CacheType.EMBEDDING: LRUCache(self.settings.cache_max_size),
+            CacheType.RERANK: LRUCache(self.settings.cache_max_size),
+        }
         self._connected = False
 
     async def connect(self) -> bool:
@@ -82,6 +201,13 @@ class RedisCache:
             )
             self._client = redis.Redis(connection_pool=self._pool)
 
+            # Vectors are stored as raw bytes, so they need a non-decoding client
+            self._binary_pool = ConnectionPool.from_url(
+                self.settings.redis_url,
+                max_connections=20,
+            )
+            self._binary_client = redis.Redis(connection_pool=self._binary_pool)
+
             # Test connection
             await self._client.ping()  # type: ignore[misc]
             self._connected = True
@@ -102,6 +228,10 @@ class RedisCache:
             await self._client.close()
         if self._pool:
             await self._pool.disconnect()
+        if self._binary_client:
+            await self._binary_client.close()
+        if self._binary_pool:
+            await self._binary_pool.disconnect()
         self._connected = False
         logger.info("redis_disconnected")
 
@@ -111,12 +241,14 @@ class RedisCache:
         return self._connected
 
     def _get_ttl(self, cache_type: CacheType) -> int:
-        """Get TTL for cache type."""
+        """Get TTL for cache type (runtime overrides from the tuning API win)."""
         ttl_map = {
-            CacheType.SEARCH: self.settings.cache_ttl_search,
-            CacheType.EMBEDDING: self.settings.cache_ttl_embedding,
-            CacheType.RERANK: self.settings.cache_ttl_rerank,
+            CacheType.SEARCH: get_runtime_value("cache_ttl_search", self.settings.cache_ttl_search),
+            CacheType.EMBEDDING: get_runtime_value("cache_ttl_embedding", self.settings.cache_ttl_embedding),
+            CacheType.RERANK: get_runtime_value("cache_ttl_rerank", self.settings.cache_ttl_rerank),
             CacheType.QUERY_EXPANSION: 3600,  # 1 hour for expansions
+            CacheType.ANSWER: self.settings.cache_ttl_answer,
+            CacheType.DECOMPOSITION: self.settings.cache_ttl_decomposition,
         }
         return ttl_map.get(cache_type, 300)
 
@@ -194,6 +326,371 @@ class RedisCache:
             logger.warning("cache_set_error", error=str(e), key=key)
             return False
 
+    def _generation_key(self, namespace: str) -> str:
+        """Key of a namespace's generation counter."""
+        return f"kas:gen:{namespace}"
+
+    async def get_generation(self, namespace: str | None) -> int | None:
+        """
+        Get the current generation for versioning cache keys of a namespace.
+
+        Exact namespaces have their own counter. Searches over all namespaces
+        or a prefix (``foo*``) use the ALL_NAMESPACES counter, which every
+        change bumps. A missing counter is seeded from the clock (ms), so a
+        Redis restart or eviction never hands out a generation that live
+        entries were already written under.
+
+        Args:
+            namespace: Namespace filter as passed to search
+
+        Returns:
+            Generation, or None if Redis is unavailable (skip caching)
+        """
+        if not self._connected or self._client is None:
+            return None
+
+        if namespace is None or namespace.endswith("*"):
+            namespace = ALL_NAMESPACES
+        key = self._generation_key(namespace)
+
+        try:
+            value = await self._client.get(key)
+            if value is None:
+                await self._client.set(key, time.time_ns() // 1_000_000, nx=True)
+                value = await self._client.get(key)
+            return int(value) if value is not None else None
+        except Exception as e:
+            logger.warning("cache_generation_error", error=str(e), namespace=namespace)
+            return None
+
+    async def bump_generations(self, namespaces: list[str]) -> bool:
+        """
+        Advance the generation of each namespace (and of ALL_NAMESPACES).
+
+        Entries keyed on an older generation are never read again and
+        age out with their TTL.
+
+        Args:
+            namespaces: Namespaces whose content changed
+
+        Returns:
+            True if the counters were bumped
+        """
+        if not self._connected or self._client is None:
+            return False
+
+        seed = time.time_ns() // 1_000_000
+        keys = [self._generation_key(ns) for ns in dict.fromkeys([*namespaces, ALL_NAMESPACES])]
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, seed, nx=True)
+                pipe.incr(key)
+            await pipe.execute()
+            logger.debug("cache_generations_bumped", namespaces=namespaces)
+            return True
+        except Exception as e:
+            logger.warning("cache_generation_error", error=str(e), namespaces=namespaces)
+            return False
+
+    async def get_generations(self) -> dict[str, int]:
+        """Get every namespace generation counter (ALL_NAMESPACES included)."""
+        if not self._connected or self._client is None:
+            return {}
+
+        prefix = self._generation_key("")
+        try:
+            keys = [key async for key in self._client.scan_iter(match=f"{prefix}*", count=100)]
+            if not keys:
+                return {}
+            values = await self._client.mget(keys)
+        except Exception as e:
+            logger.warning("cache_generation_error", error=str(e))
+            return {}
+        return {
+            key[len(prefix):]: int(value)
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    def _tag_key(self, cache_type: CacheType, tag: str) -> str:
+        """Key of the set holding every entry key carrying a tag."""
+        return f"kas:{cache_type.value}:tag:{tag}"
+
+    async def set_tagged(
+        self,
+        cache_type: CacheType,
+        value: Any,
+        tags: list[str],
+        *args: Any,
+    ) -> bool:
+        """
+        Set a value and record its key under each tag.
+
+        Tagged entries can be dropped before their TTL with invalidate_tags().
+        Tag sets expire along with the newest entry they point at.
+
+        Args:
+            cache_type: Type of cache
+            value: Value to cache (must be JSON serializable)
+            tags: Tags to file the entry under (e.g. content ids)
+            *args: Arguments that form the cache key
+
+        Returns:
+            True if successful
+        """
+        if not self._connected or self._client is None:
+            return False
+
+        key = self._make_key(cache_type, *args)
+        ttl = self._get_ttl(cache_type)
+
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.setex(key, ttl, json.dumps(value, default=str))
+            for tag in tags:
+                tag_key = self._tag_key(cache_type, tag)
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, ttl)
+            await pipe.execute()
+            return True
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_set_error", error=str(e), key=key)
+            return False
+
+    async def invalidate_tags(self, cache_type: CacheType, tags: list[str]) -> int:
+        """
+        Delete every entry filed under any of the tags.
+
+        Args:
+            cache_type: Type of cache
+            tags: Tags whose entries should be dropped
+
+        Returns:
+            Number of entries deleted
+        """
+        if not tags or not self._connected or self._client is None:
+            return 0
+
+        tag_keys = [self._tag_key(cache_type, tag) for tag in tags]
+        try:
+            keys = await self._client.sunion(tag_keys)
+            if not keys:
+                return 0
+            pipe = self._client.pipeline(transaction=False)
+            pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            deleted, _ = await pipe.execute()
+            logger.debug("cache_invalidated", cache_type=cache_type.value, tags=len(tags), deleted=deleted)
+            return int(deleted)
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_invalidate_error", error=str(e), tags=len(tags))
+            return 0
+
+    def vector_key(self, cache_type: CacheType, *args: Any) -> str:
+        """Generate a key for a packed vector entry.
+
+        Kept separate from JSON entries so old list-encoded values are never
+        misread as float32 bytes.
+        """
+        key_data = json.dumps(args, sort_keys=True, default=str)
+        key_hash = hashlib.sha256(key_data.encode()).hexdigest()[:16]
+        return f"kas:{cache_type.value}:f32:{key_hash}"
+
+    async def get_vectors(
+        self,
+        cache_type: CacheType,
+        keys: list[str],
+    ) -> list[list[float] | None]:
+        """
+        Get many vectors at once.
+
+        Checks the in-process LRU first, then fetches the remaining keys from
+        Redis with a single MGET. Redis hits are promoted into the LRU.
+
+        Args:
+            cache_type: Type of cache
+            keys: Keys from vector_key()
+
+        Returns:
+            Vectors in key order, None for misses
+        """
+        results: list[list[float] | None] = [None] * len(keys)
+        local = self._local.get(cache_type)
+        remaining: list[int] = []
+
+        for i, key in enumerate(keys):
+            vector = local.get(key) if local is not None else None
+            if vector is not None:
+                results[i] = vector.tolist()
+            else:
+                remaining.append(i)
+
+        if not remaining or not self._connected or self._binary_client is None:
+            return results
+
+        try:
+            # The binary client is created without decode_responses
+            values = cast(
+                "list[bytes | None]",
+                await self._binary_client.mget([keys[i] for i in remaining]),
+            )
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_mget_error", error=str(e), count=len(remaining))
+            return results
+
+        stats = self._stats[cache_type]
+        for i, value in zip(remaining, values, strict=True):
+            if value is None:
+                stats.misses += 1
+                continue
+            stats.hits += 1
+            vector = unpack_vector(value)
+            if local is not None:
+                local.set(keys[i], vector)
+            results[i] = vector.tolist()
+
+        return results
+
+    async def set_vectors(
+        self,
+        cache_type: CacheType,
+        items: dict[str, list[float]],
+    ) -> bool:
+        """
+        Set many vectors at once as packed float32 bytes.
+
+        Writes go to the in-process LRU and to Redis in one pipelined round trip.
+
+        Args:
+            cache_type: Type of cache
+            items: Mapping of vector_key() to vector
+
+        Returns:
+            True if written to Redis
+        """
+        if not items:
+            return True
+
+        local = self._local.get(cache_type)
+        packed: dict[str, array] = {}  # type: ignore[type-arg]
+        for key, vector in items.items():
+            packed[key] = array("f", vector)
+            if local is not None:
+                local.set(key, packed[key])
+
+        if not self._connected or self._binary_client is None:
+            return False
+
+        ttl = self._get_ttl(cache_type)
+
+        try:
+            pipe = self._binary_client.pipeline(transaction=False)
+            for key, floats in packed.items():
+                pipe.setex(key, ttl, pack_vector(floats))
+            await pipe.execute()
+            logger.debug("cache_set_many", cache_type=cache_type.value, count=len(items), ttl=ttl)
+            return True
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_set_many_error", error=str(e), count=len(items))
+            return False
+
+    async def get_many(
+        self,
+        cache_type: CacheType,
+        arg_sets: list[tuple[Any, ...]],
+    ) -> list[Any | None]:
+        """
+        Get many JSON values at once.
+
+        Like get() for each argument tuple, but served from the in-process LRU
+        where the cache type has one and otherwise fetched with a single MGET.
+
+        Args:
+            cache_type: Type of cache
+            arg_sets: One tuple of key arguments per entry
+
+        Returns:
+            Values in order, None for misses
+        """
+        keys = [self._make_key(cache_type, *args) for args in arg_sets]
+        results: list[Any | None] = [None] * len(keys)
+        local = self._local.get(cache_type)
+        remaining: list[int] = []
+
+        for i, key in enumerate(keys):
+            value = local.get(key) if local is not None else None
+            if value is not None:
+                results[i] = value
+            else:
+                remaining.append(i)
+
+        if not remaining or not self._connected or self._client is None:
+            return results
+
+        try:
+            values = await self._client.mget([keys[i] for i in remaining])
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_mget_error", error=str(e), count=len(remaining))
+            return results
+
+        stats = self._stats[cache_type]
+        for i, value in zip(remaining, values, strict=True):
+            if value is None:
+                stats.misses += 1
+                continue
+            stats.hits += 1
+            results[i] = json.loads(value)
+            if local is not None:
+                local.set(keys[i], results[i])
+
+        return results
+
+    async def set_many(
+        self,
+        cache_type: CacheType,
+        items: list[tuple[tuple[Any, ...], Any]],
+    ) -> bool:
+        """
+        Set many JSON values in one pipelined round trip.
+
+        Args:
+            cache_type: Type of cache
+            items: (key arguments, value) pairs
+
+        Returns:
+            True if written to Redis
+        """
+        if not items:
+            return True
+
+        local = self._local.get(cache_type)
+        entries = {self._make_key(cache_type, *args): value for args, value in items}
+        if local is not None:
+            for key, value in entries.items():
+                local.set(key, value)
+
+        if not self._connected or self._client is None:
+            return False
+
+        ttl = self._get_ttl(cache_type)
+
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in entries.items():
+                pipe.setex(key, ttl, json.dumps(value, default=str))
+            await pipe.execute()
+            return True
+        except Exception as e:
+            self._stats[cache_type].errors += 1
+            logger.warning("cache_set_many_error", error=str(e), count=len(items))
+            return False
+
     async def delete(self, cache_type: CacheType, *args: Any) -> bool:
         """Delete a specific cache entry."""
         if not self._connected or self._client is None:
@@ -218,6 +715,10 @@ class RedisCache:
         Returns:
             Number of keys deleted
         """
+        for ct, local in self._local.items():
+            if cache_type is None or ct == cache_type:
+                local.clear()
+
         if not self._connected or self._client is None:
             return 0
 
@@ -242,7 +743,7 @@ class RedisCache:
 
     def get_stats(self) -> dict[str, dict[str, Any]]:
         """Get cache statistics."""
-        return {
+        stats_by_type: dict[str, dict[str, Any]] = {
             ct.value: {
                 "hits": stats.hits,
                 "misses": stats.misses,
@@ -251,6 +752,14 @@ class RedisCache:
             }
             for ct, stats in self._stats.items()
         }
+        for ct, local in self._local.items():
+            stats_by_type[ct.value].update({
+                "local_hits": local.stats.hits,
+                "local_misses": local.stats.misses,
+                "local_size": len(local),
+                "local_hit_rate": f"{local.stats.hit_rate:.2%}",
+            })
+        return stats_by_type
 
     async def get_info(self) -> dict[str, Any] | None:
         """Get Redis server info."""
@@ -74,7 +74,9 @@ class Settings(BaseSettings):
     rerank_model: str = "mxbai-rerank-base-v1"
     ollama_timeout: float = 30.0
     embedding_max_concurrent: int = 5  # Max concurrent embedding requests
-    embedding_batch_size: int = 10  # Batch size for embedding generation
+    embedding_batch_size: int = 64  # Max texts per embedding request
+    embedding_batch_max_tokens: int = 8192  # Approximate token budget per request
+    embedding_native_batch: bool = True  # Use Ollama /api/embed multi-input requests
     embedding_max_retries: int = 3  # Retry attempts for embedding failures
 
     # =========================================================================
@@ -100,6 +102,13 @@ class Settings(BaseSettings):
     search_max_limit: int = 100  # Maximum allowed search limit
     bm25_candidates: int = 50  # BM25 candidate pool size
     vector_candidates: int = 50  # Vector search candidate pool size
+    multihop_max_concurrency: int = 3  # Sub-query searches run at once in multi-hop search
+
+    # In-process ANN index over chunk embeddings
+    vector_index_enabled: bool = False
+    vector_index_path: str = "~/.kas/vector_index"  # Memory-mapped snapshot directory
+    vector_index_nprobe: int = 16  # Inverted lists scanned per query
+    vector_index_refresh_interval: float = 60.0  # Seconds between catch-up syncs
 
     # Confidence thresholds
     confidence_low: float = 0.3
@@ -118,11 +127,27 @@ class Settings(BaseSettings):
     # =========================================================================
     ingest_batch_size: int = 50  # Batch size for bulk ingestion
     ingest_timeout: float = 120.0  # Timeout for ingestion operations
+    # Directory ingest pipeline (knowledge.ingest.pipeline)
+    ingest_parse_workers: int = 4  # Processes for parsing/chunking (0 = threads in-process)
+    ingest_embed_workers: int = 2  # Concurrent cross-document embedding batches
+    ingest_store_workers: int = 4  # Concurrent database writers
+    ingest_queue_size: int = 32  # Max documents buffered between stages
+    ingest_embed_batch_chunks: int = 256  # Chunks gathered per embedding batch
+    ingest_progress_dir: str = "~/.kas/ingest_progress"  # Resumable progress files
+    # Backup import (POST /api/v1/export/import)
+    import_batch_size: int = 100  # Items per import transaction
+    import_max_upload_mb: int = 0  # Upload size cap in MB (0 = unlimited)
     url_fetch_timeout: float = 30.0  # Timeout for URL fetching
     max_content_size: int = 10 * 1024 * 1024  # 10MB max content size
     max_chunk_text_size: int = 10000  # Max characters per chunk
     max_tags_count: int = 50  # Maximum number of tags per content
 
+    # =========================================================================
+    # Knowledge Graph
+    # =========================================================================
+    entity_extraction_concurrency: int = 4  # Concurrent LLM extractions during backfill
+    entity_extraction_write_batch: int = 20  # Items stored per backfill transaction
+
     # =========================================================================
     # Review / FSRS
     # =========================================================================
@@ -139,6 +164,10 @@ class Settings(BaseSettings):
     api_key: str = ""  # Optional API key for external access
     api_key_header: str = "X-API-Key"
     require_api_key: bool = False  # Set to True for production
+    api_key_cache_ttl: float = 60.0  # Seconds a verified key skips Argon2 (0 = disabled)
+    api_key_cache_size: int = 1024  # Max verified keys held in memory
+    api_key_reject_ttl: float = 5.0  # Seconds a rejected key is refused without a lookup (0 = disabled)
+    api_key_last_used_flush_interval: float = 30.0  # Seconds between batched last_used_at writes
 
     # =========================================================================
     # Rate Limiting (P18)
@@ -182,10 +211,14 @@ class Settings(BaseSettings):
     # =========================================================================
     redis_url: str = "redis://localhost:6379/0"
     redis_enabled: bool = True
-    cache_ttl_search: int = 300  # 5 minutes for search results
+    cache_ttl_search: int = 3600  # 1 hour; keys are versioned by namespace generation
     cache_ttl_embedding: int = 86400  # 24 hours for embeddings
     cache_ttl_rerank: int = 600  # 10 minutes for rerank results
+    cache_ttl_answer: int = 3600  # 1 hour for answers (dropped early on re-ingest/delete)
+    cache_ttl_decomposition: int = 86400  # 24 hours for multi-hop query decompositions
     cache_max_size: int = 10000  # Max cached items per type
+    answer_cache_enabled: bool = True  # Reuse answers for the same question and context
+    answer_cache_similarity: float = 0.0  # Near-duplicate query match threshold (0 = exact only)
 
     # =========================================================================
     # Search Tuning
@@ -194,6 +227,14 @@ class Settings(BaseSettings):
     search_vector_weight: float = 0.5  # Weight for vector in hybrid search
     search_enable_query_expansion: bool = True  # Enable synonym expansion
 
+    # =========================================================================
+    # Reranking
+    # =========================================================================
+    rerank_batch_max_wait_ms: float = 5.0  # How long to gather pairs across requests
+    rerank_batch_max_pairs: int = 128  # Score immediately once this many pairs are queued
+    rerank_backend: str = "torch"  # torch (sentence-transformers) or onnx (int8 ONNX Runtime)
+    rerank_onnx_dir: str = "~/.cache/kas/rerank-onnx"  # Exported quantized graphs
+
     # =========================================================================
     # Validation
     # =========================================================================
@@ -250,12 +291,58 @@ class Settings(BaseSettings):
             errors.append("search_default_limit cannot exceed search_max_limit")
         if self.search_default_limit < 1:
             errors.append("search_default_limit must be at least 1")
+        if self.multihop_max_concurrency < 1:
+            errors.append("multihop_max_concurrency must be at least 1")
 
         # --- Retry validation ---
         if self.db_retry_attempts < 1:
             errors.append("db_retry_attempts must be at least 1")
         if self.embedding_max_retries < 1:
             errors.append("embedding_max_retries must be at least 1")
+        if self.embedding_batch_size < 1:
+            errors.append("embedding_batch_size must be at least 1")
+        if self.embedding_batch_max_tokens < 1:
+            errors.append("embedding_batch_max_tokens must be at least 1")
+
+        # --- Ingest pipeline validation ---
+        if self.ingest_parse_workers < 0:
+            errors.append("ingest_parse_workers cannot be negative")
+        for name in ("ingest_embed_workers", "ingest_store_workers", "ingest_queue_size", "ingest_embed_batch_chunks"):
+            if getattr(self, name) < 1:
+                errors.append(f"{name} must be at least 1")
+
+        # --- Knowledge graph validation ---
+        for name in ("entity_extraction_concurrency", "entity_extraction_write_batch"):
+            if getattr(self, name) < 1:
+                errors.append(f"{name} must be at least 1")
+
+        # --- Import validation ---
+        if self.import_batch_size < 1:
+            errors.append("import_batch_size must be at least 1")
+        if self.import_max_upload_mb < 0:
+            errors.append("import_max_upload_mb cannot be negative")
+
+        # --- Reranker batching validation ---
+        if self.rerank_batch_max_wait_ms < 0:
+            errors.append("rerank_batch_max_wait_ms cannot be negative")
+        if self.rerank_batch_max_pairs < 1:
+            errors.append("rerank_batch_max_pairs must be at least 1")
+        if self.rerank_backend not in ("torch", "onnx"):
+            errors.append(f"rerank_backend must be 'torch' or 'onnx', got: {self.rerank_backend}")
+
+        # --- Answer cache validation ---
+        if not (0 <= self.answer_cache_similarity <= 1):
+            errors.append("answer_cache_similarity must be between 0 and 1")
+
+        # --- API key validation ---
+        if self.api_key_cache_ttl < 0:
+            errors.append("api_key_cache_ttl cannot be negative")
+        if self.api_key_cache_size < 1:
+            errors.append("api_key_cache_size must be at least 1")
+        if self.api_key_reject_ttl < 0:
+            errors.append("api_key_reject_ttl cannot be negative")
+        if self.api_key_last_used_flush_interval <= 0:
+            errors.append("api_key_last_used_flush_interval must be positive")
 
         # --- Rate limit validation ---
         if self.rate_limit_burst < self.rate_limit_requests:
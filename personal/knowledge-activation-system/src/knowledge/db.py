@@ -5,16 +5,17 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, TypeVar
-from uuid import UUID
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import UUID, uuid4
 
 import asyncpg
 from pgvector.asyncpg import register_vector
 
+from knowledge.cache import CacheType, get_cache
 from knowledge.config import Settings, get_settings
 from knowledge.exceptions import (
     ConnectionError,
@@ -25,10 +26,45 @@ from knowledge.exceptions import (
 )
 from knowledge.logging import get_logger
 
+if TYPE_CHECKING:
+    from knowledge.vector_index import VectorIndex
+
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
+# Column order for binary COPY into chunks (fts_vector is generated)
+CHUNK_COPY_COLUMNS = [
+    "content_id",
+    "chunk_index",
+    "chunk_text",
+    "embedding",
+    "embedding_model",
+    "embedding_version",
+    "source_ref",
+    "start_char",
+    "end_char",
+]
+
+BULK_LOAD_MODES = ("insert", "upsert", "replace")
+
+# Entity extraction text of content row ``c`` (title excluded): its first
+# five chunks joined by spaces, as sent to the LLM for extraction
+ENTITY_TEXT_JOIN = """
+    LEFT JOIN LATERAL (
+        SELECT string_agg(chunk_text, ' ' ORDER BY chunk_index) AS text
+        FROM (
+            SELECT chunk_text, chunk_index FROM chunks
+            WHERE content_id = c.id
+            ORDER BY chunk_index
+            LIMIT 5
+        ) first_chunks
+    ) t ON TRUE
+"""
+ENTITY_TEXT_HASH = "md5(c.title || E'\\n' || COALESCE(t.text, ''))"
+
+ENTITY_COPY_COLUMNS = ["id", "content_id", "name", "entity_type", "confidence", "canonical_entity_id"]
+
 
 @dataclass
 class ContentRecord:
@@ -112,6 +148,16 @@ def _build_namespace_filter(
         return f"AND COALESCE(c.metadata->>'namespace', 'default') = ${param_num}", [namespace]
 
 
+@dataclass
+class PendingChanges:
+    """Changes made inside an open transaction(), applied once it commits."""
+
+    namespaces: set[str] = field(default_factory=set)
+    content_ids: set[UUID] = field(default_factory=set)
+    # (mode, content_id, chunk_ids, vectors) for the in-process vector index
+    index_updates: list[tuple[str, UUID, list[UUID], list[Any]]] = field(default_factory=list)
+
+
 class Database:
     """Async database connection pool manager with retry logic and health monitoring."""
 
@@ -120,6 +166,11 @@ class Database:
         self._pool: asyncpg.Pool | None = None
         self._connection_attempts: int = 0
         self._last_health_check: datetime | None = None
+        # Optional in-process ANN index (attached by knowledge.vector_index)
+        self.vector_index: VectorIndex | None = None
+        # Cache invalidations and vector index updates made inside each open
+        # transaction(), applied once it commits
+        self._pending_changes: dict[asyncpg.Connection, PendingChanges] = {}
 
     async def connect(self) -> None:
         """Create connection pool with configured settings."""
@@ -251,14 +302,25 @@ class Database:
 
     @asynccontextmanager
     async def transaction(self) -> AsyncGenerator[asyncpg.Connection, None]:
-        """Acquire a connection with an active transaction."""
+        """Acquire a connection with an active transaction.
+
+        Cache invalidation and vector index updates for content changed inside
+        the transaction (see bulk_load_chunks) run after it commits, so
+        concurrent searches never see or cache pre-commit rows, and a rollback
+        leaves the index untouched.
+        """
         if self._pool is None:
             raise DatabaseError("Database not connected. Call connect() first.")
 
+        changes = PendingChanges()
         try:
             async with self._pool.acquire(timeout=self.settings.db_pool_timeout) as conn:
-                async with conn.transaction():
-                    yield conn
+                self._pending_changes[conn] = changes
+                try:
+                    async with conn.transaction():
+                        yield conn
+                finally:
+                    del self._pending_changes[conn]
         except TimeoutError as e:
             raise ConnectionPoolExhaustedError(
                 "Timeout waiting for connection",
@@ -270,6 +332,56 @@ class Database:
                 cause=e,
             ) from e
 
+        self._apply_index_updates(changes.index_updates)
+        if changes.namespaces or changes.content_ids:
+            await self._content_changed(sorted(changes.namespaces), list(changes.content_ids))
+
+    @asynccontextmanager
+    async def savepoint(self, conn: asyncpg.Connection) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Run a block as a savepoint of the caller's open transaction.
+
+        Vector index updates queued inside the block are dropped if it rolls
+        back, so only committed chunks ever reach the index.
+        """
+        pending = self._pending_changes.get(conn)
+        mark = len(pending.index_updates) if pending is not None else 0
+        try:
+            async with conn.transaction():
+                yield conn
+        except BaseException:
+            if pending is not None:
+                del pending.index_updates[mark:]
+            raise
+
+    @asynccontextmanager
+    async def _bulk_transaction(
+        self, conn: asyncpg.Connection | None
+    ) -> AsyncGenerator[asyncpg.Connection, None]:
+        """Use the caller's connection (nested transaction) or a fresh pooled one."""
+        if conn is None:
+            async with self.transaction() as pooled:
+                yield pooled
+            return
+
+        async with self.savepoint(conn):
+            yield conn
+
+    async def iterate(
+        self,
+        query: str,
+        *args: Any,
+        prefetch: int = 500,
+    ) -> AsyncGenerator[asyncpg.Record, None]:
+        """
+        Stream rows through a server-side cursor.
+
+        Only ``prefetch`` rows are held client-side at a time, so large
+        result sets (exports, backfills) run in bounded memory.
+        """
+        async with self.transaction() as conn:
+            async for row in conn.cursor(query, *args, prefetch=prefetch):
+                yield row
+
     async def check_health(self) -> dict[str, Any]:
         """Check database health and return comprehensive status."""
         try:
@@ -392,13 +504,14 @@ class Database:
                     fsrs_state,
                 )
 
-            logger.info(
-                "content_inserted",
-                content_id=str(content_id),
-                content_type=content_type,
-                title=title,
-            )
-            return content_id
+        await self._content_changed([metadata_dict.get("namespace") or "default"])
+        logger.info(
+            "content_inserted",
+            content_id=str(content_id),
+            content_type=content_type,
+            title=title,
+        )
+        return content_id
 
     async def get_content_by_id(self, content_id: UUID) -> ContentRecord | None:
         """Get content by ID."""
@@ -444,14 +557,21 @@ class Database:
     async def soft_delete_content(self, content_id: UUID) -> bool:
         """Soft delete content by ID."""
         async with self.acquire() as conn:
-            result = await conn.execute(
-                "UPDATE content SET deleted_at = NOW() WHERE id = $1 AND deleted_at IS NULL",
+            namespace = await conn.fetchval(
+                """
+                UPDATE content SET deleted_at = NOW()
+                WHERE id = $1 AND deleted_at IS NULL
+                RETURNING COALESCE(metadata->>'namespace', 'default')
+                """,
                 content_id,
             )
-            deleted = result == "UPDATE 1"
-            if deleted:
-                logger.info("content_deleted", content_id=str(content_id))
-            return deleted
+        deleted = namespace is not None
+        if deleted:
+            if self.vector_index is not None:
+                self.vector_index.remove_content(content_id)
+            await self._content_changed([namespace], [content_id])
+            logger.info("content_deleted", content_id=str(content_id))
+        return deleted
 
     async def update_content_tags(self, content_id: UUID, tags: list[str]) -> bool:
         """Update tags for content.
@@ -464,23 +584,25 @@ class Database:
             True if update succeeded
         """
         async with self.acquire() as conn:
-            result = await conn.execute(
+            namespace = await conn.fetchval(
                 """
                 UPDATE content
                 SET tags = $2, updated_at = NOW()
                 WHERE id = $1 AND deleted_at IS NULL
+                RETURNING COALESCE(metadata->>'namespace', 'default')
                 """,
                 content_id,
                 tags,
             )
-            updated = result == "UPDATE 1"
-            if updated:
-                logger.info(
-                    "content_tags_updated",
-                    content_id=str(content_id),
-                    tag_count=len(tags),
-                )
-            return updated
+        updated = namespace is not None
+        if updated:
+            await self._content_changed([namespace])
+            logger.info(
+                "content_tags_updated",
+                content_id=str(content_id),
+                tag_count=len(tags),
+            )
+        return updated
 
     async def get_content(self, content_id: UUID) -> dict[str, Any] | None:
         """Get content as dictionary (for CLI compatibility).
@@ -538,42 +660,242 @@ class Database:
         chunks: list[dict[str, Any]],
     ) -> list[UUID]:
         """Insert multiple chunks for a content record."""
-        async with self.acquire() as conn:
-            records = [
-                (
-                    content_id,
-                    chunk["chunk_index"],
-                    chunk["chunk_text"],
-                    chunk.get("embedding"),
-                    chunk.get("embedding_model", "nomic-embed-text"),
-                    chunk.get("embedding_version", "v1.5"),
-                    chunk.get("source_ref"),
-                    chunk.get("start_char"),
-                    chunk.get("end_char"),
+        loaded = await self.bulk_load_chunks(
+            [{**chunk, "content_id": content_id} for chunk in chunks],
+        )
+        return loaded.get(content_id, [])
+
+    async def bulk_load_chunks(
+        self,
+        chunks: list[dict[str, Any]],
+        mode: str = "insert",
+        conn: asyncpg.Connection | None = None,
+    ) -> dict[UUID, list[UUID]]:
+        """
+        Load chunks for one or more content items with binary COPY.
+
+        Embeddings go over the wire in pgvector's binary format (the codec is
+        registered on every pool connection), so there is no per-row
+        statement round-trip or text serialization of 768 floats.
+
+        Args:
+            chunks: Chunk dicts, each carrying its ``content_id``
+            mode: ``insert`` copies straight into chunks; ``upsert`` copies
+                into a temporary staging table and merges on
+                (content_id, chunk_index); ``replace`` upserts and then drops
+                any existing chunks of those items that were not loaded
+            conn: Run inside this connection's open transaction (as a
+                savepoint) instead of taking a pooled connection; cache
+                invalidation and vector index updates then wait until that
+                transaction() commits
+
+        Returns:
+            Chunk ids per content id, ordered by chunk_index
+        """
+        if mode not in BULK_LOAD_MODES:
+            raise ValueError(f"Unknown bulk load mode: {mode}")
+        if not chunks:
+            return {}
+
+        records = [
+            (
+                chunk["content_id"],
+                chunk["chunk_index"],
+                chunk["chunk_text"],
+                chunk.get("embedding"),
+                chunk.get("embedding_model", "nomic-embed-text"),
+                chunk.get("embedding_version", "v1.5"),
+                chunk.get("source_ref"),
+                chunk.get("start_char"),
+                chunk.get("end_char"),
+            )
+            for chunk in chunks
+        ]
+        content_ids = list(dict.fromkeys(record[0] for record in records))
+
+        # Changes made in a caller's transaction() are applied when it commits
+        pending = self._pending_changes.get(conn) if conn is not None else None
+
+        async with self._bulk_transaction(conn) as conn:
+            if mode == "insert":
+                await conn.copy_records_to_table("chunks", records=records, columns=CHUNK_COPY_COLUMNS)
+            else:
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE chunk_staging (
+                        content_id UUID, chunk_index INTEGER, chunk_text TEXT,
+                        embedding vector, embedding_model TEXT, embedding_version TEXT,
+                        source_ref TEXT, start_char INTEGER, end_char INTEGER
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "chunk_staging", records=records, columns=CHUNK_COPY_COLUMNS
+                )
+                await conn.execute(
+                    """
+                    INSERT INTO chunks (content_id, chunk_index, chunk_text, embedding,
+                                       embedding_model, embedding_version, source_ref, start_char, end_char)
+                    SELECT content_id, chunk_index, chunk_text, embedding,
+                           embedding_model, embedding_version, source_ref, start_char, end_char
+                    FROM chunk_staging
+                    ON CONFLICT (content_id, chunk_index) DO UPDATE SET
+                        chunk_text = EXCLUDED.chunk_text,
+                        embedding = EXCLUDED.embedding,
+                        embedding_model = EXCLUDED.embedding_model,
+                        embedding_version = EXCLUDED.embedding_version,
+                        source_ref = EXCLUDED.source_ref,
+                        start_char = EXCLUDED.start_char,
+                        end_char = EXCLUDED.end_char
+                    """
+                )
+                if mode == "replace":
+                    await conn.execute(
+                        """
+                        DELETE FROM chunks c
+                        WHERE c.content_id = ANY($1::uuid[])
+                          AND NOT EXISTS (
+                              SELECT 1 FROM chunk_staging s
+                              WHERE s.content_id = c.content_id AND s.chunk_index = c.chunk_index
+                          )
+                        """,
+                        content_ids,
+                    )
+                # ON COMMIT DROP only fires when the outermost transaction ends;
+                # drop now so later loads in the same transaction can recreate it
+                await conn.execute("DROP TABLE chunk_staging")
+                # Bump updated_at so other processes' vector indexes re-read these items
+                await conn.execute(
+                    "UPDATE content SET updated_at = NOW() WHERE id = ANY($1::uuid[])",
+                    content_ids,
                 )
-                for chunk in chunks
-            ]
 
-            await conn.executemany(
+            rows = await conn.fetch(
                 """
-                INSERT INTO chunks (content_id, chunk_index, chunk_text, embedding,
-                                   embedding_model, embedding_version, source_ref, start_char, end_char)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                SELECT ch.id, ch.content_id, ch.chunk_index,
+                       COALESCE(c.metadata->>'namespace', 'default') AS namespace
+                FROM chunks ch
+                JOIN content c ON c.id = ch.content_id
+                WHERE ch.content_id = ANY($1::uuid[])
+                ORDER BY ch.content_id, ch.chunk_index
                 """,
-                records,
+                content_ids,
             )
 
-            rows = await conn.fetch(
-                "SELECT id FROM chunks WHERE content_id = $1 ORDER BY chunk_index",
-                content_id,
+            # Keep the denormalized preview in step with each item's first chunk
+            await conn.execute(
+                """
+                UPDATE content c
+                SET preview_text = f.chunk_text
+                FROM (
+                    SELECT DISTINCT ON (content_id) content_id, chunk_text
+                    FROM chunks
+                    WHERE content_id = ANY($1::uuid[])
+                    ORDER BY content_id, chunk_index
+                ) f
+                WHERE c.id = f.content_id
+                  AND c.preview_text IS DISTINCT FROM f.chunk_text
+                """,
+                content_ids,
             )
-            chunk_ids = [row["id"] for row in rows]
-            logger.debug(
-                "chunks_inserted",
-                content_id=str(content_id),
-                count=len(chunk_ids),
+
+        by_content: dict[UUID, list[asyncpg.Record]] = {content_id: [] for content_id in content_ids}
+        for row in rows:
+            by_content[row["content_id"]].append(row)
+
+        index_updates: list[tuple[str, UUID, list[UUID], list[Any]]] = []
+        if self.vector_index is not None:
+            embeddings = {
+                (record[0], record[1]): record[3] for record in records if record[3] is not None
+            }
+            for content_id, content_rows in by_content.items():
+                keys = [(content_id, row["chunk_index"]) for row in content_rows]
+                chunk_ids = [row["id"] for row, key in zip(content_rows, keys, strict=True) if key in embeddings]
+                vectors = [embeddings[key] for key in keys if key in embeddings]
+                index_updates.append((mode, content_id, chunk_ids, vectors))
+
+        if pending is not None:
+            pending.index_updates.extend(index_updates)
+        else:
+            self._apply_index_updates(index_updates)
+        await self.content_changed_in(conn, list({row["namespace"] for row in rows}), content_ids)
+
+        logger.debug(
+            "chunks_loaded",
+            mode=mode,
+            content_items=len(content_ids),
+            count=len(records),
+        )
+        return {
+            content_id: [row["id"] for row in content_rows]
+            for content_id, content_rows in by_content.items()
+        }
+
+    async def content_changed_in(
+        self, conn: asyncpg.Connection, namespaces: list[str], content_ids: list[UUID]
+    ) -> None:
+        """Invalidate caches for content changed on ``conn``.
+
+        Inside a transaction() the invalidation waits until it commits;
+        otherwise it runs straight away.
+        """
+        pending = self._pending_changes.get(conn)
+        if pending is None:
+            await self._content_changed(namespaces, content_ids)
+            return
+        pending.namespaces.update(namespaces)
+        pending.content_ids.update(content_ids)
+
+    def _apply_index_updates(self, updates: list[tuple[str, UUID, list[UUID], list[Any]]]) -> None:
+        """Apply committed chunk loads to the in-process vector index."""
+        if self.vector_index is None:
+            return
+        for mode, content_id, chunk_ids, vectors in updates:
+            if mode == "insert":
+                self.vector_index.add(chunk_ids, [content_id] * len(chunk_ids), vectors)
+            else:
+                self.vector_index.replace_content(content_id, chunk_ids, vectors)
+
+    async def _content_changed(self, namespaces: list[str], content_ids: list[UUID] | None = None) -> None:
+        """Version out cached searches for the namespaces and drop answers built from the content.
+
+        Args:
+            namespaces: Namespaces whose search results may have changed
+            content_ids: Content whose text changed or was removed (answer cache)
+        """
+        cache = await get_cache()
+        await cache.bump_generations(namespaces)
+        if content_ids:
+            await cache.invalidate_tags(CacheType.ANSWER, [str(content_id) for content_id in content_ids])
+
+    async def refresh_previews(self, content_ids: list[UUID] | None = None) -> int:
+        """
+        Recompute content.preview_text from each item's first chunk.
+
+        Args:
+            content_ids: Limit to these items (default: all content)
+
+        Returns:
+            Number of content rows whose preview changed
+        """
+        id_clause = "WHERE content_id = ANY($1::uuid[])" if content_ids is not None else ""
+        async with self.acquire() as conn:
+            result = await conn.execute(
+                f"""
+                UPDATE content c
+                SET preview_text = f.chunk_text
+                FROM (
+                    SELECT DISTINCT ON (content_id) content_id, chunk_text
+                    FROM chunks
+                    {id_clause}
+                    ORDER BY content_id, chunk_index
+                ) f
+                WHERE c.id = f.content_id
+                  AND c.preview_text IS DISTINCT FROM f.chunk_text
+                """,
+                *([content_ids] if content_ids is not None else []),
             )
-            return chunk_ids
+            return int(result.split()[-1]) if result else 0
 
     async def get_chunks_by_content_id(self, content_id: UUID) -> list[ChunkRecord]:
         """Get all chunks for a content record."""
@@ -600,30 +922,57 @@ class Database:
         limit: int = 50,
         namespace: str | None = None,
     ) -> list[tuple[UUID, str, str, str | None, str | None, float]]:
-        """BM25 full-text search on content with chunk text."""
+        """BM25 full-text search returning the best-matching passage per document.
+
+        Documents match on their own FTS vector (title, summary, tags) or on
+        any chunk's FTS vector. The score is the sum of the document rank and
+        its best chunk rank, and the returned chunk_text is that best chunk
+        (the first chunk if only document metadata matched). Everything is
+        computed in one statement, without per-row subqueries.
+        """
         ns_clause, ns_params = _build_namespace_filter(namespace, 3)
 
         async with self.acquire() as conn:
             rows = await conn.fetch(
                 f"""
-                WITH ranked_content AS (
-                    SELECT c.id, c.title, c.type,
-                           c.metadata->>'namespace' as namespace,
-                           ts_rank_cd(c.fts_vector, query) AS rank
-                    FROM content c, plainto_tsquery('english', $1) query
-                    WHERE c.fts_vector @@ query
+                WITH q AS (
+                    SELECT plainto_tsquery('english', $1) AS query
+                ),
+                doc_hits AS (
+                    SELECT c.id, ts_rank_cd(c.fts_vector, q.query) AS rank
+                    FROM q, content c
+                    WHERE c.fts_vector @@ q.query
                       AND c.deleted_at IS NULL
                       {ns_clause}
+                ),
+                chunk_hits AS (
+                    SELECT DISTINCT ON (ch.content_id)
+                           ch.content_id AS id,
+                           ch.chunk_text,
+                           ts_rank_cd(ch.fts_vector, q.query) AS rank
+                    FROM q, chunks ch
+                    JOIN content c ON c.id = ch.content_id
+                    WHERE ch.fts_vector @@ q.query
+                      AND c.deleted_at IS NULL
+                      {ns_clause}
+                    ORDER BY ch.content_id, rank DESC, ch.chunk_index
+                ),
+                ranked AS (
+                    SELECT COALESCE(d.id, b.id) AS id,
+                           b.chunk_text,
+                           COALESCE(d.rank, 0) + COALESCE(b.rank, 0) AS rank
+                    FROM doc_hits d
+                    FULL OUTER JOIN chunk_hits b ON b.id = d.id
                     ORDER BY rank DESC
                     LIMIT $2
                 )
-                SELECT rc.id, rc.title, rc.type, rc.namespace,
-                       (SELECT ch.chunk_text FROM chunks ch
-                        WHERE ch.content_id = rc.id
-                        ORDER BY ch.chunk_index LIMIT 1) as chunk_text,
-                       rc.rank
-                FROM ranked_content rc
-                ORDER BY rc.rank DESC
+                SELECT c.id, c.title, c.type,
+                       c.metadata->>'namespace' as namespace,
+                       COALESCE(r.chunk_text, c.preview_text) AS chunk_text,
+                       r.rank
+                FROM ranked r
+                JOIN content c ON c.id = r.id
+                ORDER BY r.rank DESC
                 """,
                 query,
                 limit,
@@ -637,7 +986,19 @@ class Database:
         limit: int = 50,
         namespace: str | None = None,
     ) -> list[tuple[UUID, str, str, str | None, str | None, float]]:
-        """Vector similarity search on chunks."""
+        """Vector similarity search on chunks.
+
+        Uses the in-process ANN index when one is attached and ready, falling
+        back to the exact pgvector query otherwise.
+        """
+        if self.vector_index is not None and self.vector_index.ready:
+            try:
+                indexed = await self._index_vector_search(query_embedding, limit, namespace)
+                if indexed is not None:
+                    return indexed
+            except Exception as e:
+                logger.warning("vector_index_search_failed", error=str(e))
+
         ns_clause, ns_params = _build_namespace_filter(namespace, 3)
 
         async with self.acquire() as conn:
@@ -672,6 +1033,116 @@ class Database:
                 for row in rows
             ]
 
+    async def _index_vector_search(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        namespace: str | None,
+    ) -> list[tuple[UUID, str, str, str | None, str | None, float]] | None:
+        """Vector search through the ANN index, hydrated from Postgres.
+
+        Returns None when filtering (namespace, not-yet-synced deletes) leaves
+        fewer than ``limit`` results while the index had more candidates, so
+        the caller can fall back to the exact query.
+        """
+        assert self.vector_index is not None
+        fetch = limit * 4 if namespace is not None else limit + 10
+        hits = self.vector_index.search(query_embedding, fetch)
+        if not hits:
+            return []
+
+        ns_clause, ns_params = _build_namespace_filter(namespace, 2)
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT ch.id AS chunk_id, c.id, c.title, c.type,
+                       c.metadata->>'namespace' as namespace, ch.chunk_text
+                FROM chunks ch
+                JOIN content c ON ch.content_id = c.id
+                WHERE ch.id = ANY($1::uuid[])
+                  AND c.deleted_at IS NULL
+                  {ns_clause}
+                """,
+                [hit.chunk_id for hit in hits],
+                *ns_params,
+            )
+
+        by_chunk = {row["chunk_id"]: row for row in rows}
+        results = [
+            (row["id"], row["title"], row["type"], row["namespace"], row["chunk_text"], hit.similarity)
+            for hit in hits
+            if (row := by_chunk.get(hit.chunk_id)) is not None
+        ]
+        if len(results) < limit and len(hits) == fetch:
+            return None
+        return results[:limit]
+
+    async def get_database_time(self) -> datetime:
+        """Current database server time (used as a sync watermark)."""
+        async with self.acquire() as conn:
+            now: datetime = await conn.fetchval("SELECT NOW()")
+            return now
+
+    async def copy_chunk_embeddings(
+        self,
+        output: Callable[[bytes], Awaitable[None]],
+        created_after: datetime | None = None,
+        recent_after: datetime | None = None,
+        content_ids: list[UUID] | None = None,
+    ) -> None:
+        """Bulk COPY (chunk_id, content_id, recent, embedding) rows in text format.
+
+        Args:
+            output: Async callback receiving raw COPY data
+            created_after: Only chunks of content created after this time
+            recent_after: Rows of content created after this time get recent = 't'
+            content_ids: Only chunks of these content items
+        """
+        args: list[Any] = [recent_after]
+        created_clause = ""
+        if created_after is not None:
+            args.append(created_after)
+            created_clause = f"AND c.created_at > ${len(args)}"
+        if content_ids is not None:
+            args.append(content_ids)
+            created_clause += f" AND c.id = ANY(${len(args)}::uuid[])"
+
+        async with self.acquire() as conn:
+            await conn.copy_from_query(
+                f"""
+                SELECT ch.id, ch.content_id, c.created_at > $1::timestamptz, ch.embedding
+                FROM chunks ch
+                JOIN content c ON ch.content_id = c.id
+                WHERE ch.embedding IS NOT NULL
+                  AND c.deleted_at IS NULL
+                  {created_clause}
+                """,
+                *args,
+                output=output,
+                format="text",
+            )
+
+    async def get_deleted_content_ids(self, since: datetime) -> list[UUID]:
+        """Get IDs of content soft-deleted after a point in time."""
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT id FROM content WHERE deleted_at > $1",
+                since,
+            )
+            return [row["id"] for row in rows]
+
+    async def get_updated_content(self, since: datetime) -> list[tuple[UUID, datetime]]:
+        """Get (id, updated_at) of live content created before and updated after a point in time."""
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, updated_at FROM content
+                WHERE updated_at > $1 AND created_at <= $1 AND deleted_at IS NULL
+                """,
+                since,
+            )
+            return [(row["id"], row["updated_at"]) for row in rows]
+
     async def get_stats(self) -> dict[str, Any]:
         """Get database statistics."""
         async with self.acquire() as conn:
@@ -940,6 +1411,169 @@ class Database:
                 )
                 return None
 
+    async def get_entity_extraction_candidates(
+        self,
+        after: UUID | None = None,
+        limit: int = 100,
+        force: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Page through content whose entities are missing or stale.
+
+        Items are compared with entity_extraction_state by the hash of
+        their extraction text, so unchanged content is skipped in SQL.
+
+        Args:
+            after: Keyset cursor (last content id of the previous page)
+            limit: Page size
+            force: Include content whose text is unchanged
+
+        Returns:
+            Dicts with id, title, text and text_hash, ordered by id
+        """
+        async with self.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT c.id, c.title, t.text, {ENTITY_TEXT_HASH} AS text_hash
+                FROM content c
+                {ENTITY_TEXT_JOIN}
+                LEFT JOIN entity_extraction_state s ON s.content_id = c.id
+                WHERE c.deleted_at IS NULL
+                  AND t.text IS NOT NULL
+                  AND ($1::uuid IS NULL OR c.id > $1)
+                  AND ($3 OR s.text_hash IS DISTINCT FROM {ENTITY_TEXT_HASH})
+                ORDER BY c.id
+                LIMIT $2
+                """,
+                after,
+                limit,
+                force,
+            )
+            return [dict(row) for row in rows]
+
+    async def store_entity_extractions(
+        self,
+        extractions: list[dict[str, Any]],
+    ) -> dict[UUID, tuple[list[UUID], int]]:
+        """Replace the entities of several content items in one transaction.
+
+        Existing entities of the items are deleted, canonical entities are
+        upserted, entities are copied in, and relationships and extraction
+        checkpoints are written with one set-based statement each, so the
+        number of round trips does not grow with the batch.
+
+        Args:
+            extractions: Dicts with content_id, entities (name, entity_type,
+                confidence), relationships (from, to, relation_type,
+                confidence) and an optional text_hash (computed from the
+                stored chunks when missing)
+
+        Returns:
+            (entity ids in input order, relationships stored) per content id
+        """
+        if not extractions:
+            return {}
+
+        content_ids = [item["content_id"] for item in extractions]
+        entity_records: list[tuple[Any, ...]] = []
+        canonical: dict[tuple[str, str], str] = {}
+        entity_ids: dict[UUID, list[UUID]] = {}
+        owner: dict[UUID, UUID] = {}
+        relationships: dict[tuple[UUID, UUID, str], float] = {}
+
+        for item in extractions:
+            content_id = item["content_id"]
+            ids = entity_ids.setdefault(content_id, [])
+            by_name: dict[str, UUID] = {}
+            for e in item["entities"]:
+                entity_id = uuid4()
+                normalized = e["name"].lower().strip()
+                canonical.setdefault((normalized, e["entity_type"]), e["name"])
+                entity_records.append(
+                    (entity_id, content_id, e["name"], e["entity_type"], e.get("confidence", 1.0), normalized)
+                )
+                ids.append(entity_id)
+                owner[entity_id] = content_id
+                by_name.setdefault(e["name"].lower(), entity_id)
+            for r in item.get("relationships", []):
+                from_id = by_name.get(r["from"].lower())
+                to_id = by_name.get(r["to"].lower())
+                if from_id and to_id:
+                    relationships.setdefault((from_id, to_id, r["relation_type"]), r.get("confidence", 1.0))
+
+        async with self.transaction() as conn:
+            await conn.execute("DELETE FROM entities WHERE content_id = ANY($1::uuid[])", content_ids)
+
+            canonical_ids: dict[tuple[str, str], UUID] = {}
+            if canonical:
+                rows = await conn.fetch(
+                    """
+                    INSERT INTO canonical_entities (name, normalized_name, entity_type)
+                    SELECT * FROM unnest($1::text[], $2::text[], $3::text[])
+                    ON CONFLICT (normalized_name, entity_type) DO UPDATE
+                    SET updated_at = NOW()
+                    RETURNING id, normalized_name, entity_type
+                    """,
+                    list(canonical.values()),
+                    [key[0] for key in canonical],
+                    [key[1] for key in canonical],
+                )
+                canonical_ids = {(row["normalized_name"], row["entity_type"]): row["id"] for row in rows}
+
+            if entity_records:
+                await conn.copy_records_to_table(
+                    "entities",
+                    records=[(*r[:5], canonical_ids.get((r[5], r[3]))) for r in entity_records],
+                    columns=ENTITY_COPY_COLUMNS,
+                )
+
+            stored = []
+            if relationships:
+                stored = await conn.fetch(
+                    """
+                    INSERT INTO relationships (from_entity_id, to_entity_id, relation_type, confidence)
+                    SELECT * FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::float8[])
+                    ON CONFLICT (from_entity_id, to_entity_id, relation_type) DO NOTHING
+                    RETURNING from_entity_id
+                    """,
+                    [key[0] for key in relationships],
+                    [key[1] for key in relationships],
+                    [key[2] for key in relationships],
+                    list(relationships.values()),
+                )
+            rel_counts = dict.fromkeys(content_ids, 0)
+            for row in stored:
+                rel_counts[owner[row["from_entity_id"]]] += 1
+
+            await conn.execute(
+                f"""
+                INSERT INTO entity_extraction_state
+                    (content_id, text_hash, entity_count, relationship_count, extracted_at)
+                SELECT s.content_id, COALESCE(s.text_hash, {ENTITY_TEXT_HASH}),
+                       s.entity_count, s.relationship_count, NOW()
+                FROM unnest($1::uuid[], $2::text[], $3::int[], $4::int[])
+                    AS s(content_id, text_hash, entity_count, relationship_count)
+                JOIN content c ON c.id = s.content_id
+                {ENTITY_TEXT_JOIN}
+                ON CONFLICT (content_id) DO UPDATE SET
+                    text_hash = EXCLUDED.text_hash,
+                    entity_count = EXCLUDED.entity_count,
+                    relationship_count = EXCLUDED.relationship_count,
+                    extracted_at = EXCLUDED.extracted_at
+                """,
+                content_ids,
+                [item.get("text_hash") for item in extractions],
+                [len(entity_ids[cid]) for cid in content_ids],
+                [rel_counts[cid] for cid in content_ids],
+            )
+
+        logger.debug(
+            "entity_extractions_stored",
+            content_count=len(content_ids),
+            entity_count=len(entity_records),
+            relationship_count=len(stored),
+        )
+        return {cid: (entity_ids[cid], rel_counts[cid]) for cid in content_ids}
+
     async def get_entities_by_content(
         self, content_id: UUID
     ) -> list[dict[str, Any]]:
@@ -1,15 +1,18 @@
-"""Embeddings via Ollama with Redis caching."""
+"""Embeddings via Ollama with two-tier (in-process + Redis) caching."""
 
 from __future__ import annotations
 
 import asyncio
 import hashlib
+import time
 from dataclasses import dataclass
 
 import httpx
 
+from knowledge.cache import CacheType, RedisCache, SingleFlight, get_cache
 from knowledge.config import Settings, get_settings
 from knowledge.logging import get_logger
+from knowledge.metrics import record_embedding_metrics
 
 logger = get_logger(__name__)
 
@@ -23,12 +26,57 @@ class OllamaStatus:
     error: str | None = None
 
 
+class NativeBatchUnsupportedError(RuntimeError):
+    """Raised when Ollama does not expose the multi-input /api/embed endpoint."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (chars / 4, matching the chunker)."""
+    return max(1, len(text) // 4)
+
+
+def plan_batches(texts: list[str], max_texts: int, max_tokens: int) -> list[list[int]]:
+    """
+    Group text indices into request batches.
+
+    A batch is closed once adding the next text would exceed either
+    ``max_texts`` or ``max_tokens``. A single text larger than the token
+    budget still gets a batch of its own.
+
+    Args:
+        texts: Texts to embed
+        max_texts: Maximum texts per batch
+        max_tokens: Approximate token budget per batch
+
+    Returns:
+        List of batches, each a list of indices into ``texts``
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= max_texts or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(index)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
 class EmbeddingService:
     """Service for generating embeddings via Ollama."""
 
     def __init__(self, settings: Settings | None = None) -> None:
         self.settings = settings or get_settings()
         self._client: httpx.AsyncClient | None = None
+        self._native_batch = self.settings.embedding_native_batch
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
@@ -128,20 +176,81 @@ class EmbeddingService:
                 f"Embedding request timed out after {self.settings.ollama_timeout}s"
             ) from e
 
+    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """
+        Generate embeddings for several texts in a single request.
+
+        Uses Ollama's ``/api/embed`` endpoint, which accepts a list of inputs
+        and returns one vector per input in the same order.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors (same order as input)
+
+        Raises:
+            RuntimeError: If embedding fails
+        """
+        if not texts:
+            return []
+
+        client = await self._get_client()
+
+        try:
+            response = await client.post(
+                "/api/embed",
+                json={
+                    "model": self.settings.embedding_model,
+                    "input": texts,
+                },
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            embeddings = data.get("embeddings")
+
+            if embeddings is None or len(embeddings) != len(texts):
+                raise RuntimeError(
+                    f"Expected {len(texts)} embeddings, got "
+                    f"{len(embeddings) if embeddings is not None else 'none'}"
+                )
+
+            return embeddings
+
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404 and "model" not in e.response.text.lower():
+                # Older Ollama releases only expose /api/embeddings
+                raise NativeBatchUnsupportedError(
+                    "Ollama does not support /api/embed"
+                ) from e
+            raise RuntimeError(
+                f"Ollama API error: {e.response.status_code} - {e.response.text}"
+            ) from e
+        except httpx.TimeoutException as e:
+            raise RuntimeError(
+                f"Embedding request timed out after {self.settings.ollama_timeout}s"
+            ) from e
+
     async def embed_batch(
         self,
         texts: list[str],
-        batch_size: int = 10,
-        max_retries: int = 3,
+        batch_size: int | None = None,
+        max_retries: int | None = None,
         max_concurrent: int | None = None,
     ) -> list[list[float]]:
         """
-        Generate embeddings for multiple texts in batches with rate limiting.
+        Generate embeddings for multiple texts using multi-input requests.
+
+        Texts are packed into requests of at most ``batch_size`` texts and
+        ``embedding_batch_max_tokens`` approximate tokens. A failed request is
+        split in half and each half retried, so one bad text only costs
+        retries for itself. Single texts are retried with exponential backoff.
 
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts per batch
-            max_retries: Number of retries per text on failure
+            batch_size: Max texts per request (defaults to config)
+            max_retries: Number of retries per single text on failure (defaults to config)
             max_concurrent: Maximum concurrent requests (defaults to config)
 
         Returns:
@@ -149,33 +258,65 @@ class EmbeddingService:
         """
         results: list[list[float] | None] = [None] * len(texts)
 
-        # Use config value if not explicitly set
+        # Use config values if not explicitly set
+        size = batch_size or self.settings.embedding_batch_size
+        retries = max_retries or self.settings.embedding_max_retries
         concurrent = max_concurrent or self.settings.embedding_max_concurrent
 
-        # Rate limiting semaphore
+        # Rate limiting semaphore (held per request, not across splits)
         semaphore = asyncio.Semaphore(concurrent)
 
-        async def embed_with_retry(index: int, text: str) -> None:
-            """Embed single text with retry logic and rate limiting."""
-            async with semaphore:  # Limit concurrent requests
-                for attempt in range(max_retries):
+        async def request(indices: list[int]) -> list[list[float]]:
+            """Send one embedding request for the given text indices."""
+            batch = [texts[i] for i in indices]
+            async with semaphore:
+                start = time.perf_counter()
+                if self._native_batch:
                     try:
-                        embedding = await self.embed_text(text)
-                        results[index] = embedding
+                        vectors = await self.embed_texts(batch)
+                    except NativeBatchUnsupportedError:
+                        logger.warning("embedding_native_batch_unsupported")
+                        self._native_batch = False
+                        vectors = [await self.embed_text(text) for text in batch]
+                else:
+                    vectors = [await self.embed_text(text) for text in batch]
+                record_embedding_metrics(time.perf_counter() - start, len(batch))
+            return vectors
+
+        async def embed_indices(indices: list[int]) -> None:
+            """Embed a batch, splitting it in half on failure."""
+            if len(indices) == 1:
+                index = indices[0]
+                for attempt in range(retries):
+                    try:
+                        results[index] = (await request(indices))[0]
                         return
                     except Exception as e:
-                        if attempt == max_retries - 1:
+                        if attempt == retries - 1:
                             raise RuntimeError(
-                                f"Failed to embed text at index {index} after {max_retries} attempts: {e}"
+                                f"Failed to embed text at index {index} after {retries} attempts: {e}"
                             ) from e
                         # Exponential backoff
                         await asyncio.sleep(2**attempt)
+                return
+
+            try:
+                vectors = await request(indices)
+            except Exception as e:
+                mid = len(indices) // 2
+                logger.warning(
+                    "embedding_batch_split",
+                    batch_size=len(indices),
+                    error=str(e),
+                )
+                await asyncio.gather(embed_indices(indices[:mid]), embed_indices(indices[mid:]))
+                return
 
-        # Process in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            tasks = [embed_with_retry(i + j, text) for j, text in enumerate(batch)]
-            await asyncio.gather(*tasks)
+            for index, vector in zip(indices, vectors, strict=True):
+                results[index] = vector
+
+        batches = plan_batches(texts, size, self.settings.embedding_batch_max_tokens)
+        await asyncio.gather(*(embed_indices(batch) for batch in batches))
 
         # Verify all embeddings were generated
         for i, result in enumerate(results):
@@ -205,48 +346,106 @@ async def close_embedding_service() -> None:
         _embedding_service = None
 
 
+def _embedding_cache_key(cache: RedisCache, text: str) -> str:
+    """Build the vector cache key for a text under the configured model."""
+    text_hash = hashlib.sha256(text.encode()).hexdigest()[:32]
+    return cache.vector_key(CacheType.EMBEDDING, get_settings().embedding_model, text_hash)
+
+
+# Coalesces concurrent embed_text calls for the same text
+_embed_flight = SingleFlight("embed_text")
+
+
 async def embed_text(text: str, use_cache: bool = True) -> list[float]:
     """
-    Embed text using global service with optional Redis caching.
+    Embed text using global service with optional two-tier caching.
+
+    Lookups hit the in-process LRU first and Redis second; vectors are
+    stored as packed float32 bytes. Concurrent cached calls for the same
+    text share one lookup and embedding request.
 
     Args:
         text: Text to embed
-        use_cache: Whether to use Redis cache (default True)
+        use_cache: Whether to use the embedding cache (default True)
 
     Returns:
         768-dimensional embedding vector
     """
-    # Import here to avoid circular dependency
-    from knowledge.cache import CacheType, get_cache
+    if not use_cache:
+        service = await get_embedding_service()
+        return await service.embed_text(text)
 
-    cache = await get_cache()
+    return await _embed_flight.do(text, lambda: _embed_text_cached(text))
 
-    # Create cache key from text hash
-    text_hash = hashlib.sha256(text.encode()).hexdigest()[:32]
+
+async def _embed_text_cached(text: str) -> list[float]:
+    """Embed text through the two-tier cache."""
+    service = await get_embedding_service()
+    cache = await get_cache()
+    key = _embedding_cache_key(cache, text)
 
     # Check cache first
-    if use_cache and cache.is_connected:
-        cached = await cache.get(CacheType.EMBEDDING, text_hash)
-        if cached is not None:
-            logger.debug("embedding_cache_hit", text_preview=text[:50])
-            return cached
+    cached = (await cache.get_vectors(CacheType.EMBEDDING, [key]))[0]
+    if cached is not None:
+        logger.debug("embedding_cache_hit", text_preview=text[:50])
+        return cached
 
     # Generate embedding
-    service = await get_embedding_service()
     embedding = await service.embed_text(text)
 
     # Cache the result
-    if use_cache and cache.is_connected:
-        await cache.set(CacheType.EMBEDDING, embedding, text_hash)
-        logger.debug("embedding_cached", text_preview=text[:50])
+    await cache.set_vectors(CacheType.EMBEDDING, {key: embedding})
+    logger.debug("embedding_cached", text_preview=text[:50])
 
     return embedding
 
 
-async def embed_batch(texts: list[str], batch_size: int = 10) -> list[list[float]]:
-    """Convenience function to embed batch using global service."""
+async def embed_batch(
+    texts: list[str],
+    batch_size: int | None = None,
+    use_cache: bool = True,
+) -> list[list[float]]:
+    """
+    Embed a batch using the global service with batched cache lookups.
+
+    Cached vectors are fetched with one LRU pass plus one Redis MGET; only
+    the distinct misses are embedded, and they are written back in one
+    pipelined round trip.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Max texts per embedding request (defaults to config)
+        use_cache: Whether to use the embedding cache (default True)
+
+    Returns:
+        List of embedding vectors (same order as input)
+    """
     service = await get_embedding_service()
-    return await service.embed_batch(texts, batch_size)
+
+    if not use_cache:
+        return await service.embed_batch(texts, batch_size)
+
+    cache = await get_cache()
+    keys = [_embedding_cache_key(cache, text) for text in texts]
+    results = await cache.get_vectors(CacheType.EMBEDDING, keys)
+
+    missing = [i for i, vector in enumerate(results) if vector is None]
+    if missing:
+        # Identical chunks (boilerplate, repeated headers) are embedded once
+        texts_by_key = {keys[i]: texts[i] for i in missing}
+        fresh = dict(
+            zip(
+                texts_by_key,
+                await service.embed_batch(list(texts_by_key.values()), batch_size),
+                strict=True,
+            )
+        )
+        await cache.set_vectors(CacheType.EMBEDDING, fresh)
+        for i in missing:
+            results[i] = fresh[keys[i]]
+
+    logger.debug("embedding_batch_cache", total=len(texts), misses=len(missing))
+    return results  # type: ignore[return-value]
 
 
 async def check_ollama_health() -> OllamaStatus:
@@ -0,0 +1,183 @@
+"""Background entity extraction over the stored corpus.
+
+Content is paged out of the database by id, extracted by a bounded pool of
+LLM workers and written back in batches:
+
+    candidates (keyset pages) -> extract (N workers) -> store (batched)
+
+Each batch is one transaction holding the entities, relationships and the
+entity_extraction_state checkpoint of its items. An interrupted run loses
+at most the batch in flight, and items whose text hash is unchanged are
+skipped on the next run. Failed extractions are not checkpointed and are
+retried next time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from knowledge.ai import AIProvider
+from knowledge.config import Settings, get_settings
+from knowledge.db import Database, get_db
+from knowledge.entity_extraction import ExtractionResult, extract_entities
+from knowledge.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Queue sentinel telling an extraction worker to exit
+_DONE: Any = object()
+
+
+@dataclass
+class BackfillReport:
+    """Progress and outcome of an entity backfill."""
+
+    scanned: int = 0  # Candidates pulled from the database
+    extracted: int = 0  # Items stored with fresh entities
+    failed: int = 0
+    entities: int = 0
+    relationships: int = 0
+    elapsed: float = 0.0
+    running: bool = False
+
+    @property
+    def items_per_second(self) -> float:
+        return self.extracted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Flat summary for logging and the API."""
+        return {
+            "running": self.running,
+            "scanned": self.scanned,
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "entities": self.entities,
+            "relationships": self.relationships,
+            "elapsed_s": round(self.elapsed, 2),
+            "items_per_s": round(self.items_per_second, 2),
+        }
+
+
+def extraction_record(content_id: Any, result: ExtractionResult, text_hash: str | None = None) -> dict[str, Any]:
+    """Database.store_entity_extractions input for one extraction result."""
+    return {
+        "content_id": content_id,
+        "text_hash": text_hash,
+        "entities": [
+            {"name": e.name, "entity_type": e.entity_type, "confidence": e.confidence}
+            for e in result.entities
+        ],
+        "relationships": [
+            {"from": r.from_entity, "to": r.to_entity, "relation_type": r.relation_type, "confidence": r.confidence}
+            for r in result.relationships
+        ],
+    }
+
+
+async def run_entity_backfill(
+    db: Database | None = None,
+    settings: Settings | None = None,
+    concurrency: int | None = None,
+    write_batch: int | None = None,
+    limit: int | None = None,
+    force: bool = False,
+    ai: AIProvider | None = None,
+    report: BackfillReport | None = None,
+    on_progress: Callable[[BackfillReport], None] | None = None,
+) -> BackfillReport:
+    """
+    Extract entities for every item that lacks them or has changed.
+
+    Args:
+        db: Optional database instance override
+        settings: Optional settings override
+        concurrency: Concurrent LLM extractions (default from settings)
+        write_batch: Items stored per transaction (default from settings)
+        limit: Stop after this many candidates (None = whole corpus)
+        force: Re-extract items whose text is unchanged
+        ai: Shared AI provider (one is created when OpenRouter is configured)
+        report: Report to update in place (lets callers poll a running backfill)
+        on_progress: Called after every stored batch
+
+    Returns:
+        BackfillReport with counts and throughput
+    """
+    settings = settings or get_settings()
+    db = db or await get_db()
+    concurrency = concurrency or settings.entity_extraction_concurrency
+    write_batch = write_batch or settings.entity_extraction_write_batch
+    report = report or BackfillReport()
+    report.running = True
+
+    # One client for every worker instead of one per extraction
+    owned_ai = ai is None and bool(os.environ.get("OPENROUTER_API_KEY"))
+    if owned_ai:
+        ai = AIProvider()
+
+    queue: asyncio.Queue[Any] = asyncio.Queue(concurrency * 2)
+    pending: list[dict[str, Any]] = []
+    write_lock = asyncio.Lock()
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        batch = pending[:]
+        pending.clear()
+        if not batch:
+            return
+        async with write_lock:
+            stored = await db.store_entity_extractions(batch)
+        report.extracted += len(stored)
+        report.entities += sum(len(ids) for ids, _ in stored.values())
+        report.relationships += sum(rels for _, rels in stored.values())
+        report.elapsed = time.perf_counter() - started
+        if on_progress is not None:
+            on_progress(report)
+
+    async def produce() -> None:
+        after = None
+        page_size = max(write_batch, concurrency * 2)
+        while limit is None or report.scanned < limit:
+            size = page_size if limit is None else min(page_size, limit - report.scanned)
+            rows = await db.get_entity_extraction_candidates(after=after, limit=size, force=force)
+            if not rows:
+                break
+            for row in rows:
+                report.scanned += 1
+                await queue.put(row)
+            after = rows[-1]["id"]
+        for _ in range(concurrency):
+            await queue.put(_DONE)
+
+    async def work() -> None:
+        while (row := await queue.get()) is not _DONE:
+            try:
+                result = await extract_entities(row["title"], row["text"], ai=ai)
+            except Exception as e:
+                result = ExtractionResult(entities=[], relationships=[], success=False, error=str(e))
+            if not result.success:
+                report.failed += 1
+                logger.debug("entity_backfill_item_failed", content_id=str(row["id"]), error=result.error)
+                continue
+            pending.append(extraction_record(row["id"], result, row["text_hash"]))
+            if len(pending) >= write_batch:
+                await flush()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce())
+            for _ in range(concurrency):
+                group.create_task(work())
+        await flush()
+    finally:
+        report.running = False
+        report.elapsed = time.perf_counter() - started
+        if owned_ai and ai is not None:
+            await ai.close()
+
+    logger.info("entity_backfill_complete", **report.summary())
+    return report
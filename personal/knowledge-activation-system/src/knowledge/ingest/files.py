@@ -8,16 +8,26 @@ Supports secure ingestion of local files with:
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
+from uuid import UUID
 
 from pypdf import PdfReader
 
 from knowledge.autotag import extract_tags
-from knowledge.chunking import ChunkingStrategy, chunk_content
+from knowledge.chunking import Chunk, ChunkingStrategy, chunk_content
 from knowledge.config import Settings, get_settings
 from knowledge.db import get_db
 from knowledge.embeddings import embed_batch
+from knowledge.entity_backfill import extraction_record
 from knowledge.entity_extraction import extract_entities
+from knowledge.exceptions import (
+    ChunkingError,
+    ContentParseError,
+    DuplicateContentError,
+    IngestError,
+    UnsupportedContentTypeError,
+)
 from knowledge.ingest import IngestResult
 from knowledge.logging import get_logger
 from knowledge.obsidian import create_note, get_relative_path
@@ -99,6 +109,294 @@ def read_text_file(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+@dataclass
+class PreparedFile:
+    """A file that has been read, validated and chunked."""
+
+    path: Path
+    title: str
+    content: str  # Validated content (what gets chunked and stored)
+    metadata: dict[str, str | int]
+    tags: list[str]  # Tags from frontmatter
+    chunks: list[Chunk]
+
+
+def check_file(path: Path) -> str:
+    """
+    Run security and type checks on a file before reading it.
+
+    Args:
+        path: Resolved file path
+
+    Returns:
+        File type
+
+    Raises:
+        IngestError: If the file must not or cannot be ingested
+    """
+    # Security: Validate filename
+    if not is_safe_filename(path.name):
+        logger.warning(f"Unsafe filename rejected: {path.name}")
+        raise IngestError("Invalid filename")
+
+    # Check file exists
+    if not path.exists():
+        raise IngestError(f"File not found: {path}")
+
+    # Security: Ensure it's a regular file (not symlink, device, etc.)
+    if not path.is_file():
+        logger.warning(f"Non-regular file rejected: {path}")
+        raise IngestError("Path is not a regular file")
+
+    # Check file type
+    file_type = get_file_type(path)
+    if not file_type:
+        raise UnsupportedContentTypeError(f"Unsupported file type: {path.suffix}")
+    return file_type
+
+
+def read_file(path: Path, file_type: str) -> tuple[str, dict[str, str | int], ChunkingStrategy]:
+    """
+    Read a file's text and metadata.
+
+    Synchronous and CPU-bound for PDFs; the ingest pipeline runs it in a
+    process pool.
+
+    Args:
+        path: File path
+        file_type: Type from check_file
+
+    Returns:
+        Tuple of (content, metadata, chunking strategy)
+    """
+    metadata: dict[str, str | int] = {"source_path": str(path)}
+
+    if file_type == "pdf":
+        content, pdf_meta = read_pdf(path)
+        metadata.update(pdf_meta)
+        return content, metadata, ChunkingStrategy.PAGE
+
+    content = read_text_file(path)
+    metadata["file_size"] = path.stat().st_size
+    return content, metadata, ChunkingStrategy.RECURSIVE
+
+
+def prepare_content(
+    path: Path,
+    content: str,
+    metadata: dict[str, str | int],
+    strategy: ChunkingStrategy,
+    title: str | None = None,
+) -> PreparedFile:
+    """
+    Validate and chunk file content, resolving title, namespace and tags.
+
+    Synchronous; the ingest pipeline runs it in a process pool.
+
+    Args:
+        path: File path (title fallback)
+        content: Raw content from read_file
+        metadata: Metadata from read_file (namespace is added here)
+        strategy: Chunking strategy from read_file
+        title: Optional title override
+
+    Returns:
+        PreparedFile ready for embedding
+
+    Raises:
+        ContentParseError: If content validation fails
+        ChunkingError: If no chunks were produced
+    """
+    # Validate content
+    validation = validate_content(content, min_length=50)  # Lower threshold for files
+    if not validation.valid:
+        error_msg = validation.error.value if validation.error else "Unknown validation error"
+        raise ContentParseError(f"Content validation failed: {error_msg}")
+
+    # Extract frontmatter fields (title, namespace, tags)
+    frontmatter_fields = extract_frontmatter_fields(content)
+    if frontmatter_fields.get("namespace"):
+        metadata["namespace"] = frontmatter_fields["namespace"]
+
+    frontmatter_tags = frontmatter_fields.get("tags")
+    tags = list(frontmatter_tags) if isinstance(frontmatter_tags, list) else []
+
+    # Determine title (extract from ORIGINAL content to get YAML frontmatter)
+    final_title = title
+    if not final_title:
+        # Try to extract from frontmatter first
+        final_title = frontmatter_fields.get("title") if isinstance(frontmatter_fields.get("title"), str) else None
+    if not final_title:
+        # Try to extract from original content (includes YAML frontmatter)
+        final_title = extract_title_from_content(content)
+    if not final_title:
+        # Use filename without extension
+        final_title = path.stem
+
+    # Chunk content
+    chunks = chunk_content(validation.content, strategy=strategy)
+    if not chunks:
+        raise ChunkingError("No chunks generated from content")
+
+    return PreparedFile(
+        path=path,
+        title=final_title,
+        content=validation.content,
+        metadata=metadata,
+        tags=tags,
+        chunks=chunks,
+    )
+
+
+async def resolve_tags(
+    prepared: PreparedFile,
+    tags: list[str] | None,
+    auto_tag: bool,
+    title: str | None = None,
+) -> list[str]:
+    """
+    Merge provided, frontmatter and (optionally) LLM-generated tags.
+
+    Args:
+        prepared: Prepared file
+        tags: Tags provided by the caller
+        auto_tag: Generate tags with the LLM when fewer than 3 are present
+        title: Title override (used as the preliminary title for tagging)
+
+    Returns:
+        Deduplicated tags, preserving order
+    """
+    final_tags = list(tags) if tags else []
+    final_tags.extend(prepared.tags)
+
+    # Auto-tag if enabled and we don't have many tags already
+    if auto_tag and len(final_tags) < 3:
+        try:
+            # Use filename as preliminary title for tagging
+            preliminary_title = title or prepared.path.stem
+            auto_tags = await extract_tags(preliminary_title, prepared.content)
+            if auto_tags:
+                final_tags.extend(auto_tags)
+                logger.debug(
+                    "auto_tags_generated",
+                    path=str(prepared.path),
+                    tags=auto_tags,
+                )
+        except Exception as e:
+            # Don't fail ingestion if auto-tagging fails
+            logger.warning(
+                "auto_tagging_failed",
+                path=str(prepared.path),
+                error=str(e),
+            )
+
+    return list(dict.fromkeys(final_tags))  # Dedupe preserving order
+
+
+async def store_file(
+    prepared: PreparedFile,
+    embeddings: list[list[float]],
+    tags: list[str],
+    settings: Settings,
+) -> tuple[UUID, Path]:
+    """
+    Create the Obsidian note and database rows for a prepared file.
+
+    Args:
+        prepared: Prepared file
+        embeddings: One embedding per chunk
+        tags: Final tags
+        settings: Settings
+
+    Returns:
+        Tuple of (content_id, note_path)
+
+    Raises:
+        DuplicateContentError: If the note is already in the database
+    """
+    # Create Obsidian note (reference to original file)
+    note_content = f"**Source file:** `{prepared.path}`\n\n{prepared.content}"
+
+    note_path = create_note(
+        content_type="file",
+        title=prepared.title,
+        content=note_content,
+        tags=tags if tags else None,
+        metadata=prepared.metadata,
+        settings=settings,
+    )
+
+    # Store in database
+    db = await get_db()
+    relative_path = get_relative_path(note_path, settings)
+
+    # Check if already exists
+    if await db.content_exists(relative_path):
+        raise DuplicateContentError(f"Content already exists: {relative_path}")
+
+    # Insert content
+    content_id = await db.insert_content(
+        filepath=relative_path,
+        content_type="file",
+        title=prepared.title,
+        content_for_hash=prepared.content,
+        tags=tags if tags else None,
+        metadata=prepared.metadata,
+    )
+
+    # Insert chunks with embeddings
+    chunk_records = [
+        {
+            "chunk_index": chunk.index,
+            "chunk_text": chunk.text,
+            "embedding": embeddings[i],
+            "source_ref": chunk.source_ref,
+            "start_char": chunk.start_char,
+            "end_char": chunk.end_char,
+        }
+        for i, chunk in enumerate(prepared.chunks)
+    ]
+    await db.insert_chunks(content_id, chunk_records)
+
+    return content_id, note_path
+
+
+async def store_entities(content_id: UUID, title: str, content: str) -> int:
+    """
+    Extract entities and relationships from content and store them.
+
+    Failures are logged and never raised.
+
+    Returns:
+        Number of entities stored
+    """
+    entities_extracted = 0
+    try:
+        db = await get_db()
+        extraction_result = await extract_entities(
+            title=title,
+            content=content,
+        )
+        if extraction_result.success and extraction_result.entities:
+            # Entities, relationships and the extraction checkpoint in one transaction
+            stored = await db.store_entity_extractions([extraction_record(content_id, extraction_result)])
+            entities_extracted = len(stored[content_id][0])
+
+            logger.debug(
+                "entities_auto_extracted",
+                content_id=str(content_id),
+                entity_count=entities_extracted,
+            )
+    except Exception as e:
+        # Don't fail ingestion if entity extraction fails
+        logger.warning(
+            "entity_extraction_failed",
+            content_id=str(content_id),
+            error=str(e),
+        )
+    return entities_extracted
+
+
 async def ingest_file(
     path: str | Path,
     title: str | None = None,
@@ -119,6 +417,8 @@ async def ingest_file(
     7. Store in database
     8. Extract entities (optional, default True)
 
+    For many files, use ingest_files_batch (staged pipeline).
+
     Args:
         path: Path to file
         title: Optional title override
@@ -133,227 +433,36 @@ async def ingest_file(
     settings = settings or get_settings()
     path = Path(path).resolve()
 
-    # Security: Validate filename
-    if not is_safe_filename(path.name):
-        logger.warning(f"Unsafe filename rejected: {path.name}")
-        return IngestResult(
-            success=False,
-            error="Invalid filename",
-        )
-
-    # Check file exists
-    if not path.exists():
-        return IngestResult(
-            success=False,
-            error=f"File not found: {path}",
-        )
-
-    # Security: Ensure it's a regular file (not symlink, device, etc.)
-    if not path.is_file():
-        logger.warning(f"Non-regular file rejected: {path}")
-        return IngestResult(
-            success=False,
-            error="Path is not a regular file",
-        )
-
-    # Check file type
-    file_type = get_file_type(path)
-    if not file_type:
-        return IngestResult(
-            success=False,
-            error=f"Unsupported file type: {path.suffix}",
-        )
-
     try:
-        # Read file
-        metadata: dict[str, str | int] = {"source_path": str(path)}
-
-        if file_type == "pdf":
-            content, pdf_meta = read_pdf(path)
-            metadata.update(pdf_meta)
-            strategy = ChunkingStrategy.PAGE
-        else:
-            content = read_text_file(path)
-            metadata["file_size"] = path.stat().st_size
-            strategy = ChunkingStrategy.RECURSIVE
-
-        # Validate content
-        validation = validate_content(content, min_length=50)  # Lower threshold for files
-        if not validation.valid:
-            error_msg = validation.error.value if validation.error else "Unknown validation error"
-            return IngestResult(
-                success=False,
-                error=f"Content validation failed: {error_msg}",
-            )
+        file_type = check_file(path)
+    except IngestError as e:
+        return IngestResult(success=False, error=e.message)
 
-        # Extract frontmatter fields (title, namespace, tags)
-        frontmatter_fields = extract_frontmatter_fields(content)
-        if frontmatter_fields.get("namespace"):
-            metadata["namespace"] = frontmatter_fields["namespace"]
-
-        # Merge tags from frontmatter with provided tags
-        final_tags = list(tags) if tags else []
-        if frontmatter_fields.get("tags"):
-            frontmatter_tags = frontmatter_fields["tags"]
-            if isinstance(frontmatter_tags, list):
-                final_tags.extend(frontmatter_tags)
-
-        # Auto-tag if enabled and we don't have many tags already
-        if auto_tag and len(final_tags) < 3:
-            try:
-                # Use filename as preliminary title for tagging
-                preliminary_title = title or path.stem
-                auto_tags = await extract_tags(preliminary_title, validation.content)
-                if auto_tags:
-                    final_tags.extend(auto_tags)
-                    logger.debug(
-                        "auto_tags_generated",
-                        path=str(path),
-                        tags=auto_tags,
-                    )
-            except Exception as e:
-                # Don't fail ingestion if auto-tagging fails
-                logger.warning(
-                    "auto_tagging_failed",
-                    path=str(path),
-                    error=str(e),
-                )
-
-        final_tags = list(dict.fromkeys(final_tags))  # Dedupe preserving order
-
-        # Determine title (extract from ORIGINAL content to get YAML frontmatter)
-        final_title = title
-        if not final_title:
-            # Try to extract from frontmatter first
-            final_title = frontmatter_fields.get("title") if isinstance(frontmatter_fields.get("title"), str) else None
-        if not final_title:
-            # Try to extract from original content (includes YAML frontmatter)
-            final_title = extract_title_from_content(content)
-        if not final_title:
-            # Use filename without extension
-            final_title = path.stem
-
-        # Chunk content
-        chunks = chunk_content(validation.content, strategy=strategy)
-
-        if not chunks:
-            return IngestResult(
-                success=False,
-                error="No chunks generated from content",
-            )
+    try:
+        prepared = prepare_content(path, *read_file(path, file_type), title=title)
+        final_tags = await resolve_tags(prepared, tags, auto_tag, title=title)
 
         # Generate embeddings
-        chunk_texts = [chunk.text for chunk in chunks]
-        embeddings = await embed_batch(chunk_texts)
-
-        # Create Obsidian note (reference to original file)
-        note_content = f"**Source file:** `{path}`\n\n{validation.content}"
-
-        note_path = create_note(
-            content_type="file",
-            title=final_title,
-            content=note_content,
-            tags=final_tags if final_tags else None,
-            metadata=metadata,
-            settings=settings,
-        )
-
-        # Store in database
-        db = await get_db()
-        relative_path = get_relative_path(note_path, settings)
+        embeddings = await embed_batch([chunk.text for chunk in prepared.chunks])
 
-        # Check if already exists
-        if await db.content_exists(relative_path):
-            return IngestResult(
-                success=False,
-                error=f"Content already exists: {relative_path}",
-            )
-
-        # Insert content
-        content_id = await db.insert_content(
-            filepath=relative_path,
-            content_type="file",
-            title=final_title,
-            content_for_hash=validation.content,
-            tags=final_tags if final_tags else None,
-            metadata=metadata,
-        )
-
-        # Insert chunks with embeddings
-        chunk_records = [
-            {
-                "chunk_index": chunk.index,
-                "chunk_text": chunk.text,
-                "embedding": embeddings[i],
-                "source_ref": chunk.source_ref,
-                "start_char": chunk.start_char,
-                "end_char": chunk.end_char,
-            }
-            for i, chunk in enumerate(chunks)
-        ]
-        await db.insert_chunks(content_id, chunk_records)
+        content_id, note_path = await store_file(prepared, embeddings, final_tags, settings)
 
         # Extract entities if enabled
         entities_extracted = 0
         if auto_extract_entities:
-            try:
-                extraction_result = await extract_entities(
-                    title=final_title,
-                    content=validation.content,
-                )
-                if extraction_result.success and extraction_result.entities:
-                    # Store entities in database
-                    entity_records = [
-                        {
-                            "name": e.name,
-                            "entity_type": e.entity_type,
-                            "confidence": e.confidence,
-                        }
-                        for e in extraction_result.entities
-                    ]
-                    entity_ids = await db.insert_entities_batch(content_id, entity_records)
-                    entities_extracted = len(entity_ids)
-
-                    # Store relationships
-                    if extraction_result.relationships:
-                        # Build name to ID mapping
-                        name_to_id = {}
-                        for eid, entity in zip(entity_ids, extraction_result.entities):
-                            name_to_id[entity.name.lower()] = eid
-
-                        for rel in extraction_result.relationships:
-                            from_id = name_to_id.get(rel.from_entity.lower())
-                            to_id = name_to_id.get(rel.to_entity.lower())
-                            if from_id and to_id:
-                                await db.insert_relationship(
-                                    from_entity_id=from_id,
-                                    to_entity_id=to_id,
-                                    relation_type=rel.relation_type,
-                                    confidence=rel.confidence,
-                                )
-
-                    logger.debug(
-                        "entities_auto_extracted",
-                        content_id=str(content_id),
-                        entity_count=entities_extracted,
-                    )
-            except Exception as e:
-                # Don't fail ingestion if entity extraction fails
-                logger.warning(
-                    "entity_extraction_failed",
-                    content_id=str(content_id),
-                    error=str(e),
-                )
+            entities_extracted = await store_entities(content_id, prepared.title, prepared.content)
 
         return IngestResult(
             success=True,
             content_id=content_id,
             filepath=note_path,
-            title=final_title,
-            chunks_created=len(chunks),
+            title=prepared.title,
+            chunks_created=len(prepared.chunks),
             entities_extracted=entities_extracted,
         )
 
+    except IngestError as e:
+        return IngestResult(success=False, error=e.message)
     except Exception as e:
         return IngestResult(
             success=False,
@@ -368,7 +477,10 @@ async def ingest_files_batch(
     auto_tag: bool = False,
 ) -> list[IngestResult]:
     """
-    Ingest multiple files.
+    Ingest multiple files through the staged ingest pipeline.
+
+    Files are parsed in a process pool, embedded in cross-document batches
+    and stored concurrently (see knowledge.ingest.pipeline).
 
     Args:
         paths: List of file paths
@@ -377,13 +489,13 @@ async def ingest_files_batch(
         auto_tag: Auto-generate tags using LLM (default False)
 
     Returns:
-        List of IngestResult for each file
+        List of IngestResult for each file (same order as paths)
     """
-    results = []
-    for path in paths:
-        result = await ingest_file(path, tags=tags, settings=settings, auto_tag=auto_tag)
-        results.append(result)
-    return results
+    from knowledge.ingest.pipeline import run_ingest_pipeline
+
+    resolved = [Path(path).resolve() for path in paths]
+    report = await run_ingest_pipeline(resolved, tags=tags, settings=settings, auto_tag=auto_tag)
+    return [report.results[path] for path in resolved]
 
 
 def scan_directory(
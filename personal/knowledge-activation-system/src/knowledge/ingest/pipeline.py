@@ -0,0 +1,387 @@
+"""Streaming directory ingest pipeline.
+
+Files flow through five stages connected by bounded queues; a full queue
+blocks the stage feeding it, so memory stays flat however many files are
+discovered:
+
+    discover -> parse -> chunk -> embed -> store
+
+- parse: read_file (PDF text extraction) in a process pool
+- chunk: validation, frontmatter and chunking, also in the process pool
+- embed: chunks from several documents share one embed_batch call
+- store: Obsidian note plus content/chunk rows, several writers at once
+
+Finished files are appended to a progress file so an interrupted run can
+resume without re-reading them. Transient failures (embedding, database)
+are not recorded and are retried on the next run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from knowledge.config import Settings, get_settings
+from knowledge.embeddings import embed_batch
+from knowledge.exceptions import IngestError
+from knowledge.ingest import IngestResult
+from knowledge.ingest.files import (
+    PreparedFile,
+    check_file,
+    prepare_content,
+    read_file,
+    resolve_tags,
+    store_entities,
+    store_file,
+)
+from knowledge.logging import get_logger
+
+logger = get_logger(__name__)
+
+STAGES = ("parse", "chunk", "embed", "store")
+
+# Queue sentinel telling a stage worker to exit
+_DONE: Any = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Per-stage concurrency and buffering."""
+
+    parse_workers: int = 4  # Processes (0 = threads in this process)
+    embed_workers: int = 2
+    store_workers: int = 4
+    queue_size: int = 32
+    embed_batch_chunks: int = 256
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> PipelineConfig:
+        return cls(
+            parse_workers=settings.ingest_parse_workers,
+            embed_workers=settings.ingest_embed_workers,
+            store_workers=settings.ingest_store_workers,
+            queue_size=settings.ingest_queue_size,
+            embed_batch_chunks=settings.ingest_embed_batch_chunks,
+        )
+
+
+@dataclass
+class StageStats:
+    """Work done by one stage, summed across its workers."""
+
+    items: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class PipelineReport:
+    """Outcome and throughput of a pipeline run."""
+
+    discovered: int = 0
+    skipped: int = 0  # Completed in a previous run
+    ingested: int = 0
+    failed: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    stages: dict[str, StageStats] = field(default_factory=lambda: {name: StageStats() for name in STAGES})
+    results: dict[Path, IngestResult] = field(default_factory=dict)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.ingested / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Flat summary for logging."""
+        return {
+            "discovered": self.discovered,
+            "skipped": self.skipped,
+            "ingested": self.ingested,
+            "failed": self.failed,
+            "chunks": self.chunks,
+            "elapsed_s": round(self.elapsed, 2),
+            "docs_per_s": round(self.docs_per_second, 2),
+            "chunks_per_s": round(self.chunks_per_second, 2),
+            **{f"{name}_busy_s": round(stats.busy_seconds, 2) for name, stats in self.stages.items()},
+        }
+
+
+class IngestProgress:
+    """
+    Append-only record of files already handled by the pipeline.
+
+    A file is identified by path, size and modification time, so an edited
+    file is ingested again on the next run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._done: set[tuple[str, int, int]] = set()
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                    self._done.add((entry["path"], entry["size"], entry["mtime_ns"]))
+                except (ValueError, KeyError):
+                    continue  # Torn final line from an interrupted run
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    @staticmethod
+    def _identity(file: Path) -> tuple[str, int, int]:
+        stat = file.stat()
+        return (str(file), stat.st_size, stat.st_mtime_ns)
+
+    def is_done(self, file: Path) -> bool:
+        try:
+            return self._identity(file) in self._done
+        except OSError:
+            return False
+
+    def record(self, file: Path, result: IngestResult) -> None:
+        try:
+            path, size, mtime_ns = self._identity(file)
+        except OSError:
+            return
+        self._done.add((path, size, mtime_ns))
+        entry = {"path": path, "size": size, "mtime_ns": mtime_ns, "success": result.success}
+        if result.error:
+            entry["error"] = result.error
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def default_progress_path(directory: str | Path, settings: Settings | None = None) -> Path:
+    """Progress file for a directory under settings.ingest_progress_dir."""
+    settings = settings or get_settings()
+    key = hashlib.sha256(str(Path(directory).resolve()).encode()).hexdigest()[:16]
+    return Path(settings.ingest_progress_dir).expanduser() / f"{key}.jsonl"
+
+
+@dataclass
+class _Document:
+    """A file moving through the pipeline."""
+
+    path: Path
+    file_type: str
+    raw: tuple[str, dict[str, str | int], Any] | None = None  # read_file output
+    prepared: PreparedFile | None = None
+    embeddings: list[list[float]] | None = None
+    failed: bool = False
+
+
+async def run_ingest_pipeline(
+    paths: Iterable[str | Path],
+    tags: list[str] | None = None,
+    settings: Settings | None = None,
+    auto_tag: bool = False,
+    auto_extract_entities: bool = True,
+    progress_path: Path | None = None,
+    config: PipelineConfig | None = None,
+    on_result: Callable[[Path, IngestResult], None] | None = None,
+) -> PipelineReport:
+    """
+    Ingest files through the staged pipeline.
+
+    Args:
+        paths: Files to ingest (consumed lazily)
+        tags: Tags applied to every file
+        settings: Optional settings override
+        auto_tag: Auto-generate tags using LLM (default False)
+        auto_extract_entities: Extract entities after storing (default True)
+        progress_path: Progress file for resuming (None disables it)
+        config: Stage configuration (default from settings)
+        on_result: Called as each file finishes
+
+    Returns:
+        PipelineReport with per-file results and throughput
+    """
+    settings = settings or get_settings()
+    config = config or PipelineConfig.from_settings(settings)
+    report = PipelineReport()
+    progress = IngestProgress(progress_path) if progress_path else None
+    loop = asyncio.get_running_loop()
+    # None runs parse/chunk on the default thread pool
+    executor: Executor | None = ProcessPoolExecutor(config.parse_workers) if config.parse_workers > 0 else None
+    cpu_workers = max(config.parse_workers, 1)
+
+    parse_queue: asyncio.Queue[Any] = asyncio.Queue(config.queue_size)
+    chunk_queue: asyncio.Queue[Any] = asyncio.Queue(config.queue_size)
+    embed_queue: asyncio.Queue[Any] = asyncio.Queue(config.queue_size)
+    store_queue: asyncio.Queue[Any] = asyncio.Queue(config.queue_size)
+
+    def finish(doc_path: Path, result: IngestResult, permanent: bool = True) -> None:
+        report.results[doc_path] = result
+        if result.success:
+            report.ingested += 1
+            report.chunks += result.chunks_created
+        else:
+            report.failed += 1
+            logger.debug("ingest_pipeline_file_failed", path=str(doc_path), error=result.error)
+        if progress is not None and permanent:
+            progress.record(doc_path, result)
+        if on_result is not None:
+            on_result(doc_path, result)
+
+    def fail(doc: _Document, error: Exception) -> None:
+        doc.failed = True
+        if isinstance(error, IngestError):
+            finish(doc.path, IngestResult(success=False, error=error.message))
+        else:
+            finish(doc.path, IngestResult(success=False, error=f"Failed to process file: {error}"), permanent=False)
+
+    async def discover() -> None:
+        for raw_path in paths:
+            path = Path(raw_path).resolve()
+            report.discovered += 1
+            if progress is not None and progress.is_done(path):
+                report.skipped += 1
+                continue
+            try:
+                file_type = check_file(path)
+            except IngestError as e:
+                finish(path, IngestResult(success=False, error=e.message))
+                continue
+            await parse_queue.put(_Document(path, file_type))
+        for _ in range(cpu_workers):
+            await parse_queue.put(_DONE)
+
+    async def stage(
+        name: str,
+        inbox: asyncio.Queue[Any],
+        outbox: asyncio.Queue[Any] | None,
+        workers: int,
+        next_workers: int,
+        handle: Callable[[list[_Document]], Awaitable[None]],
+        batch: Callable[[_Document, asyncio.Queue[Any]], list[_Document]] | None = None,
+    ) -> None:
+        stats = report.stages[name]
+
+        async def worker() -> None:
+            while (doc := await inbox.get()) is not _DONE:
+                docs = batch(doc, inbox) if batch else [doc]
+                start = time.perf_counter()
+                await handle(docs)
+                stats.busy_seconds += time.perf_counter() - start
+                stats.items += len(docs)
+                if outbox is not None:
+                    for d in docs:
+                        if not d.failed:
+                            await outbox.put(d)
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(workers):
+                group.create_task(worker())
+        # Upstream is drained: tell each downstream worker to exit
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def parse(docs: list[_Document]) -> None:
+        (doc,) = docs
+        try:
+            doc.raw = await loop.run_in_executor(executor, read_file, doc.path, doc.file_type)
+        except Exception as e:
+            fail(doc, e)
+
+    async def chunk(docs: list[_Document]) -> None:
+        (doc,) = docs
+        try:
+            doc.prepared = await loop.run_in_executor(executor, prepare_content, doc.path, *doc.raw)  # type: ignore[misc]
+        except Exception as e:
+            fail(doc, e)
+        doc.raw = None  # Release the raw text early
+
+    def gather_embed_batch(doc: _Document, inbox: asyncio.Queue[Any]) -> list[_Document]:
+        """Take queued documents until the chunk budget is reached."""
+        docs = [doc]
+        total = len(doc.prepared.chunks)  # type: ignore[union-attr]
+        while total < config.embed_batch_chunks and not inbox.empty():
+            more = inbox.get_nowait()
+            if more is _DONE:
+                inbox.put_nowait(more)  # Leave it for this worker's next get
+                break
+            docs.append(more)
+            total += len(more.prepared.chunks)
+        return docs
+
+    async def embed(docs: list[_Document]) -> None:
+        prepared = [doc.prepared for doc in docs if doc.prepared is not None]
+        texts = [chunk.text for p in prepared for chunk in p.chunks]
+        try:
+            embeddings = await embed_batch(texts)
+        except Exception as e:
+            for doc in docs:
+                fail(doc, e)
+            return
+        offset = 0
+        for doc, p in zip(docs, prepared, strict=True):
+            doc.embeddings = embeddings[offset : offset + len(p.chunks)]
+            offset += len(p.chunks)
+
+    async def store(docs: list[_Document]) -> None:
+        (doc,) = docs
+        prepared, embeddings = doc.prepared, doc.embeddings
+        if prepared is None or embeddings is None:
+            return
+        try:
+            final_tags = await resolve_tags(prepared, tags, auto_tag)
+            content_id, note_path = await store_file(prepared, embeddings, final_tags, settings)
+        except Exception as e:
+            fail(doc, e)
+            return
+        entities = 0
+        if auto_extract_entities:
+            entities = await store_entities(content_id, prepared.title, prepared.content)
+        finish(
+            doc.path,
+            IngestResult(
+                success=True,
+                content_id=content_id,
+                filepath=note_path,
+                title=prepared.title,
+                chunks_created=len(prepared.chunks),
+                entities_extracted=entities,
+            ),
+        )
+
+    started = time.perf_counter()
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(discover())
+            group.create_task(stage("parse", parse_queue, chunk_queue, cpu_workers, cpu_workers, parse))
+            group.create_task(
+                stage("chunk", chunk_queue, embed_queue, cpu_workers, config.embed_workers, chunk)
+            )
+            group.create_task(
+                stage(
+                    "embed", embed_queue, store_queue, config.embed_workers, config.store_workers,
+                    embed, batch=gather_embed_batch,
+                )
+            )
+            group.create_task(stage("store", store_queue, None, config.store_workers, 0, store))
+    finally:
+        report.elapsed = time.perf_counter() - started
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if progress is not None:
+            progress.close()
+
+    logger.info("ingest_pipeline_complete", **report.summary())
+    return report
@@ -327,11 +327,25 @@ if PROMETHEUS_AVAILABLE:
         "kas_cache_connected",
         "Cache connection status (1=connected, 0=disconnected)",
     )
+
+    cache_hit_rate = Gauge(
+        "kas_cache_hit_rate",
+        "Cache hit rate since process start (0-1)",
+        ["cache_type"],
+    )
+
+    cache_generation = Gauge(
+        "kas_cache_generation",
+        "Search cache generation per namespace ('*' = all namespaces)",
+        ["namespace"],
+    )
 else:
     cache_hits_total = _StubMetric()  # type: ignore[assignment]
     cache_misses_total = _StubMetric()  # type: ignore[assignment]
     cache_errors_total = _StubMetric()  # type: ignore[assignment]
     cache_connected = _StubMetric()  # type: ignore[assignment]
+    cache_hit_rate = _StubMetric()  # type: ignore[assignment]
+    cache_generation = _StubMetric()  # type: ignore[assignment]
 
 
 # =============================================================================
@@ -453,6 +467,22 @@ def update_cache_connection_status(connected: bool) -> None:
     cache_connected.set(1 if connected else 0)
 
 
+def update_cache_metrics(
+    connected: bool,
+    stats: dict[str, dict[str, Any]],
+    generations: dict[str, int],
+) -> None:
+    """Update cache gauges from RedisCache.get_stats() and get_generations()."""
+    if not PROMETHEUS_AVAILABLE:
+        return
+    cache_connected.set(1 if connected else 0)
+    for cache_type, type_stats in stats.items():
+        total = type_stats["hits"] + type_stats["misses"]
+        cache_hit_rate.labels(cache_type=cache_type).set(type_stats["hits"] / total if total else 0.0)
+    for namespace, generation in generations.items():
+        cache_generation.labels(namespace=namespace).set(generation)
+
+
 def record_query_expansion(terms_added: int) -> None:
     """Record a query expansion operation."""
     if not PROMETHEUS_AVAILABLE:
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from dataclasses import dataclass
+from uuid import UUID
 
 import httpx
 
 from knowledge.ai import AIProvider, AIResponse
+from knowledge.cache import CacheType, get_cache
+from knowledge.config import get_settings
+from knowledge.embeddings import embed_batch
 from knowledge.logging import get_logger
-from knowledge.search import SearchResult, hybrid_search
+from knowledge.query_router import QueryType, analyze_query, classify_query
+from knowledge.search import SearchResult, hybrid_search, hybrid_search_with_status
 
 logger = get_logger(__name__)
 
@@ -105,21 +111,38 @@ def _parse_sub_queries(content: str) -> list[str]:
     return sub_queries[:3]  # Limit to 3
 
 
+def _normalize_query(query: str) -> str:
+    """Decomposition cache key: case and whitespace insensitive."""
+    return " ".join(query.lower().split())
+
+
 async def decompose_query(
     query: str,
     ai: AIProvider | None = None,
     use_ollama: bool = False,
+    use_cache: bool = True,
 ) -> list[str]:
     """Decompose complex query into sub-questions.
 
+    Successful decompositions are cached per normalized query; fallbacks
+    to the original query are not, so a later call can retry the LLM.
+
     Args:
         query: Complex user query
         ai: Optional AI provider instance
         use_ollama: Force use of local Ollama instead of OpenRouter
+        use_cache: Use the decomposition cache (default True)
 
     Returns:
         List of simpler sub-questions (max 3)
     """
+    cache = await get_cache() if use_cache else None
+    if cache is not None:
+        cached = await cache.get(CacheType.DECOMPOSITION, _normalize_query(query))
+        if cached:
+            logger.debug("decomposition_cache_hit", query=query[:50])
+            return list(cached)
+
     prompt = DECOMPOSE_PROMPT.format(query=query)
     raw_content = None
 
@@ -197,9 +220,39 @@ async def decompose_query(
         sub_query_count=len(sub_queries),
     )
 
+    if cache is not None:
+        await cache.set(CacheType.DECOMPOSITION, sub_queries, _normalize_query(query))
+
     return sub_queries
 
 
+def merge_hops(hops: list[list[SearchResult]], k: int = 60) -> list[SearchResult]:
+    """Merge per-hop result lists with reciprocal rank fusion.
+
+    A result found by several hops keeps one entry (the copy with the best
+    score) and accumulates 1 / (k + rank) from every hop that returned it.
+    Ties in fused rank fall back to the hybrid score.
+
+    Args:
+        hops: Ranked results of each sub-query
+        k: RRF constant
+
+    Returns:
+        Deduplicated results ordered by fused rank
+    """
+    fused: dict[UUID, float] = {}
+    best: dict[UUID, SearchResult] = {}
+
+    for results in hops:
+        for rank, result in enumerate(results, start=1):
+            content_id = result.content_id
+            fused[content_id] = fused.get(content_id, 0.0) + 1.0 / (k + rank)
+            if content_id not in best or result.score > best[content_id].score:
+                best[content_id] = result
+
+    return sorted(best.values(), key=lambda r: (fused[r.content_id], r.score), reverse=True)
+
+
 async def multihop_search(
     query: str,
     limit: int = 10,
@@ -208,8 +261,9 @@ async def multihop_search(
 ) -> MultiHopResult:
     """Execute multi-hop search for complex queries.
 
-    Decomposes the query into sub-questions, searches each,
-    and combines/deduplicates results.
+    Decomposes the query into sub-questions (skipped when the router
+    classifies it as a simple lookup), embeds all sub-questions in one
+    batch, searches them concurrently and merges the hops with RRF.
 
     Args:
         query: Complex user query
@@ -220,32 +274,41 @@ async def multihop_search(
     Returns:
         MultiHopResult with combined results
     """
-    # Decompose query
-    sub_queries = await decompose_query(query, ai)
-
-    # Search each sub-query
-    all_results: list[SearchResult] = []
-    seen_ids: set[str] = set()
+    settings = get_settings()
 
-    for sq in sub_queries:
-        # Search with smaller limit per sub-query
-        per_query_limit = max(5, limit // len(sub_queries))
+    # Simple lookups gain nothing from decomposition
+    if classify_query(query) == QueryType.SIMPLE:
+        sub_queries = [query]
+    else:
+        sub_queries = await decompose_query(query, ai)
 
-        results = await hybrid_search(
-            query=sq,
-            limit=per_query_limit,
-            namespace=namespace,
-        )
+    # One embedding request for every hop; searches embed on their own if it fails
+    embeddings: list[list[float] | None]
+    try:
+        embeddings = list(await embed_batch(sub_queries))
+    except Exception as e:
+        logger.warning("multihop_embedding_failed", error=str(e))
+        embeddings = [None] * len(sub_queries)
+
+    # Search with smaller limit per sub-query
+    per_query_limit = max(5, limit // len(sub_queries))
+    semaphore = asyncio.Semaphore(settings.multihop_max_concurrency)
+
+    async def search_hop(sq: str, embedding: list[float] | None) -> list[SearchResult]:
+        async with semaphore:
+            response = await hybrid_search_with_status(
+                query=sq,
+                limit=per_query_limit,
+                namespace=namespace,
+                query_embedding=embedding,
+            )
+        return response.results
 
-        # Add unique results
-        for result in results:
-            content_id = str(result.content_id)
-            if content_id not in seen_ids:
-                seen_ids.add(content_id)
-                all_results.append(result)
+    hops = await asyncio.gather(
+        *(search_hop(sq, emb) for sq, emb in zip(sub_queries, embeddings, strict=True))
+    )
 
-    # Sort by score and limit
-    all_results.sort(key=lambda r: r.score, reverse=True)
+    all_results = merge_hops(list(hops), k=settings.rrf_k)
     final_results = all_results[:limit]
 
     logger.debug(
@@ -284,8 +347,6 @@ async def search_with_routing(
     Returns:
         List of search results
     """
-    from knowledge.query_router import QueryType, analyze_query
-
     query_type, params = analyze_query(query)
 
     # Use multi-hop for complex/comparison queries
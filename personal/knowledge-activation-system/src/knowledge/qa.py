@@ -3,13 +3,34 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
+import hashlib
+import time
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-
-from knowledge.ai import generate_answer
+from typing import Any
+
+import numpy as np
+
+from knowledge.ai import (
+    ANSWER_SYSTEM_PROMPT,
+    ANSWER_TEMPERATURE,
+    AnswerStream,
+    build_answer_prompt,
+    generate_answer,
+    get_ai_provider,
+)
+from knowledge.cache import CacheType, get_cache
 from knowledge.config import get_settings
-from knowledge.reranker import rerank_results
-from knowledge.search import SearchResult, hybrid_search
+from knowledge.embeddings import embed_text
+from knowledge.logging import get_logger
+from knowledge.reranker import get_reranker, rerank_results
+from knowledge.search import Candidate, SearchResult, hybrid_search, hybrid_search_with_status
+
+logger = get_logger(__name__)
+
+# Near-duplicate queries remembered per retrieved context
+ANSWER_NEIGHBOURS = 8
 
 
 class ConfidenceLevel(Enum):
@@ -42,6 +63,7 @@ class QAResult:
     citations: list[Citation] = field(default_factory=list)
     warning: str | None = None
     error: str | None = None
+    cached: bool = False
 
     @property
     def success(self) -> bool:
@@ -49,6 +71,20 @@ class QAResult:
         return self.error is None and bool(self.answer)
 
 
+@dataclass
+class AskEvent:
+    """One step of a streamed answer.
+
+    Events arrive as: ``context`` (confidence and citations, once retrieval
+    and reranking finish), zero or more ``token`` events, then ``done`` with
+    the full answer, any warning or error, and whether the answer came from
+    the answer cache. ``done`` is always last.
+    """
+
+    event: str
+    data: dict[str, Any]
+
+
 def calculate_confidence(
     results: list[SearchResult],
     top_n: int = 3,
@@ -118,6 +154,129 @@ def build_citations(
     return citations
 
 
+def normalize_query(query: str) -> str:
+    """Normalize a question for answer cache keys (case, spacing, end punctuation)."""
+    return " ".join(query.lower().split()).rstrip("?!. ")
+
+
+def context_fingerprint(results: list[SearchResult]) -> str:
+    """
+    Fingerprint the answer context: ordered content ids and chunk text versions.
+
+    Args:
+        results: Reranked results used as LLM context
+
+    Returns:
+        Hex digest that changes if any context item, its text or the order changes
+    """
+    digest = hashlib.sha256()
+    for result in results:
+        digest.update(result.content_id.bytes)
+        digest.update(hashlib.sha256((result.chunk_text or "").encode()).digest())
+    return digest.hexdigest()[:32]
+
+
+def _neighbours_key(fingerprint: str) -> tuple[str, ...]:
+    """
+    Cache key arguments for a context's near-duplicate question list.
+
+    Answers are keyed by (normalized query, fingerprint); the extra element
+    keeps this key distinct from every answer key, including that of a
+    question that normalizes to "neighbours".
+    """
+    return ("neighbours", fingerprint, "embeddings")
+
+
+async def get_cached_answer(query: str, results: list[SearchResult]) -> str | None:
+    """
+    Look up a previous answer to this question over the same context.
+
+    Exact matches use the normalized query. With answer_cache_similarity set,
+    a near-duplicate question (query embedding cosine at or above the
+    threshold) over the same context also matches.
+
+    Args:
+        query: User's question
+        results: Reranked results that would be used as context
+
+    Returns:
+        Cached answer text, or None
+    """
+    settings = get_settings()
+    if not settings.answer_cache_enabled:
+        return None
+    cache = await get_cache()
+    if not cache.is_connected:
+        return None
+
+    fingerprint = context_fingerprint(results)
+    answer = await cache.get(CacheType.ANSWER, normalize_query(query), fingerprint)
+    if isinstance(answer, str) or settings.answer_cache_similarity <= 0:
+        return answer if isinstance(answer, str) else None
+
+    neighbours = await cache.get(CacheType.ANSWER, *_neighbours_key(fingerprint))
+    if not neighbours:
+        return None
+    embedding = await _query_embedding(query)
+    if embedding is None:
+        return None
+
+    candidates = np.asarray([n["embedding"] for n in neighbours], dtype=np.float32)
+    similarities = candidates @ embedding / (np.linalg.norm(candidates, axis=1) + 1e-12)
+    best = int(np.argmax(similarities))
+    if similarities[best] < settings.answer_cache_similarity:
+        return None
+    logger.debug("answer_cache_near_hit", query=query[:50], similarity=float(similarities[best]))
+    return str(neighbours[best]["answer"])
+
+
+async def store_answer(query: str, results: list[SearchResult], answer: str) -> None:
+    """
+    Cache an answer under its question and context fingerprint.
+
+    Entries are tagged with the context's content ids, so re-ingesting or
+    deleting any of them drops the answer (see Database._invalidate_answers).
+
+    Args:
+        query: User's question
+        results: Reranked results used as context
+        answer: Generated answer
+    """
+    settings = get_settings()
+    if not settings.answer_cache_enabled:
+        return
+    cache = await get_cache()
+    if not cache.is_connected:
+        return
+
+    fingerprint = context_fingerprint(results)
+    tags = list(dict.fromkeys(str(r.content_id) for r in results))
+    await cache.set_tagged(CacheType.ANSWER, answer, tags, normalize_query(query), fingerprint)
+
+    if settings.answer_cache_similarity > 0:
+        embedding = await _query_embedding(query)
+        if embedding is None:
+            return
+        neighbours = await cache.get(CacheType.ANSWER, *_neighbours_key(fingerprint))
+        if not isinstance(neighbours, list):
+            neighbours = []
+        neighbours.append({"embedding": embedding.tolist(), "answer": answer})
+        await cache.set_tagged(
+            CacheType.ANSWER, neighbours[-ANSWER_NEIGHBOURS:], tags, *_neighbours_key(fingerprint)
+        )
+
+
+async def _query_embedding(query: str) -> np.ndarray | None:
+    """Unit-length query embedding (served from the embedding cache after search)."""
+    try:
+        embedding = np.asarray(await embed_text(query), dtype=np.float32)
+    except Exception as e:
+        logger.debug("answer_cache_embedding_failed", error=str(e))
+        return None
+    norm = float(np.linalg.norm(embedding))
+    return embedding / norm if norm > 0 else None
+
+
 async def ask(
     query: str,
     limit: int = 10,
@@ -203,6 +362,18 @@ async def ask(
             for r in ranked_results
         ]
 
+        cached_answer = await get_cached_answer(query, ranked_results)
+        if cached_answer is not None:
+            return QAResult(
+                query=query,
+                answer=cached_answer,
+                confidence=confidence_level,
+                confidence_score=confidence_score,
+                citations=citations,
+                warning=warning,
+                cached=True,
+            )
+
         settings = get_settings()
         try:
             ai_response = await asyncio.wait_for(
@@ -231,6 +402,8 @@ async def ask(
                 error=f"Failed to generate answer: {ai_response.error}",
             )
 
+        await store_answer(query, ranked_results, ai_response.content)
+
         return QAResult(
             query=query,
             answer=ai_response.content,
@@ -250,6 +423,181 @@ async def ask(
         )
 
 
+async def ask_stream(
+    query: str,
+    limit: int = 10,
+    rerank_top_k: int = 5,
+    min_confidence: float = 0.0,
+) -> AsyncIterator[AskEvent]:
+    """
+    Answer a question, streaming tokens as they are generated.
+
+    Same result as ask(), but the stages overlap instead of running back to back:
+    1. The LLM request is opened (connection, headers, system prompt) before search starts
+    2. BM25 candidates are reranked as soon as they arrive, while vector search runs;
+       the scores land in the rerank cache, so the final rerank only scores new passages
+    3. The prompt is sent as soon as reranking finishes and tokens are yielded as they arrive
+
+    Args:
+        query: User's question
+        limit: Number of search results to retrieve
+        rerank_top_k: Number of results to use after reranking
+        min_confidence: Minimum confidence to generate answer (0-1)
+
+    Yields:
+        AskEvent items (see AskEvent for the order)
+    """
+    settings = get_settings()
+    stream = await _open_answer_stream()
+    speculative: asyncio.Task[list[float]] | None = None
+
+    def rerank_bm25(candidates: list[Candidate]) -> None:
+        nonlocal speculative
+        texts = [chunk_text or title for _, title, _, _, chunk_text, _ in candidates[:limit]]
+        speculative = asyncio.create_task(get_reranker().score(query, texts, use_cache=True))
+
+    def done(
+        answer: str = "",
+        warning: str | None = None,
+        error: str | None = None,
+        cached: bool = False,
+    ) -> AskEvent:
+        return AskEvent("done", {"answer": answer, "warning": warning, "error": error, "cached": cached})
+
+    try:
+        try:
+            response = await hybrid_search_with_status(query, limit=limit, on_bm25_results=rerank_bm25)
+            if speculative is not None:
+                try:
+                    await speculative
+                except Exception as e:
+                    logger.warning("speculative_rerank_failed", error=str(e))
+
+            if not response.results:
+                yield done(error="No relevant content found in knowledge base.")
+                return
+
+            ranked_results = await rerank_results(query, response.results, top_k=rerank_top_k)
+        except Exception as e:
+            yield done(error=f"Q&A failed: {str(e)}")
+            return
+
+        if not ranked_results:
+            yield done(error="Reranking failed.")
+            return
+
+        confidence_level, confidence_score = calculate_confidence(ranked_results)
+        warning = None
+        if confidence_score < min_confidence:
+            warning = (
+                f"Confidence too low ({confidence_score:.2f} < {min_confidence}). "
+                "The knowledge base may not contain relevant information for this query."
+            )
+        elif confidence_level == ConfidenceLevel.LOW:
+            warning = (
+                "Low confidence answer. The knowledge base may not contain "
+                "sufficient information for this query."
+            )
+
+        yield AskEvent(
+            "context",
+            {
+                "confidence": confidence_level.value,
+                "confidence_score": confidence_score,
+                "citations": [asdict(c) for c in build_citations(ranked_results)],
+                "warning": warning,
+            },
+        )
+        if confidence_score < min_confidence:
+            yield done(warning=warning)
+            return
+
+        context = [
+            {"title": r.title, "text": r.chunk_text or "", "source": r.source_ref or ""}
+            for r in ranked_results
+        ]
+        cached_answer = await get_cached_answer(query, ranked_results)
+        if cached_answer is not None:
+            yield AskEvent("token", {"text": cached_answer})
+            yield done(cached_answer, warning, cached=True)
+            return
+
+        deadline = time.monotonic() + settings.llm_timeout
+        parts: list[str] = []
+
+        if stream is not None:
+            stream.send(build_answer_prompt(query, context))
+            tokens = stream.tokens()
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    token = await asyncio.wait_for(anext(tokens), timeout=max(remaining, 0))
+                    parts.append(token)
+                    yield AskEvent("token", {"text": token})
+            except StopAsyncIteration:
+                pass
+            except TimeoutError:
+                await tokens.aclose()
+                yield done(
+                    "".join(parts),
+                    warning="LLM generation timed out. Results shown without synthesized answer.",
+                    error=f"LLM timeout after {settings.llm_timeout}s",
+                )
+                return
+            except Exception as e:
+                if parts:
+                    yield done("".join(parts), warning, f"Answer stream interrupted: {str(e)}")
+                    return
+                logger.warning("answer_stream_failed", model=stream.model, error=str(e))
+
+            if parts:
+                answer = "".join(parts)
+                await store_answer(query, ranked_results, answer)
+                yield done(answer, warning)
+                return
+
+        # No stream (or it failed before the first token): fall back across models
+        try:
+            ai_response = await asyncio.wait_for(
+                generate_answer(query, context),
+                timeout=max(deadline - time.monotonic(), 0),
+            )
+        except TimeoutError:
+            yield done(
+                warning="LLM generation timed out. Results shown without synthesized answer.",
+                error=f"LLM timeout after {settings.llm_timeout}s",
+            )
+            return
+
+        if not ai_response.success:
+            yield done(error=f"Failed to generate answer: {ai_response.error}")
+            return
+
+        await store_answer(query, ranked_results, ai_response.content)
+        yield AskEvent("token", {"text": ai_response.content})
+        yield done(ai_response.content, warning)
+
+    finally:
+        if speculative is not None and not speculative.done():
+            speculative.cancel()
+        if stream is not None:
+            await stream.aclose()
+
+
+async def _open_answer_stream() -> AnswerStream | None:
+    """Open the answer request ahead of retrieval, or None if streaming is unavailable."""
+    try:
+        provider = await get_ai_provider()
+        return await provider.open_stream(
+            system_prompt=ANSWER_SYSTEM_PROMPT,
+            max_tokens=1024,
+            temperature=ANSWER_TEMPERATURE,
+        )
+    except Exception as e:
+        logger.debug("answer_stream_unavailable", error=str(e))
+        return None
+
+
 async def search_and_summarize(
     query: str,
     limit: int = 5,
@@ -5,6 +5,9 @@ Expands user queries with:
 - Synonyms and related terms
 - Acronym expansions
 - Common variations
+
+The synonym dictionary is compiled into a SynonymIndex at import time and
+recompiled by add_synonym; expand_query never leaves the process.
 """
 
 from __future__ import annotations
@@ -12,7 +15,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 
-from knowledge.cache import CacheType, get_cache
+from knowledge.cache import LRUCache
 from knowledge.config import get_settings
 from knowledge.logging import get_logger
 
@@ -177,17 +180,13 @@ for primary, synonyms in SYNONYMS.items():
 
 
 # =============================================================================
-# Query Expansion
+# Compiled Synonym Index
 # =============================================================================
 
+_PUNCTUATION = re.compile(r"[^\w\s]")
 
-@dataclass
-class ExpandedQuery:
-    """Result of query expansion."""
-    original: str
-    expanded: str
-    terms_added: list[str]
-    expansion_applied: bool
+# Expanded queries kept in-process (cleared whenever the index is rebuilt)
+EXPANSION_CACHE_SIZE = 4096
 
 
 def _normalize_term(term: str) -> str:
@@ -195,25 +194,95 @@ def _normalize_term(term: str) -> str:
     return term.lower().strip()
 
 
-def _extract_terms(query: str) -> list[str]:
-    """Extract searchable terms from query."""
-    # Remove punctuation for matching
-    clean_query = re.sub(r'[^\w\s]', '', query)
+def _tokenize(query: str) -> list[str]:
+    """Lowercase words of a query with punctuation removed."""
+    return _PUNCTUATION.sub("", query).lower().split()
 
-    # Split on whitespace and common delimiters
-    terms = re.split(r'[\s,;:]+', clean_query)
-    # Also try to find multi-word phrases
-    words = clean_query.lower().split()
 
-    # Check for 2-word and 3-word phrases
-    phrases = []
-    for i in range(len(words)):
-        if i + 1 < len(words):
-            phrases.append(" ".join(words[i:i+2]))
-        if i + 2 < len(words):
-            phrases.append(" ".join(words[i:i+3]))
+class SynonymIndex:
+    """
+    Frozen term/phrase -> expansions map compiled from the synonym dictionary.
+
+    Every primary term and synonym is a key, with its direct synonyms, its
+    primary and the primary's other synonyms resolved ahead of time. Keys
+    may span several words; ``prefixes`` holds the leading word sequences
+    of multi-word keys, so a phrase window only grows while some key can
+    still match.
+    """
 
-    return [t for t in terms + phrases if t]
+    __slots__ = ("expansions", "prefixes", "max_words")
+
+    def __init__(self, synonyms: dict[str, list[str]], reverse: dict[str, str]) -> None:
+        expansions: dict[str, tuple[str, ...]] = {}
+        for term in (*synonyms, *reverse):
+            if term in expansions:
+                continue
+            found = list(synonyms.get(term, []))
+            primary = reverse.get(term)
+            if primary is not None:
+                if primary != term:
+                    found.append(primary)
+                found.extend(s for s in synonyms.get(primary, []) if s != term)
+            if found:
+                expansions[term] = tuple(dict.fromkeys(found))
+
+        prefixes: set[str] = set()
+        max_words = 1
+        for key in expansions:
+            words = key.split()
+            max_words = max(max_words, len(words))
+            for n in range(1, len(words)):
+                prefixes.add(" ".join(words[:n]))
+
+        self.expansions = expansions
+        self.prefixes = frozenset(prefixes)
+        self.max_words = max_words
+
+    def match(self, words: list[str]) -> list[str]:
+        """Keys found in a tokenized query, in order of position."""
+        matched = []
+        for i in range(len(words)):
+            phrase = words[i]
+            for n in range(1, min(self.max_words, len(words) - i) + 1):
+                if n > 1:
+                    phrase = f"{phrase} {words[i + n - 1]}"
+                if phrase in self.expansions:
+                    matched.append(phrase)
+                if phrase not in self.prefixes:
+                    break
+        return matched
+
+    def expand(self, query: str) -> list[str]:
+        """Expansions of every key in the query, deduplicated in match order."""
+        found: dict[str, None] = {}
+        for key in self.match(_tokenize(query)):
+            found.update(dict.fromkeys(self.expansions[key]))
+        return list(found)
+
+
+_index = SynonymIndex(SYNONYMS, _REVERSE_SYNONYMS)
+_expansion_cache = LRUCache(EXPANSION_CACHE_SIZE)
+
+
+def rebuild_synonym_index() -> None:
+    """Recompile the index from SYNONYMS and drop cached expansions."""
+    global _index
+    _index = SynonymIndex(SYNONYMS, _REVERSE_SYNONYMS)
+    _expansion_cache.clear()
+
+
+# =============================================================================
+# Query Expansion
+# =============================================================================
+
+
+@dataclass
+class ExpandedQuery:
+    """Result of query expansion."""
+    original: str
+    expanded: str
+    terms_added: list[str]
+    expansion_applied: bool
 
 
 def expand_term(term: str) -> list[str]:
@@ -222,28 +291,16 @@ def expand_term(term: str) -> list[str]:
 
     Returns list of related terms (not including original).
     """
-    normalized = _normalize_term(term)
-    expansions = []
-
-    # Direct lookup
-    if normalized in SYNONYMS:
-        expansions.extend(SYNONYMS[normalized])
-
-    # Reverse lookup (synonym -> primary)
-    if normalized in _REVERSE_SYNONYMS:
-        primary = _REVERSE_SYNONYMS[normalized]
-        if primary != normalized:
-            expansions.append(primary)
-        # Also add other synonyms of the primary
-        expansions.extend(s for s in SYNONYMS.get(primary, []) if s != normalized)
-
-    return list(set(expansions))
+    return list(_index.expansions.get(_normalize_term(term), ()))
 
 
 async def expand_query(query: str) -> ExpandedQuery:
     """
     Expand a search query with synonyms and related terms.
 
+    Expansion is a lookup in the compiled synonym index; results are kept
+    in a process-local LRU, so no network round trip is involved.
+
     Args:
         query: Original search query
 
@@ -260,23 +317,18 @@ async def expand_query(query: str) -> ExpandedQuery:
             expansion_applied=False,
         )
 
-    # Check cache first
-    cache = await get_cache()
-    cached_result = await cache.get(CacheType.QUERY_EXPANSION, query)
-    if cached_result:
-        return ExpandedQuery(**cached_result)
-
-    # Extract and expand terms
-    terms = _extract_terms(query)
-    all_expansions: set[str] = set()
+    result = _expansion_cache.get(query)
+    if result is None:
+        result = _expand_query(query)
+        _expansion_cache.set(query, result)
+    return result
 
-    for term in terms:
-        expansions = expand_term(term)
-        all_expansions.update(expansions)
 
+def _expand_query(query: str) -> ExpandedQuery:
+    """Expand a query against the compiled index."""
     # Remove terms that are already in the query
     query_lower = query.lower()
-    new_terms = [t for t in all_expansions if t.lower() not in query_lower]
+    new_terms = [t for t in _index.expand(query) if t.lower() not in query_lower]
 
     # Build expanded query
     if new_terms:
@@ -293,18 +345,6 @@ async def expand_query(query: str) -> ExpandedQuery:
         expansion_applied=bool(new_terms),
     )
 
-    # Cache the result
-    await cache.set(
-        CacheType.QUERY_EXPANSION,
-        {
-            "original": result.original,
-            "expanded": result.expanded,
-            "terms_added": result.terms_added,
-            "expansion_applied": result.expansion_applied,
-        },
-        query,
-    )
-
     if result.expansion_applied:
         logger.debug(
             "query_expanded",
@@ -344,4 +384,6 @@ def add_synonym(primary: str, synonyms: list[str]) -> None:
     for syn in normalized_synonyms:
         _REVERSE_SYNONYMS[syn] = primary
 
+    rebuild_synonym_index()
+
     logger.info("synonyms_added", primary=primary, count=len(synonyms))  # type: ignore[call-arg]
@@ -6,14 +6,26 @@ mxbai-rerank-base-v1 or mxbai-rerank-large-v2 to improve search quality.
 Performance optimizations:
 - Model preloading at startup to avoid cold-start delays
 - Async prediction via thread pool to avoid blocking event loop
+- Micro-batching of pairs across concurrent requests (RerankScheduler)
+- Per-pair score cache keyed on (model, query hash, passage hash)
+- Optional int8-quantized ONNX Runtime backend for CPU-only hosts
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import platform
+from collections.abc import Callable
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from knowledge.cache import CacheType, get_cache
+from knowledge.config import get_settings
 from knowledge.logging import get_logger
 from knowledge.search import SearchResult
 
@@ -29,6 +41,267 @@ class RerankResult:
     original_score: float
 
 
+def _text_hash(text: str) -> str:
+    """Hash a query or passage for the rerank cache key."""
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+class RerankScheduler:
+    """Micro-batches cross-encoder scoring across concurrent requests.
+
+    Callers queue query-passage pairs; once ``max_wait_ms`` has passed since
+    the first queued pair, or ``max_pairs`` are waiting, every queued pair is
+    scored in one forward pass and each caller gets back its own scores.
+    Pairs are sorted by length before scoring so padded batches stay tight,
+    identical pairs are scored once, and batches run one at a time so
+    requests stop contending for the model.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[list[list[str]], int], list[float]],
+        max_wait_ms: float = 5.0,
+        max_pairs: int = 128,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            predict: Blocking scorer taking (pairs, batch_size), run in a thread
+            max_wait_ms: Longest time a pair waits for others to join its batch
+            max_pairs: Queue size that triggers scoring immediately
+        """
+        self._predict = predict
+        self.max_wait = max_wait_ms / 1000
+        self.max_pairs = max_pairs
+        self.batches = 0
+        self.pairs_scored = 0
+        self._pending: list[tuple[list[tuple[str, str]], asyncio.Future[list[float]]]] = []
+        self._pending_pairs = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score pairs as part of the next shared batch.
+
+        Args:
+            pairs: (query, passage) pairs
+
+        Returns:
+            Scores in pair order
+        """
+        if not pairs:
+            return []
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((pairs, future))
+        self._pending_pairs += len(pairs)
+
+        if self._pending_pairs >= self.max_pairs or self.max_wait <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand everything queued so far to a scoring task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending, self._pending_pairs = self._pending, [], 0
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self,
+        batch: list[tuple[list[tuple[str, str]], asyncio.Future[list[float]]]],
+    ) -> None:
+        """Score a batch and resolve each caller's future."""
+        slots: dict[tuple[str, str], int] = {}
+        for pairs, _ in batch:
+            for pair in pairs:
+                slots.setdefault(pair, len(slots))
+        distinct = list(slots)
+        order = sorted(range(len(distinct)), key=lambda i: len(distinct[i][0]) + len(distinct[i][1]))
+        scores = [0.0] * len(distinct)
+
+        try:
+            async with self._lock:
+                for start in range(0, len(order), self.max_pairs):
+                    window = order[start : start + self.max_pairs]
+                    predicted = await asyncio.to_thread(
+                        self._predict, [list(distinct[i]) for i in window], len(window)
+                    )
+                    for i, score in zip(window, predicted, strict=True):
+                        scores[i] = float(score)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.pairs_scored += len(distinct)
+        logger.debug("rerank_batch_scored", requests=len(batch), pairs=len(distinct))
+
+        for pairs, future in batch:
+            if not future.done():
+                future.set_result([scores[slots[pair]] for pair in pairs])
+
+
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+RERANK_BACKENDS = ("torch", "onnx")
+
+
+def export_quantized_onnx(model_name: str, output_dir: Path) -> Path:
+    """Export a cross-encoder to ONNX and quantize its weights to int8.
+
+    Uses dynamic quantization (no calibration data), targeting ARM64 on
+    Apple Silicon / aarch64 hosts and AVX2 elsewhere.
+
+    Args:
+        model_name: HuggingFace model name
+        output_dir: Directory for the exported graph and tokenizer
+
+    Returns:
+        Path to the quantized graph
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+    except ImportError as err:
+        raise ImportError(
+            "optimum required to export the ONNX reranker. "
+            "Install with: uv pip install 'knowledge-activation-system[onnx]'"
+        ) from err
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    else:
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    ORTQuantizer.from_pretrained(model).quantize(save_dir=output_dir, quantization_config=qconfig)
+
+    logger.info("reranker_onnx_exported", model=model_name, path=str(output_dir))
+    return output_dir / ONNX_QUANTIZED_FILE
+
+
+class OnnxCrossEncoder:
+    """Cross-encoder scored with ONNX Runtime from an int8-quantized graph.
+
+    Stands in for sentence-transformers' ``CrossEncoder``: ``predict`` takes
+    query-passage pairs and returns one score per pair, with the same
+    sigmoid activation for single-logit models.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        max_length: int = 512,
+        apply_sigmoid: bool = True,
+    ) -> None:
+        """Initialize from a loaded session and tokenizer.
+
+        Args:
+            session: onnxruntime InferenceSession
+            tokenizer: HuggingFace tokenizer for the model
+            max_length: Maximum tokens per pair
+            apply_sigmoid: Squash single-logit outputs to 0..1
+        """
+        self._session = session
+        self._tokenizer = tokenizer
+        self._input_names = [i.name for i in session.get_inputs()]
+        self.max_length = max_length
+        self.apply_sigmoid = apply_sigmoid
+
+    @classmethod
+    def load(cls, model_name: str, cache_dir: Path, max_length: int = 512) -> OnnxCrossEncoder:
+        """Load the quantized graph, exporting it on first use.
+
+        Args:
+            model_name: HuggingFace model name
+            cache_dir: Directory holding exported models
+            max_length: Maximum tokens per pair
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as err:
+            raise ImportError(
+                "onnxruntime required for the ONNX reranker backend. "
+                "Install with: uv pip install 'knowledge-activation-system[onnx]'"
+            ) from err
+
+        model_dir = cache_dir / model_name.replace("/", "--")
+        graph = model_dir / ONNX_QUANTIZED_FILE
+        if not graph.exists():
+            graph = export_quantized_onnx(model_name, model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(str(graph), options, providers=["CPUExecutionProvider"])
+
+        # Honour an explicit activation saved by sentence-transformers
+        apply_sigmoid = True
+        config_path = model_dir / "config.json"
+        if config_path.exists():
+            activation = json.loads(config_path.read_text()).get("sbert_ce_default_activation_function")
+            apply_sigmoid = activation is None or activation.endswith("Sigmoid")
+
+        return cls(session, AutoTokenizer.from_pretrained(model_dir), max_length, apply_sigmoid)
+
+    def predict(self, pairs: list[list[str]], batch_size: int = 32) -> np.ndarray:
+        """Score query-passage pairs.
+
+        Args:
+            pairs: [query, passage] pairs
+            batch_size: Pairs per forward pass
+
+        Returns:
+            Scores in pair order (logits per label for multi-label models)
+        """
+        outputs = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start : start + batch_size]
+            encoded = self._tokenizer(
+                [pair[0] for pair in batch],
+                [pair[1] for pair in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feeds = {
+                name: np.asarray(encoded[name], dtype=np.int64)
+                for name in self._input_names
+                if name in encoded
+            }
+            outputs.append(self._session.run(None, feeds)[0])
+
+        if not outputs:
+            return np.zeros(0, dtype=np.float32)
+
+        logits = np.concatenate(outputs)
+        if logits.ndim == 2 and logits.shape[1] == 1:
+            logits = logits[:, 0]
+            if self.apply_sigmoid:
+                return 1.0 / (1.0 + np.exp(-logits))
+        return logits
+
+
 class LocalReranker:
     """Local reranker using sentence-transformers cross-encoder models.
 
@@ -36,28 +309,59 @@ class LocalReranker:
     - mixedbread-ai/mxbai-rerank-base-v1 (faster, ~100MB)
     - mixedbread-ai/mxbai-rerank-large-v2 (better quality, ~1.4GB)
     - BAAI/bge-reranker-v2-m3 (multilingual)
+
+    With the ``onnx`` backend the same models run as int8-quantized ONNX
+    graphs under ONNX Runtime on the CPU, without loading torch.
     """
 
     def __init__(
         self,
         model_name: str = "mixedbread-ai/mxbai-rerank-base-v1",
         device: str | None = None,
+        backend: str | None = None,
     ) -> None:
         """Initialize the reranker.
 
         Args:
             model_name: HuggingFace model name for the cross-encoder
             device: Device to use ('cpu', 'cuda', 'mps'). Auto-detected if None.
+            backend: 'torch' or 'onnx' (default: settings.rerank_backend)
         """
         self.model_name = model_name
         self._model: Any = None
         self._device = device
+        self._backend = backend
+        self._scheduler: RerankScheduler | None = None
+
+    @property
+    def backend(self) -> str:
+        """Inference backend in use."""
+        if self._backend is None:
+            self._backend = get_settings().rerank_backend
+        return self._backend
+
+    @property
+    def cache_model_key(self) -> str:
+        """Model identity for cached scores (quantized scores differ slightly)."""
+        return f"{self.model_name}@onnx-int8" if self.backend == "onnx" else self.model_name
 
     def _load_model(self) -> None:
         """Lazy load the model on first use."""
         if self._model is not None:
             return
 
+        if self.backend not in RERANK_BACKENDS:
+            raise ValueError(f"Unknown reranker backend: {self.backend}")
+
+        if self.backend == "onnx":
+            self._device = "cpu"
+            self._model = OnnxCrossEncoder.load(
+                self.model_name,
+                Path(get_settings().rerank_onnx_dir).expanduser(),
+            )
+            logger.info(f"Loaded int8 ONNX reranker model {self.model_name}")
+            return
+
         try:
             from sentence_transformers import CrossEncoder
         except ImportError as err:
@@ -87,15 +391,60 @@ class LocalReranker:
         """Explicitly preload the model (call during startup)."""
         self._load_model()
 
-    def _predict_sync(self, pairs: list[list[str]]) -> list[float]:
+    def _predict_sync(self, pairs: list[list[str]], batch_size: int | None = None) -> list[float]:
         """Synchronous prediction (blocks the calling thread)."""
         self._load_model()
-        return self._model.predict(pairs).tolist()
+        if batch_size is None:
+            return self._model.predict(pairs).tolist()
+        return self._model.predict(pairs, batch_size=batch_size).tolist()
 
     async def _predict_async(self, pairs: list[list[str]]) -> list[float]:
         """Async prediction via thread pool (non-blocking)."""
         return await asyncio.to_thread(self._predict_sync, pairs)
 
+    @property
+    def scheduler(self) -> RerankScheduler:
+        """Cross-request batching scheduler for this model."""
+        if self._scheduler is None:
+            settings = get_settings()
+            self._scheduler = RerankScheduler(
+                self._predict_sync,
+                max_wait_ms=settings.rerank_batch_max_wait_ms,
+                max_pairs=settings.rerank_batch_max_pairs,
+            )
+        return self._scheduler
+
+    async def score(self, query: str, texts: list[str], use_cache: bool = False) -> list[float]:
+        """Score passages against a query through the batching scheduler.
+
+        Args:
+            query: Search query
+            texts: Passages to score
+            use_cache: Look up and store per-pair scores in the rerank cache
+
+        Returns:
+            Scores in passage order
+        """
+        pairs = [(query, text) for text in texts]
+        if not use_cache:
+            return await self.scheduler.score(pairs)
+
+        cache = await get_cache()
+        query_hash = _text_hash(query)
+        keys = [(self.cache_model_key, query_hash, _text_hash(text)) for text in texts]
+        cached = await cache.get_many(CacheType.RERANK, keys)
+
+        scores = [float(value) if value is not None else 0.0 for value in cached]
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if missing:
+            fresh = await self.scheduler.score([pairs[i] for i in missing])
+            for i, score in zip(missing, fresh, strict=True):
+                scores[i] = score
+            await cache.set_many(CacheType.RERANK, [(keys[i], scores[i]) for i in missing])
+
+        logger.debug("rerank_cache", total=len(texts), misses=len(missing))
+        return scores
+
     def rerank(
         self,
         query: str,
@@ -150,16 +499,18 @@ class LocalReranker:
         query: str,
         results: list[SearchResult],
         top_k: int | None = None,
+        use_cache: bool = False,
     ) -> list[RerankResult]:
         """Async rerank search results (non-blocking).
 
-        This method runs model prediction in a thread pool to avoid
-        blocking the async event loop.
+        Pairs are scored by the batching scheduler, which runs model
+        prediction in a thread pool shared with concurrent requests.
 
         Args:
             query: Original search query
             results: Search results to rerank
             top_k: Number of top results to return (None = all)
+            use_cache: Reuse cached per-pair scores
 
         Returns:
             List of RerankResult sorted by rerank score
@@ -167,14 +518,9 @@ class LocalReranker:
         if not results:
             return []
 
-        # Create query-document pairs
-        pairs = []
-        for result in results:
-            text = result.chunk_text or result.title
-            pairs.append([query, text])
-
-        # Get rerank scores (non-blocking)
-        scores = await self._predict_async(pairs)
+        # Get rerank scores (non-blocking, batched across requests)
+        texts = [result.chunk_text or result.title for result in results]
+        scores = await self.score(query, texts, use_cache=use_cache)
 
         # Combine with original results
         reranked = []
@@ -203,18 +549,20 @@ _preload_task: asyncio.Task[None] | None = None
 
 def get_reranker(
     model_name: str = "mixedbread-ai/mxbai-rerank-base-v1",
+    backend: str | None = None,
 ) -> LocalReranker:
     """Get or create the global reranker instance.
 
     Args:
         model_name: Model to use (only used on first call)
+        backend: 'torch' or 'onnx' (only used on first call; default from settings)
 
     Returns:
         LocalReranker instance
     """
     global _reranker
     if _reranker is None:
-        _reranker = LocalReranker(model_name=model_name)
+        _reranker = LocalReranker(model_name=model_name, backend=backend)
     return _reranker
 
 
@@ -262,23 +610,26 @@ async def rerank_results(
     results: list[SearchResult],
     top_k: int | None = None,
     model_name: str = "mixedbread-ai/mxbai-rerank-base-v1",
+    use_cache: bool = True,
 ) -> list[SearchResult]:
     """Convenience function to rerank and return SearchResults.
 
-    Uses async prediction to avoid blocking the event loop.
+    Uses async, cross-request batched prediction to avoid blocking the
+    event loop, and caches per-pair scores.
 
     Args:
         query: Original search query
         results: Search results to rerank
         top_k: Number of top results to return
         model_name: Reranker model to use
+        use_cache: Reuse cached per-pair scores (default True)
 
     Returns:
         List of SearchResult with updated scores from reranking
     """
     reranker = get_reranker(model_name)
     # Use async rerank to avoid blocking
-    reranked = await reranker.rerank_async(query, results, top_k)
+    reranked = await reranker.rerank_async(query, results, top_k, use_cache=use_cache)
 
     # Update scores to reflect reranking
     output = []
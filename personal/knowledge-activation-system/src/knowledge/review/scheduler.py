@@ -133,13 +133,7 @@ async def get_due_items(
                 r.fsrs_state,
                 r.next_review,
                 r.last_reviewed,
-                (
-                    SELECT chunk_text
-                    FROM chunks
-                    WHERE content_id = r.content_id
-                    ORDER BY chunk_index
-                    LIMIT 1
-                ) as preview_text
+                c.preview_text
             FROM review_queue r
             JOIN content c ON c.id = r.content_id
             WHERE r.status = 'active'
@@ -210,13 +204,7 @@ async def get_upcoming_items(
                 r.fsrs_state,
                 r.next_review,
                 r.last_reviewed,
-                (
-                    SELECT chunk_text
-                    FROM chunks
-                    WHERE content_id = r.content_id
-                    ORDER BY chunk_index
-                    LIMIT 1
-                ) as preview_text
+                c.preview_text
             FROM review_queue r
             JOIN content c ON c.id = r.content_id
             WHERE r.status = 'active'
@@ -3,22 +3,38 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 from uuid import UUID
 
-from knowledge.cache import CacheType, get_cache
+import numpy as np
+
+from knowledge.cache import CacheType, SingleFlight, get_cache
 from knowledge.config import Settings, get_settings
 from knowledge.db import Database, get_db
 from knowledge.embeddings import embed_text
 from knowledge.exceptions import CircuitOpenError
 from knowledge.logging import get_logger
 from knowledge.query_expansion import ExpandedQuery, expand_query
+from knowledge.tuning import (
+    get_effective_bm25_weight,
+    get_effective_rrf_k,
+    get_effective_vector_weight,
+    is_query_expansion_enabled,
+)
 
 logger = get_logger(__name__)
 
 
-@dataclass
+# (content_id, title, type, namespace, chunk_text, score) as returned by Database
+Candidate = tuple[UUID, str, str, str | None, str | None, float]
+
+# Quality score assumed for content without one (neutral factor of 1.0)
+DEFAULT_QUALITY = 0.5
+
+
+@dataclass(slots=True)
 class SearchResult:
     """Search result with RRF score."""
 
@@ -52,9 +68,147 @@ class HybridSearchResponse:
     expanded_terms: list[str] = field(default_factory=list)  # Terms added by expansion
 
 
+class RankFusion:
+    """
+    Columnar score fusion over BM25 and vector candidate lists.
+
+    Candidates are mapped to dense slots once, then RRF, source weights,
+    quality factors and the score threshold are applied as NumPy array
+    operations. Only the top ``limit`` slots are materialized as
+    SearchResult objects.
+    """
+
+    def __init__(self, bm25_results: Sequence[Candidate], vector_results: Sequence[Candidate]) -> None:
+        self._bm25 = bm25_results
+        self._vector = vector_results
+
+        slots: dict[UUID, int] = {}
+        self._bm25_slots = np.fromiter(
+            (slots.setdefault(row[0], len(slots)) for row in bm25_results),
+            dtype=np.intp,
+            count=len(bm25_results),
+        )
+        self._vector_slots = np.fromiter(
+            (slots.setdefault(row[0], len(slots)) for row in vector_results),
+            dtype=np.intp,
+            count=len(vector_results),
+        )
+        self.content_ids: list[UUID] = list(slots)
+
+        # Row of each slot in each source list (-1 when absent); 0-based rank
+        self._bm25_row = np.full(len(slots), -1, dtype=np.intp)
+        self._bm25_row[self._bm25_slots] = np.arange(len(bm25_results))
+        self._vector_row = np.full(len(slots), -1, dtype=np.intp)
+        self._vector_row[self._vector_slots] = np.arange(len(vector_results))
+
+    def __len__(self) -> int:
+        return len(self.content_ids)
+
+    def scores(
+        self,
+        k: int = 60,
+        bm25_weight: float = 1.0,
+        vector_weight: float = 1.0,
+        raw_bm25: bool = False,
+    ) -> np.ndarray:
+        """
+        Compute the fused score of every slot.
+
+        Args:
+            k: RRF constant
+            bm25_weight: Multiplier for the BM25 reciprocal rank term
+            vector_weight: Multiplier for the vector reciprocal rank term
+            raw_bm25: Use raw BM25 scores instead of RRF (BM25-only fallback)
+
+        Returns:
+            Array of scores indexed by slot
+        """
+        scores = np.zeros(len(self.content_ids))
+        if raw_bm25:
+            scores[self._bm25_slots] = np.fromiter(
+                (row[5] for row in self._bm25), dtype=np.float64, count=len(self._bm25)
+            )
+            return scores
+
+        # np.add.at accumulates repeated slots like the sum in RRF
+        bm25_ranks = np.arange(1, len(self._bm25) + 1, dtype=np.float64)
+        np.add.at(scores, self._bm25_slots, bm25_weight / (k + bm25_ranks))
+        vector_ranks = np.arange(1, len(self._vector) + 1, dtype=np.float64)
+        np.add.at(scores, self._vector_slots, vector_weight / (k + vector_ranks))
+        return scores
+
+    def quality_factors(self, quality_scores: Mapping[UUID, float]) -> np.ndarray:
+        """Quality factor per slot: 0.8 + 0.4 * quality (range 0.8 to 1.2)."""
+        quality = np.fromiter(
+            (quality_scores.get(cid, DEFAULT_QUALITY) for cid in self.content_ids),
+            dtype=np.float64,
+            count=len(self.content_ids),
+        )
+        return 0.8 + 0.4 * quality
+
+    def top(
+        self,
+        scores: np.ndarray,
+        limit: int | None = None,
+        min_score: float | None = None,
+    ) -> list[SearchResult]:
+        """
+        Select and materialize the highest scoring slots.
+
+        Ties keep first-seen order (BM25 candidates before vector-only ones).
+
+        Args:
+            scores: Array from scores(), optionally multiplied by quality factors
+            limit: Maximum results to return (None for all)
+            min_score: Drop results scoring below this threshold
+
+        Returns:
+            List of SearchResult sorted by score descending
+        """
+        selected = np.arange(len(scores)) if min_score is None else np.flatnonzero(scores >= min_score)
+        if limit is not None and len(selected) > limit:
+            if limit <= 0:
+                return []
+            # Keep everything tied with the limit-th score so tie-breaking stays stable
+            cutoff = np.partition(scores[selected], len(selected) - limit)[len(selected) - limit]
+            selected = selected[scores[selected] >= cutoff]
+        order = selected[np.lexsort((selected, -scores[selected]))][:limit]
+        return [self._materialize(int(slot), float(scores[slot])) for slot in order]
+
+    def _materialize(self, slot: int, score: float) -> SearchResult:
+        b = self._bm25_row[slot]
+        v = self._vector_row[slot]
+        bm25_row = self._bm25[b] if b >= 0 else None
+        vector_row = self._vector[v] if v >= 0 else None
+        first = bm25_row if bm25_row is not None else vector_row
+        assert first is not None  # Every slot comes from at least one result list
+
+        # Prefer chunk_text from vector results, namespace from whichever has one
+        chunk_text = first[4]
+        namespace = first[3]
+        if vector_row is not None:
+            if vector_row[4]:
+                chunk_text = vector_row[4]
+            if not namespace:
+                namespace = vector_row[3]
+
+        return SearchResult(
+            content_id=first[0],
+            title=first[1],
+            content_type=first[2],
+            score=score,
+            chunk_text=chunk_text,
+            namespace=namespace,
+            bm25_rank=int(b) + 1 if bm25_row is not None else None,
+            vector_rank=int(v) + 1 if vector_row is not None else None,
+            vector_similarity=vector_row[5] if vector_row is not None else None,
+            bm25_score=bm25_row[5] if bm25_row is not None else None,
+        )
+
+
 def rrf_fusion(
-    bm25_results: list[tuple[UUID, str, str, str | None, str | None, float]],
-    vector_results: list[tuple[UUID, str, str, str | None, str | None, float]],
+    bm25_results: list[Candidate],
+    vector_results: list[Candidate],
     k: int = 60,
 ) -> list[SearchResult]:
     """
@@ -70,84 +224,8 @@ def rrf_fusion(
     Returns:
         List of SearchResult sorted by combined RRF score
     """
-    # Track scores and metadata by content_id
-    scores: dict[UUID, float] = {}
-    metadata: dict[UUID, dict[str, Any]] = {}
-
-    # Process BM25 results (1-indexed rank)
-    for rank, (content_id, title, content_type, namespace, chunk_text, bm25_score) in enumerate(bm25_results, start=1):
-        rrf_score = 1.0 / (k + rank)
-        scores[content_id] = scores.get(content_id, 0.0) + rrf_score
-
-        if content_id not in metadata:
-            metadata[content_id] = {
-                "title": title,
-                "content_type": content_type,
-                "namespace": namespace,
-                "chunk_text": chunk_text,
-                "bm25_rank": rank,
-                "bm25_score": bm25_score,
-                "vector_rank": None,
-                "vector_similarity": None,
-            }
-        else:
-            metadata[content_id]["bm25_rank"] = rank
-            metadata[content_id]["bm25_score"] = bm25_score
-            if chunk_text and not metadata[content_id].get("chunk_text"):
-                metadata[content_id]["chunk_text"] = chunk_text
-            if namespace and not metadata[content_id].get("namespace"):
-                metadata[content_id]["namespace"] = namespace
-
-    # Process vector results (1-indexed rank)
-    for rank, (content_id, title, content_type, namespace, chunk_text, similarity) in enumerate(
-        vector_results, start=1
-    ):
-        rrf_score = 1.0 / (k + rank)
-        scores[content_id] = scores.get(content_id, 0.0) + rrf_score
-
-        if content_id not in metadata:
-            metadata[content_id] = {
-                "title": title,
-                "content_type": content_type,
-                "namespace": namespace,
-                "chunk_text": chunk_text,
-                "bm25_rank": None,
-                "bm25_score": None,
-                "vector_rank": rank,
-                "vector_similarity": similarity,
-            }
-        else:
-            metadata[content_id]["vector_rank"] = rank
-            metadata[content_id]["vector_similarity"] = similarity
-            # Prefer chunk_text from vector results
-            if chunk_text:
-                metadata[content_id]["chunk_text"] = chunk_text
-            if namespace and not metadata[content_id].get("namespace"):
-                metadata[content_id]["namespace"] = namespace
-
-    # Sort by combined score descending
-    sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
-
-    # Build results
-    results = []
-    for content_id in sorted_ids:
-        meta = metadata[content_id]
-        results.append(
-            SearchResult(
-                content_id=content_id,
-                title=meta["title"],
-                content_type=meta["content_type"],
-                score=scores[content_id],
-                chunk_text=meta["chunk_text"],
-                namespace=meta["namespace"],
-                bm25_rank=meta["bm25_rank"],
-                vector_rank=meta["vector_rank"],
-                vector_similarity=meta["vector_similarity"],
-                bm25_score=meta["bm25_score"],
-            )
-        )
-
-    return results
+    fusion = RankFusion(bm25_results, vector_results)
+    return fusion.top(fusion.scores(k=k))
 
 
 async def hybrid_search(
@@ -189,6 +267,10 @@ async def hybrid_search(
     return response.results
 
 
+# Coalesces concurrent identical searches (keyed like the search cache)
+_search_flight = SingleFlight("hybrid_search")
+
+
 async def hybrid_search_with_status(
     query: str,
     limit: int | None = None,
@@ -199,12 +281,16 @@ async def hybrid_search_with_status(
     use_expansion: bool = True,
     settings: Settings | None = None,
     db: Database | None = None,
+    query_embedding: list[float] | None = None,
+    on_bm25_results: Callable[[list[Candidate]], None] | None = None,
 ) -> HybridSearchResponse:
     """
     Perform hybrid search with graceful degradation (P27).
 
     Falls back to BM25-only search if vector search fails (Ollama down, circuit open, etc.).
     Supports caching and query expansion for improved performance and recall.
+    Concurrent cached searches with the same cache key share one execution
+    (unless settings, db or on_bm25_results are given).
 
     Args:
         query: Search query text
@@ -216,50 +302,151 @@ async def hybrid_search_with_status(
         use_expansion: Enable query expansion (default True)
         settings: Optional settings override
         db: Optional database instance override
+        query_embedding: Precomputed embedding of query (skips the embedding call)
+        on_bm25_results: Called with the BM25 candidates as soon as they arrive,
+            while vector search is still running (not called on cache hits)
 
     Returns:
         HybridSearchResponse with results and degradation status
     """
+    if not use_cache or settings is not None or db is not None or on_bm25_results is not None:
+        return await _hybrid_search(
+            query, limit, namespace, min_score, quality_boost,
+            use_cache, use_expansion, settings, db, query_embedding, on_bm25_results,
+        )
+
+    limit = limit or get_settings().search_default_limit
+    key = (query, limit, namespace, min_score, quality_boost, use_expansion)
+    return await _search_flight.do(
+        key,
+        lambda: _hybrid_search(
+            query, limit, namespace, min_score, quality_boost,
+            use_cache, use_expansion, None, None, query_embedding, None,
+        ),
+    )
+
+
+def _search_cache_key(
+    query: str,
+    limit: int,
+    namespace: str | None,
+    min_score: float | None,
+    quality_boost: bool,
+    expand: bool,
+    settings: Settings,
+    generation: int | None,
+) -> tuple[Any, ...]:
+    """Cache key arguments for a hybrid search."""
+    return (
+        query, limit, namespace, min_score, quality_boost, expand,
+        get_effective_bm25_weight(settings), get_effective_vector_weight(settings),
+        get_effective_rrf_k(settings), generation,
+    )
+
+
+def _response_from_cache(cached_result: dict[str, Any]) -> HybridSearchResponse:
+    """Reconstruct a response from its cached form."""
+    results = [
+        SearchResult(
+            content_id=UUID(r["content_id"]),
+            title=r["title"],
+            content_type=r["content_type"],
+            score=r["score"],
+            chunk_text=r.get("chunk_text"),
+            namespace=r.get("namespace"),
+            vector_similarity=r.get("vector_similarity"),
+            bm25_score=r.get("bm25_score"),
+        )
+        for r in cached_result["results"]
+    ]
+    return HybridSearchResponse(
+        results=results,
+        degraded=cached_result.get("degraded", False),
+        search_mode=cached_result.get("search_mode", "hybrid"),
+        warnings=cached_result.get("warnings", []),
+        cached=True,
+        query_expanded=cached_result.get("query_expanded", False),
+        expanded_terms=cached_result.get("expanded_terms", []),
+    )
+
+
+async def get_cached_search(
+    query: str,
+    limit: int | None = None,
+    namespace: str | None = None,
+    min_score: float | None = None,
+    quality_boost: bool = True,
+    use_expansion: bool = True,
+) -> HybridSearchResponse | None:
+    """
+    Look up a hybrid search in the result cache without running it.
+
+    Takes the same arguments as hybrid_search_with_status, so callers can
+    skip work (such as embedding the query) for searches already cached.
+
+    Returns:
+        The cached response, or None on a miss or when caching is unavailable
+    """
+    settings = get_settings()
+    cache = await get_cache()
+    if not cache.is_connected:
+        return None
+    generation = await cache.get_generation(namespace)
+    if generation is None:
+        return None
+
+    cache_key = _search_cache_key(
+        query,
+        limit or settings.search_default_limit,
+        namespace,
+        min_score,
+        quality_boost,
+        use_expansion and is_query_expansion_enabled(settings),
+        settings,
+        generation,
+    )
+    cached_result = await cache.get(CacheType.SEARCH, *cache_key)
+    return _response_from_cache(cached_result) if cached_result else None
+
+
+async def _hybrid_search(
+    query: str,
+    limit: int | None,
+    namespace: str | None,
+    min_score: float | None,
+    quality_boost: bool,
+    use_cache: bool,
+    use_expansion: bool,
+    settings: Settings | None,
+    db: Database | None,
+    query_embedding: list[float] | None,
+    on_bm25_results: Callable[[list[Candidate]], None] | None = None,
+) -> HybridSearchResponse:
+    """Run hybrid search (see hybrid_search_with_status)."""
     settings = settings or get_settings()
     db = db or await get_db()
     limit = limit or settings.search_default_limit
 
-    # Check cache first
+    # Check cache first. Keys carry the namespace generation (bumped on every
+    # content change) and the effective tuning, so entries never go stale.
     cache = await get_cache()
-    cache_key = (query, limit, namespace, min_score, quality_boost)
+    generation = await cache.get_generation(namespace) if use_cache and cache.is_connected else None
+    use_cache = generation is not None
+    expand = use_expansion and is_query_expansion_enabled(settings)
+    cache_key = _search_cache_key(
+        query, limit, namespace, min_score, quality_boost, expand, settings, generation
+    )
 
-    if use_cache and cache.is_connected:
+    if use_cache:
         cached_result = await cache.get(CacheType.SEARCH, *cache_key)
         if cached_result:
             logger.debug("search_cache_hit", query=query[:50])
-            # Reconstruct response from cache
-            results = [
-                SearchResult(
-                    content_id=UUID(r["content_id"]),
-                    title=r["title"],
-                    content_type=r["content_type"],
-                    score=r["score"],
-                    chunk_text=r.get("chunk_text"),
-                    namespace=r.get("namespace"),
-                    vector_similarity=r.get("vector_similarity"),
-                    bm25_score=r.get("bm25_score"),
-                )
-                for r in cached_result["results"]
-            ]
-            return HybridSearchResponse(
-                results=results,
-                degraded=cached_result.get("degraded", False),
-                search_mode=cached_result.get("search_mode", "hybrid"),
-                warnings=cached_result.get("warnings", []),
-                cached=True,
-                query_expanded=cached_result.get("query_expanded", False),
-                expanded_terms=cached_result.get("expanded_terms", []),
-            )
+            return _response_from_cache(cached_result)
 
     # Apply query expansion
     expanded: ExpandedQuery | None = None
     search_query = query
-    if use_expansion and settings.search_enable_query_expansion:
+    if expand:
         expanded = await expand_query(query)
         if expanded.expansion_applied:
             search_query = expanded.expanded
@@ -281,6 +468,8 @@ async def hybrid_search_with_status(
         return await db.bm25_search(search_query, limit=settings.bm25_candidates, namespace=namespace)
 
     async def run_embedding() -> list[float]:
+        if query_embedding is not None:
+            return query_embedding
         return await embed_text(query)
 
     # Execute in parallel
@@ -301,6 +490,9 @@ async def hybrid_search_with_status(
         )
         warnings.append(f"BM25 search failed: {type(e).__name__}: {str(e)[:100]}")
 
+    if on_bm25_results is not None and bm25_results:
+        on_bm25_results(bm25_results)
+
     # Gather embedding and run vector search
     try:
         query_embedding = await embedding_task
@@ -327,73 +519,36 @@ async def hybrid_search_with_status(
             query=query[:50],
             query_length=len(query),
             namespace=namespace,
-            embedding_generated=len(locals().get('query_embedding', [])) > 0,
+            embedding_generated=query_embedding is not None,
         )
         warnings.append(f"Semantic search failed: {type(e).__name__}: {str(e)[:100]}")
         degraded = True
         search_mode = "bm25_only"
 
-    # Combine results
-    if vector_results:
-        combined = rrf_fusion(bm25_results, vector_results, k=settings.rrf_k)
-    else:
-        # Fallback to BM25-only results
-        combined = [
-            SearchResult(
-                content_id=content_id,
-                title=title,
-                content_type=content_type,
-                score=bm25_score,
-                chunk_text=chunk_text,
-                namespace=ns,
-                bm25_rank=rank,
-                bm25_score=bm25_score,
-            )
-            for rank, (content_id, title, content_type, ns, chunk_text, bm25_score) in enumerate(
-                bm25_results, start=1
-            )
-        ]
+    # Fuse, boost, filter and cut to limit in one columnar pass.
+    # Weights are scaled by 2 so the default 0.5/0.5 split is plain RRF.
+    fusion = RankFusion(bm25_results, vector_results)
+    scores = fusion.scores(
+        k=get_effective_rrf_k(settings),
+        bm25_weight=2 * get_effective_bm25_weight(settings),
+        vector_weight=2 * get_effective_vector_weight(settings),
+        raw_bm25=not vector_results,  # BM25-only fallback keeps raw scores
+    )
 
     # Apply quality boosting if enabled
-    if quality_boost and combined:
-        content_ids = [r.content_id for r in combined]
+    if quality_boost and len(fusion):
         try:
-            quality_scores = await db.get_quality_scores(content_ids)
-
-            # Apply quality boost (multiply score by quality factor)
-            # Quality factor = 0.8 + 0.4 * quality_score (range 0.8 to 1.2)
-            boosted = []
-            for result in combined:
-                quality = quality_scores.get(result.content_id, 0.5)
-                quality_factor = 0.8 + 0.4 * quality
-                boosted.append(
-                    SearchResult(
-                        content_id=result.content_id,
-                        title=result.title,
-                        content_type=result.content_type,
-                        score=result.score * quality_factor,
-                        chunk_text=result.chunk_text,
-                        source_ref=result.source_ref,
-                        namespace=result.namespace,
-                        bm25_rank=result.bm25_rank,
-                        vector_rank=result.vector_rank,
-                        vector_similarity=result.vector_similarity,
-                        bm25_score=result.bm25_score,
-                    )
-                )
-            # Re-sort by boosted score
-            combined = sorted(boosted, key=lambda x: x.score, reverse=True)
+            quality_scores = await db.get_quality_scores(fusion.content_ids)
+            scores *= fusion.quality_factors(quality_scores)
         except Exception as e:
             logger.warning("quality_boost_failed", error=str(e))
             # Continue without quality boost
 
-    # Apply minimum score filter if specified
-    if min_score is not None:
-        combined = [r for r in combined if r.score >= min_score]
+    combined = fusion.top(scores, limit=limit, min_score=min_score)
 
     # Build response
     response = HybridSearchResponse(
-        results=combined[:limit],
+        results=combined,
         degraded=degraded,
         search_mode=search_mode,
         warnings=warnings,
@@ -403,7 +558,7 @@ async def hybrid_search_with_status(
     )
 
     # Cache the results
-    if use_cache and cache.is_connected and response.results:
+    if use_cache and response.results:
         cache_data = {
             "results": [
                 {
@@ -477,6 +632,7 @@ async def search_vector_only(
     namespace: str | None = None,
     settings: Settings | None = None,
     db: Database | None = None,
+    query_embedding: list[float] | None = None,
 ) -> list[SearchResult]:
     """
     Perform vector-only search (for comparison/debugging).
@@ -487,6 +643,7 @@ async def search_vector_only(
         namespace: Optional namespace filter
         settings: Optional settings override
         db: Optional database instance override
+        query_embedding: Precomputed embedding of query (skips the embedding call)
 
     Returns:
         List of SearchResult sorted by vector similarity
@@ -495,7 +652,8 @@ async def search_vector_only(
     db = db or await get_db()
     limit = limit or settings.search_default_limit
 
-    query_embedding = await embed_text(query)
+    if query_embedding is None:
+        query_embedding = await embed_text(query)
     vector_results = await db.vector_search(query_embedding, limit=limit, namespace=namespace)
 
     return [
@@ -0,0 +1,49 @@
+"""Runtime overrides for tunable settings.
+
+Overrides are set through the tuning API and take precedence over
+``Settings`` until the process restarts. They live here rather than in
+the API package so search can read them without importing FastAPI.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from knowledge.config import Settings, get_settings
+
+# Runtime-adjustable settings (not persisted to file)
+_runtime_config: dict[str, Any] = {}
+
+
+def get_runtime_value(key: str, default: Any) -> Any:
+    """Get runtime config value, falling back to the given default."""
+    return _runtime_config.get(key, default)
+
+
+def set_runtime_value(key: str, value: Any) -> None:
+    """Set runtime config value."""
+    _runtime_config[key] = value
+
+
+def get_effective_bm25_weight(settings: Settings | None = None) -> float:
+    """Get the effective BM25 weight (runtime or default)."""
+    settings = settings or get_settings()
+    return get_runtime_value("search_bm25_weight", settings.search_bm25_weight)
+
+
+def get_effective_vector_weight(settings: Settings | None = None) -> float:
+    """Get the effective vector weight (runtime or default)."""
+    settings = settings or get_settings()
+    return get_runtime_value("search_vector_weight", settings.search_vector_weight)
+
+
+def get_effective_rrf_k(settings: Settings | None = None) -> int:
+    """Get the effective RRF constant (runtime or default)."""
+    settings = settings or get_settings()
+    return get_runtime_value("rrf_k", settings.rrf_k)
+
+
+def is_query_expansion_enabled(settings: Settings | None = None) -> bool:
+    """Check if query expansion is enabled (runtime or default)."""
+    settings = settings or get_settings()
+    return get_runtime_value("search_enable_query_expansion", settings.search_enable_query_expansion)
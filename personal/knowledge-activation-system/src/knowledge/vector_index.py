@@ -0,0 +1,781 @@
+"""In-process approximate nearest-neighbour index over chunk embeddings.
+
+pgvector stays the source of truth; this index only accelerates
+``Database.vector_search``. It is an IVF-flat index: a k-means coarse
+quantizer over unit-normalized vectors, with queries scanning the
+``nprobe`` closest inverted lists by inner product (cosine similarity).
+
+Lifecycle:
+- Built from a bulk COPY of the chunks table (or loaded from a snapshot)
+- Kept current by ``insert_chunks`` / ``soft_delete_content`` and a
+  periodic catch-up against the database for writes from other processes
+- Persisted as generation-tagged ``.npy`` files that are memory-mapped on
+  restart, published by atomically replacing ``meta.json``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from knowledge.config import get_settings
+from knowledge.logging import get_logger
+
+if TYPE_CHECKING:
+    from knowledge.db import Database
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 2
+
+BASE_ARRAYS = ("centroids", "offsets", "vectors", "chunk_ids", "content_ids")
+
+# Refresh window overlap to catch chunks committed just after a watermark
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass
+class IndexHit:
+    """Best-matching chunk for a content item."""
+
+    chunk_id: UUID
+    content_id: UUID
+    similarity: float
+
+
+@dataclass
+class IndexSnapshot:
+    """Point-in-time copy of an index's state, ready to be written to disk."""
+
+    path: Path
+    arrays: dict[str, np.ndarray]
+    files: dict[str, str]
+    meta: dict[str, Any]
+    # Centroids of the base segment the files belong to
+    centroids: np.ndarray | None
+
+    def write(self) -> None:
+        """
+        Write the arrays, then atomically publish them via ``meta.json``.
+
+        Touches nothing but the snapshot, so it can run in a worker thread
+        while the index keeps changing.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        generation = uuid4().hex[:12]
+        for name, array in self.arrays.items():
+            self.files[name] = f"{name}-{generation}.npy"
+            with (self.path / self.files[name]).open("wb") as f:
+                np.save(f, array)
+                f.flush()
+                os.fsync(f.fileno())
+
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps({**self.meta, "files": self.files}))
+        os.replace(tmp, self.path / "meta.json")
+
+        live = set(self.files.values())
+        for stale in self.path.glob("*.npy"):
+            if stale.name not in live:
+                stale.unlink(missing_ok=True)
+        logger.info("vector_index_saved", path=str(self.path), **self.meta)
+
+
+def _uuid_bytes(values: Iterable[UUID]) -> np.ndarray:
+    """Pack UUIDs into a fixed-width byte array."""
+    return np.array([value.bytes for value in values], dtype="S16")
+
+
+def _to_uuid(value: bytes) -> UUID:
+    """Unpack a UUID from an S16 item (numpy strips trailing NUL bytes)."""
+    return UUID(bytes=bytes(value).ljust(16, b"\0"))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so inner product equals cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+    """Assign each vector to its closest centroid, in bounded-memory batches."""
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch):
+        block = np.asarray(vectors[start : start + batch])
+        assignments[start : start + batch] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def _train_centroids(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    seed: int = 0,
+) -> np.ndarray:
+    """Spherical k-means on a sample of the (normalized) vectors."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), max(nlist * 64, 10000))
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists from random sample points
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+class VectorIndex:
+    """
+    IVF-flat index mapping chunk embeddings to (chunk_id, content_id).
+
+    The base segment is immutable once built (and may be memory-mapped);
+    inserts land in an in-memory delta segment that is scanned exhaustively,
+    and deletes are tracked with tombstone masks. Once the delta grows large
+    ``needs_rebuild`` turns true and the owner rebuilds from the database.
+    """
+
+    def __init__(self, dim: int = 768, nprobe: int = 16) -> None:
+        self.dim = dim
+        self.nprobe = nprobe
+        self.synced_at: datetime | None = None
+
+        # Base segment (sorted by inverted list)
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+        self._vectors: np.ndarray | None = None
+        self._chunk_ids: np.ndarray | None = None
+        self._content_ids: np.ndarray | None = None
+        self._deleted: np.ndarray | None = None
+
+        # Delta segment
+        self._delta_vectors: list[np.ndarray] = []
+        self._delta_chunk_ids: list[bytes] = []
+        self._delta_content_ids: list[bytes] = []
+        self._delta_deleted: list[bool] = []
+        # Stacked (vectors, chunk ids, content ids) and live mask for search
+        self._delta_cache: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self._delta_live: np.ndarray | None = None
+
+        # Chunk ids added since the base was built (and recent base rows),
+        # used to make catch-up refreshes idempotent
+        self._known_chunks: set[bytes] = set()
+
+        # updated_at of content already re-read by sync_vector_index
+        self._content_versions: dict[bytes, datetime] = {}
+
+        # Snapshot directory and file names already holding the (immutable) base segment
+        self._base_path: Path | None = None
+        self._base_files: dict[str, str] = {}
+
+    # -------------------------------------------------------------------------
+    # Properties
+    # -------------------------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built or loaded."""
+        return self._centroids is not None
+
+    @property
+    def base_size(self) -> int:
+        return 0 if self._vectors is None else len(self._vectors)
+
+    @property
+    def delta_size(self) -> int:
+        return len(self._delta_chunk_ids)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """Whether the delta segment is large enough to warrant a rebuild."""
+        return self.delta_size > max(10000, self.base_size // 5)
+
+    def __len__(self) -> int:
+        live_base = 0
+        if self._deleted is not None:
+            live_base = self.base_size - int(self._deleted.sum())
+        return live_base + self._delta_deleted.count(False)
+
+    # -------------------------------------------------------------------------
+    # Build / update
+    # -------------------------------------------------------------------------
+
+    def build(
+        self,
+        chunk_ids: list[UUID],
+        content_ids: list[UUID],
+        vectors: np.ndarray,
+        nlist: int | None = None,
+    ) -> None:
+        """
+        Build the base segment from scratch.
+
+        Args:
+            chunk_ids: Chunk IDs, one per vector
+            content_ids: Owning content IDs, one per vector
+            vectors: Embedding matrix of shape (n, dim)
+            nlist: Number of inverted lists (default ~4 * sqrt(n))
+        """
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        n = len(vectors)
+        if nlist is None:
+            nlist = int(4 * math.sqrt(n))
+        nlist = max(1, min(nlist, n, 65536))
+
+        if n == 0:
+            centroids = np.zeros((1, self.dim), dtype=np.float32)
+            assignments = np.zeros(0, dtype=np.int32)
+        else:
+            centroids = _train_centroids(vectors, nlist)
+            assignments = _assign(vectors, centroids)
+
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=len(centroids))
+
+        self._centroids = centroids
+        self._offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._vectors = vectors[order]
+        self._chunk_ids = _uuid_bytes(chunk_ids)[order] if n else np.zeros(0, dtype="S16")
+        self._content_ids = _uuid_bytes(content_ids)[order] if n else np.zeros(0, dtype="S16")
+        self._deleted = np.zeros(n, dtype=bool)
+
+        self._delta_vectors.clear()
+        self._delta_chunk_ids.clear()
+        self._delta_content_ids.clear()
+        self._delta_deleted.clear()
+        self._delta_cache = None
+        self._delta_live = None
+        self._known_chunks.clear()
+        self._content_versions.clear()
+        self._base_path = None
+        self._base_files = {}
+
+        logger.info("vector_index_built", vectors=n, nlist=len(centroids))
+
+    def mark_known(self, chunk_ids: Iterable[UUID]) -> None:
+        """Record chunk ids already present, so catch-up does not re-add them."""
+        self._known_chunks.update(chunk_id.bytes for chunk_id in chunk_ids)
+
+    def add(
+        self,
+        chunk_ids: list[UUID],
+        content_ids: list[UUID],
+        vectors: list[list[float]] | np.ndarray,
+    ) -> int:
+        """
+        Add chunks to the delta segment, skipping ids already indexed.
+
+        Returns:
+            Number of chunks added
+        """
+        if not chunk_ids:
+            return 0
+
+        normalized = _normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim))
+        added = 0
+        for chunk_id, content_id, vector in zip(chunk_ids, content_ids, normalized, strict=True):
+            key = chunk_id.bytes
+            if key in self._known_chunks:
+                continue
+            self._known_chunks.add(key)
+            self._delta_vectors.append(vector)
+            self._delta_chunk_ids.append(key)
+            self._delta_content_ids.append(content_id.bytes)
+            self._delta_deleted.append(False)
+            added += 1
+
+        if added:
+            self._delta_cache = None
+            self._delta_live = None
+        return added
+
+    def remove_content(self, content_id: UUID) -> int:
+        """
+        Tombstone every chunk belonging to a content item.
+
+        Returns:
+            Number of chunks removed
+        """
+        key = content_id.bytes
+        removed = 0
+
+        if self._content_ids is not None and self._deleted is not None and len(self._content_ids):
+            rows = np.flatnonzero(self._content_ids == np.bytes_(key))
+            live = rows[~self._deleted[rows]]
+            self._deleted[live] = True
+            removed += len(live)
+
+        for i, owner in enumerate(self._delta_content_ids):
+            if owner == key and not self._delta_deleted[i]:
+                self._delta_deleted[i] = True
+                if self._delta_live is not None:
+                    self._delta_live[i] = False
+                removed += 1
+
+        return removed
+
+    def replace_content(
+        self,
+        content_id: UUID,
+        chunk_ids: list[UUID],
+        vectors: list[list[float]] | np.ndarray,
+    ) -> int:
+        """
+        Swap a content item's chunks for a freshly written set.
+
+        Upserted chunks keep their ids, so they are forgotten before being
+        re-added rather than skipped as already known.
+
+        Returns:
+            Number of chunks added
+        """
+        self.remove_content(content_id)
+        self._known_chunks.difference_update(chunk_id.bytes for chunk_id in chunk_ids)
+        return self.add(chunk_ids, [content_id] * len(chunk_ids), vectors)
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def search(self, query: list[float] | np.ndarray, k: int) -> list[IndexHit]:
+        """
+        Find the best-matching chunk for up to ``k`` distinct content items.
+
+        Args:
+            query: Query embedding
+            k: Number of distinct content items to return
+
+        Returns:
+            Hits sorted by cosine similarity, one per content item
+        """
+        if not self.ready or k <= 0:
+            return []
+
+        assert self._centroids is not None and self._offsets is not None
+        assert self._vectors is not None and self._deleted is not None
+
+        q = _normalize(np.asarray(query, dtype=np.float32).reshape(self.dim))
+
+        score_parts: list[np.ndarray] = []
+        chunk_parts: list[np.ndarray] = []
+        content_parts: list[np.ndarray] = []
+
+        # Base segment: scan the nprobe closest inverted lists
+        if self.base_size:
+            nlist = len(self._centroids)
+            centroid_scores = self._centroids @ q
+            if self.nprobe < nlist:
+                probes = np.argpartition(-centroid_scores, self.nprobe - 1)[: self.nprobe]
+            else:
+                probes = np.arange(nlist)
+            for list_id in probes:
+                start, end = int(self._offsets[list_id]), int(self._offsets[list_id + 1])
+                if start == end:
+                    continue
+                live = ~self._deleted[start:end]
+                if not live.any():
+                    continue
+                scores = np.asarray(self._vectors[start:end]) @ q
+                score_parts.append(scores[live])
+                chunk_parts.append(self._chunk_ids[start:end][live])  # type: ignore[index]
+                content_parts.append(self._content_ids[start:end][live])  # type: ignore[index]
+
+        # Delta segment: exhaustive scan
+        if self._delta_chunk_ids:
+            if self._delta_cache is None:
+                self._delta_cache = (
+                    np.vstack(self._delta_vectors),
+                    np.array(self._delta_chunk_ids, dtype="S16"),
+                    np.array(self._delta_content_ids, dtype="S16"),
+                )
+            if self._delta_live is None:
+                self._delta_live = ~np.array(self._delta_deleted, dtype=bool)
+            delta_vectors, delta_chunks, delta_contents = self._delta_cache
+            live = self._delta_live
+            if live.any():
+                score_parts.append((delta_vectors @ q)[live])
+                chunk_parts.append(delta_chunks[live])
+                content_parts.append(delta_contents[live])
+
+        if not score_parts:
+            return []
+
+        scores = np.concatenate(score_parts)
+        chunk_ids = np.concatenate(chunk_parts)
+        content_ids = np.concatenate(content_parts)
+
+        hits: list[IndexHit] = []
+        seen: set[bytes] = set()
+        for row in np.argsort(-scores, kind="stable"):
+            owner = bytes(content_ids[row])
+            if owner in seen:
+                continue
+            seen.add(owner)
+            hits.append(
+                IndexHit(
+                    chunk_id=_to_uuid(chunk_ids[row]),
+                    content_id=_to_uuid(owner),
+                    similarity=float(scores[row]),
+                )
+            )
+            if len(hits) >= k:
+                break
+
+        return hits
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def snapshot(self, path: Path) -> IndexSnapshot | None:
+        """
+        Copy the state to save to ``path`` (a directory).
+
+        The base segment is immutable and only included if it changed since
+        the last save to ``path``. The tombstones, delta segment and known
+        chunks are copied, since add and remove keep changing them.
+
+        Returns:
+            The snapshot, or None if the index is not ready
+        """
+        if not self.ready:
+            return None
+
+        arrays: dict[str, np.ndarray] = {}
+        files = dict(self._base_files) if self._base_path == path else {}
+        if not files:
+            arrays.update({
+                "centroids": np.asarray(self._centroids),
+                "offsets": np.asarray(self._offsets),
+                "vectors": np.asarray(self._vectors),
+                "chunk_ids": np.asarray(self._chunk_ids),
+                "content_ids": np.asarray(self._content_ids),
+            })
+        arrays.update({
+            "deleted": np.array(self._deleted, dtype=bool),
+            "delta_vectors": (
+                np.vstack(self._delta_vectors)
+                if self._delta_vectors
+                else np.zeros((0, self.dim), dtype=np.float32)
+            ),
+            "delta_chunk_ids": np.array(self._delta_chunk_ids, dtype="S16"),
+            "delta_content_ids": np.array(self._delta_content_ids, dtype="S16"),
+            "delta_deleted": np.array(self._delta_deleted, dtype=bool),
+            "known_chunks": np.array(list(self._known_chunks), dtype="S16"),
+        })
+        meta = {
+            "version": SNAPSHOT_VERSION,
+            "dim": self.dim,
+            "base_size": self.base_size,
+            "delta_size": self.delta_size,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+        }
+        return IndexSnapshot(path, arrays, files, meta, self._centroids)
+
+    def mark_saved(self, snapshot: IndexSnapshot) -> None:
+        """Remember the written base files, unless the base was rebuilt since."""
+        if snapshot.centroids is self._centroids:
+            self._base_path = snapshot.path
+            self._base_files = {name: snapshot.files[name] for name in BASE_ARRAYS}
+
+    def save(self, path: Path) -> None:
+        """
+        Write a snapshot to ``path`` (a directory).
+
+        Arrays go to files tagged with a fresh generation, and ``meta.json``,
+        which names the files of the current generation, is atomically
+        replaced last. A crash mid-save therefore leaves the previous snapshot
+        intact. The base segment is only rewritten if it changed since the
+        last save; files no longer referenced are removed afterwards.
+        """
+        snapshot = self.snapshot(path)
+        if snapshot is None:
+            return
+        snapshot.write()
+        self.mark_saved(snapshot)
+
+    async def save_in_thread(self, path: Path) -> None:
+        """Like save(), but copy the state on the event loop and write it in a thread."""
+        snapshot = self.snapshot(path)
+        if snapshot is None:
+            return
+        await asyncio.to_thread(snapshot.write)
+        self.mark_saved(snapshot)
+
+    @classmethod
+    def load(cls, path: Path, nprobe: int = 16) -> VectorIndex | None:
+        """
+        Load a snapshot, memory-mapping the base vectors and ids.
+
+        Returns:
+            The index, or None if no valid snapshot exists at ``path``
+        """
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta.get("version") != SNAPSHOT_VERSION:
+                return None
+            files = {name: path / filename for name, filename in meta["files"].items()}
+
+            index = cls(dim=int(meta["dim"]), nprobe=nprobe)
+            index._centroids = np.load(files["centroids"])
+            index._offsets = np.load(files["offsets"])
+            index._vectors = np.load(files["vectors"], mmap_mode="r")
+            index._chunk_ids = np.load(files["chunk_ids"], mmap_mode="r")
+            index._content_ids = np.load(files["content_ids"], mmap_mode="r")
+            index._deleted = np.array(np.load(files["deleted"]))
+
+            delta_vectors = np.load(files["delta_vectors"])
+            index._delta_vectors = list(delta_vectors)
+            index._delta_chunk_ids = [bytes(v).ljust(16, b"\0") for v in np.load(files["delta_chunk_ids"])]
+            index._delta_content_ids = [bytes(v).ljust(16, b"\0") for v in np.load(files["delta_content_ids"])]
+            index._delta_deleted = [bool(v) for v in np.load(files["delta_deleted"])]
+            # Delta ids plus the recent base rows a catch-up sync will see again
+            index._known_chunks = {bytes(v).ljust(16, b"\0") for v in np.load(files["known_chunks"])}
+            index._base_path = path
+            index._base_files = {name: files[name].name for name in BASE_ARRAYS}
+            index.synced_at = datetime.fromisoformat(meta["synced_at"]) if meta.get("synced_at") else None
+
+            if (
+                index.base_size != meta["base_size"]
+                or index.delta_size != meta["delta_size"]
+                or len(index._deleted) != index.base_size
+                or int(index._offsets[-1]) != index.base_size
+            ):
+                logger.warning("vector_index_snapshot_inconsistent", path=str(path))
+                return None
+
+            logger.info("vector_index_loaded", path=str(path), vectors=len(index))
+            return index
+        except Exception as e:
+            logger.warning("vector_index_snapshot_load_failed", path=str(path), error=str(e))
+            return None
+
+
+# =============================================================================
+# Database synchronization
+# =============================================================================
+
+
+class _CopyParser:
+    """Incrementally parse ``COPY ... TO STDOUT`` text rows of chunk embeddings."""
+
+    def __init__(self) -> None:
+        self.chunk_ids: list[UUID] = []
+        self.content_ids: list[UUID] = []
+        self.recent: list[UUID] = []
+        self.vectors: list[np.ndarray] = []
+        self._buffer = b""
+
+    async def __call__(self, data: bytes) -> None:
+        self._buffer += data
+        lines = self._buffer.split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            self._parse(line)
+
+    def _parse(self, line: bytes) -> None:
+        if not line:
+            return
+        chunk_id, content_id, recent, embedding = line.split(b"\t")
+        chunk_uuid = UUID(chunk_id.decode())
+        self.chunk_ids.append(chunk_uuid)
+        self.content_ids.append(UUID(content_id.decode()))
+        if recent == b"t":
+            self.recent.append(chunk_uuid)
+        # pgvector text format: [0.1,0.2,...]
+        self.vectors.append(np.array(embedding[1:-1].split(b","), dtype=np.float32))
+
+    def finish(self) -> None:
+        self._parse(self._buffer)
+        self._buffer = b""
+
+    def matrix(self, dim: int) -> np.ndarray:
+        if not self.vectors:
+            return np.zeros((0, dim), dtype=np.float32)
+        return np.vstack(self.vectors)
+
+
+async def build_vector_index(db: Database, dim: int = 768, nprobe: int = 16) -> VectorIndex:
+    """
+    Build a fresh index from a bulk COPY of the chunks table.
+
+    Args:
+        db: Connected database
+        dim: Embedding dimensionality
+        nprobe: Inverted lists scanned per query
+
+    Returns:
+        Built index with ``synced_at`` set to the database time of the copy
+    """
+    synced_at = await db.get_database_time()
+    parser = _CopyParser()
+    await db.copy_chunk_embeddings(
+        parser,
+        recent_after=synced_at - SYNC_OVERLAP,
+    )
+    parser.finish()
+
+    index = VectorIndex(dim=dim, nprobe=nprobe)
+    vectors = parser.matrix(dim)
+    # k-means and list assignment are CPU-bound; keep them off the event loop
+    await asyncio.to_thread(index.build, parser.chunk_ids, parser.content_ids, vectors)
+    index.mark_known(parser.recent)
+    index.synced_at = synced_at
+    return index
+
+
+async def sync_vector_index(db: Database, index: VectorIndex) -> tuple[int, int]:
+    """
+    Catch the index up with writes made since its last sync (e.g. by the CLI).
+
+    Returns:
+        Tuple of (chunks added, chunks removed)
+    """
+    if index.synced_at is None:
+        return 0, 0
+
+    now = await db.get_database_time()
+    since = index.synced_at - SYNC_OVERLAP
+
+    parser = _CopyParser()
+    await db.copy_chunk_embeddings(parser, created_after=since)
+    parser.finish()
+    added = index.add(parser.chunk_ids, parser.content_ids, parser.matrix(index.dim))
+
+    removed = 0
+    for content_id in await db.get_deleted_content_ids(since):
+        removed += index.remove_content(content_id)
+
+    # Older content whose chunks may have been replaced or re-embedded
+    versions = index._content_versions
+    changed = [
+        (content_id, updated_at)
+        for content_id, updated_at in await db.get_updated_content(since)
+        if versions.get(content_id.bytes) != updated_at
+    ]
+    if changed:
+        parser = _CopyParser()
+        await db.copy_chunk_embeddings(parser, content_ids=[content_id for content_id, _ in changed])
+        parser.finish()
+        rows: dict[UUID, list[int]] = {content_id: [] for content_id, _ in changed}
+        for row, content_id in enumerate(parser.content_ids):
+            rows[content_id].append(row)
+        vectors = parser.matrix(index.dim)
+        for content_id, updated_at in changed:
+            removed += index.remove_content(content_id)
+            added += index.replace_content(
+                content_id,
+                [parser.chunk_ids[row] for row in rows[content_id]],
+                vectors[rows[content_id]],
+            )
+            versions[content_id.bytes] = updated_at
+
+    # Versions older than the next sync window are never compared again
+    for key in [key for key, updated_at in versions.items() if updated_at <= now - SYNC_OVERLAP]:
+        del versions[key]
+
+    index.synced_at = now
+    if added or removed:
+        logger.info("vector_index_synced", added=added, removed=removed)
+    return added, removed
+
+
+# =============================================================================
+# Global index management
+# =============================================================================
+
+_index: VectorIndex | None = None
+_task: asyncio.Task[None] | None = None
+
+
+def get_vector_index() -> VectorIndex | None:
+    """Get the global index, if one is loaded."""
+    return _index
+
+
+def get_vector_index_path() -> Path:
+    """Snapshot directory from settings."""
+    return Path(get_settings().vector_index_path).expanduser()
+
+
+async def _run_vector_index(db: Database) -> None:
+    """Load or build the index, attach it to the database, then keep it current."""
+    global _index
+    settings = get_settings()
+    path = get_vector_index_path()
+
+    index = await asyncio.to_thread(VectorIndex.load, path, settings.vector_index_nprobe)
+    if index is None:
+        index = await build_vector_index(db, nprobe=settings.vector_index_nprobe)
+        await index.save_in_thread(path)
+
+    _index = index
+    db.vector_index = index
+
+    while True:
+        try:
+            await sync_vector_index(db, index)
+            if index.needs_rebuild:
+                index = await build_vector_index(db, nprobe=settings.vector_index_nprobe)
+                await index.save_in_thread(path)
+                _index = index
+                db.vector_index = index
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("vector_index_sync_failed", error=str(e))
+        await asyncio.sleep(settings.vector_index_refresh_interval)
+
+
+async def start_vector_index() -> None:
+    """Start the global vector index in the background if enabled."""
+    global _task
+    settings = get_settings()
+    if not settings.vector_index_enabled:
+        return
+    from knowledge.db import get_db
+
+    db = await get_db()
+    _task = asyncio.create_task(_run_vector_index(db))
+    logger.info("vector_index_starting", path=str(get_vector_index_path()))
+
+
+async def stop_vector_index() -> None:
+    """Stop background sync and persist the current index."""
+    global _index, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning("vector_index_task_failed", error=str(e))
+        _task = None
+
+    if _index is not None:
+        await _index.save_in_thread(get_vector_index_path())
+        _index = None
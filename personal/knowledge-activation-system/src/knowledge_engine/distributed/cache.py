@@ -4,9 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import heapq
+import itertools
 import json
 import logging
+import math
+import random
+import sys
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -17,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Marks values stored by CacheLayer.cached along with their expiry metadata
+_ENVELOPE = "__cached__"
+
 
 class CacheBackend(str, Enum):
     """Cache backend types."""
@@ -74,6 +83,11 @@ class CacheStats:
     evictions: int = 0
     total_items: int = 0
     memory_size_bytes: int = 0
+    # CacheLayer.cached only
+    coalesced: int = 0  # Callers that waited on another caller's computation
+    stale_hits: int = 0  # Expired values served while a refresh ran
+    early_refreshes: int = 0  # Refreshes started before expiry (XFetch)
+    negative_hits: int = 0  # Cached None results served
 
     @property
     def hit_rate(self) -> float:
@@ -81,124 +95,182 @@ class CacheStats:
         return self.hits / total if total > 0 else 0.0
 
 
+# Items measured per container by estimate_size
+_SIZE_SAMPLE = 16
+_SEQUENCES = (list, tuple, set, frozenset)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate memory footprint of a value in bytes.
+
+    ``sys.getsizeof`` of the value plus, for dicts and sequences, of their
+    top-level items. At most _SIZE_SAMPLE items are measured and the rest
+    extrapolated, so the cost is constant however large the value is.
+    Callers that know a value's real size can pass it to MemoryCache.set.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        sampled = sum(
+            sys.getsizeof(k) + sys.getsizeof(v) for k, v in itertools.islice(value.items(), _SIZE_SAMPLE)
+        )
+    elif isinstance(value, _SEQUENCES):
+        sampled = sum(map(sys.getsizeof, itertools.islice(value, _SIZE_SAMPLE)))
+    else:
+        return size
+
+    count = len(value)
+    if count > _SIZE_SAMPLE:
+        sampled = sampled * count // _SIZE_SAMPLE
+    return size + sampled
+
+
 class MemoryCache:
-    """In-memory LRU cache."""
+    """
+    In-memory LRU cache with TTL and size bounds.
+
+    Entries live in an OrderedDict kept in recency order, so lookups,
+    touches and evictions are O(1). Expiry deadlines sit in a min-heap:
+    expired entries are dropped as they come due rather than waiting to be
+    read or evicted. Heap items for overwritten or deleted keys are skipped
+    when popped and compacted away when they outnumber live entries.
+
+    No operation awaits while it touches the cache, so each one is atomic
+    on the event loop and no lock is needed.
+    """
 
     def __init__(self, max_items: int = 10000, max_size_mb: int = 100):
         self.max_items = max_items
         self.max_size_bytes = max_size_mb * 1024 * 1024
 
-        self._cache: dict[str, CacheEntry] = {}
-        self._access_order: list[str] = []
-        self._lock = asyncio.Lock()
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._expiry: list[tuple[float, str]] = []  # (expires_at, key) min-heap
         self._stats = CacheStats()
         self._current_size = 0
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
     async def get(self, key: str) -> Any | None:
         """Get value from cache."""
-        async with self._lock:
-            entry = self._cache.get(key)
+        entry = self._cache.get(key)
 
-            if entry is None:
-                self._stats.misses += 1
-                return None
+        if entry is None:
+            self._stats.misses += 1
+            return None
 
-            if entry.is_expired:
-                self._stats.expirations += 1
-                await self._delete_entry(key)
-                return None
+        if entry.is_expired:
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            self._remove(key)
+            return None
 
-            entry.hits += 1
-            self._stats.hits += 1
+        entry.hits += 1
+        self._stats.hits += 1
 
-            # Update access order for LRU
-            if key in self._access_order:
-                self._access_order.remove(key)
-            self._access_order.append(key)
+        # Most recently used entries sit at the end
+        self._cache.move_to_end(key)
 
-            return entry.value
+        return entry.value
 
     async def set(
-        self, key: str, value: Any, ttl: int | None = None
+        self, key: str, value: Any, ttl: int | None = None, size: int | None = None
     ) -> None:
-        """Set value in cache."""
-        async with self._lock:
-            # Calculate size
-            size = len(json.dumps(value, default=str).encode())
+        """
+        Set value in cache.
 
-            # Evict if needed
-            await self._ensure_capacity(size)
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (None = no expiry)
+            size: Size in bytes if the caller knows it (default: estimate_size)
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_size_bytes:
+            logger.debug(f"Value for {key} ({size} bytes) exceeds cache size; not cached")
+            self._remove(key)
+            return
 
-            expires_at = time.time() + ttl if ttl else None
+        now = time.time()
+        self.purge_expired(now)
 
-            entry = CacheEntry(
-                value=value,
-                expires_at=expires_at,
-                size_bytes=size,
-            )
+        # Replace rather than evict for an existing key
+        previous = self._cache.pop(key, None)
+        if previous is not None:
+            self._current_size -= previous.size_bytes
 
-            # Update if exists
-            if key in self._cache:
-                self._current_size -= self._cache[key].size_bytes
+        self._ensure_capacity(size)
 
-            self._cache[key] = entry
-            self._current_size += size
-            self._stats.sets += 1
-            self._stats.total_items = len(self._cache)
+        expires_at = now + ttl if ttl else None
+        self._cache[key] = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            size_bytes=size,
+        )
+        self._current_size += size
+        self._stats.sets += 1
+        self._stats.total_items = len(self._cache)
 
-            # Update access order
-            if key in self._access_order:
-                self._access_order.remove(key)
-            self._access_order.append(key)
+        if expires_at is not None:
+            heapq.heappush(self._expiry, (expires_at, key))
+            if len(self._expiry) > 2 * len(self._cache) + 64:
+                self._compact_expiry()
 
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
-        async with self._lock:
-            return await self._delete_entry(key)
-
-    async def _delete_entry(self, key: str) -> bool:
-        """Internal delete without lock."""
-        if key in self._cache:
-            entry = self._cache.pop(key)
-            self._current_size -= entry.size_bytes
+        removed = self._remove(key)
+        if removed:
             self._stats.deletes += 1
-            self._stats.total_items = len(self._cache)
-
-            if key in self._access_order:
-                self._access_order.remove(key)
-            return True
-        return False
-
-    async def _ensure_capacity(self, needed_size: int) -> None:
-        """Ensure cache has capacity, evicting if needed."""
-        # Evict by count
-        while len(self._cache) >= self.max_items and self._access_order:
-            oldest_key = self._access_order.pop(0)
-            if oldest_key in self._cache:
-                entry = self._cache.pop(oldest_key)
-                self._current_size -= entry.size_bytes
-                self._stats.evictions += 1
-
-        # Evict by size
-        while (
-            self._current_size + needed_size > self.max_size_bytes
-            and self._access_order
+        return removed
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """Drop every entry whose TTL has passed. Returns the number dropped."""
+        now = time.time() if now is None else now
+        expired = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._cache.get(key)
+            # Skip heap items left behind by an overwrite or delete
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                expired += 1
+        self._stats.expirations += expired
+        return expired
+
+    def _remove(self, key: str) -> bool:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return False
+        self._current_size -= entry.size_bytes
+        self._stats.total_items = len(self._cache)
+        return True
+
+    def _compact_expiry(self) -> None:
+        """Rebuild the expiry heap from live entries."""
+        self._expiry = [
+            (entry.expires_at, key) for key, entry in self._cache.items() if entry.expires_at is not None
+        ]
+        heapq.heapify(self._expiry)
+
+    def _ensure_capacity(self, needed_size: int) -> None:
+        """Ensure cache has capacity, evicting least recently used entries if needed."""
+        while self._cache and (
+            len(self._cache) >= self.max_items
+            or self._current_size + needed_size > self.max_size_bytes
         ):
-            oldest_key = self._access_order.pop(0)
-            if oldest_key in self._cache:
-                entry = self._cache.pop(oldest_key)
-                self._current_size -= entry.size_bytes
-                self._stats.evictions += 1
+            _, entry = self._cache.popitem(last=False)
+            self._current_size -= entry.size_bytes
+            self._stats.evictions += 1
 
         self._stats.total_items = len(self._cache)
 
     async def clear(self) -> None:
         """Clear all cache entries."""
-        async with self._lock:
-            self._cache.clear()
-            self._access_order.clear()
-            self._current_size = 0
-            self._stats.total_items = 0
+        self._cache.clear()
+        self._expiry.clear()
+        self._current_size = 0
+        self._stats.total_items = 0
 
     @property
     def stats(self) -> CacheStats:
@@ -328,6 +400,10 @@ class CacheLayer:
                 self.config.namespace,
             )
 
+        # State for the cached() decorator
+        self._cached_stats = CacheStats()
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+
     async def start(self) -> None:
         """Initialize cache connections."""
         if self._redis:
@@ -336,6 +412,9 @@ class CacheLayer:
 
     async def close(self) -> None:
         """Close cache connections."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
         if self._redis:
             await self._redis.close()
 
@@ -421,6 +500,7 @@ class CacheLayer:
         """Get cache statistics."""
         memory_stats = self._memory.stats
         redis_stats = self._redis.stats if self._redis else None
+        cached_stats = self._cached_stats
 
         return {
             "memory": {
@@ -438,24 +518,86 @@ class CacheLayer:
             }
             if redis_stats
             else None,
+            "cached": {
+                "hits": cached_stats.hits,
+                "misses": cached_stats.misses,
+                "hit_rate": cached_stats.hit_rate,
+                "coalesced": cached_stats.coalesced,
+                "stale_hits": cached_stats.stale_hits,
+                "early_refreshes": cached_stats.early_refreshes,
+                "negative_hits": cached_stats.negative_hits,
+            },
         }
 
+    @property
+    def cached_stats(self) -> CacheStats:
+        """Statistics for functions wrapped with cached()."""
+        return self._cached_stats
+
     def cached(
         self,
         ttl: int | None = None,
         key_builder: Callable[..., str] | None = None,
+        stale_ttl: int = 0,
+        xfetch_beta: float = 1.0,
+        negative_ttl: int | None = None,
     ) -> Callable[[Callable[..., T]], Callable[..., T]]:
         """
         Decorator for caching function results.
 
+        Concurrent misses for the same key share one call of the function.
+        Values are stored with their expiry and how long they took to
+        compute, which allows two ways of refreshing without making callers
+        wait:
+
+        - XFetch: each hit may start a background refresh shortly before
+          expiry, with a probability that rises as expiry nears and with the
+          cost of recomputing (``xfetch_beta`` scales it; 0 disables).
+        - Stale-while-revalidate: for ``stale_ttl`` seconds after expiry the
+          old value is still returned while one background task refreshes it.
+
         Args:
             ttl: Time to live in seconds
             key_builder: Custom function to build cache key
+            stale_ttl: Seconds an expired value may be served while refreshing
+            xfetch_beta: Early refresh aggressiveness (0 = refresh on expiry only)
+            negative_ttl: Seconds to cache None results (None/0 = don't cache them)
         """
 
         def decorator(func: Callable[..., T]) -> Callable[..., T]:
+            async def load(cache_key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+                start = time.perf_counter()
+                if asyncio.iscoroutinefunction(func):
+                    result = await func(*args, **kwargs)
+                else:
+                    result = func(*args, **kwargs)
+                delta = time.perf_counter() - start
+
+                if result is None and not negative_ttl:
+                    return result
+                entry_ttl = negative_ttl if result is None else ttl or self.config.default_ttl
+                envelope = {
+                    _ENVELOPE: 1,
+                    "value": result,
+                    "delta": delta,
+                    "expires_at": time.time() + entry_ttl,
+                }
+                await self.set(cache_key, envelope, entry_ttl + stale_ttl)
+                return result
+
+            def start_load(cache_key: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> asyncio.Task[Any]:
+                """The in-flight load for a key, starting one if there is none."""
+                task = self._inflight.get(cache_key)
+                if task is None:
+                    task = asyncio.create_task(load(cache_key, args, kwargs))
+                    self._inflight[cache_key] = task
+                    task.add_done_callback(lambda t: self._load_done(cache_key, t))
+                return task
+
             @wraps(func)
             async def wrapper(*args: Any, **kwargs: Any) -> T:
+                stats = self._cached_stats
+
                 # Build cache key
                 if key_builder:
                     cache_key = key_builder(*args, **kwargs)
@@ -464,24 +606,50 @@ class CacheLayer:
 
                 # Try cache
                 cached_value = await self.get(cache_key)
-                if cached_value is not None:
+                if isinstance(cached_value, dict) and _ENVELOPE in cached_value:
+                    now = time.time()
+                    expires_at = cached_value["expires_at"]
+                    value = cached_value["value"]
+
+                    if now < expires_at:
+                        stats.hits += 1
+                        if value is None:
+                            stats.negative_hits += 1
+                        # XFetch: refresh early with probability rising towards expiry
+                        if xfetch_beta > 0 and cache_key not in self._inflight:
+                            gap = -cached_value["delta"] * xfetch_beta * math.log(1.0 - random.random())
+                            if now + gap >= expires_at:
+                                stats.early_refreshes += 1
+                                start_load(cache_key, args, kwargs)
+                        return value
+
+                    if now < expires_at + stale_ttl:
+                        stats.stale_hits += 1
+                        start_load(cache_key, args, kwargs)
+                        return value
+                elif cached_value is not None:
+                    # Stored by set() directly rather than by this decorator
+                    stats.hits += 1
                     return cached_value
 
-                # Execute function
-                if asyncio.iscoroutinefunction(func):
-                    result = await func(*args, **kwargs)
-                else:
-                    result = func(*args, **kwargs)
-
-                # Cache result
-                await self.set(cache_key, result, ttl)
-
-                return result
+                # Miss: share the computation with concurrent callers
+                stats.misses += 1
+                if cache_key in self._inflight:
+                    stats.coalesced += 1
+                task = start_load(cache_key, args, kwargs)
+                return await asyncio.shield(task)
 
             return wrapper
 
         return decorator
 
+    def _load_done(self, cache_key: str, task: asyncio.Task[Any]) -> None:
+        """Forget a finished load and log its failure, if any."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Cached function failed for {cache_key}: {task.exception()}")
+
     def _build_key(
         self,
         func_name: str,
@@ -1,5 +1,8 @@
 """Tests for AI provider integration."""
 
+import json
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -162,6 +165,85 @@ class TestAIProvider:
         assert "All models failed" in response.error
 
 
+class TestAnswerStream:
+    """Tests for streaming generation opened ahead of the prompt."""
+
+    @staticmethod
+    def _provider(handler) -> AIProvider:
+        provider = AIProvider(api_key="test-key")
+        provider._client = httpx.AsyncClient(
+            base_url="https://llm.test", transport=httpx.MockTransport(handler)
+        )
+        return provider
+
+    @pytest.mark.asyncio
+    async def test_streams_tokens_after_prompt_is_sent(self):
+        """Test the held-open body is completed by send() and deltas are parsed."""
+        seen = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen["payload"] = json.loads(await request.aread())
+            events = [
+                {"choices": [{"delta": {"role": "assistant"}}]},
+                {"choices": [{"delta": {"content": "Hello"}}]},
+                {"choices": [{"delta": {"content": " \"world\""}}]},
+            ]
+            body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+            return httpx.Response(200, text=body)
+
+        provider = self._provider(handler)
+        stream = await provider.open_stream(system_prompt="Be brief", temperature=0.3)
+        stream.send('Say "hi"')
+        tokens = [token async for token in stream.tokens()]
+        await stream.aclose()
+
+        assert tokens == ["Hello", ' "world"']
+        assert seen["payload"]["stream"] is True
+        assert seen["payload"]["messages"] == [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": 'Say "hi"'},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_api_error_raises(self):
+        """Test a non-200 response surfaces as an error before any token."""
+        from knowledge.exceptions import ExternalServiceError
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await request.aread()
+            return httpx.Response(429, text="rate limited")
+
+        stream = await self._provider(handler).open_stream()
+        stream.send("Hello")
+
+        with pytest.raises(ExternalServiceError, match="429"):
+            async for _ in stream.tokens():
+                pass
+
+    @pytest.mark.asyncio
+    async def test_aclose_abandons_unsent_request(self):
+        """Test closing before send() cancels the in-flight request."""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await request.aread()
+            return httpx.Response(200, text="")
+
+        stream = await self._provider(handler).open_stream()
+        await stream.aclose()
+
+        assert stream._response.done()
+
+    @pytest.mark.asyncio
+    async def test_open_stream_requires_api_key(self):
+        """Test streaming is unavailable without an API key."""
+        from knowledge.exceptions import ExternalServiceError
+
+        provider = AIProvider(api_key=None)
+        provider.api_key = None
+
+        with pytest.raises(ExternalServiceError):
+            await provider.open_stream()
+
+
 class TestGenerateAnswer:
     """Tests for generate_answer function."""
 
@@ -196,6 +196,25 @@ class TestSearchEndpoints:
             assert data["search_mode"] == "hybrid"
 
 
+    def test_ask_stream_returns_sse(self, client: TestClient):
+        """Test streamed ask returns server-sent events in order."""
+        from knowledge.qa import AskEvent
+
+        async def fake_stream(query: str, limit: int):
+            yield AskEvent("context", {"confidence": "high", "citations": []})
+            yield AskEvent("token", {"text": "Hello"})
+            yield AskEvent("done", {"answer": "Hello", "warning": None, "error": None})
+
+        with patch("knowledge.api.routes.search.ask_stream", fake_stream):
+            response = client.post("/search/ask", json={"query": "test", "stream": True})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = [b for b in response.text.split("\n\n") if b]
+        assert [b.split("\n")[0] for b in blocks] == ["event: context", "event: token", "event: done"]
+        assert blocks[1].split("\n")[1] == 'data: {"text": "Hello"}'
+
+
 class TestContentEndpoints:
     """Tests for content management endpoints."""
 
@@ -520,6 +539,21 @@ class TestIntegrationWithMockedServices:
 class TestBatchSearchEndpoint:
     """Tests for batch search endpoint."""
 
+    @pytest.fixture(autouse=True)
+    def mock_embed_batch(self, mock_embedding: list[float]):
+        """Batch search embeds query texts up front."""
+        async def embed(texts: list[str]) -> list[list[float]]:
+            return [mock_embedding for _ in texts]
+
+        with patch("knowledge.api.routes.batch.embed_batch", AsyncMock(side_effect=embed)) as mock:
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def mock_cached_search(self):
+        """Hybrid queries are looked up in the search cache first (all misses by default)."""
+        with patch("knowledge.api.routes.batch.get_cached_search", AsyncMock(return_value=None)) as mock:
+            yield mock
+
     def test_batch_search_single_query(self, client: TestClient):
         """Test batch search with single query."""
         from knowledge.search import HybridSearchResponse
@@ -576,12 +610,87 @@ class TestBatchSearchEndpoint:
 
     def test_batch_search_max_queries_limit(self, client: TestClient):
         """Test batch search respects max queries limit."""
-        # More than 10 queries should fail validation
-        queries = [{"query": f"test {i}", "limit": 5, "mode": "hybrid"} for i in range(11)]
+        # More than 50 queries should fail validation
+        queries = [{"query": f"test {i}", "limit": 5, "mode": "hybrid"} for i in range(51)]
 
         response = client.post("/api/v1/batch/search", json={"queries": queries})
         assert response.status_code == 422  # Validation error
 
+    def test_batch_search_shares_embeddings_and_deduplicates(
+        self, client: TestClient, mock_embed_batch: AsyncMock, mock_embedding: list[float]
+    ):
+        """Test duplicate queries run once and embeddings come from one batched call."""
+        from knowledge.search import HybridSearchResponse
+
+        mock_response = HybridSearchResponse(results=[], degraded=False, search_mode="hybrid")
+        hybrid = AsyncMock(return_value=mock_response)
+        vector = AsyncMock(return_value=[])
+        bm25 = AsyncMock(return_value=[])
+
+        with patch("knowledge.api.routes.batch.hybrid_search_with_status", hybrid), \
+             patch("knowledge.api.routes.batch.search_bm25_only", bm25), \
+             patch("knowledge.api.routes.batch.search_vector_only", vector):
+            response = client.post("/api/v1/batch/search", json={
+                "queries": [
+                    {"query": "rag", "limit": 5, "mode": "hybrid"},
+                    {"query": "rag", "limit": 5, "mode": "hybrid"},
+                    {"query": "rag", "limit": 5, "mode": "vector"},
+                    {"query": "pgvector", "limit": 5, "mode": "bm25"},
+                    {"query": "rag", "limit": 10, "mode": "hybrid"},
+                ]
+            })
+            assert response.status_code == 200
+
+            data = response.json()
+            assert data["total_queries"] == 5
+            assert data["succeeded"] == 5
+            assert [r["query"] for r in data["results"]] == ["rag", "rag", "rag", "pgvector", "rag"]
+
+            mock_embed_batch.assert_awaited_once_with(["rag"])
+            assert hybrid.await_count == 2
+            assert vector.await_count == 1
+            assert bm25.await_count == 1
+            assert hybrid.await_args.kwargs["query_embedding"] == mock_embedding
+            assert vector.await_args.kwargs["query_embedding"] == mock_embedding
+
+    def test_batch_search_cached_queries_skip_embedding(
+        self, client: TestClient, mock_embed_batch: AsyncMock, mock_cached_search: AsyncMock
+    ):
+        """Test cached hybrid queries are served without embedding or searching."""
+        from knowledge.search import HybridSearchResponse, SearchResult
+
+        cached = HybridSearchResponse(
+            results=[SearchResult(content_id=uuid4(), title="Cached", content_type="note", score=0.7)],
+            degraded=False,
+            search_mode="hybrid",
+            cached=True,
+        )
+        mock_cached_search.side_effect = lambda query, **kwargs: cached if query == "rag" else None
+        hybrid = AsyncMock(return_value=HybridSearchResponse(results=[], degraded=False, search_mode="hybrid"))
+
+        with patch("knowledge.api.routes.batch.hybrid_search_with_status", hybrid):
+            response = client.post("/api/v1/batch/search", json={
+                "queries": [
+                    {"query": "rag", "limit": 5, "mode": "hybrid"},
+                    {"query": "pgvector", "limit": 5, "mode": "hybrid"},
+                ]
+            })
+            assert response.status_code == 200
+
+            data = response.json()
+            assert [r["total"] for r in data["results"]] == [1, 0]
+            mock_embed_batch.assert_awaited_once_with(["pgvector"])
+            hybrid.assert_awaited_once()
+            assert hybrid.await_args.args[0] == "pgvector"
+
+        # A fully cached batch makes no embedding call at all
+        mock_embed_batch.reset_mock()
+        response = client.post("/api/v1/batch/search", json={
+            "queries": [{"query": "rag", "limit": 5, "mode": "hybrid"}]
+        })
+        assert response.json()["results"][0]["total"] == 1
+        mock_embed_batch.assert_not_awaited()
+
     def test_batch_search_empty_queries(self, client: TestClient):
         """Test batch search with empty queries list."""
         response = client.post("/api/v1/batch/search", json={"queries": []})
@@ -795,6 +904,20 @@ class TestTuningCacheEndpoint:
         assert data["search_ttl"] == 600
         assert data["embedding_ttl"] == 43200
 
+    def test_get_cache_generations(self, client: TestClient):
+        """Test search cache generations and stats are exposed."""
+        cache = MagicMock()
+        cache.get_generations = AsyncMock(return_value={"*": 12, "work": 5})
+        cache.get_stats.return_value = {"search": {"hits": 3, "misses": 1, "errors": 0, "hit_rate": "75.00%"}}
+
+        with patch("knowledge.api.routes.tuning.get_cache", AsyncMock(return_value=cache)):
+            response = client.get("/api/v1/tuning/cache/generations")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["generations"] == {"*": 12, "work": 5}
+        assert data["stats"]["search"]["hits"] == 3
+
     def test_update_cache_ttl_validation(self, client: TestClient):
         """Test cache TTL validation bounds."""
         # TTL > max should fail
@@ -881,12 +1004,124 @@ class TestExportEndpoints:
             data = response.json()
             assert data["metadata"]["namespace"] == "project-a"
 
+    def _export_db(self, mock_db: MagicMock, items: int) -> tuple[MagicMock, list[str]]:
+        """Mock content rows plus one embedded chunk per item."""
+        from datetime import UTC, datetime
+
+        import numpy as np
+
+        ids = [uuid4() for _ in range(items)]
+        queries: list[str] = []
+
+        async def mock_iterate(query, *args, **kwargs):
+            queries.append(query)
+            if "FROM chunks" in query:
+                for content_id in args[0]:
+                    yield {
+                        "content_id": content_id,
+                        "chunk_index": 0,
+                        "chunk_text": f"text {content_id}",
+                        "embedding": np.full(768, 0.5, dtype=np.float32),
+                    }
+                return
+            for i, content_id in enumerate(ids):
+                yield {
+                    "id": content_id, "filepath": f"notes/{i}.md", "title": f"Item {i}", "content_type": "note",
+                    "source_ref": None, "namespace": "default", "tags": ["t"],
+                    "created_at": datetime(2026, 1, 1, tzinfo=UTC), "updated_at": None,
+                }
+
+        mock_db.iterate = mock_iterate
+        return mock_db, queries
+
+    def test_export_streams_items_with_page_chunk_prefetch(self, client: TestClient, mock_db: MagicMock):
+        """Test chunks are fetched per page and embeddings encode as float lists."""
+        import json
+
+        from knowledge.api.routes import export as export_module
+
+        db, queries = self._export_db(mock_db, items=5)
+        with patch("knowledge.api.routes.export.get_db", AsyncMock(return_value=db)), \
+             patch.object(export_module, "EXPORT_PAGE_SIZE", 2):
+            response = client.post("/api/v1/export", json={
+                "format": "json",
+                "include_embeddings": True,
+            })
+
+        assert response.status_code == 200
+        data = json.loads(response.content)
+        assert data["metadata"]["total_items"] == 5
+        assert [item["title"] for item in data["items"]] == [f"Item {i}" for i in range(5)]
+        embedding = data["items"][0]["chunks"][0]["embedding"]
+        assert len(embedding) == 768 and embedding[0] == 0.5
+        # One content cursor plus one chunk query per page of two
+        assert sum("FROM chunks" in q for q in queries) == 3
+
+    def test_export_parquet_writes_float32_embeddings(self, client: TestClient, mock_db: MagicMock):
+        """Test Parquet export stores one row per chunk with fixed-size float32 vectors."""
+        import io
+
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        db, _ = self._export_db(mock_db, items=3)
+        with patch("knowledge.api.routes.export.get_db", AsyncMock(return_value=db)):
+            response = client.post("/api/v1/export", json={
+                "format": "parquet",
+                "include_embeddings": True,
+            })
+
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 3
+        assert table.schema.field("embedding").type == pa.list_(pa.float32(), 768)
+        assert table.column("embedding")[0].as_py()[0] == 0.5
+
+    def _import_db(
+        self,
+        mock_db: MagicMock,
+        existing: list[str] | None = None,
+        filepaths: dict[str, str] | None = None,
+    ) -> MagicMock:
+        """Mock a transaction connection reporting the given ids (and filepath owners) as existing.
+
+        Content upserts are routed to ``conn.upsert``.
+        """
+        from contextlib import asynccontextmanager
+        from uuid import UUID
+
+        rows = [{"id": UUID(i), "filepath": f"existing/{i}.md"} for i in existing or []]
+        rows += [{"id": UUID(i), "filepath": path} for path, i in (filepaths or {}).items()]
+        conn = MagicMock()
+        conn.upsert = AsyncMock(return_value=[{"namespace": "default"}])
+
+        async def fetch(sql, *args):
+            if "INSERT INTO content" in sql:
+                return await conn.upsert(sql, *args)
+            return rows
+
+        conn.fetch = AsyncMock(side_effect=fetch)
+        conn.execute = AsyncMock()
+
+        @asynccontextmanager
+        async def transaction():
+            yield conn
+
+        @asynccontextmanager
+        async def savepoint(conn):
+            yield conn
+
+        mock_db.transaction = transaction
+        mock_db.savepoint = savepoint
+        mock_db.bulk_load_chunks = AsyncMock(return_value={})
+        mock_db.content_changed_in = AsyncMock()
+        return conn
+
     def test_import_json_file(self, client: TestClient, mock_db: MagicMock):
         """Test importing JSON backup file."""
         import io
 
-        mock_db.fetchrow = AsyncMock(return_value=None)  # Item doesn't exist
-        mock_db.execute = AsyncMock()
+        conn = self._import_db(mock_db)  # Item doesn't exist
 
         export_data = {
             "metadata": {"version": "1.0", "total_items": 1},
@@ -909,6 +1144,8 @@ class TestExportEndpoints:
 
             data = response.json()
             assert data["total"] == 1
+            assert data["imported"] == 1
+            conn.upsert.assert_awaited_once()
 
     def test_import_invalid_json(self, client: TestClient):
         """Test importing invalid JSON fails gracefully."""
@@ -928,7 +1165,7 @@ class TestExportEndpoints:
         content_id = str(uuid4())
 
         # Item exists
-        mock_db.fetchrow = AsyncMock(return_value={"id": content_id})
+        self._import_db(mock_db, existing=[content_id])
 
         export_data = {
             "items": [
@@ -948,6 +1185,199 @@ class TestExportEndpoints:
             assert data["skipped"] == 1
             assert data["imported"] == 0
 
+    def test_import_groups_items_with_one_existence_check(self, client: TestClient, mock_db: MagicMock):
+        """Test a large gzipped JSONL import runs one existence query and upsert per group."""
+        import gzip
+        import io
+
+        from knowledge.api.routes import export as export_module
+
+        ids = [str(uuid4()) for _ in range(7)]
+        conn = self._import_db(mock_db, existing=ids[:2])
+        lines = [json.dumps({"type": "metadata", "data": {}})] + [
+            json.dumps({"type": "item", "data": {
+                "id": content_id, "title": f"Item {i}", "content_type": "note",
+                "chunks": [{"index": 0, "text": "body", "embedding": [0.1] * 768}],
+            }})
+            for i, content_id in enumerate(ids)
+        ]
+        body = gzip.compress("\n".join(lines).encode())
+
+        settings = MagicMock(import_batch_size=3, import_max_upload_mb=0)
+        with patch("knowledge.api.routes.export.get_db", AsyncMock(return_value=mock_db)), \
+             patch("knowledge.api.routes.export.get_settings", return_value=settings), \
+             patch.object(export_module, "IMPORT_READ_SIZE", 64):
+            response = client.post(
+                "/api/v1/export/import?job_id=restore-1",
+                files={"file": ("backup.jsonl.gz", io.BytesIO(body), "application/gzip")},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["total"], data["imported"], data["skipped"]) == (7, 5, 2)
+        assert data["job_id"] == "restore-1"
+        # Groups of 3, 3 and 1: one existence check and one upsert each
+        assert conn.fetch.await_count - conn.upsert.await_count == 3
+        assert conn.upsert.await_count == 3
+        loaded = [c for call in mock_db.bulk_load_chunks.await_args_list for c in call.args[0]]
+        assert len(loaded) == 5
+
+        job = client.get("/api/v1/export/import/restore-1")
+        assert job.status_code == 200
+        assert job.json()["status"] == "completed"
+        assert job.json()["imported"] == 5
+
+    def _post_import(self, client: TestClient, mock_db: MagicMock, items: list[dict]):
+        import io
+
+        with patch("knowledge.api.routes.export.get_db", AsyncMock(return_value=mock_db)):
+            return client.post(
+                "/api/v1/export/import",
+                files={"file": ("backup.json", io.BytesIO(json.dumps({"items": items}).encode()), "application/json")},
+            )
+
+    def test_import_rejects_unknown_content_type_per_item(self, client: TestClient, mock_db: MagicMock):
+        """Test an invalid content_type fails only its own item."""
+        conn = self._import_db(mock_db)
+        good, bad = str(uuid4()), str(uuid4())
+
+        response = self._post_import(client, mock_db, [
+            {"id": good, "title": "Good", "content_type": "paper"},
+            {"id": bad, "title": "Bad", "content_type": "podcast"},
+        ])
+
+        data = response.json()
+        assert (data["imported"], data["errors"][0]["item_id"]) == (1, bad)
+        assert "content_type" in data["errors"][0]["error"]
+        upserted_ids = conn.upsert.await_args.args[1]
+        assert [str(i) for i in upserted_ids] == [good]
+
+    def test_import_suffixes_filepath_owned_by_another_item(self, client: TestClient, mock_db: MagicMock):
+        """Test a filepath already used by different content gets a unique suffix."""
+        from uuid import UUID
+
+        owner, first, second = str(uuid4()), str(uuid4()), str(uuid4())
+        conn = self._import_db(mock_db, filepaths={"notes/a.md": owner})
+
+        response = self._post_import(client, mock_db, [
+            {"id": first, "title": "A", "filepath": "notes/a.md"},
+            {"id": second, "title": "B", "filepath": "notes/b.md"},
+            {"id": str(uuid4()), "title": "B again", "filepath": "notes/b.md"},
+        ])
+
+        assert response.json()["imported"] == 3
+        filepaths = conn.upsert.await_args.args[2]
+        assert filepaths[0] == f"notes/a-{UUID(first).hex[:8]}.md"
+        assert filepaths[1] == "notes/b.md"
+        assert filepaths[2].startswith("notes/b-")
+
+    def test_import_retries_failed_group_item_by_item(self, client: TestClient, mock_db: MagicMock):
+        """Test a failing group is retried per item so only the bad item is reported."""
+        conn = self._import_db(mock_db)
+        ids = [str(uuid4()) for _ in range(3)]
+
+        async def upsert(sql, *args):
+            if any(str(i) == ids[1] for i in args[0]):
+                raise RuntimeError("duplicate key value violates unique constraint")
+            return [{"namespace": "default"}]
+
+        conn.upsert = AsyncMock(side_effect=upsert)
+
+        response = self._post_import(client, mock_db, [{"id": i, "title": i} for i in ids])
+
+        data = response.json()
+        assert (data["total"], data["imported"]) == (3, 2)
+        assert [e["item_id"] for e in data["errors"]] == [ids[1]]
+        # One group attempt, then one upsert per item
+        assert conn.upsert.await_count == 4
+
+    def test_import_size_cap_is_optional(self, client: TestClient, mock_db: MagicMock):
+        """Test the upload cap only applies when configured."""
+        import io
+
+        self._import_db(mock_db)
+        settings = MagicMock(import_batch_size=100, import_max_upload_mb=1)
+        body = b'{"items": [' + b" " * (2 * 1024 * 1024) + b"]}"
+
+        with patch("knowledge.api.routes.export.get_db", AsyncMock(return_value=mock_db)), \
+             patch("knowledge.api.routes.export.get_settings", return_value=settings):
+            response = client.post(
+                "/api/v1/export/import",
+                files={"file": ("backup.json", io.BytesIO(body), "application/json")},
+            )
+
+        assert response.status_code == 413
+
+
+class TestImportParsers:
+    """Tests for the incremental import parsers."""
+
+    def test_json_items_split_across_reads(self):
+        from knowledge.api.routes.export import _JsonItemParser
+
+        text = json.dumps({
+            "items": [{"id": str(i), "title": "t [x]", "chunks": [{"index": 0}]} for i in range(4)],
+            "metadata": {"total_items": 4},
+        })
+        parser = _JsonItemParser()
+        items = []
+        for start in range(0, len(text), 7):
+            items.extend(parser.feed(text[start:start + 7]))
+        items.extend(parser.close())
+
+        assert [item["id"] for item in items] == ["0", "1", "2", "3"]
+
+    def test_json_without_items_is_empty(self):
+        from knowledge.api.routes.export import _JsonItemParser
+
+        parser = _JsonItemParser()
+        assert parser.feed('{"metadata": {}}') == []
+        assert parser.close() == []
+
+    def test_truncated_json_raises(self):
+        from knowledge.api.routes.export import _JsonItemParser
+
+        parser = _JsonItemParser()
+        parser.feed('{"items": [{"id": "1"}, {"id": ')
+        with pytest.raises(json.JSONDecodeError):
+            parser.close()
+
+
+# =============================================================================
+# Entity Backfill API Tests
+# =============================================================================
+
+
+class TestEntityBackfillEndpoints:
+    """Tests for entity backfill access control."""
+
+    @pytest.fixture
+    def read_only_key(self):
+        from knowledge.api.auth import APIKey, get_api_key
+
+        app.dependency_overrides[get_api_key] = lambda: APIKey(
+            id=uuid4(), name="reader", scopes=["read"], rate_limit=100
+        )
+        yield
+        app.dependency_overrides.pop(get_api_key)
+
+    def test_start_requires_write_scope(self, client: TestClient, read_only_key):
+        """Test a read-only key cannot start a paid extraction run over the corpus."""
+        from knowledge.exceptions import InsufficientScopeError
+
+        with patch("knowledge.api.routes.entities.run_entity_backfill") as run, \
+             pytest.raises(InsufficientScopeError, match="'write' required"):
+            client.post("/entities/backfill", json={})
+
+        run.assert_not_called()
+
+    def test_status_allows_read_scope(self, client: TestClient, read_only_key):
+        """Test backfill progress is readable with the read scope."""
+        response = client.get("/entities/backfill")
+
+        assert response.status_code == 200
+        assert response.json()["running"] is False
+
 
 # =============================================================================
 # Webhooks API Tests
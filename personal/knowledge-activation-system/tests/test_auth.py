@@ -0,0 +1,332 @@
+"""Tests for API key authentication."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from knowledge.api import auth
+from knowledge.api.auth import (
+    APIKey,
+    LastUsedTracker,
+    RejectedKeyCache,
+    VerifiedKeyCache,
+    api_key_prefix,
+    generate_api_key,
+    get_api_key,
+    hash_api_key_sha256,
+    revoke_api_key,
+)
+from knowledge.config import Settings
+from knowledge.exceptions import InvalidAPIKeyError
+
+# One Argon2 hash shared by every filler key: they never match, and hashing
+# hundreds of distinct keys would dominate the test run
+_FILLER_KEY, _FILLER_HASH = generate_api_key()
+
+
+class FakeConnection:
+    """Answers the api_keys queries issued by knowledge.api.auth."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries: list[str] = []
+        self.executed: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        self.queries.append(query)
+        active = [row for row in self.rows if row["revoked_at"] is None]
+        if "key_prefix = $1" in query:
+            prefix, digest = args
+            return [row for row in active if row["key_prefix"] == prefix or row["key_hash"] == digest]
+        return [row for row in active if row["key_prefix"] is None and row["key_hash"].startswith("$argon2")]
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self.executed.append((query, args))
+        if "SET key_prefix" in query:
+            key_id, prefix = args
+            next(row for row in self.rows if row["id"] == key_id)["key_prefix"] = prefix
+        if "SET revoked_at" in query:
+            for row in self.rows:
+                if row["id"] == args[0] and row["revoked_at"] is None:
+                    row["revoked_at"] = datetime.now(UTC)
+                    return "UPDATE 1"
+            return "UPDATE 0"
+        return "UPDATE 0"
+
+
+class FakeDatabase:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.conn = FakeConnection(rows)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def key_row(key_hash: str, prefix: str | None, **overrides: Any) -> dict[str, Any]:
+    row = {
+        "id": uuid4(),
+        "name": "test",
+        "scopes": ["read"],
+        "rate_limit": 100,
+        "key_hash": key_hash,
+        "key_prefix": prefix,
+        "expires_at": None,
+        "revoked_at": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def fillers(count: int) -> list[dict[str, Any]]:
+    return [key_row(_FILLER_HASH, f"kas_filler{i:06d}") for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(test_settings: Settings, monkeypatch):
+    monkeypatch.setattr(auth, "_verified_keys", None)
+    monkeypatch.setattr(auth, "_rejected_keys", None)
+    monkeypatch.setattr(auth, "_legacy_argon2_keys", True)
+    monkeypatch.setattr(auth, "_last_used", LastUsedTracker())
+    with patch("knowledge.api.auth.get_settings", return_value=test_settings):
+        yield
+
+
+@pytest.fixture
+def request_() -> MagicMock:
+    request = MagicMock()
+    request.url.path = "/api/v1/search"
+    return request
+
+
+def use_db(rows: list[dict[str, Any]]):
+    db = FakeDatabase(rows)
+
+    async def get_db():
+        return db
+
+    return db, patch("knowledge.api.auth.get_db", side_effect=get_db)
+
+
+class TestGetAPIKey:
+    """Tests for the get_api_key dependency."""
+
+    async def test_verifies_exactly_one_hash(self, request_):
+        key, key_hash = generate_api_key()
+        rows = fillers(100) + [key_row(key_hash, api_key_prefix(key), name="mine")]
+        db, patched = use_db(rows)
+
+        with patched, patch("knowledge.api.auth.verify_api_key", wraps=auth.verify_api_key) as verify:
+            api_key = await get_api_key(request_, key)
+
+        assert api_key.name == "mine"
+        assert verify.call_count == 1
+        assert len(db.conn.queries) == 1
+        # Reads never write
+        assert db.conn.executed == []
+        assert len(auth._last_used) == 1
+
+    async def test_cached_key_skips_database(self, request_):
+        key, key_hash = generate_api_key()
+        db, patched = use_db([key_row(key_hash, api_key_prefix(key))])
+
+        with patched:
+            first = await get_api_key(request_, key)
+            second = await get_api_key(request_, key)
+
+        assert first == second
+        assert len(db.conn.queries) == 1
+
+    async def test_invalid_key_rejected(self, request_):
+        key, _ = generate_api_key()
+        _, patched = use_db(fillers(3))
+
+        with patched, pytest.raises(InvalidAPIKeyError):
+            await get_api_key(request_, key)
+
+        assert len(auth.get_verified_key_cache()) == 0
+
+    async def test_rejected_key_skips_database(self, request_):
+        key, _ = generate_api_key()
+        db, patched = use_db(fillers(3))
+
+        with patched:
+            for _ in range(2):
+                with pytest.raises(InvalidAPIKeyError):
+                    await get_api_key(request_, key)
+
+        # Prefix lookup and legacy scan once, then refused from memory
+        assert len(db.conn.queries) == 2
+
+    async def test_legacy_scan_skipped_once_none_remain(self, request_):
+        db, patched = use_db(fillers(3))
+
+        with patched:
+            for _ in range(2):
+                key, _ = generate_api_key()
+                with pytest.raises(InvalidAPIKeyError):
+                    await get_api_key(request_, key)
+
+        assert len(db.conn.queries) == 3
+        assert auth._legacy_argon2_keys is False
+
+    async def test_legacy_scan_kept_while_unprefixed_rows_remain(self, request_):
+        db, patched = use_db([key_row(_FILLER_HASH, None)])
+
+        with patched:
+            for _ in range(2):
+                key, _ = generate_api_key()
+                with pytest.raises(InvalidAPIKeyError):
+                    await get_api_key(request_, key)
+
+        assert len(db.conn.queries) == 4
+
+    async def test_legacy_sha256_key(self, request_):
+        key = "kas_legacy-key"
+        db, patched = use_db([key_row(hash_api_key_sha256(key), None, name="legacy")])
+
+        with patched:
+            api_key = await get_api_key(request_, key)
+
+        assert api_key.name == "legacy"
+        assert len(db.conn.queries) == 1
+
+    async def test_unprefixed_argon2_key_is_backfilled(self, request_):
+        key, key_hash = generate_api_key()
+        row = key_row(key_hash, None)
+        db, patched = use_db([row])
+
+        with patched:
+            await get_api_key(request_, key)
+            auth.get_verified_key_cache().clear()
+            await get_api_key(request_, key)
+
+        assert row["key_prefix"] == api_key_prefix(key)
+        # Scan once, then found by prefix
+        assert len(db.conn.queries) == 3
+        assert auth._legacy_argon2_keys is False
+
+    async def test_revoke_invalidates_cache(self, request_):
+        key, key_hash = generate_api_key()
+        row = key_row(key_hash, api_key_prefix(key))
+        _, patched = use_db([row])
+
+        with patched:
+            await get_api_key(request_, key)
+            assert await revoke_api_key(row["id"])
+            with pytest.raises(InvalidAPIKeyError):
+                await get_api_key(request_, key)
+
+
+class TestVerifiedKeyCache:
+    """Tests for VerifiedKeyCache."""
+
+    def make_key(self) -> APIKey:
+        return APIKey(id=uuid4(), name="k", scopes=["read"], rate_limit=100)
+
+    def test_ttl_expiry(self):
+        cache = VerifiedKeyCache(ttl=10)
+        api_key = self.make_key()
+        with patch("knowledge.api.auth.time.monotonic", return_value=100.0):
+            cache.put("d", api_key)
+        with patch("knowledge.api.auth.time.monotonic", return_value=109.0):
+            assert cache.get("d") == api_key
+        with patch("knowledge.api.auth.time.monotonic", return_value=110.0):
+            assert cache.get("d") is None
+
+    def test_key_expiry_caps_ttl(self):
+        cache = VerifiedKeyCache(ttl=60)
+        cache.put("expired", self.make_key(), datetime.now(UTC) - timedelta(seconds=1))
+        assert cache.get("expired") is None
+
+        with patch("knowledge.api.auth.time.monotonic", return_value=100.0):
+            cache.put("soon", self.make_key(), datetime.now(UTC) + timedelta(seconds=5))
+        with patch("knowledge.api.auth.time.monotonic", return_value=106.0):
+            assert cache.get("soon") is None
+
+    def test_zero_ttl_disables(self):
+        cache = VerifiedKeyCache(ttl=0)
+        cache.put("d", self.make_key())
+        assert len(cache) == 0
+
+    def test_bounded_lru(self):
+        cache = VerifiedKeyCache(ttl=60, max_size=2)
+        keys = [self.make_key() for _ in range(3)]
+        cache.put("a", keys[0])
+        cache.put("b", keys[1])
+        cache.get("a")
+        cache.put("c", keys[2])
+        assert cache.get("b") is None
+        assert cache.get("a") == keys[0]
+
+    def test_invalidate_by_id(self):
+        cache = VerifiedKeyCache(ttl=60)
+        api_key, other = self.make_key(), self.make_key()
+        cache.put("a", api_key)
+        cache.put("b", other)
+        assert cache.invalidate(api_key.id) == 1
+        assert cache.get("a") is None
+        assert cache.get("b") == other
+
+
+class TestRejectedKeyCache:
+    """Tests for RejectedKeyCache."""
+
+    def test_ttl_expiry(self):
+        cache = RejectedKeyCache(ttl=5)
+        with patch("knowledge.api.auth.time.monotonic", return_value=100.0):
+            cache.add("d")
+        with patch("knowledge.api.auth.time.monotonic", return_value=104.0):
+            assert "d" in cache
+        with patch("knowledge.api.auth.time.monotonic", return_value=105.0):
+            assert "d" not in cache
+        assert len(cache) == 0
+
+    def test_zero_ttl_disables(self):
+        cache = RejectedKeyCache(ttl=0)
+        cache.add("d")
+        assert "d" not in cache
+
+    def test_bounded(self):
+        cache = RejectedKeyCache(ttl=5, max_size=2)
+        for digest in ("a", "b", "c"):
+            cache.add(digest)
+        assert len(cache) == 2
+        assert "a" not in cache
+
+
+class TestLastUsedTracker:
+    """Tests for batched last_used_at writes."""
+
+    async def test_flush_is_one_update(self):
+        tracker = LastUsedTracker()
+        ids: list[UUID] = [uuid4(), uuid4()]
+        for key_id in ids * 50:
+            tracker.touch(key_id)
+        db, patched = use_db([])
+
+        with patched:
+            assert await tracker.flush() == 2
+            assert await tracker.flush() == 0
+
+        assert len(db.conn.executed) == 1
+        query, (flushed_ids, timestamps) = db.conn.executed[0]
+        assert "unnest" in query
+        assert flushed_ids == ids
+        assert len(timestamps) == 2
+
+    async def test_failed_flush_keeps_pending(self):
+        tracker = LastUsedTracker()
+        tracker.touch(uuid4())
+
+        with patch("knowledge.api.auth.get_db", side_effect=ConnectionError("db down")):
+            with pytest.raises(ConnectionError):
+                await tracker.flush()
+
+        assert len(tracker) == 1
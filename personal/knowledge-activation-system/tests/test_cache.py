@@ -1,15 +1,22 @@
 """Tests for Redis caching layer."""
 
+import asyncio
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from knowledge.cache import (
+    LRUCache,
     RedisCache,
+    SingleFlight,
     CacheType,
     CacheStats,
     get_cache,
     close_cache,
     cached,
+    pack_vector,
+    unpack_vector,
 )
 
 
@@ -37,6 +44,116 @@ class TestCacheType:
         assert CacheType.EMBEDDING.value == "embedding"
         assert CacheType.RERANK.value == "rerank"
         assert CacheType.QUERY_EXPANSION.value == "expansion"
+        assert CacheType.ANSWER.value == "answer"
+
+
+class TestLRUCache:
+    """Test the in-process LRU tier."""
+
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_size=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        assert lru.get("a") == 1  # "b" is now least recently used
+        lru.set("c", 3)
+        assert lru.get("b") is None
+        assert lru.get("a") == 1
+        assert lru.get("c") == 3
+        assert len(lru) == 2
+
+    def test_tracks_stats(self):
+        lru = LRUCache(max_size=2)
+        lru.set("a", 1)
+        lru.get("a")
+        lru.get("missing")
+        assert lru.stats.hits == 1
+        assert lru.stats.misses == 1
+
+
+class TestVectorPacking:
+    """Test float32 vector packing."""
+
+    def test_round_trip(self):
+        vector = [0.5, -1.25, 3.0]
+        assert unpack_vector(pack_vector(vector)).tolist() == vector
+
+    def test_packed_size_is_four_bytes_per_dimension(self):
+        vector = [-0.012345678901234567] * 768  # Typical float64 JSON width
+        packed = pack_vector(vector)
+        assert len(packed) == 768 * 4
+        assert len(packed) < len(json.dumps(vector)) / 4
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls."""
+
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+        calls = 0
+
+        async def work() -> list[int]:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return [1, 2]
+
+        tasks = [asyncio.create_task(flight.do("k", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert len(flight) == 1
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert (flight.calls, flight.coalesced) == (5, 4)
+        assert len(flight) == 0
+
+    async def test_distinct_keys_run_separately(self):
+        flight = SingleFlight("test")
+
+        async def work(value: int) -> int:
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+        assert results == [1, 2]
+        assert flight.coalesced == 0
+
+    async def test_exception_propagates_to_all_waiters_and_is_not_kept(self):
+        flight = SingleFlight("test")
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+
+        async def succeed() -> str:
+            return "ok"
+
+        assert await flight.do("k", succeed) == "ok"
+
+    async def test_cancelled_caller_does_not_cancel_shared_work(self):
+        flight = SingleFlight("test")
+        release = asyncio.Event()
+
+        async def work() -> str:
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", work))
+        second = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
 
 
 class TestRedisCache:
@@ -52,6 +169,9 @@ class TestRedisCache:
                 cache_ttl_search=300,
                 cache_ttl_embedding=86400,
                 cache_ttl_rerank=600,
+                cache_ttl_answer=3600,
+                cache_ttl_decomposition=86400,
+                cache_max_size=100,
             )
             return RedisCache()
 
@@ -130,6 +250,166 @@ class TestRedisCache:
         assert result == 0
 
 
+    async def test_get_vectors_uses_local_tier_without_redis(self, cache):
+        """Test vectors are served from the LRU when Redis is down."""
+        key = cache.vector_key(CacheType.EMBEDDING, "model", "hash")
+        assert await cache.set_vectors(CacheType.EMBEDDING, {key: [1.0, 2.0]}) is False
+        assert await cache.get_vectors(CacheType.EMBEDDING, [key, "other"]) == [[1.0, 2.0], None]
+        assert cache.get_stats()["embedding"]["local_hits"] == 1
+
+    async def test_get_vectors_batches_redis_lookup(self, cache):
+        """Test LRU misses are fetched with one MGET and promoted."""
+        client = MagicMock()
+        client.mget = AsyncMock(return_value=[pack_vector([0.5, 0.25]), None])
+        cache._binary_client = client
+        cache._connected = True
+
+        keys = ["kas:embedding:f32:a", "kas:embedding:f32:b"]
+        assert await cache.get_vectors(CacheType.EMBEDDING, keys) == [[0.5, 0.25], None]
+        client.mget.assert_awaited_once_with(keys)
+
+        # Second lookup for the hit stays in-process
+        assert await cache.get_vectors(CacheType.EMBEDDING, keys[:1]) == [[0.5, 0.25]]
+        client.mget.assert_awaited_once()
+
+    async def test_set_vectors_pipelines_packed_values(self, cache):
+        """Test misses are written in a single pipeline as float32 bytes."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        client = MagicMock()
+        client.pipeline.return_value = pipe
+        cache._binary_client = client
+        cache._connected = True
+
+        items = {"k1": [1.0], "k2": [2.0]}
+        assert await cache.set_vectors(CacheType.EMBEDDING, items) is True
+        pipe.setex.assert_any_call("k1", 86400, pack_vector([1.0]))
+        pipe.setex.assert_any_call("k2", 86400, pack_vector([2.0]))
+        pipe.execute.assert_awaited_once()
+
+
+    async def test_get_many_uses_local_tier_then_one_mget(self, cache):
+        """Test JSON entries are read from the LRU, then fetched together."""
+        client = MagicMock()
+        client.mget = AsyncMock(return_value=[json.dumps(0.25), None])
+        client.pipeline.return_value.execute = AsyncMock(return_value=[True])
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.set_many(CacheType.RERANK, [(("m", "q", "p0"), 0.5)]) is True
+
+        values = await cache.get_many(
+            CacheType.RERANK, [("m", "q", "p0"), ("m", "q", "p1"), ("m", "q", "p2")]
+        )
+
+        assert values == [0.5, 0.25, None]
+        client.mget.assert_awaited_once()
+        assert len(client.mget.await_args.args[0]) == 2
+
+    async def test_set_many_pipelines_json_values(self, cache):
+        """Test JSON entries are written in one pipeline with the type TTL."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, True])
+        client = MagicMock()
+        client.pipeline.return_value = pipe
+        cache._client = client
+        cache._connected = True
+
+        items = [(("m", "q", "a"), 0.1), (("m", "q", "b"), 0.2)]
+        assert await cache.set_many(CacheType.RERANK, items) is True
+        key = cache._make_key(CacheType.RERANK, "m", "q", "a")
+        pipe.setex.assert_any_call(key, cache.settings.cache_ttl_rerank, "0.1")
+        pipe.execute.assert_awaited_once()
+
+    async def test_get_generation_seeds_missing_counter(self, cache):
+        """Test a missing counter is seeded once and prefix searches use the global one."""
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=[None, "1700000000000"])
+        client.set = AsyncMock(return_value=True)
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.get_generation("docs*") == 1700000000000
+        assert client.set.await_args.args[0] == "kas:gen:*"
+        assert client.set.await_args.kwargs == {"nx": True}
+
+    async def test_get_generation_without_redis(self, cache):
+        """Test callers are told to skip caching when Redis is down."""
+        assert await cache.get_generation("work") is None
+
+    async def test_bump_generations_includes_all_namespaces(self, cache):
+        """Test a bump advances each namespace and the all-namespaces counter."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[])
+        client = MagicMock()
+        client.pipeline.return_value = pipe
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.bump_generations(["work", "work"]) is True
+        assert [c.args[0] for c in pipe.incr.call_args_list] == ["kas:gen:work", "kas:gen:*"]
+
+    async def test_get_generations(self, cache):
+        """Test counters are listed by namespace."""
+        async def scan_iter(match, count):
+            for key in ("kas:gen:*", "kas:gen:work"):
+                yield key
+
+        client = MagicMock()
+        client.scan_iter = scan_iter
+        client.mget = AsyncMock(return_value=["12", "5"])
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.get_generations() == {"*": 12, "work": 5}
+
+    def test_runtime_ttl_override(self, cache):
+        """Test TTLs set through the tuning API apply to new entries."""
+        with patch("knowledge.cache.get_runtime_value", side_effect=lambda key, default: 7200 if key == "cache_ttl_search" else default):
+            assert cache._get_ttl(CacheType.SEARCH) == 7200
+            assert cache._get_ttl(CacheType.RERANK) == 600
+
+    async def test_set_tagged_files_key_under_each_tag(self, cache):
+        """Test a tagged entry is written with its tag sets in one pipeline."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[True, 1, True, 1, True])
+        client = MagicMock()
+        client.pipeline.return_value = pipe
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.set_tagged(CacheType.ANSWER, "answer", ["a", "b"], "q", "ctx") is True
+        key = cache._make_key(CacheType.ANSWER, "q", "ctx")
+        pipe.setex.assert_called_once_with(key, cache.settings.cache_ttl_answer, '"answer"')
+        pipe.sadd.assert_any_call("kas:answer:tag:a", key)
+        pipe.sadd.assert_any_call("kas:answer:tag:b", key)
+        pipe.execute.assert_awaited_once()
+
+    async def test_invalidate_tags_deletes_tagged_entries(self, cache):
+        """Test invalidation deletes the union of tagged keys and the tag sets."""
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[2, 2])
+        client = MagicMock()
+        client.sunion = AsyncMock(return_value={"kas:answer:1", "kas:answer:2"})
+        client.pipeline.return_value = pipe
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.invalidate_tags(CacheType.ANSWER, ["a", "b"]) == 2
+        client.sunion.assert_awaited_once_with(["kas:answer:tag:a", "kas:answer:tag:b"])
+        pipe.delete.assert_any_call("kas:answer:tag:a", "kas:answer:tag:b")
+
+    async def test_invalidate_tags_without_entries(self, cache):
+        """Test invalidating untagged content is a single lookup."""
+        client = MagicMock()
+        client.sunion = AsyncMock(return_value=set())
+        cache._client = client
+        cache._connected = True
+
+        assert await cache.invalidate_tags(CacheType.ANSWER, ["a"]) == 0
+        client.pipeline.assert_not_called()
+
+
 class TestCacheConnection:
     """Test cache connection behavior."""
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID, uuid4
 
@@ -158,6 +159,43 @@ class TestContentOperations:
         assert result is True
 
 
+    @pytest.mark.asyncio
+    async def test_soft_delete_versions_out_caches(self, test_settings: Settings):
+        """Test deleting content bumps its namespace generation and drops its answers."""
+        db = Database(test_settings)
+        conn = MagicMock(fetchval=AsyncMock(return_value="work"))
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        content_id = uuid4()
+        cache = MagicMock(invalidate_tags=AsyncMock(return_value=1), bump_generations=AsyncMock(return_value=True))
+        with patch.object(db, "acquire", acquire), \
+             patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            assert await db.soft_delete_content(content_id) is True
+
+        cache.bump_generations.assert_awaited_once_with(["work"])
+        assert cache.invalidate_tags.await_args.args[1] == [str(content_id)]
+
+    @pytest.mark.asyncio
+    async def test_update_tags_of_missing_content(self, test_settings: Settings):
+        """Test retagging missing content neither succeeds nor bumps generations."""
+        db = Database(test_settings)
+        conn = MagicMock(fetchval=AsyncMock(return_value=None))
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        cache = MagicMock(bump_generations=AsyncMock())
+        with patch.object(db, "acquire", acquire), \
+             patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            assert await db.update_content_tags(uuid4(), ["x"]) is False
+
+        cache.bump_generations.assert_not_awaited()
+
+
 class TestChunkOperations:
     """Tests for chunk operations."""
 
@@ -173,6 +211,247 @@ class TestChunkOperations:
         assert len(result) == len(expected_ids)
         assert all(isinstance(id, UUID) for id in result)
 
+    def _copy_conn(self, rows: list[dict]) -> MagicMock:
+        conn = MagicMock()
+        conn.copy_records_to_table = AsyncMock()
+        conn.execute = AsyncMock()
+        conn.fetch = AsyncMock(return_value=rows)
+        return conn
+
+    @pytest.mark.asyncio
+    async def test_insert_chunks_copies_records(self, test_settings: Settings):
+        """Test insert_chunks loads chunks with one binary COPY and refreshes the preview."""
+        db = Database(test_settings)
+        content_id = uuid4()
+        chunk_ids = [uuid4(), uuid4()]
+        conn = self._copy_conn(
+            [
+                {"id": chunk_ids[0], "content_id": content_id, "chunk_index": 0, "namespace": "default"},
+                {"id": chunk_ids[1], "content_id": content_id, "chunk_index": 1, "namespace": "default"},
+            ]
+        )
+
+        @asynccontextmanager
+        async def transaction():
+            yield conn
+
+        chunks = [
+            {"chunk_index": 1, "chunk_text": "second", "embedding": [0.1] * 768},
+            {"chunk_index": 0, "chunk_text": "first", "embedding": [0.2] * 768},
+        ]
+        with patch.object(db, "transaction", transaction):
+            assert await db.insert_chunks(content_id, chunks) == chunk_ids
+
+        table = conn.copy_records_to_table.await_args.args[0]
+        kwargs = conn.copy_records_to_table.await_args.kwargs
+        assert table == "chunks"
+        assert "fts_vector" not in kwargs["columns"]
+        assert [r[1] for r in kwargs["records"]] == [1, 0]
+        assert kwargs["records"][0][0] == content_id
+
+        sql, *params = conn.execute.await_args.args
+        assert "preview_text" in sql
+        assert params == [[content_id]]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_replace_merges_through_staging(self, test_settings: Settings):
+        """Test replace mode stages, merges on conflict and drops stale chunks."""
+        db = Database(test_settings)
+        first, second = uuid4(), uuid4()
+        conn = self._copy_conn(
+            [
+                {"id": uuid4(), "content_id": first, "chunk_index": 0, "namespace": "default"},
+                {"id": uuid4(), "content_id": second, "chunk_index": 0, "namespace": "work"},
+                {"id": uuid4(), "content_id": second, "chunk_index": 1, "namespace": "work"},
+            ]
+        )
+
+        @asynccontextmanager
+        async def transaction():
+            yield conn
+
+        chunks = [
+            {"content_id": first, "chunk_index": 0, "chunk_text": "a"},
+            {"content_id": second, "chunk_index": 0, "chunk_text": "b"},
+            {"content_id": second, "chunk_index": 1, "chunk_text": "c"},
+        ]
+        cache = MagicMock(invalidate_tags=AsyncMock(return_value=0), bump_generations=AsyncMock(return_value=True))
+        with patch.object(db, "transaction", transaction), \
+             patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            loaded = await db.bulk_load_chunks(chunks, mode="replace")
+
+        assert [len(loaded[first]), len(loaded[second])] == [1, 2]
+        # Re-ingested content versions out searches and drops answers built from it
+        assert sorted(cache.bump_generations.await_args.args[0]) == ["default", "work"]
+        assert cache.invalidate_tags.await_args.args[1] == [str(first), str(second)]
+        assert conn.copy_records_to_table.await_args.args[0] == "chunk_staging"
+        statements = [call.args[0] for call in conn.execute.await_args_list]
+        assert "CREATE TEMP TABLE chunk_staging" in statements[0]
+        assert "ON CONFLICT (content_id, chunk_index) DO UPDATE" in statements[1]
+        assert "DELETE FROM chunks" in statements[2]
+        assert conn.execute.await_args_list[2].args[1] == [first, second]
+        # Dropped explicitly, so a second load inside the caller's transaction can recreate it
+        assert statements[3] == "DROP TABLE chunk_staging"
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_in_caller_transaction_invalidates_after_commit(self, test_settings: Settings):
+        """Test loads inside a caller's transaction bump generations only once it commits."""
+        db = Database(test_settings)
+        first, second = uuid4(), uuid4()
+        conn = self._copy_conn([])
+        conn.fetch = AsyncMock(side_effect=lambda sql, ids: [
+            {"id": uuid4(), "content_id": content_id, "chunk_index": 0, "namespace": "work"} for content_id in ids
+        ])
+        events: list[str] = []
+
+        @asynccontextmanager
+        async def acquire(timeout=None):
+            yield conn
+
+        @asynccontextmanager
+        async def tx():
+            yield
+            events.append("commit")
+
+        conn.transaction = tx
+        db._pool = MagicMock(acquire=acquire)
+        cache = MagicMock(
+            invalidate_tags=AsyncMock(return_value=0),
+            bump_generations=AsyncMock(side_effect=lambda namespaces: events.append("bump")),
+        )
+
+        with patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            async with db.transaction() as outer:
+                for content_id in (first, second):
+                    await db.bulk_load_chunks(
+                        [{"content_id": content_id, "chunk_index": 0, "chunk_text": "x"}],
+                        mode="replace",
+                        conn=outer,
+                    )
+                assert events == ["commit", "commit"]  # Savepoints only
+
+        assert events == ["commit", "commit", "commit", "bump"]
+        cache.bump_generations.assert_awaited_once_with(["work"])
+        assert set(cache.invalidate_tags.await_args.args[1]) == {str(first), str(second)}
+        assert db._pending_changes == {}
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_import_item_never_reaches_vector_index(self, test_settings: Settings):
+        """Test an import item whose savepoint rolls back leaves no vectors in the index."""
+        import numpy as np
+
+        from knowledge.api.routes.export import ImportJob, _content_row, _import_rows_individually
+        from knowledge.vector_index import VectorIndex
+
+        db = Database(test_settings)
+        db.vector_index = VectorIndex(dim=768)
+        db.vector_index.build([], [], np.zeros((0, 768), dtype=np.float32))
+        good, bad = uuid4(), uuid4()
+        conn = self._copy_conn([])
+        conn.fetch = AsyncMock(side_effect=lambda sql, ids, *args: [{"namespace": "default"}] if args else [
+            {"id": uuid4(), "content_id": content_id, "chunk_index": 0, "namespace": "default"}
+            for content_id in ids
+        ])
+        depth = 0
+        loading: list[UUID] = []
+
+        @asynccontextmanager
+        async def acquire(timeout=None):
+            yield conn
+
+        @asynccontextmanager
+        async def tx():
+            nonlocal depth
+            depth += 1
+            try:
+                yield
+                # The per-item savepoint of the bad item fails on release
+                if depth == 2 and loading[-1] == bad:
+                    raise RuntimeError("savepoint release failed")
+            finally:
+                depth -= 1
+
+        conn.transaction = tx
+        db._pool = MagicMock(acquire=acquire)
+        cache = MagicMock(invalidate_tags=AsyncMock(return_value=0), bump_generations=AsyncMock())
+        rows = [
+            _content_row({"id": str(content_id), "title": "t", "content_type": "note"})
+            for content_id in (good, bad)
+        ]
+        chunk_lists = [[{"index": 0, "text": "x", "embedding": [0.1] * 768}] for _ in rows]
+        original_load = db.bulk_load_chunks
+
+        async def bulk_load_chunks(chunks, **kwargs):
+            loading.append(chunks[0]["content_id"])
+            return await original_load(chunks, **kwargs)
+
+        job = ImportJob(job_id="restore", total=2, imported=0, skipped=0, started_at="2026-01-01T00:00:00Z")
+        with patch.object(db, "bulk_load_chunks", bulk_load_chunks), \
+             patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            await _import_rows_individually(db, rows, chunk_lists, job)
+
+        assert job.imported == 1
+        assert [error["item_id"] for error in job.errors] == [str(bad)]
+        assert len(db.vector_index) == 1
+        assert [hit.content_id for hit in db.vector_index.search([0.1] * 768, 5)] == [good]
+        assert db._pending_changes == {}
+
+    @pytest.mark.asyncio
+    async def test_imported_item_without_chunks_invalidates_both_namespaces(self, test_settings: Settings):
+        """Test an import that only moves an item between namespaces still invalidates both."""
+        from knowledge.api.routes.export import _content_row, _upsert_rows
+
+        db = Database(test_settings)
+        content_id = uuid4()
+        conn = self._copy_conn([{"namespace": "old"}, {"namespace": "new"}])
+
+        @asynccontextmanager
+        async def acquire(timeout=None):
+            yield conn
+
+        @asynccontextmanager
+        async def tx():
+            yield
+
+        conn.transaction = tx
+        db._pool = MagicMock(acquire=acquire)
+        cache = MagicMock(invalidate_tags=AsyncMock(return_value=0), bump_generations=AsyncMock())
+        row = _content_row({"id": str(content_id), "title": "t", "namespace": "new"})
+
+        with patch("knowledge.db.get_cache", AsyncMock(return_value=cache)):
+            async with db.transaction() as outer:
+                await _upsert_rows(db, outer, [row], [[]])
+                cache.bump_generations.assert_not_awaited()
+
+        cache.bump_generations.assert_awaited_once_with(["new", "old"])
+        assert cache.invalidate_tags.await_args.args[1] == [str(content_id)]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_rejects_unknown_mode(self, test_settings: Settings):
+        """Test an unknown bulk load mode is rejected before touching the database."""
+        db = Database(test_settings)
+        with pytest.raises(ValueError, match="Unknown bulk load mode"):
+            await db.bulk_load_chunks([], mode="merge")
+
+    @pytest.mark.asyncio
+    async def test_refresh_previews_for_selected_content(self, test_settings: Settings):
+        """Test preview backfill restricted to specific content IDs."""
+        db = Database(test_settings)
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value="UPDATE 2")
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        ids = [uuid4(), uuid4()]
+        with patch.object(db, "acquire", acquire):
+            assert await db.refresh_previews(ids) == 2
+
+        sql, *params = conn.execute.await_args.args
+        assert "DISTINCT ON (content_id)" in sql
+        assert params == [ids]
+
     @pytest.mark.asyncio
     async def test_get_chunks_by_content_id(self, mock_db: MagicMock):
         """Test retrieving chunks by content ID."""
@@ -215,6 +494,40 @@ class TestSearchOperations:
         # Results should be tuples of (id, title, type, namespace, chunk_text, rank)
         assert len(result[0]) == 6
 
+    @pytest.mark.asyncio
+    async def test_bm25_search_selects_best_chunk_in_one_query(self, test_settings: Settings):
+        """Test BM25 ranks chunks in a single statement without per-row subqueries."""
+        db = Database(test_settings)
+        content_id = uuid4()
+        conn = MagicMock()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {
+                    "id": content_id,
+                    "title": "Doc",
+                    "type": "note",
+                    "namespace": "projects/kas",
+                    "chunk_text": "the matching passage",
+                    "rank": 0.7,
+                }
+            ]
+        )
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        with patch.object(db, "acquire", acquire):
+            result = await db.bm25_search("passage", limit=5, namespace="projects/*")
+
+        assert result == [(content_id, "Doc", "note", "projects/kas", "the matching passage", 0.7)]
+        conn.fetch.assert_awaited_once()
+        sql, *params = conn.fetch.await_args.args
+        assert "ch.fts_vector @@ q.query" in sql
+        assert "c.preview_text" in sql
+        assert "LIMIT 1" not in sql
+        assert params == ["passage", 5, "projects/%"]
+
     @pytest.mark.asyncio
     async def test_vector_search(
         self, mock_db: MagicMock, sample_vector_results: list[tuple], mock_embedding: list[float]
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
 
+from knowledge.db import Database
+
 
 class TestEntityOperations:
     """Tests for entity database operations."""
@@ -237,3 +240,76 @@ class TestEntityOperations:
         count = await mock_db.delete_entities_by_content(content_id)
 
         assert count == 0
+
+
+class TestStoreEntityExtractions:
+    """Tests for the set-based entity writer."""
+
+    @pytest.mark.asyncio
+    async def test_writes_batch_with_set_based_statements(self, test_settings):
+        """Test a whole batch costs a fixed number of statements."""
+        db = Database(test_settings)
+        first, second = uuid4(), uuid4()
+        canonical_id = uuid4()
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.copy_records_to_table = AsyncMock()
+
+        async def fetch(sql, *args):
+            if "canonical_entities" in sql:
+                names, types = args[1], args[2]
+                return [
+                    {"id": canonical_id, "normalized_name": n, "entity_type": t}
+                    for n, t in zip(names, types, strict=True)
+                ]
+            return [{"from_entity_id": from_id} for from_id in args[0]]
+
+        conn.fetch = AsyncMock(side_effect=fetch)
+
+        @asynccontextmanager
+        async def transaction():
+            yield conn
+
+        extractions = [
+            {
+                "content_id": first,
+                "text_hash": "abc",
+                "entities": [
+                    {"name": "FastAPI", "entity_type": "framework", "confidence": 0.9},
+                    {"name": "Python", "entity_type": "technology"},
+                ],
+                "relationships": [
+                    {"from": "fastapi", "to": "Python", "relation_type": "uses"},
+                    {"from": "FastAPI", "to": "Python", "relation_type": "uses"},  # duplicate
+                    {"from": "FastAPI", "to": "Unknown", "relation_type": "uses"},  # dangling
+                ],
+            },
+            {"content_id": second, "entities": [{"name": "python", "entity_type": "technology"}], "relationships": []},
+        ]
+
+        with patch.object(db, "transaction", transaction):
+            stored = await db.store_entity_extractions(extractions)
+
+        assert [len(stored[first][0]), stored[first][1]] == [2, 1]
+        assert [len(stored[second][0]), stored[second][1]] == [1, 0]
+
+        delete_sql, content_ids = conn.execute.await_args_list[0].args
+        assert "DELETE FROM entities" in delete_sql
+        assert content_ids == [first, second]
+
+        # "Python" and "python" share one canonical entity
+        canonical_args = conn.fetch.await_args_list[0].args
+        assert canonical_args[2] == ["fastapi", "python"]
+
+        records = conn.copy_records_to_table.await_args.kwargs["records"]
+        assert [r[0] for r in records] == [*stored[first][0], *stored[second][0]]
+        assert all(r[5] == canonical_id for r in records)
+
+        state_sql, *state_args = conn.execute.await_args_list[1].args
+        assert "entity_extraction_state" in state_sql
+        assert state_args == [[first, second], ["abc", None], [2, 1], [1, 0]]
+        assert conn.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_a_no_op(self, test_settings):
+        assert await Database(test_settings).store_entity_extractions([]) == {}
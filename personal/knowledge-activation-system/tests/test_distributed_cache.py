@@ -0,0 +1,272 @@
+"""Tests for knowledge_engine.distributed.cache."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from knowledge_engine.distributed.cache import CacheLayer, MemoryCache, estimate_size
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("knowledge_engine.distributed.cache.time.time", clock):
+        yield clock
+
+
+class TestMemoryCache:
+    """Tests for MemoryCache."""
+
+    async def test_get_set_delete(self):
+        cache = MemoryCache()
+        await cache.set("a", {"x": 1})
+
+        assert await cache.get("a") == {"x": 1}
+        assert await cache.get("missing") is None
+        assert await cache.delete("a") is True
+        assert await cache.delete("a") is False
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.deletes) == (1, 1, 1)
+
+    async def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_items=3)
+        for key in ("a", "b", "c"):
+            await cache.set(key, key)
+        await cache.get("a")
+        await cache.set("d", "d")
+
+        assert await cache.get("b") is None
+        assert [await cache.get(k) for k in ("a", "c", "d")] == ["a", "c", "d"]
+        assert cache.stats.evictions == 1
+
+    async def test_overwrite_does_not_evict(self):
+        cache = MemoryCache(max_items=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.set("a", 3)
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 0
+        assert await cache.get("a") == 3
+
+    async def test_evicts_by_size(self):
+        cache = MemoryCache(max_items=100, max_size_mb=1)
+        await cache.set("a", "x", size=600_000)
+        await cache.set("b", "y", size=600_000)
+
+        assert await cache.get("a") is None
+        assert cache.stats.memory_size_bytes == 600_000
+
+    async def test_value_larger_than_cache_is_not_stored(self):
+        cache = MemoryCache(max_items=100, max_size_mb=1)
+        await cache.set("small", "x", size=10)
+        await cache.set("huge", "y", size=2 * 1024 * 1024)
+
+        assert await cache.get("huge") is None
+        assert await cache.get("small") == "x"
+
+    async def test_expired_entries_are_purged_proactively(self, clock):
+        cache = MemoryCache()
+        await cache.set("short", 1, ttl=10)
+        await cache.set("long", 2, ttl=100)
+        await cache.set("forever", 3)
+
+        clock.now += 50
+        await cache.set("other", 4)  # Writes purge whatever has come due
+
+        assert len(cache) == 3
+        assert cache.stats.expirations == 1
+        assert await cache.get("long") == 2
+
+    async def test_expired_entry_is_a_miss(self, clock):
+        cache = MemoryCache()
+        await cache.set("a", 1, ttl=10)
+        clock.now += 11
+
+        assert await cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    async def test_overwrite_resets_ttl(self, clock):
+        cache = MemoryCache()
+        await cache.set("a", 1, ttl=10)
+        await cache.set("a", 2, ttl=100)
+
+        clock.now += 50
+        assert cache.purge_expired() == 0
+        assert await cache.get("a") == 2
+
+    async def test_expiry_heap_is_compacted(self, clock):
+        cache = MemoryCache()
+        for i in range(1000):
+            await cache.set("a", i, ttl=60)
+
+        assert len(cache._expiry) <= 2 * len(cache) + 64
+
+    async def test_clear(self):
+        cache = MemoryCache()
+        await cache.set("a", 1, ttl=10)
+        await cache.clear()
+
+        assert len(cache) == 0
+        assert cache.stats.memory_size_bytes == 0
+        assert cache._expiry == []
+
+
+class TestEstimateSize:
+    """Tests for estimate_size."""
+
+    def test_scalars(self):
+        assert estimate_size("hello") == sys.getsizeof("hello")
+        assert estimate_size(None) == sys.getsizeof(None)
+
+    def test_containers_include_items(self):
+        value = {"title": "x" * 1000, "tags": ["a", "b"]}
+        assert estimate_size(value) > sys.getsizeof(value) + 1000
+
+    def test_large_containers_are_sampled(self):
+        small = estimate_size(["x" * 100] * 10)
+        large = estimate_size(["x" * 100] * 10_000)
+        assert large > small * 500
+
+
+class TestCachedDecorator:
+    """Tests for CacheLayer.cached."""
+
+    async def test_concurrent_misses_are_coalesced(self):
+        layer = CacheLayer()
+        calls = 0
+
+        @layer.cached(ttl=60)
+        async def compute(x: int) -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return x * 2
+
+        results = await asyncio.gather(*(compute(4) for _ in range(10)))
+
+        assert results == [8] * 10
+        assert calls == 1
+        stats = layer.cached_stats
+        assert (stats.misses, stats.coalesced) == (10, 9)
+        assert await compute(4) == 8
+        assert stats.hits == 1
+
+    async def test_failure_reaches_every_waiter_and_is_not_cached(self):
+        layer = CacheLayer()
+        calls = 0
+
+        @layer.cached(ttl=60)
+        async def compute() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("backend down")
+
+        results = await asyncio.gather(*(compute() for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await compute()
+        assert calls == 2
+
+    async def test_stale_value_served_while_refreshing(self, clock):
+        layer = CacheLayer()
+        version = 0
+
+        @layer.cached(ttl=10, stale_ttl=30, xfetch_beta=0)
+        async def compute() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        assert await compute() == 1
+        clock.now += 15
+
+        assert await compute() == 1  # Stale, refresh started in the background
+        await asyncio.sleep(0)
+        assert await compute() == 2
+        assert layer.cached_stats.stale_hits == 1
+
+    async def test_expired_beyond_stale_window_is_a_miss(self, clock):
+        layer = CacheLayer()
+        version = 0
+
+        @layer.cached(ttl=10, stale_ttl=5, xfetch_beta=0)
+        async def compute() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        await compute()
+        clock.now += 16
+        assert await compute() == 2
+        assert layer.cached_stats.stale_hits == 0
+
+    async def test_xfetch_refreshes_before_expiry(self, clock):
+        layer = CacheLayer()
+        version = 0
+
+        @layer.cached(ttl=10, xfetch_beta=1.0)
+        def compute() -> int:
+            nonlocal version
+            version += 1
+            return version
+
+        # Takes 2s to compute
+        with patch("knowledge_engine.distributed.cache.time.perf_counter", side_effect=[0.0, 2.0]):
+            await compute()
+        clock.now += 7  # 3s before expiry
+
+        # -2 * ln(1 - 0.9) ≈ 4.6s early: refresh
+        with patch("knowledge_engine.distributed.cache.random.random", return_value=0.9):
+            assert await compute() == 1
+        await asyncio.sleep(0)
+        assert layer.cached_stats.early_refreshes == 1
+        assert await compute() == 2
+
+    async def test_xfetch_disabled(self, clock):
+        layer = CacheLayer()
+
+        @layer.cached(ttl=10, xfetch_beta=0)
+        async def compute() -> int:
+            return 1
+
+        await compute()
+        clock.now += 9.9
+        with patch("knowledge_engine.distributed.cache.random.random", return_value=0.999999):
+            await compute()
+        assert layer.cached_stats.early_refreshes == 0
+
+    async def test_negative_caching(self):
+        layer = CacheLayer()
+        calls = {"cached": 0, "uncached": 0}
+
+        @layer.cached(ttl=60, negative_ttl=30)
+        async def lookup() -> None:
+            calls["cached"] += 1
+            return None
+
+        @layer.cached(ttl=60)
+        async def lookup_uncached() -> None:
+            calls["uncached"] += 1
+            return None
+
+        for _ in range(3):
+            assert await lookup() is None
+            assert await lookup_uncached() is None
+
+        assert calls == {"cached": 1, "uncached": 3}
+        assert layer.cached_stats.negative_hits == 2
+        assert layer.get_stats()["cached"]["negative_hits"] == 2
@@ -14,6 +14,7 @@ from knowledge.embeddings import (
     check_ollama_health,
     embed_batch,
     embed_text,
+    plan_batches,
 )
 
 
@@ -40,6 +41,24 @@ class TestOllamaStatus:
         assert status.error == "Connection refused"
 
 
+class TestPlanBatches:
+    """Tests for token-aware batch planning."""
+
+    def test_respects_max_texts(self):
+        """Test batches are capped by text count."""
+        assert plan_batches(["a"] * 5, max_texts=2, max_tokens=1000) == [[0, 1], [2, 3], [4]]
+
+    def test_respects_token_budget(self):
+        """Test batches are closed before exceeding the token budget."""
+        texts = ["x" * 400, "x" * 400, "x" * 400]  # ~100 tokens each
+        assert plan_batches(texts, max_texts=10, max_tokens=250) == [[0, 1], [2]]
+
+    def test_oversized_text_gets_own_batch(self):
+        """Test a text larger than the budget is still embedded alone."""
+        texts = ["short", "x" * 4000, "short"]
+        assert plan_batches(texts, max_texts=10, max_tokens=100) == [[0], [1], [2]]
+
+
 class TestEmbeddingService:
     """Tests for EmbeddingService class."""
 
@@ -172,19 +191,24 @@ class TestEmbeddingService:
         """Test batch embedding."""
         texts = ["Text 1", "Text 2", "Text 3"]
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"embedding": mock_embedding}
-        mock_response.raise_for_status = MagicMock()
+        async def post(url, json):
+            response = MagicMock()
+            response.json.return_value = {"embeddings": [mock_embedding] * len(json["input"])}
+            response.raise_for_status = MagicMock()
+            return response
 
         with patch.object(service, "_get_client") as mock_get_client:
             mock_client = AsyncMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
+            mock_client.post = AsyncMock(side_effect=post)
             mock_get_client.return_value = mock_client
 
             results = await service.embed_batch(texts, batch_size=2)
 
             assert len(results) == 3
             assert all(len(emb) == 768 for emb in results)
+            # Two multi-input requests instead of one per text
+            assert mock_client.post.call_count == 2
+            assert mock_client.post.call_args_list[0].args[0] == "/api/embed"
 
     @pytest.mark.asyncio
     async def test_embed_batch_retry_on_failure(self, service: EmbeddingService, mock_embedding: list[float]):
@@ -192,7 +216,7 @@ class TestEmbeddingService:
         texts = ["Text 1"]
 
         mock_response = MagicMock()
-        mock_response.json.return_value = {"embedding": mock_embedding}
+        mock_response.json.return_value = {"embeddings": [mock_embedding]}
         mock_response.raise_for_status = MagicMock()
 
         call_count = 0
@@ -214,6 +238,61 @@ class TestEmbeddingService:
             assert len(results) == 1
             assert call_count == 2  # One failure, one success
 
+    @pytest.mark.asyncio
+    async def test_embed_batch_splits_failed_batch(self, service: EmbeddingService):
+        """Test a failing batch is split so only the bad text is retried."""
+        texts = ["good 1", "good 2", "bad", "good 3"]
+        batch_sizes: list[int] = []
+
+        async def post(url, json):
+            batch_sizes.append(len(json["input"]))
+            if "bad" in json["input"] and len(json["input"]) > 1:
+                raise RuntimeError("Batch rejected")
+            response = MagicMock()
+            response.json.return_value = {
+                "embeddings": [[float(len(text))] for text in json["input"]]
+            }
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch.object(service, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=post)
+            mock_get_client.return_value = mock_client
+
+            results = await service.embed_batch(texts, batch_size=4)
+
+        assert results == [[6.0], [6.0], [3.0], [6.0]]
+        # Full batch, then halves, then the half containing "bad" split again
+        assert sorted(batch_sizes, reverse=True) == [4, 2, 2, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_falls_back_without_native_endpoint(
+        self, service: EmbeddingService, mock_embedding: list[float]
+    ):
+        """Test embed_batch falls back to per-text requests on older Ollama."""
+        not_found = MagicMock()
+        not_found.status_code = 404
+        not_found.text = "404 page not found"
+
+        async def post(url, json):
+            if url == "/api/embed":
+                raise httpx.HTTPStatusError("Not found", request=MagicMock(), response=not_found)
+            response = MagicMock()
+            response.json.return_value = {"embedding": mock_embedding}
+            response.raise_for_status = MagicMock()
+            return response
+
+        with patch.object(service, "_get_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.post = AsyncMock(side_effect=post)
+            mock_get_client.return_value = mock_client
+
+            results = await service.embed_batch(["Text 1", "Text 2"])
+
+        assert results == [mock_embedding, mock_embedding]
+        assert service._native_batch is False
+
     @pytest.mark.asyncio
     async def test_close(self, service: EmbeddingService):
         """Test closing the service."""
@@ -257,6 +336,44 @@ class TestConvenienceFunctions:
 
             assert result == [mock_embedding]
 
+    @pytest.mark.asyncio
+    async def test_embed_batch_only_embeds_distinct_misses(self):
+        """Test embed_batch serves cached vectors and dedupes misses."""
+        from knowledge.cache import CacheType
+
+        cache = MagicMock()
+        cache.vector_key = lambda cache_type, model, text_hash: text_hash
+        cached = {}
+
+        async def get_vectors(cache_type, keys):
+            return [cached.get(key) for key in keys]
+
+        async def set_vectors(cache_type, items):
+            assert cache_type == CacheType.EMBEDDING
+            cached.update(items)
+            return True
+
+        cache.get_vectors = AsyncMock(side_effect=get_vectors)
+        cache.set_vectors = AsyncMock(side_effect=set_vectors)
+
+        with (
+            patch("knowledge.embeddings.get_embedding_service") as mock_get,
+            patch("knowledge.embeddings.get_cache", AsyncMock(return_value=cache)),
+        ):
+            mock_service = AsyncMock()
+            mock_service.embed_batch = AsyncMock(
+                side_effect=lambda texts, batch_size: [[float(len(t))] for t in texts]
+            )
+            mock_get.return_value = mock_service
+
+            first = await embed_batch(["aa", "bbb", "aa"])
+            second = await embed_batch(["bbb", "cccc"])
+
+        assert first == [[2.0], [3.0], [2.0]]
+        assert second == [[3.0], [4.0]]
+        assert mock_service.embed_batch.call_args_list[0].args[0] == ["aa", "bbb"]
+        assert mock_service.embed_batch.call_args_list[1].args[0] == ["cccc"]
+
     @pytest.mark.asyncio
     async def test_check_ollama_health_convenience(self):
         """Test check_ollama_health convenience function."""
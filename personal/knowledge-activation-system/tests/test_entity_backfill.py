@@ -0,0 +1,119 @@
+"""Tests for the background entity backfill."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from knowledge.config import Settings
+from knowledge.entity_backfill import BackfillReport, run_entity_backfill
+from knowledge.entity_extraction import Entity, ExtractionResult, Relationship
+
+
+class FakeDatabase:
+    """Serves candidate pages and records stored batches."""
+
+    def __init__(self, count: int) -> None:
+        self.rows = sorted(
+            ({"id": uuid4(), "title": f"Doc {i}", "text": f"text {i}", "text_hash": f"h{i}"} for i in range(count)),
+            key=lambda row: row["id"],
+        )
+        self.pages: list[tuple[UUID | None, int, bool]] = []
+        self.batches: list[list[dict[str, Any]]] = []
+
+    async def get_entity_extraction_candidates(self, after=None, limit=100, force=False):
+        self.pages.append((after, limit, force))
+        rows = [row for row in self.rows if after is None or row["id"] > after]
+        return rows[:limit]
+
+    async def store_entity_extractions(self, extractions):
+        self.batches.append(extractions)
+        return {item["content_id"]: ([uuid4() for _ in item["entities"]], len(item["relationships"])) for item in extractions}
+
+
+def extraction(title: str) -> ExtractionResult:
+    return ExtractionResult(
+        entities=[Entity(name=f"{title} A", entity_type="concept"), Entity(name=f"{title} B", entity_type="tool")],
+        relationships=[Relationship(from_entity=f"{title} A", to_entity=f"{title} B", relation_type="uses")],
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_openrouter(monkeypatch):
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+
+
+class TestRunEntityBackfill:
+    """Tests for run_entity_backfill."""
+
+    async def test_extracts_all_pages_in_batches(self, test_settings: Settings):
+        db = FakeDatabase(25)
+        running = peak = 0
+
+        async def extract(title, content, ai=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return extraction(title)
+
+        progress: list[int] = []
+        with patch("knowledge.entity_backfill.extract_entities", side_effect=extract):
+            report = await run_entity_backfill(
+                db=db, settings=test_settings, concurrency=3, write_batch=10,
+                on_progress=lambda r: progress.append(r.extracted),
+            )
+
+        assert (report.scanned, report.extracted, report.failed) == (25, 25, 0)
+        assert (report.entities, report.relationships) == (50, 25)
+        assert report.running is False
+        assert peak == 3
+        assert [len(batch) for batch in db.batches] == [10, 10, 5]
+        assert progress == [10, 20, 25]
+
+        # Keyset pages, and the text hash read with each item is checkpointed
+        assert db.pages[1][0] == db.rows[9]["id"]
+        stored = {item["content_id"]: item for batch in db.batches for item in batch}
+        first = db.rows[0]
+        assert stored[first["id"]]["text_hash"] == first["text_hash"]
+        assert stored[first["id"]]["relationships"][0]["relation_type"] == "uses"
+
+    async def test_failed_items_are_not_checkpointed(self, test_settings: Settings):
+        db = FakeDatabase(4)
+
+        async def extract(title, content, ai=None):
+            if title == "Doc 1":
+                return ExtractionResult(entities=[], relationships=[], success=False, error="timeout")
+            if title == "Doc 2":
+                raise RuntimeError("connection reset")
+            return extraction(title)
+
+        with patch("knowledge.entity_backfill.extract_entities", side_effect=extract):
+            report = await run_entity_backfill(db=db, settings=test_settings, concurrency=2, write_batch=10)
+
+        assert (report.extracted, report.failed) == (2, 2)
+        titles = {row["id"]: row["title"] for row in db.rows}
+        assert sorted(titles[item["content_id"]] for item in db.batches[0]) == ["Doc 0", "Doc 3"]
+
+    async def test_limit_and_force(self, test_settings: Settings):
+        db = FakeDatabase(30)
+
+        async def extract(title, content, ai=None):
+            return ExtractionResult(entities=[], relationships=[])
+
+        report = BackfillReport()
+        with patch("knowledge.entity_backfill.extract_entities", side_effect=extract):
+            await run_entity_backfill(
+                db=db, settings=test_settings, concurrency=2, write_batch=4, limit=6, force=True, report=report,
+            )
+
+        assert report.scanned == 6
+        # Items with no entities are still checkpointed so they are skipped next time
+        assert report.extracted == 6
+        assert all(force for _, _, force in db.pages)
+        assert sum(limit for _, limit, _ in db.pages) == 6
@@ -0,0 +1,138 @@
+"""Tests for the staged directory ingest pipeline."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from knowledge.config import Settings
+from knowledge.exceptions import DuplicateContentError
+from knowledge.ingest.pipeline import IngestProgress, PipelineConfig, run_ingest_pipeline
+
+BODY = "This paragraph is long enough to pass content validation for file ingestion. " * 3
+
+# In-process parsing keeps tests free of worker processes
+CONFIG = PipelineConfig(parse_workers=0, embed_workers=2, store_workers=2, queue_size=2)
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> list[Path]:
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"note{i}.md"
+        path.write_text(f"# Note {i}\n\n{BODY}", encoding="utf-8")
+        paths.append(path)
+    short = tmp_path / "short.md"
+    short.write_text("too short", encoding="utf-8")
+    paths.append(short)
+    return paths
+
+
+@pytest.fixture
+def mock_embed():
+    async def embed(texts: list[str]) -> list[list[float]]:
+        return [[0.1] * 4 for _ in texts]
+
+    with patch("knowledge.ingest.pipeline.embed_batch", AsyncMock(side_effect=embed)) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_store():
+    async def store(prepared, embeddings, tags, settings):
+        assert len(embeddings) == len(prepared.chunks)
+        return uuid4(), prepared.path.with_suffix(".note.md")
+
+    with patch("knowledge.ingest.pipeline.store_file", AsyncMock(side_effect=store)) as mock:
+        yield mock
+
+
+class TestIngestPipeline:
+    """Tests for run_ingest_pipeline."""
+
+    async def test_ingests_files_and_reports_throughput(
+        self, files: list[Path], test_settings: Settings, mock_embed: AsyncMock, mock_store: AsyncMock
+    ):
+        seen = []
+        report = await run_ingest_pipeline(
+            files,
+            tags=["batch"],
+            settings=test_settings,
+            auto_extract_entities=False,
+            config=CONFIG,
+            on_result=lambda path, result: seen.append(path),
+        )
+
+        assert (report.discovered, report.ingested, report.failed) == (6, 5, 1)
+        assert sorted(seen) == sorted(files)
+        assert report.results[files[-1]].error.startswith("Content validation failed")
+        assert report.results[files[0]].title == "Note 0"
+        assert report.chunks == sum(r.chunks_created for r in report.results.values())
+
+        # Every chunk was embedded exactly once, in cross-document batches
+        embedded = sum(len(call.args[0]) for call in mock_embed.await_args_list)
+        assert embedded == report.chunks
+        assert mock_embed.await_count <= 5
+
+        assert mock_store.await_count == 5
+        assert "batch" in mock_store.await_args.args[2]
+        assert report.stages["parse"].items == 6
+        assert report.stages["store"].items == 5
+        assert report.summary()["docs_per_s"] >= 0
+
+    async def test_resume_skips_finished_files(
+        self, files: list[Path], tmp_path: Path, test_settings: Settings, mock_embed: AsyncMock, mock_store: AsyncMock
+    ):
+        progress = tmp_path / "progress" / "run.jsonl"
+        await run_ingest_pipeline(
+            files, settings=test_settings, auto_extract_entities=False, config=CONFIG, progress_path=progress
+        )
+        assert len(IngestProgress(progress)) == 6
+
+        mock_store.reset_mock()
+        report = await run_ingest_pipeline(
+            files, settings=test_settings, auto_extract_entities=False, config=CONFIG, progress_path=progress
+        )
+
+        assert report.skipped == 6
+        assert report.ingested == 0
+        mock_store.assert_not_awaited()
+
+    async def test_transient_failures_are_retried_on_resume(
+        self, files: list[Path], tmp_path: Path, test_settings: Settings, mock_embed: AsyncMock
+    ):
+        progress = tmp_path / "run.jsonl"
+
+        async def store(prepared, embeddings, tags, settings):
+            if prepared.path == files[0]:
+                raise ConnectionError("db down")
+            if prepared.path == files[1]:
+                raise DuplicateContentError("Content already exists: x.md")
+            return uuid4(), prepared.path
+
+        with patch("knowledge.ingest.pipeline.store_file", AsyncMock(side_effect=store)):
+            report = await run_ingest_pipeline(
+                files, settings=test_settings, auto_extract_entities=False, config=CONFIG, progress_path=progress
+            )
+
+        assert report.results[files[0]].error == "Failed to process file: db down"
+        assert report.results[files[1]].error == "Content already exists: x.md"
+
+        progress_log = IngestProgress(progress)
+        assert not progress_log.is_done(files[0])
+        assert progress_log.is_done(files[1])
+
+    async def test_embedding_failure_fails_batch_without_stopping(
+        self, files: list[Path], test_settings: Settings, mock_store: AsyncMock
+    ):
+        with patch("knowledge.ingest.pipeline.embed_batch", AsyncMock(side_effect=RuntimeError("ollama down"))):
+            report = await run_ingest_pipeline(
+                files, settings=test_settings, auto_extract_entities=False, config=CONFIG
+            )
+
+        assert report.ingested == 0
+        assert report.failed == 6
+        mock_store.assert_not_awaited()
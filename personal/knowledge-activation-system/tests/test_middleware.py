@@ -0,0 +1,175 @@
+"""Tests for the pure-ASGI API middleware."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from knowledge.api.middleware import (
+    APIVersionMiddleware,
+    MetricsMiddleware,
+    RateLimitInfo,
+    SecurityHeadersMiddleware,
+    SecurityMiddleware,
+)
+from knowledge.config import Settings
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @app.post("/items")
+    async def create_item() -> dict:
+        return {"created": True}
+
+    @app.get("/v0/legacy")
+    async def legacy() -> dict:
+        return {}
+
+    # Same order as knowledge.api.main
+    app.add_middleware(APIVersionMiddleware, version="v1")
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(SecurityMiddleware)
+    return app
+
+
+@pytest.fixture
+def limiter() -> MagicMock:
+    limiter = MagicMock()
+    limiter.acquire = AsyncMock(return_value=(True, RateLimitInfo(limit=100, remaining=99, reset=1_700_000_000)))
+    return limiter
+
+
+@pytest.fixture
+def client(test_settings: Settings, limiter: MagicMock):
+    with patch("knowledge.api.middleware.get_settings", return_value=test_settings), \
+         patch("knowledge.api.middleware.rate_limiter", limiter):
+        yield TestClient(make_app())
+
+
+class TestSecurityMiddleware:
+    """Tests for request IDs, CSRF, API keys and rate limiting."""
+
+    def test_adds_request_and_rate_limit_headers(self, client: TestClient):
+        response = client.get("/items/1", headers={"X-Request-ID": "req-123"})
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "req-123"
+        assert response.headers["X-RateLimit-Limit"] == "100"
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+        assert response.headers["X-RateLimit-Reset"] == "1700000000"
+
+    def test_rejects_foreign_origin(self, client: TestClient):
+        response = client.post("/items", headers={"Origin": "http://evil.example"})
+
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Invalid origin"}
+        assert "X-Request-ID" in response.headers
+
+    def test_rejects_foreign_referer(self, client: TestClient):
+        response = client.post("/items", headers={"Referer": "http://evil.example/page"})
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Invalid referer"}
+
+    def test_allows_known_origin(self, client: TestClient):
+        response = client.post("/items", headers={"Origin": "http://localhost:3000"})
+        assert response.status_code == 200
+
+    def test_requires_api_key(self, client: TestClient, test_settings: Settings):
+        test_settings.require_api_key = True
+        test_settings.api_key = "kas_secret"
+
+        missing = client.get("/items/1")
+        wrong = client.get("/items/1", headers={"X-API-Key": "kas_wrong"})
+        ok = client.get("/items/1", headers={"X-API-Key": "kas_secret"})
+
+        assert missing.status_code == 401
+        assert missing.headers["WWW-Authenticate"] == "ApiKey"
+        assert wrong.status_code == 403
+        assert ok.status_code == 200
+
+    def test_rate_limited(self, client: TestClient, limiter: MagicMock):
+        limiter.acquire.return_value = (False, RateLimitInfo(limit=100, remaining=0, reset=2**40))
+
+        response = client.get("/items/1")
+
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Rate limit exceeded"}
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_skip_paths_bypass_checks(self, client: TestClient, limiter: MagicMock):
+        client.get("/health")
+        limiter.acquire.assert_not_called()
+
+
+class TestResponseHeaders:
+    """Tests for the security header and version middleware."""
+
+    def test_security_and_version_headers(self, client: TestClient):
+        response = client.get("/items/1")
+
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy"]
+        assert "Strict-Transport-Security" not in response.headers
+        assert response.headers["X-API-Version"] == "v1"
+        assert "Deprecation" not in response.headers
+
+    def test_hsts_over_https(self, client: TestClient):
+        response = client.get("https://testserver/items/1")
+        assert "Strict-Transport-Security" in response.headers
+
+    def test_deprecation_headers(self, client: TestClient):
+        response = client.get("/v0/legacy")
+        assert response.headers["Deprecation"] == "true"
+        assert response.headers["X-API-Version"] == "v1"
+
+    async def test_streamed_body_is_not_buffered(self, test_settings: Settings, limiter: MagicMock):
+        events: list[str] = []
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for i in range(3):
+                events.append(f"app sent {i}")
+                await send({"type": "http.response.body", "body": b"x", "more_body": i < 2})
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                events.append("start")
+            else:
+                events.append(f"client got {len(events)}")
+
+        stack = SecurityMiddleware(SecurityHeadersMiddleware(APIVersionMiddleware(MetricsMiddleware(app))))
+        scope = {"type": "http", "method": "GET", "path": "/stream", "headers": [], "scheme": "http"}
+        with patch("knowledge.api.middleware.get_settings", return_value=test_settings), \
+             patch("knowledge.api.middleware.rate_limiter", limiter):
+            await stack(scope, AsyncMock(), send)
+
+        # Each chunk reaches the client before the app produces the next
+        assert [e.split()[0] for e in events] == ["start", "app", "client", "app", "client", "app", "client"]
+
+
+class TestMetricsMiddleware:
+    """Tests for MetricsMiddleware."""
+
+    def test_records_status_and_normalized_path(self, client: TestClient):
+        total = MagicMock()
+        # The middleware stack is built on the first request
+        with patch("knowledge.metrics.http_requests_total", total):
+            client.get("/items/42")
+
+        total.labels.assert_called_with(method="GET", endpoint="/items/{id}", status="200")
+
+    def test_normalize_path(self):
+        middleware = MetricsMiddleware(AsyncMock())
+        path = "/api/v1/content/3fa85f64-5717-4562-b3fc-2c963f66afa6/chunks/12"
+        assert middleware._normalize_path(path) == "/api/v1/content/{id}/chunks/{id}"
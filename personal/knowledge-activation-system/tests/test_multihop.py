@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
@@ -11,9 +15,49 @@ from knowledge.ai import AIResponse
 from knowledge.multihop import (
     MultiHopResult,
     decompose_query,
+    merge_hops,
     multihop_search,
 )
-from knowledge.search import SearchResult
+from knowledge.search import HybridSearchResponse, SearchResult
+
+# Classified as COMPLEX, so multihop_search decomposes it
+COMPLEX_QUERY = "Why pick one approach over the other?"
+
+
+class FakeDecompositionCache:
+    """Dict-backed stand-in for the Redis cache."""
+
+    def __init__(self) -> None:
+        self.store: dict[tuple[Any, ...], Any] = {}
+
+    async def get(self, cache_type, *args):
+        return self.store.get((cache_type, *args))
+
+    async def set(self, cache_type, value, *args):
+        self.store[(cache_type, *args)] = value
+        return True
+
+
+@pytest.fixture(autouse=True)
+def decomposition_cache() -> Iterator[FakeDecompositionCache]:
+    cache = FakeDecompositionCache()
+    with patch("knowledge.multihop.get_cache", AsyncMock(return_value=cache)):
+        yield cache
+
+
+@contextmanager
+def patch_hops(*hops: list[SearchResult]) -> Iterator[tuple[AsyncMock, AsyncMock]]:
+    """Patch the batched embedding call and return one result list per hop."""
+    responses = [HybridSearchResponse(results=results) for results in hops]
+
+    async def embed(texts: list[str]) -> list[list[float]]:
+        return [[float(i)] for i in range(len(texts))]
+
+    with (
+        patch("knowledge.multihop.embed_batch", AsyncMock(side_effect=embed)) as mock_embed,
+        patch("knowledge.multihop.hybrid_search_with_status", AsyncMock(side_effect=responses)) as mock_search,
+    ):
+        yield mock_embed, mock_search
 
 
 class TestDecomposeQuery:
@@ -150,6 +194,23 @@ class TestDecomposeQuery:
         assert len(sub_queries) == 1
         assert "PostgreSQL" in sub_queries[0]
 
+    @pytest.mark.asyncio
+    async def test_decompose_cached_per_query(self, decomposition_cache):
+        """Test that a decomposition is reused for the same normalized query."""
+        mock_ai = MagicMock()
+        mock_ai.generate = AsyncMock(
+            return_value=AIResponse(content="What is Redis?\nWhat is Memcached?", model="deepseek")
+        )
+
+        first = await decompose_query("Redis vs Memcached", ai=mock_ai)
+        second = await decompose_query("  redis VS memcached ", ai=mock_ai)
+
+        assert first == second == ["What is Redis?", "What is Memcached?"]
+        mock_ai.generate.assert_awaited_once()
+
+        await decompose_query("Redis vs Memcached", ai=mock_ai, use_cache=False)
+        assert mock_ai.generate.await_count == 2
+
 
 class TestMultihopSearch:
     """Tests for multihop_search function."""
@@ -179,9 +240,7 @@ class TestMultihopSearch:
             score=0.85,
         )
 
-        with patch("knowledge.multihop.hybrid_search") as mock_search:
-            mock_search.side_effect = [[result1], [result2]]
-
+        with patch_hops([result1], [result2]):
             result = await multihop_search(
                 "PostgreSQL vs MySQL",
                 limit=10,
@@ -224,11 +283,9 @@ class TestMultihopSearch:
             score=0.8,
         )
 
-        with patch("knowledge.multihop.hybrid_search") as mock_search:
-            mock_search.side_effect = [[result1], [result2, result3]]
-
+        with patch_hops([result1], [result2, result3]):
             result = await multihop_search(
-                "Complex query",
+                COMPLEX_QUERY,
                 limit=10,
                 ai=mock_ai,
             )
@@ -254,11 +311,9 @@ class TestMultihopSearch:
             for i in range(10)
         ]
 
-        with patch("knowledge.multihop.hybrid_search") as mock_search:
-            mock_search.side_effect = [results[:5], results[5:]]
-
+        with patch_hops(results[:5], results[5:]):
             result = await multihop_search(
-                "Complex query",
+                COMPLEX_QUERY,
                 limit=3,
                 ai=mock_ai,
             )
@@ -290,11 +345,9 @@ class TestMultihopSearch:
             score=0.95,
         )
 
-        with patch("knowledge.multihop.hybrid_search") as mock_search:
-            mock_search.side_effect = [[low_score], [high_score]]
-
+        with patch_hops([low_score], [high_score]):
             result = await multihop_search(
-                "Complex query",
+                COMPLEX_QUERY,
                 limit=10,
                 ai=mock_ai,
             )
@@ -302,6 +355,103 @@ class TestMultihopSearch:
         # High score should be first
         assert result.results[0].score > result.results[1].score
 
+    @pytest.mark.asyncio
+    async def test_simple_query_skips_decomposition(self):
+        """Test the early exit for queries the router classifies as simple."""
+        mock_ai = MagicMock()
+        mock_ai.generate = AsyncMock()
+        hit = SearchResult(content_id=uuid4(), title="Redis", content_type="note", score=0.9)
+
+        with patch_hops([hit]) as (_, mock_search):
+            result = await multihop_search("redis persistence", ai=mock_ai)
+
+        mock_ai.generate.assert_not_awaited()
+        assert result.sub_queries == ["redis persistence"]
+        assert result.results == [hit]
+        assert mock_search.await_args.kwargs["limit"] == 10
+
+    @pytest.mark.asyncio
+    async def test_sub_queries_share_one_embedding_batch(self):
+        """Test that every hop gets its vector from a single embed_batch call."""
+        mock_ai = MagicMock()
+        mock_ai.generate = AsyncMock(
+            return_value=AIResponse(content="Query one\nQuery two\nQuery three", model="deepseek")
+        )
+
+        with patch_hops([], [], []) as (mock_embed, mock_search):
+            await multihop_search(COMPLEX_QUERY, ai=mock_ai)
+
+        mock_embed.assert_awaited_once_with(["Query one", "Query two", "Query three"])
+        sent = {c.kwargs["query"]: c.kwargs["query_embedding"] for c in mock_search.await_args_list}
+        assert sent == {"Query one": [0.0], "Query two": [1.0], "Query three": [2.0]}
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_lets_hops_embed(self):
+        """Test that hops still run, embedding themselves, if the batch fails."""
+        mock_ai = MagicMock()
+        mock_ai.generate = AsyncMock(return_value=AIResponse(content="Query one\nQuery two", model="deepseek"))
+
+        with (
+            patch_hops([], []) as (_, mock_search),
+            patch("knowledge.multihop.embed_batch", AsyncMock(side_effect=RuntimeError("ollama down"))),
+        ):
+            await multihop_search(COMPLEX_QUERY, ai=mock_ai)
+
+        assert [c.kwargs["query_embedding"] for c in mock_search.await_args_list] == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_hops_run_concurrently_up_to_limit(self, test_settings):
+        """Test that sub-query searches overlap but respect the concurrency limit."""
+        mock_ai = MagicMock()
+        mock_ai.generate = AsyncMock(
+            return_value=AIResponse(content="Query one\nQuery two\nQuery three", model="deepseek")
+        )
+        test_settings.multihop_max_concurrency = 2
+        running = peak = 0
+
+        async def search(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return HybridSearchResponse(results=[])
+
+        with (
+            patch_hops() as (_, mock_search),
+            patch("knowledge.multihop.get_settings", return_value=test_settings),
+        ):
+            mock_search.side_effect = search
+            await multihop_search(COMPLEX_QUERY, ai=mock_ai)
+
+        assert mock_search.await_count == 3
+        assert peak == 2
+
+
+class TestMergeHops:
+    """Tests for cross-hop reciprocal rank fusion."""
+
+    def test_results_found_by_several_hops_rank_first(self):
+        shared, first, second = uuid4(), uuid4(), uuid4()
+        hop1 = [
+            SearchResult(content_id=first, title="A", content_type="note", score=0.9),
+            SearchResult(content_id=shared, title="S", content_type="note", score=0.6),
+        ]
+        hop2 = [
+            SearchResult(content_id=second, title="B", content_type="note", score=0.95),
+            SearchResult(content_id=shared, title="S", content_type="note", score=0.7, chunk_text="best"),
+        ]
+
+        merged = merge_hops([hop1, hop2])
+
+        assert [r.content_id for r in merged] == [shared, second, first]
+        # The duplicate keeps its best-scoring copy
+        assert merged[0].score == 0.7
+        assert merged[0].chunk_text == "best"
+
+    def test_empty_hops(self):
+        assert merge_hops([[], []]) == []
+
 
 class TestMultiHopResult:
     """Tests for MultiHopResult dataclass."""
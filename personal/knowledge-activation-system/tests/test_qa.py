@@ -1,7 +1,7 @@
 """Tests for Q&A module."""
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from knowledge.qa import (
     QAResult,
@@ -10,9 +10,14 @@ from knowledge.qa import (
     calculate_confidence,
     build_citations,
     ask,
+    ask_stream,
+    context_fingerprint,
+    get_cached_answer,
+    normalize_query,
     search_and_summarize,
+    store_answer,
 )
-from knowledge.search import SearchResult
+from knowledge.search import HybridSearchResponse, SearchResult
 
 
 class TestConfidenceLevel:
@@ -218,6 +223,194 @@ class TestAsk:
                     assert "Low confidence" in result.warning
 
 
+class TestAskStream:
+    """Tests for the pipelined, streaming ask."""
+
+    @staticmethod
+    def _fake_stream(tokens: list[str], fail: Exception | None = None) -> MagicMock:
+        async def token_iter():
+            for token in tokens:
+                yield token
+            if fail is not None:
+                raise fail
+
+        stream = MagicMock()
+        stream.model = "deepseek"
+        stream.tokens = token_iter
+        stream.aclose = AsyncMock()
+        return stream
+
+    @staticmethod
+    def _search(results: list[SearchResult]):
+        async def search(query, limit, on_bm25_results):
+            # BM25 candidates are handed over before the vector stage finishes
+            on_bm25_results([(r.content_id, r.title, r.content_type, None, r.chunk_text, 1.0) for r in results])
+            return HybridSearchResponse(results=results)
+
+        return AsyncMock(side_effect=search)
+
+    async def _collect(self, **kwargs) -> list:
+        return [event async for event in ask_stream("What is X?", **kwargs)]
+
+    @pytest.mark.asyncio
+    async def test_overlaps_stages_and_streams_tokens(self):
+        """Test BM25 reranking starts before search returns and tokens stream through."""
+        results = [_mock_search_result(title="Doc", chunk_text="Chunk")]
+        stream = self._fake_stream(["The answer", " is Y."])
+        reranker = MagicMock()
+        reranker.score = AsyncMock(return_value=[0.9])
+
+        with patch("knowledge.qa._open_answer_stream", AsyncMock(return_value=stream)), \
+             patch("knowledge.qa.hybrid_search_with_status", self._search(results)), \
+             patch("knowledge.qa.get_reranker", return_value=reranker), \
+             patch("knowledge.qa.rerank_results", AsyncMock(return_value=[_mock_search_result(score=0.9)])):
+            events = await self._collect()
+
+        assert [e.event for e in events] == ["context", "token", "token", "done"]
+        assert events[0].data["confidence"] == "high"
+        assert events[0].data["citations"][0]["index"] == 1
+        assert events[-1].data == {"answer": "The answer is Y.", "warning": None, "error": None, "cached": False}
+        reranker.score.assert_awaited_once_with("What is X?", ["Chunk"], use_cache=True)
+        assert "Context:" in stream.send.call_args.args[0]
+        stream.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_stream_fails_before_first_token(self):
+        """Test a failed stream falls back to non-streaming generation."""
+        from knowledge.ai import AIResponse
+
+        results = [_mock_search_result()]
+        stream = self._fake_stream([], fail=RuntimeError("connection reset"))
+        reranker = MagicMock()
+        reranker.score = AsyncMock(return_value=[0.5])
+
+        with patch("knowledge.qa._open_answer_stream", AsyncMock(return_value=stream)), \
+             patch("knowledge.qa.hybrid_search_with_status", self._search(results)), \
+             patch("knowledge.qa.get_reranker", return_value=reranker), \
+             patch("knowledge.qa.rerank_results", AsyncMock(return_value=[_mock_search_result(score=0.5)])), \
+             patch("knowledge.qa.generate_answer", AsyncMock(return_value=AIResponse(content="Y", model="claude"))):
+            events = await self._collect()
+
+        assert [e.event for e in events] == ["context", "token", "done"]
+        assert events[-1].data["answer"] == "Y"
+
+    @pytest.mark.asyncio
+    async def test_no_results_closes_stream(self):
+        """Test the warmed-up request is abandoned when nothing is found."""
+        stream = self._fake_stream([])
+
+        with patch("knowledge.qa._open_answer_stream", AsyncMock(return_value=stream)), \
+             patch("knowledge.qa.hybrid_search_with_status", AsyncMock(return_value=HybridSearchResponse(results=[]))):
+            events = await self._collect()
+
+        assert [e.event for e in events] == ["done"]
+        assert "No relevant content" in events[0].data["error"]
+        stream.send.assert_not_called()
+        stream.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_below_min_confidence_skips_generation(self):
+        """Test low-confidence answers stop after the context event."""
+        stream = self._fake_stream(["unused"])
+
+        with patch("knowledge.qa._open_answer_stream", AsyncMock(return_value=stream)), \
+             patch("knowledge.qa.hybrid_search_with_status", AsyncMock(return_value=HybridSearchResponse(results=[_mock_search_result()]))), \
+             patch("knowledge.qa.rerank_results", AsyncMock(return_value=[_mock_search_result(score=0.1)])):
+            events = await self._collect(min_confidence=0.5)
+
+        assert [e.event for e in events] == ["context", "done"]
+        assert "Confidence too low" in events[-1].data["warning"]
+        stream.send.assert_not_called()
+
+
+class FakeAnswerCache:
+    """In-memory stand-in for the tagged answer cache."""
+
+    is_connected = True
+
+    def __init__(self):
+        self.entries: dict[tuple, object] = {}
+        self.tags: dict[tuple, list[str]] = {}
+
+    async def get(self, cache_type, *args):
+        return self.entries.get(args)
+
+    async def set_tagged(self, cache_type, value, tags, *args):
+        self.entries[args] = value
+        self.tags[args] = tags
+        return True
+
+
+class TestAnswerCache:
+    """Tests for the context-fingerprinted answer cache."""
+
+    def test_normalize_query(self):
+        assert normalize_query("  What IS  RRF?? ") == normalize_query("what is rrf")
+
+    def test_fingerprint_tracks_ids_text_and_order(self):
+        a, b = _mock_search_result(chunk_text="A"), _mock_search_result(chunk_text="B")
+        base = context_fingerprint([a, b])
+
+        assert context_fingerprint([a, b]) == base
+        assert context_fingerprint([b, a]) != base
+        edited = SearchResult(content_id=a.content_id, title=a.title, content_type="note", score=0.5, chunk_text="A2")
+        assert context_fingerprint([edited, b]) != base
+
+    @pytest.mark.asyncio
+    async def test_ask_reuses_answer_for_same_context(self, test_settings):
+        """Test the second ask skips the LLM and is tagged by content id."""
+        from knowledge.ai import AIResponse
+
+        cache = FakeAnswerCache()
+        ranked = [_mock_search_result(score=0.8)]
+
+        with patch("knowledge.qa.get_cache", AsyncMock(return_value=cache)), \
+             patch("knowledge.qa.get_settings", return_value=test_settings), \
+             patch("knowledge.qa.hybrid_search", AsyncMock(return_value=ranked)), \
+             patch("knowledge.qa.rerank_results", AsyncMock(return_value=ranked)), \
+             patch("knowledge.qa.generate_answer", AsyncMock(return_value=AIResponse(content="Y", model="test"))) as mock_gen:
+            first = await ask("What is X?")
+            second = await ask("what is x")
+
+        assert (first.cached, second.cached) == (False, True)
+        assert second.answer == "Y"
+        mock_gen.assert_awaited_once()
+        assert list(cache.tags.values()) == [[str(ranked[0].content_id)]]
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_query_match(self, test_settings):
+        """Test a differently worded question over the same context matches by embedding."""
+        settings = test_settings.model_copy(update={"answer_cache_similarity": 0.9})
+        cache = FakeAnswerCache()
+        results = [_mock_search_result()]
+        embeddings = {"how does rrf work": [1.0, 0.0], "explain rrf": [0.95, 0.1], "unrelated": [0.0, 1.0]}
+
+        with patch("knowledge.qa.get_cache", AsyncMock(return_value=cache)), \
+             patch("knowledge.qa.get_settings", return_value=settings), \
+             patch("knowledge.qa.embed_text", AsyncMock(side_effect=lambda q: embeddings[q])):
+            await store_answer("how does rrf work", results, "RRF sums reciprocal ranks.")
+
+            assert await get_cached_answer("explain rrf", results) == "RRF sums reciprocal ranks."
+            assert await get_cached_answer("unrelated", results) is None
+            assert await get_cached_answer("explain rrf", [_mock_search_result()]) is None
+
+    @pytest.mark.asyncio
+    async def test_question_named_neighbours_does_not_collide(self, test_settings):
+        """Test the near-duplicate list never shares a key with a question's answer."""
+        settings = test_settings.model_copy(update={"answer_cache_similarity": 0.9})
+        cache = FakeAnswerCache()
+        results = [_mock_search_result()]
+
+        with patch("knowledge.qa.get_cache", AsyncMock(return_value=cache)), \
+             patch("knowledge.qa.get_settings", return_value=settings), \
+             patch("knowledge.qa.embed_text", AsyncMock(return_value=[1.0, 0.0])):
+            await store_answer("what is rrf", results, "RRF sums reciprocal ranks.")
+            await store_answer("Neighbours?", results, "Adjacent items.")
+
+            assert await get_cached_answer("neighbours", results) == "Adjacent items."
+            assert await get_cached_answer("what is rrf", results) == "RRF sums reciprocal ranks."
+
+
 class TestSearchAndSummarize:
     """Tests for search_and_summarize function."""
 
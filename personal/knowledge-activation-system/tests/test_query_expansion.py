@@ -1,17 +1,20 @@
 """Tests for query expansion module."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
+from knowledge import query_expansion
 from knowledge.query_expansion import (
     SYNONYMS,
     ExpandedQuery,
+    SynonymIndex,
     expand_term,
     expand_query,
     get_all_synonyms,
     add_synonym,
+    rebuild_synonym_index,
     _normalize_term,
-    _extract_terms,
+    _tokenize,
 )
 
 
@@ -28,22 +31,44 @@ class TestNormalizeTerm:
         assert _normalize_term("  PYTHON  ") == "python"
 
 
-class TestExtractTerms:
-    """Test term extraction from queries."""
+class TestSynonymIndex:
+    """Test the compiled synonym index."""
 
-    def test_single_word(self):
-        terms = _extract_terms("python")
-        assert "python" in terms
+    @pytest.fixture
+    def index(self):
+        return SynonymIndex(
+            {"postgresql": ["postgres", "pg"], "free spaced repetition scheduler": ["fsrs"]},
+            {"postgres": "postgresql", "pg": "postgresql", "fsrs": "free spaced repetition scheduler"},
+        )
+
+    def test_tokenize(self):
+        assert _tokenize("Next.js, FastAPI?") == ["nextjs", "fastapi"]
+
+    def test_single_word(self, index):
+        assert index.match(["postgresql"]) == ["postgresql"]
 
     def test_multiple_words(self):
-        terms = _extract_terms("python fastapi")
-        assert "python" in terms
-        assert "fastapi" in terms
+        matched = query_expansion._index.match(_tokenize("python fastapi"))
+        assert matched == ["python", "fastapi"]
 
     def test_extracts_phrases(self):
-        terms = _extract_terms("ci cd pipeline")
-        # Should include 2-word and 3-word phrases
-        assert any("ci cd" in t for t in terms)
+        matched = query_expansion._index.match(_tokenize("ci cd pipeline"))
+        assert "ci cd" in matched
+        assert "pipeline" in matched
+
+    def test_phrases_longer_than_three_words(self, index):
+        words = _tokenize("tuning the free spaced repetition scheduler")
+        assert index.match(words) == ["free spaced repetition scheduler"]
+        assert index.expand("free spaced repetition scheduler") == ["fsrs"]
+
+    def test_partial_phrase_does_not_match(self, index):
+        assert index.match(_tokenize("free spaced repetition")) == []
+
+    def test_reverse_lookup_resolved_at_compile_time(self, index):
+        assert index.expansions["pg"] == ("postgresql", "postgres")
+
+    def test_expand_deduplicates_in_match_order(self, index):
+        assert index.expand("postgres vs pg") == ["postgresql", "pg", "postgres"]
 
 
 class TestExpandTerm:
@@ -94,15 +119,6 @@ class TestExpandQuery:
             mock.return_value = MagicMock(search_enable_query_expansion=True)
             yield mock
 
-    @pytest.fixture
-    def mock_cache(self):
-        with patch("knowledge.query_expansion.get_cache") as mock:
-            cache = AsyncMock()
-            cache.get.return_value = None
-            cache.set.return_value = True
-            mock.return_value = cache
-            yield cache
-
     async def test_expansion_disabled(self):
         """Test no expansion when disabled."""
         with patch("knowledge.query_expansion.get_settings") as mock:
@@ -114,7 +130,7 @@ class TestExpandQuery:
             assert result.expanded == "python fastapi"
             assert result.terms_added == []
 
-    async def test_expansion_adds_terms(self, mock_settings, mock_cache):
+    async def test_expansion_adds_terms(self, mock_settings):
         """Test expansion adds synonym terms."""
         result = await expand_query("python api")
 
@@ -123,14 +139,14 @@ class TestExpandQuery:
         # Should have added synonyms
         assert len(result.terms_added) > 0
 
-    async def test_expansion_limits_terms(self, mock_settings, mock_cache):
+    async def test_expansion_limits_terms(self, mock_settings):
         """Test expansion limits to 5 terms."""
         # Query with many expandable terms
         result = await expand_query("python javascript typescript golang rust")
 
         assert len(result.terms_added) <= 5
 
-    async def test_no_duplicate_terms(self, mock_settings, mock_cache):
+    async def test_no_duplicate_terms(self, mock_settings):
         """Test expansion doesn't add terms already in query."""
         result = await expand_query("python py python3")
 
@@ -139,22 +155,31 @@ class TestExpandQuery:
             assert term not in ["python", "py", "python3"]
 
     async def test_returns_cached_result(self, mock_settings):
-        """Test returns cached expansion result."""
-        with patch("knowledge.query_expansion.get_cache") as mock:
-            cache = AsyncMock()
-            cache.get.return_value = {
-                "original": "test",
-                "expanded": "test expanded",
-                "terms_added": ["expanded"],
-                "expansion_applied": True,
-            }
-            mock.return_value = cache
+        """Test repeated queries are served from the process-local LRU."""
+        first = await expand_query("kubernetes helm")
+
+        with patch("knowledge.query_expansion._expand_query") as compute:
+            second = await expand_query("kubernetes helm")
+
+        compute.assert_not_called()
+        assert second is first
+        assert "k8s" in second.terms_added
 
-            result = await expand_query("test")
+    async def test_add_synonym_invalidates_cached_expansions(self, mock_settings):
+        """Test runtime synonyms apply to queries expanded before they were added."""
+        before = await expand_query("warp drive internals")
+        assert before.expansion_applied is False
+
+        try:
+            add_synonym("warp drive", ["ftl engine"])
+            after = await expand_query("warp drive internals")
+        finally:
+            del SYNONYMS["warp drive"]
+            del query_expansion._REVERSE_SYNONYMS["ftl engine"]
+            rebuild_synonym_index()
 
-            assert result.original == "test"
-            assert result.expanded == "test expanded"
-            assert result.expansion_applied is True
+        assert after.terms_added == ["ftl engine"]
+        assert after.expanded == "warp drive internals ftl engine"
 
 
 class TestSynonymDictionary:
@@ -219,9 +244,12 @@ class TestAddSynonym:
             add_synonym("testterm123", ["testsynonym"])
             assert "testterm123" in SYNONYMS
             assert "testsynonym" in SYNONYMS["testterm123"]
+            assert expand_term("testsynonym") == ["testterm123"]
         finally:
             if original is None and "testterm123" in SYNONYMS:
                 del SYNONYMS["testterm123"]
+            query_expansion._REVERSE_SYNONYMS.pop("testsynonym", None)
+            rebuild_synonym_index()
 
     def test_add_to_existing(self):
         # Add to existing term
@@ -230,8 +258,11 @@ class TestAddSynonym:
         try:
             add_synonym("python", ["newpythonsynonym"])
             assert "newpythonsynonym" in SYNONYMS["python"]
+            assert "newpythonsynonym" in expand_term("python")
         finally:
             SYNONYMS["python"] = original_python
+            query_expansion._REVERSE_SYNONYMS.pop("newpythonsynonym", None)
+            rebuild_synonym_index()
 
     def test_normalizes_terms(self):
         original = SYNONYMS.get("normalizetest", None)
@@ -243,3 +274,5 @@ class TestAddSynonym:
         finally:
             if original is None and "normalizetest" in SYNONYMS:
                 del SYNONYMS["normalizetest"]
+            query_expansion._REVERSE_SYNONYMS.pop("synonym", None)
+            rebuild_synonym_index()
@@ -0,0 +1,136 @@
+"""Tests for the in-memory and Redis token bucket rate limiters."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from knowledge.api.middleware import RedisRateLimiter, TokenBucketRateLimiter
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("knowledge.api.middleware.time.time", clock):
+        yield clock
+
+
+class TestTokenBucketRateLimiter:
+    """Tests for TokenBucketRateLimiter."""
+
+    async def test_burst_then_refill(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=3)
+
+        results = [await limiter.acquire("a") for _ in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[2][1].remaining == 0
+        assert results[3][1].reset == int(clock.now + 1)
+
+        clock.now += 1  # one token at 1/s
+        allowed, info = await limiter.acquire("a")
+        assert allowed and info.remaining == 0
+
+    async def test_clients_are_independent(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=1)
+        assert (await limiter.acquire("a"))[0]
+        assert not (await limiter.acquire("a"))[0]
+        assert (await limiter.acquire("b"))[0]
+
+    async def test_custom_rate_limit(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60)
+        allowed, info = await limiter.acquire("a", rate_limit=5)
+        assert allowed
+        assert (info.limit, info.remaining) == (5, 9)
+
+    async def test_bounded_by_max_clients(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=1, max_clients=2, shards=1)
+        for client in ("a", "b", "c"):
+            await limiter.acquire(client)
+        assert len(limiter) == 2
+        # "a" was least recently used and evicted
+        assert limiter.get_info("a") is None
+        assert limiter.get_info("c") is not None
+
+    async def test_idle_buckets_expire_lazily(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=2, shards=1)
+        await limiter.acquire("idle")
+        await limiter.acquire("busy")
+        for _ in range(2):
+            await limiter.acquire("busy")
+
+        clock.now += 1.5  # "idle" has refilled, "busy" has not
+        await limiter.acquire("new")
+        assert limiter.get_info("idle") is None
+        assert limiter.get_info("busy") is not None
+
+    async def test_get_info_does_not_consume(self, clock):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst_size=5)
+        assert limiter.get_info("a") is None
+        await limiter.acquire("a")
+        assert limiter.get_info("a").remaining == 4
+        assert limiter.get_info("a").remaining == 4
+
+
+class TestRedisRateLimiter:
+    """Tests for the Lua token bucket, against fakeredis."""
+
+    @pytest.fixture
+    def redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def test_workers_share_one_bucket(self, redis, clock):
+        workers = [RedisRateLimiter(requests_per_minute=60, burst_size=3, redis=redis) for _ in range(2)]
+
+        results = [await workers[i % 2].acquire("client") for i in range(4)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert [info.remaining for _, info in results] == [2, 1, 0, 0]
+
+        clock.now += 2
+        assert (await workers[1].acquire("client"))[1].remaining == 1
+
+    async def test_key_expires_when_refilled(self, redis, clock):
+        limiter = RedisRateLimiter(requests_per_minute=60, burst_size=3, redis=redis)
+        await limiter.acquire("client")
+
+        ttl = await redis.pttl(f"{RedisRateLimiter.KEY_PREFIX}client")
+        assert 0 < ttl <= 4000
+
+    async def test_one_round_trip(self, clock):
+        redis = MagicMock()
+        script = AsyncMock(return_value=[1, "9.0"])
+        redis.register_script.return_value = script
+        limiter = RedisRateLimiter(requests_per_minute=60, burst_size=10, redis=redis)
+
+        allowed, info = await limiter.acquire("client")
+
+        assert allowed and info.remaining == 9
+        script.assert_awaited_once()
+        assert script.call_args.kwargs["keys"] == ["ratelimit:tb:client"]
+
+    async def test_falls_back_on_redis_error(self, clock):
+        redis = MagicMock()
+        redis.register_script.return_value = AsyncMock(side_effect=ConnectionError("down"))
+        limiter = RedisRateLimiter(requests_per_minute=60, burst_size=1, redis=redis)
+
+        assert (await limiter.acquire("client"))[0]
+        assert not (await limiter.acquire("client"))[0]
+
+    async def test_reconnect_is_throttled(self):
+        limiter = RedisRateLimiter(requests_per_minute=60, redis_url="redis://unreachable:1/0")
+        with patch("redis.asyncio.from_url") as from_url:
+            from_url.return_value.ping = AsyncMock(side_effect=ConnectionError("refused"))
+            await limiter.acquire("client")
+            await limiter.acquire("client")
+
+        assert from_url.call_count == 1
@@ -587,3 +587,214 @@ class TestErrorHandling:
 
             # Task should complete (with warning logged)
             assert reranker_module._preload_task is not None
+
+
+class TestRerankScheduler:
+    """Tests for cross-request micro-batching."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_sorted_batch(self):
+        """Test pairs from concurrent callers are scored together, shortest first."""
+        from knowledge.reranker import RerankScheduler
+
+        calls: list[tuple[list[list[str]], int]] = []
+
+        def predict(pairs: list[list[str]], batch_size: int) -> list[float]:
+            calls.append((pairs, batch_size))
+            return [float(len(passage)) for _, passage in pairs]
+
+        scheduler = RerankScheduler(predict, max_wait_ms=20, max_pairs=100)
+
+        first, second = await asyncio.gather(
+            scheduler.score([("q", "long passage"), ("q", "mid one")]),
+            scheduler.score([("q", "a"), ("q", "mid one")]),
+        )
+
+        assert first == [12.0, 7.0]
+        assert second == [1.0, 7.0]
+        assert len(calls) == 1
+        pairs, batch_size = calls[0]
+        # Duplicate pair scored once, batch ordered by length
+        assert [p[1] for p in pairs] == ["a", "mid one", "long passage"]
+        assert batch_size == 3
+        assert (scheduler.batches, scheduler.pairs_scored) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_max_pairs_flushes_without_waiting(self):
+        """Test a full queue is scored immediately and split into max_pairs windows."""
+        from knowledge.reranker import RerankScheduler
+
+        sizes: list[int] = []
+
+        def predict(pairs: list[list[str]], batch_size: int) -> list[float]:
+            sizes.append(batch_size)
+            return [0.5] * len(pairs)
+
+        scheduler = RerankScheduler(predict, max_wait_ms=60_000, max_pairs=2)
+        scores = await asyncio.wait_for(
+            scheduler.score([("q", "a"), ("q", "b"), ("q", "c")]), timeout=1
+        )
+
+        assert scores == [0.5, 0.5, 0.5]
+        assert sizes == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_prediction_error_reaches_every_caller(self):
+        """Test a failed batch raises in each waiting request."""
+        from knowledge.reranker import RerankScheduler
+
+        def predict(pairs: list[list[str]], batch_size: int) -> list[float]:
+            raise RuntimeError("model crashed")
+
+        scheduler = RerankScheduler(predict, max_wait_ms=5)
+        results = await asyncio.gather(
+            scheduler.score([("q", "a")]),
+            scheduler.score([("q", "b")]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestRerankScoreCache:
+    """Tests for the per-pair rerank score cache."""
+
+    @pytest.mark.asyncio
+    async def test_only_uncached_pairs_reach_the_model(self):
+        """Test cached pair scores are reused and misses are written back."""
+        import numpy as np
+
+        from knowledge.cache import CacheType
+        from knowledge.reranker import LocalReranker
+
+        reranker = LocalReranker(model_name="test-model")
+        reranker._model = MagicMock()
+        reranker._model.predict.return_value = np.array([0.7])
+
+        cache = MagicMock()
+        cache.get_many = AsyncMock(return_value=[0.9, None])
+        cache.set_many = AsyncMock(return_value=True)
+
+        with patch("knowledge.reranker.get_cache", AsyncMock(return_value=cache)):
+            scores = await reranker.score("query", ["cached", "fresh"], use_cache=True)
+
+        assert scores == [0.9, pytest.approx(0.7)]
+        assert reranker._model.predict.call_args[0][0] == [["query", "fresh"]]
+
+        cache_type, keys = cache.get_many.await_args.args
+        assert cache_type == CacheType.RERANK
+        assert keys[0][0] == "test-model"
+        assert keys[0][1] == keys[1][1]  # same query hash
+        assert keys[0][2] != keys[1][2]  # passage hashes differ
+        written = cache.set_many.await_args.args[1]
+        assert written == [(keys[1], pytest.approx(0.7))]
+
+
+class TestOnnxBackend:
+    """Tests for the int8 ONNX Runtime reranker backend."""
+
+    def _fake_encoder(self):
+        import numpy as np
+
+        from knowledge.reranker import OnnxCrossEncoder
+
+        session = MagicMock()
+        session.get_inputs.return_value = [MagicMock(), MagicMock()]
+        session.get_inputs.return_value[0].name = "input_ids"
+        session.get_inputs.return_value[1].name = "attention_mask"
+        # One logit per pair: the passage length
+        session.run.side_effect = lambda _, feeds: [
+            feeds["attention_mask"].sum(axis=1, keepdims=True).astype(np.float32)
+        ]
+
+        def tokenizer(queries, passages, **kwargs):
+            assert kwargs["return_tensors"] == "np"
+            width = max(len(p) for p in passages)
+            mask = np.array([[1] * len(p) + [0] * (width - len(p)) for p in passages])
+            return {"input_ids": mask * 7, "attention_mask": mask, "token_type_ids": mask * 0}
+
+        return OnnxCrossEncoder(session, tokenizer), session
+
+    def test_predict_batches_and_applies_sigmoid(self):
+        """Test pairs are scored in batches and squashed like CrossEncoder."""
+        import numpy as np
+
+        encoder, session = self._fake_encoder()
+        pairs = [["q", "a"], ["q", "abc"], ["q", ""]]
+
+        scores = encoder.predict(pairs, batch_size=2)
+
+        assert session.run.call_count == 2
+        feeds = session.run.call_args_list[0].args[1]
+        # Only inputs the graph declares are fed, as int64
+        assert set(feeds) == {"input_ids", "attention_mask"}
+        assert feeds["input_ids"].dtype == np.int64
+        np.testing.assert_allclose(scores, 1 / (1 + np.exp(-np.array([1.0, 3.0, 0.0]))), rtol=1e-6)
+
+    def test_predict_raw_logits_without_sigmoid(self):
+        """Test models saved with an identity activation return raw logits."""
+        encoder, _ = self._fake_encoder()
+        encoder.apply_sigmoid = False
+        assert encoder.predict([["q", "abcd"]]).tolist() == [4.0]
+
+    def test_local_reranker_loads_onnx_backend(self, tmp_path):
+        """Test the onnx backend loads the quantized graph on the CPU."""
+        from knowledge.reranker import LocalReranker
+
+        encoder, _ = self._fake_encoder()
+        settings = MagicMock(rerank_onnx_dir=str(tmp_path))
+        with patch("knowledge.reranker.get_settings", return_value=settings), \
+             patch("knowledge.reranker.OnnxCrossEncoder.load", return_value=encoder) as load:
+            reranker = LocalReranker(model_name="test-model", backend="onnx")
+            reranker.preload()
+
+        load.assert_called_once_with("test-model", tmp_path)
+        assert reranker._device == "cpu"
+        assert reranker.cache_model_key == "test-model@onnx-int8"
+        assert reranker._predict_sync([["q", "ab"]], batch_size=8) == pytest.approx([0.8808], abs=1e-4)
+
+    def test_unknown_backend_rejected(self):
+        """Test an unknown backend fails on load."""
+        from knowledge.reranker import LocalReranker
+
+        with pytest.raises(ValueError, match="Unknown reranker backend"):
+            LocalReranker(model_name="test-model", backend="tensorrt").preload()
+
+
+def _onnx_parity_available() -> bool:
+    try:
+        import onnxruntime  # noqa: F401
+        import optimum.onnxruntime  # noqa: F401
+    except Exception:
+        return False
+    return _sentence_transformers_available
+
+
+@pytest.mark.skipif(
+    not _onnx_parity_available(),
+    reason="onnxruntime, optimum and sentence-transformers required for parity check",
+)
+def test_onnx_int8_scores_match_torch(tmp_path):
+    """Test the quantized ONNX graph ranks like the full-precision model."""
+    import numpy as np
+    from sentence_transformers import CrossEncoder
+
+    from knowledge.reranker import OnnxCrossEncoder
+
+    model_name = "cross-encoder/ms-marco-TinyBERT-L-2-v2"
+    query = "how does postgres store vectors"
+    passages = [
+        "pgvector adds a vector column type and approximate nearest neighbour indexes to Postgres.",
+        "The recipe calls for two cups of flour and a pinch of salt.",
+        "Postgres stores table rows in 8kB heap pages.",
+        "Vector databases index embeddings for similarity search.",
+        "The match ended in a draw after extra time.",
+    ]
+    pairs = [[query, p] for p in passages]
+
+    torch_scores = np.asarray(CrossEncoder(model_name, device="cpu").predict(pairs))
+    onnx_scores = OnnxCrossEncoder.load(model_name, tmp_path).predict(pairs)
+
+    np.testing.assert_allclose(onnx_scores, torch_scores, atol=0.05)
+    assert np.argmax(onnx_scores) == np.argmax(torch_scores)
+    assert list(np.argsort(-onnx_scores)[:3]) == list(np.argsort(-torch_scores)[:3])
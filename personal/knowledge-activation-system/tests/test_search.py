@@ -9,8 +9,11 @@ import pytest
 
 from knowledge.config import Settings
 from knowledge.search import (
+    RankFusion,
     SearchResult,
+    get_cached_search,
     hybrid_search,
+    hybrid_search_with_status,
     rrf_fusion,
     search_bm25_only,
     search_vector_only,
@@ -155,6 +158,84 @@ class TestRRFFusion:
         assert results_k1[0].score > results_k100[0].score
 
 
+class TestRankFusion:
+    """Tests for columnar score fusion."""
+
+    @staticmethod
+    def _lists(n: int) -> tuple[list[tuple], list[tuple]]:
+        ids = [uuid4() for _ in range(n)]
+        bm25 = [(cid, f"T{i}", "note", "default", f"bm25 {i}", 1.0 - i / n) for i, cid in enumerate(ids)]
+        # Vector list ranks the same content in reverse order
+        vector = [(cid, f"T{i}", "note", None, f"vec {i}", 0.5) for i, cid in reversed(list(enumerate(ids)))]
+        return bm25, vector
+
+    def test_top_matches_full_sort(self):
+        """Top-k selection returns the head of the fully ranked list."""
+        bm25, vector = self._lists(50)
+        vector = vector[:20]
+        full = rrf_fusion(bm25, vector, k=60)
+
+        fusion = RankFusion(bm25, vector)
+        top = fusion.top(fusion.scores(k=60), limit=10)
+
+        assert [r.content_id for r in top] == [r.content_id for r in full[:10]]
+        assert [r.score for r in top] == pytest.approx([r.score for r in full[:10]])
+
+    def test_ties_keep_first_seen_order(self):
+        """Equal scores are ordered by first appearance, across the limit cut."""
+        bm25 = [(uuid4(), f"T{i}", "note", "default", None, 1.0) for i in range(6)]
+        fusion = RankFusion(bm25, [])
+
+        top = fusion.top(fusion.scores(raw_bm25=True), limit=3)
+
+        assert [r.content_id for r in top] == [row[0] for row in bm25[:3]]
+
+    def test_weights_shift_ranking(self):
+        """Source weights favour the heavier list."""
+        bm25, vector = self._lists(5)
+        fusion = RankFusion(bm25, vector)
+
+        bm25_heavy = fusion.top(fusion.scores(bm25_weight=1.8, vector_weight=0.2))
+        vector_heavy = fusion.top(fusion.scores(bm25_weight=0.2, vector_weight=1.8))
+
+        assert bm25_heavy[0].content_id == bm25[0][0]
+        assert vector_heavy[0].content_id == vector[0][0]
+
+    def test_quality_factors_and_min_score(self):
+        """Quality factors scale scores before thresholding."""
+        bm25, _ = self._lists(3)
+        fusion = RankFusion(bm25, [])
+        scores = fusion.scores(raw_bm25=True)
+        scores *= fusion.quality_factors({bm25[2][0]: 1.0, bm25[0][0]: 0.0})
+
+        results = fusion.top(scores, min_score=0.5)
+
+        # 1.0 * 0.8, 0.667 * 1.0 (default quality); 0.333 * 1.2 falls below
+        assert [r.content_id for r in results] == [bm25[0][0], bm25[1][0]]
+        assert [r.score for r in results] == pytest.approx([0.8, bm25[1][5]])
+        assert results[1].bm25_score == bm25[1][5]
+
+    def test_materializes_merged_metadata(self):
+        """Namespace falls back to the vector row, chunk text prefers it."""
+        cid = uuid4()
+        fusion = RankFusion(
+            [(cid, "Title", "note", None, "bm25 text", 2.0)],
+            [(cid, "Other", "file", "work", "vector text", 0.8)],
+        )
+
+        (result,) = fusion.top(fusion.scores())
+
+        assert (result.title, result.content_type) == ("Title", "note")
+        assert result.namespace == "work"
+        assert result.chunk_text == "vector text"
+        assert (result.bm25_rank, result.vector_rank, result.vector_similarity) == (1, 1, 0.8)
+
+    def test_search_result_uses_slots(self):
+        """SearchResult carries no per-instance __dict__."""
+        result = SearchResult(content_id=uuid4(), title="T", content_type="note", score=1.0)
+        assert not hasattr(result, "__dict__")
+
+
 class TestHybridSearch:
     """Tests for hybrid search function."""
 
@@ -221,6 +302,151 @@ class TestHybridSearch:
 
             assert len(results) <= 5
 
+    @pytest.mark.asyncio
+    async def test_hybrid_search_uses_precomputed_embedding(
+        self,
+        test_settings: Settings,
+        mock_embedding: list[float],
+        sample_bm25_results: list[tuple],
+        sample_vector_results: list[tuple],
+    ):
+        """Test that a supplied query embedding skips the embedding call."""
+        mock_cache = AsyncMock()
+        mock_cache.is_connected = False
+
+        with patch("knowledge.search.get_db") as mock_get_db, \
+             patch("knowledge.search.embed_text") as mock_embed, \
+             patch("knowledge.search.get_cache", AsyncMock(return_value=mock_cache)):
+
+            mock_db = AsyncMock()
+            mock_db.bm25_search = AsyncMock(return_value=sample_bm25_results)
+            mock_db.vector_search = AsyncMock(return_value=sample_vector_results)
+            mock_db.get_quality_scores = AsyncMock(return_value={})
+            mock_get_db.return_value = mock_db
+
+            response = await hybrid_search_with_status(
+                "machine learning", settings=test_settings, query_embedding=mock_embedding
+            )
+
+            mock_embed.assert_not_called()
+            assert mock_db.vector_search.await_args.args[0] == mock_embedding
+            assert response.search_mode == "hybrid"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_falls_back_to_bm25_when_embedding_fails(
+        self,
+        test_settings: Settings,
+        sample_bm25_results: list[tuple],
+    ):
+        """Test that an embedding failure degrades to BM25-only results."""
+        mock_cache = AsyncMock()
+        mock_cache.is_connected = False
+
+        with patch("knowledge.search.get_db") as mock_get_db, \
+             patch("knowledge.search.embed_text", AsyncMock(side_effect=RuntimeError("ollama down"))), \
+             patch("knowledge.search.get_cache", AsyncMock(return_value=mock_cache)):
+
+            mock_db = AsyncMock()
+            mock_db.bm25_search = AsyncMock(return_value=sample_bm25_results)
+            mock_db.get_quality_scores = AsyncMock(return_value={})
+            mock_get_db.return_value = mock_db
+
+            response = await hybrid_search_with_status("machine learning", settings=test_settings)
+
+            assert response.degraded
+            assert response.search_mode == "bm25_only"
+            assert len(response.results) == len(sample_bm25_results)
+            mock_db.vector_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_are_coalesced(
+        self,
+        test_settings: Settings,
+        mock_embedding: list[float],
+        sample_bm25_results: list[tuple],
+        sample_vector_results: list[tuple],
+    ):
+        """Test that identical in-flight searches share one execution."""
+        import asyncio
+
+        mock_cache = AsyncMock()
+        mock_cache.is_connected = False
+
+        async def slow_bm25(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return sample_bm25_results
+
+        with patch("knowledge.search.get_settings", return_value=test_settings), \
+             patch("knowledge.search.get_db") as mock_get_db, \
+             patch("knowledge.search.embed_text", AsyncMock(return_value=mock_embedding)), \
+             patch("knowledge.search.get_cache", AsyncMock(return_value=mock_cache)):
+
+            mock_db = AsyncMock()
+            mock_db.bm25_search = AsyncMock(side_effect=slow_bm25)
+            mock_db.vector_search = AsyncMock(return_value=sample_vector_results)
+            mock_db.get_quality_scores = AsyncMock(return_value={})
+            mock_get_db.return_value = mock_db
+
+            responses = await asyncio.gather(
+                *(hybrid_search_with_status("machine learning", limit=5) for _ in range(4)),
+                hybrid_search_with_status("machine learning", limit=3),
+            )
+
+            # Four identical calls share one search; the different limit runs separately
+            assert mock_db.bm25_search.await_count == 2
+            assert all(r is responses[0] for r in responses[:4])
+            assert responses[4] is not responses[0]
+
+    @pytest.mark.asyncio
+    async def test_cache_key_embeds_namespace_generation(
+        self,
+        test_settings: Settings,
+        mock_embedding: list[float],
+        sample_bm25_results: list[tuple],
+        sample_vector_results: list[tuple],
+    ):
+        """Test a generation bump makes earlier cache entries unreachable."""
+        store: dict[tuple, dict] = {}
+        generation = {"work": 7}
+
+        mock_cache = MagicMock()
+        mock_cache.is_connected = True
+        mock_cache.get_generation = AsyncMock(side_effect=lambda ns: generation[ns])
+        mock_cache.get = AsyncMock(side_effect=lambda ct, *key: store.get(key))
+        mock_cache.set = AsyncMock(side_effect=lambda ct, value, *key: store.setdefault(key, value))
+
+        with patch("knowledge.search.get_db") as mock_get_db, \
+             patch("knowledge.search.embed_text", AsyncMock(return_value=mock_embedding)), \
+             patch("knowledge.search.get_cache", AsyncMock(return_value=mock_cache)):
+
+            mock_db = AsyncMock()
+            mock_db.bm25_search = AsyncMock(return_value=sample_bm25_results)
+            mock_db.vector_search = AsyncMock(return_value=sample_vector_results)
+            mock_db.get_quality_scores = AsyncMock(return_value={})
+            mock_get_db.return_value = mock_db
+
+            search = lambda: hybrid_search_with_status(  # noqa: E731
+                "machine learning", namespace="work", settings=test_settings
+            )
+            first = await search()
+            second = await search()
+            generation["work"] += 1
+            third = await search()
+
+        assert (first.cached, second.cached, third.cached) == (False, True, False)
+        assert mock_db.bm25_search.await_count == 2
+        assert [key[-1] for key in store] == [7, 8]
+
+        # The cache-only lookup uses the same key as the search itself
+        with patch("knowledge.search.get_cache", AsyncMock(return_value=mock_cache)), \
+             patch("knowledge.search.get_settings", return_value=test_settings):
+            hit = await get_cached_search("machine learning", namespace="work")
+            miss = await get_cached_search("machine learning", namespace="work", limit=3)
+
+        assert hit is not None and hit.cached
+        assert [r.content_id for r in hit.results] == [r.content_id for r in third.results]
+        assert miss is None
+
     @pytest.mark.asyncio
     async def test_hybrid_search_empty_results(
         self,
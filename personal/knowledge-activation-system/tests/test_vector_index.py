@@ -0,0 +1,312 @@
+"""Tests for the in-process ANN vector index."""
+
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from knowledge.config import Settings
+from knowledge.db import Database
+from knowledge.vector_index import VectorIndex, _CopyParser, sync_vector_index
+
+DIM = 16
+
+
+@pytest.fixture
+def corpus() -> tuple[list[UUID], list[UUID], np.ndarray]:
+    """200 content items with 3 chunks each."""
+    rng = np.random.default_rng(7)
+    content_ids = [uuid4() for _ in range(200)]
+    chunk_owner = [cid for cid in content_ids for _ in range(3)]
+    chunk_ids = [uuid4() for _ in chunk_owner]
+    vectors = rng.standard_normal((len(chunk_ids), DIM)).astype(np.float32)
+    return chunk_ids, chunk_owner, vectors
+
+
+@pytest.fixture
+def index(corpus) -> VectorIndex:
+    chunk_ids, content_ids, vectors = corpus
+    vi = VectorIndex(dim=DIM, nprobe=64)
+    vi.build(chunk_ids, content_ids, vectors, nlist=16)
+    return vi
+
+
+def brute_force(corpus, query, k):
+    """Exact best-chunk-per-content ranking."""
+    chunk_ids, content_ids, vectors = corpus
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    best: dict[UUID, float] = {}
+    for owner, score in zip(content_ids, scores, strict=True):
+        best[owner] = max(best.get(owner, -2.0), float(score))
+    return sorted(best, key=best.get, reverse=True)[:k]
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex build/search/update."""
+
+    def test_search_matches_exact_when_probing_all_lists(self, index, corpus):
+        query = np.random.default_rng(1).standard_normal(DIM)
+        hits = index.search(query, 10)
+        assert [h.content_id for h in hits] == brute_force(corpus, query, 10)
+
+    def test_search_returns_one_hit_per_content(self, index):
+        hits = index.search(np.ones(DIM), 50)
+        assert len({h.content_id for h in hits}) == len(hits) == 50
+        assert all(a.similarity >= b.similarity for a, b in zip(hits, hits[1:], strict=False))
+
+    def test_partial_probe_has_high_recall(self, index, corpus):
+        index.nprobe = 8
+        rng = np.random.default_rng(2)
+        recall = []
+        for _ in range(20):
+            query = rng.standard_normal(DIM)
+            expected = set(brute_force(corpus, query, 10))
+            found = {h.content_id for h in index.search(query, 10)}
+            recall.append(len(expected & found) / 10)
+        assert sum(recall) / len(recall) >= 0.7
+
+    def test_add_and_remove_content(self, index):
+        content_id = uuid4()
+        chunk_id = uuid4()
+        target = np.zeros(DIM)
+        target[0] = 1.0
+
+        assert index.add([chunk_id], [content_id], [target.tolist()]) == 1
+        # Re-adding a known chunk is a no-op (idempotent catch-up)
+        assert index.add([chunk_id], [content_id], [target.tolist()]) == 0
+        assert index.search(target, 1)[0].chunk_id == chunk_id
+
+        assert index.remove_content(content_id) == 1
+        assert index.search(target, 1)[0].content_id != content_id
+
+    def test_replace_content_reindexes_upserted_chunks(self, index):
+        content_id = uuid4()
+        chunk_id = uuid4()
+        old, new = np.zeros(DIM), np.zeros(DIM)
+        old[0], new[1] = 1.0, 1.0
+        index.add([chunk_id], [content_id], [old.tolist()])
+
+        # Same chunk id with a new embedding, as written by an upsert
+        assert index.replace_content(content_id, [chunk_id], [new.tolist()]) == 1
+        assert index.search(new, 1)[0].chunk_id == chunk_id
+        assert index.search(old, 1)[0].content_id != content_id
+
+    def test_remove_base_content(self, index, corpus):
+        _, content_ids, _ = corpus
+        size = len(index)
+        assert index.remove_content(content_ids[0]) == 3
+        assert len(index) == size - 3
+        assert all(h.content_id != content_ids[0] for h in index.search(np.ones(DIM), 200))
+
+    def test_empty_index(self):
+        vi = VectorIndex(dim=DIM)
+        vi.build([], [], np.zeros((0, DIM)))
+        assert vi.ready
+        assert vi.search(np.ones(DIM), 5) == []
+
+    def test_save_and_load_round_trip(self, index, corpus, tmp_path: Path):
+        _, content_ids, _ = corpus
+        extra_content = uuid4()
+        index.add([uuid4()], [extra_content], [np.ones(DIM).tolist()])
+        index.remove_content(content_ids[5])
+        query = np.random.default_rng(3).standard_normal(DIM)
+        before = index.search(query, 10)
+
+        index.save(tmp_path)
+        loaded = VectorIndex.load(tmp_path, nprobe=64)
+
+        assert loaded is not None
+        assert isinstance(loaded._vectors, np.memmap)
+        assert len(loaded) == len(index)
+        assert loaded.search(query, 10) == before
+
+        # Later saves only rewrite the mutable parts
+        base_files = dict(loaded._base_files)
+        deleted_file = json.loads((tmp_path / "meta.json").read_text())["files"]["deleted"]
+        loaded.remove_content(content_ids[6])
+        loaded.save(tmp_path)
+        files = json.loads((tmp_path / "meta.json").read_text())["files"]
+        assert {name: files[name] for name in base_files} == base_files
+        assert files["deleted"] != deleted_file
+        assert sorted(p.name for p in tmp_path.glob("*.npy")) == sorted(files.values())
+
+    def test_interrupted_save_keeps_previous_snapshot(self, index, corpus, tmp_path: Path):
+        _, content_ids, _ = corpus
+        index.save(tmp_path)
+        size = len(index)
+
+        index.remove_content(content_ids[0])
+        index.add([uuid4()], [uuid4()], [np.ones(DIM).tolist()])
+        real_save = np.save
+        calls = 0
+
+        def failing_save(f, array):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise OSError("disk full")
+            real_save(f, array)
+
+        with patch("knowledge.vector_index.np.save", failing_save), pytest.raises(OSError):
+            index.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+        assert loaded is not None
+        assert len(loaded) == size
+        assert loaded.delta_size == 0
+
+    async def test_threaded_save_writes_state_from_when_it_started(self, index, corpus, tmp_path: Path):
+        _, content_ids, _ = corpus
+        index.add([uuid4()], [uuid4()], [np.ones(DIM).tolist()])
+        size = len(index)
+        real_snapshot = VectorIndex.snapshot
+
+        def snapshot_then_mutate(self, path):
+            snapshot = real_snapshot(self, path)
+            # The loop keeps mutating while the thread writes
+            self.add([uuid4()], [uuid4()], [np.ones(DIM).tolist()])
+            self.remove_content(content_ids[0])
+            return snapshot
+
+        with patch.object(VectorIndex, "snapshot", snapshot_then_mutate):
+            await index.save_in_thread(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path)
+        assert loaded is not None
+        assert len(loaded) == size
+        assert loaded.delta_size == 1
+        assert len(loaded._known_chunks) == 1
+        assert index._base_path == tmp_path
+
+    def test_load_keeps_recent_base_chunks_known(self, corpus, tmp_path: Path):
+        chunk_ids, content_ids, vectors = corpus
+        vi = VectorIndex(dim=DIM, nprobe=64)
+        vi.build(chunk_ids, content_ids, vectors, nlist=16)
+        vi.mark_known(chunk_ids[-3:])
+        vi.save(tmp_path)
+
+        loaded = VectorIndex.load(tmp_path, nprobe=64)
+        assert loaded is not None
+        # The first catch-up sync sees the recent base rows again
+        assert loaded.add(chunk_ids[-3:], content_ids[-3:], vectors[-3:]) == 0
+        hits = loaded.search(vectors[-1], 200)
+        assert len({h.chunk_id for h in hits}) == len(hits)
+
+    def test_search_sees_delta_changes(self, index):
+        content_id = uuid4()
+        target = np.zeros(DIM)
+        target[0] = 1.0
+        index.add([uuid4()], [content_id], [target.tolist()])
+        assert index.search(target, 1)[0].content_id == content_id
+
+        index.remove_content(content_id)
+        assert index.search(target, 1)[0].content_id != content_id
+
+        index.add([uuid4()], [content_id], [target.tolist()])
+        assert index.search(target, 1)[0].content_id == content_id
+
+    def test_load_missing_snapshot(self, tmp_path: Path):
+        assert VectorIndex.load(tmp_path) is None
+
+
+class TestSyncVectorIndex:
+    """Tests for catching the index up with other processes' writes."""
+
+    def _db(self, now: datetime, rows: bytes, updated: list[tuple[UUID, datetime]]) -> MagicMock:
+        db = MagicMock()
+        db.get_database_time = AsyncMock(return_value=now)
+        db.get_deleted_content_ids = AsyncMock(return_value=[])
+        db.get_updated_content = AsyncMock(return_value=updated)
+
+        async def copy_chunk_embeddings(output, content_ids=None, **kwargs):
+            await output(rows if content_ids else b"")
+
+        db.copy_chunk_embeddings = AsyncMock(side_effect=copy_chunk_embeddings)
+        return db
+
+    async def test_rechunked_content_is_replaced(self, index, corpus):
+        _, content_ids, _ = corpus
+        owner = content_ids[0]
+        new_chunk = uuid4()
+        vector = ",".join(["1"] + ["0"] * (DIM - 1))
+        now = datetime.now(UTC)
+        index.synced_at = now - timedelta(minutes=1)
+        db = self._db(now, f"{new_chunk}\t{owner}\tf\t[{vector}]\n".encode(), [(owner, now)])
+
+        added, removed = await sync_vector_index(db, index)
+
+        assert (added, removed) == (1, 3)
+        hits = [h for h in index.search(np.eye(DIM)[0], 200) if h.content_id == owner]
+        assert [h.chunk_id for h in hits] == [new_chunk]
+
+        # The same version is not re-read on the next sync
+        assert await sync_vector_index(db, index) == (0, 0)
+
+
+class TestCopyParser:
+    """Tests for parsing COPY text output."""
+
+    async def test_parses_rows_split_across_chunks(self):
+        chunk_id, content_id = uuid4(), uuid4()
+        data = f"{chunk_id}\t{content_id}\tt\t[0.5,-1,2]\n{uuid4()}\t{content_id}\tf\t[1,2,3]\n".encode()
+
+        parser = _CopyParser()
+        await parser(data[:30])
+        await parser(data[30:])
+        parser.finish()
+
+        assert parser.chunk_ids[0] == chunk_id
+        assert parser.content_ids == [content_id, content_id]
+        assert parser.recent == [chunk_id]
+        assert parser.matrix(3).tolist() == [[0.5, -1.0, 2.0], [1.0, 2.0, 3.0]]
+
+
+class TestDatabaseIndexSearch:
+    """Tests for Database.vector_search using an attached index."""
+
+    def _db_with_rows(self, settings: Settings, rows: list[dict]) -> tuple[Database, MagicMock]:
+        db = Database(settings)
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=rows)
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        db.acquire = acquire  # type: ignore[method-assign]
+        return db, conn
+
+    async def test_hydrates_index_hits(self, test_settings: Settings, index):
+        query = np.ones(DIM)
+        hits = index.search(query, 3)
+        rows = [
+            {"chunk_id": h.chunk_id, "id": h.content_id, "title": f"T{i}", "type": "note",
+             "namespace": None, "chunk_text": "text"}
+            for i, h in enumerate(hits)
+        ]
+        db, conn = self._db_with_rows(test_settings, rows)
+        db.vector_index = index
+
+        results = await db.vector_search(query.tolist(), limit=3)
+
+        assert [r[0] for r in results] == [h.content_id for h in hits]
+        assert results[0][5] == pytest.approx(hits[0].similarity)
+        conn.fetch.assert_awaited_once()
+
+    async def test_falls_back_to_sql_when_filtered_short(self, test_settings: Settings, index):
+        db, conn = self._db_with_rows(test_settings, [])
+        db.vector_index = index
+
+        results = await db.vector_search(np.ones(DIM).tolist(), limit=3, namespace="other")
+
+        assert results == []
+        # Index hydration returned nothing, so the exact query ran as well
+        assert conn.fetch.await_count == 2